@@ -0,0 +1,38 @@
+"""Add sample_weight to guard_operations and guard_metrics
+
+Revision ID: 0011_guard_sample_weight
+Revises: df138efe9c17
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0011_guard_sample_weight'
+down_revision = 'df138efe9c17'
+branch_labels = None
+depends_on = None
+
+GUARD_TABLES = ('guard_operations', 'guard_metrics')
+
+
+def _existing_tables() -> set:
+    # The guard tables are created on first use (create_all), so they may not exist yet
+    return set(sa.inspect(op.get_bind()).get_table_names())
+
+
+def upgrade() -> None:
+    """Add sample_weight (operations a sampled row stands for) to the guard tables."""
+    existing = _existing_tables()
+    for table in GUARD_TABLES:
+        if table in existing:
+            op.add_column(table, sa.Column('sample_weight', sa.Float(), nullable=False, server_default='1'))
+
+
+def downgrade() -> None:
+    """Remove sample_weight from the guard tables."""
+    existing = _existing_tables()
+    for table in GUARD_TABLES:
+        if table in existing:
+            op.drop_column(table, 'sample_weight')
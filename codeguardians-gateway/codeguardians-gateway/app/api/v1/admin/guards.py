@@ -31,13 +31,17 @@ async def get_circuit_breakers(
         circuit_breaker_data = {}
         
         for service_name, breaker in orchestrator.circuit_breakers.items():
+            window = breaker.get_state()
             circuit_breaker_data[service_name] = {
                 "state": breaker.state,
                 "failure_count": breaker.failure_count,
                 "threshold": breaker.threshold,
                 "timeout": breaker.timeout,
                 "last_failure_time": breaker.last_failure_time.isoformat() if breaker.last_failure_time else None,
-                "can_execute": breaker.can_execute()
+                "can_execute": not breaker.is_open,
+                "failure_rate": window["failure_rate"],
+                "slow_call_rate": window["slow_call_rate"],
+                "consecutive_opens": breaker.consecutive_opens
             }
         
         return {
@@ -7,9 +7,11 @@ through the unified gateway.
 
 import uuid
 import json
+from datetime import datetime
 from typing import Dict, Any, Optional, List
 from fastapi import APIRouter, HTTPException, Depends, Request, BackgroundTasks
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
+from starlette.background import BackgroundTask
 from pydantic import BaseModel, Field
 import logging
 
@@ -20,7 +22,7 @@ from app.core.guard_orchestrator import (
     GuardServiceType,
     ServiceHealth
 )
-from app.core.exceptions import GuardServiceError, ServiceUnavailableError
+from app.core.exceptions import GuardServiceError, ServiceUnavailableError, ValidationError
 from app.api.dependencies import get_current_user, require_admin_access
 from app.middleware.explicit_rate_limiting import public_rate_limit, admin_rate_limit
 from app.utils.logging import get_logger
@@ -88,6 +90,74 @@ def sanitize_service_name(name: str) -> str:
     return sanitized
 
 
+def _get_tenant_id(http_request: Request) -> Optional[str]:
+    """Get the organization id resolved by the tenant context middleware, if any."""
+    tenant_context = getattr(http_request.state, "tenant_context", None)
+    return getattr(tenant_context, "organization_id", None)
+
+
+def _validate_guard_payload(payload: Dict[str, Any], http_request: Request, default_path: str) -> None:
+    """
+    Validate a guard request payload (size, injection patterns, depth).
+    
+    Shared by the single-guard and multi-guard endpoints so a scan is
+    validated exactly once regardless of how many guards it is sent to.
+    
+    Raises:
+        HTTPException: 413 if the payload is too large, 400 if it is unsafe
+    """
+    from app.core.input_validation import get_input_validator
+    validator = get_input_validator()
+    validator.clear_threats()
+    
+    # Validate payload size
+    payload_str = json.dumps(payload)
+    payload_size = len(payload_str.encode('utf-8'))
+    if not validator.validate_payload_size(payload):
+        # Record payload size metric before rejecting
+        try:
+            from app.core.orchestrator_metrics import record_payload_size
+            record_payload_size(http_request.url.path if hasattr(http_request, 'url') else default_path, payload_size)
+        except Exception:
+            pass
+        
+        raise HTTPException(
+            status_code=413,
+            detail=f"Payload exceeds maximum size of {MAX_PAYLOAD_SIZE} bytes (got {payload_size} bytes)"
+        )
+    
+    # Validate payload content for security threats
+    if validator.detect_sql_injection(payload_str):
+        raise HTTPException(
+            status_code=400,
+            detail="SQL injection pattern detected in payload"
+        )
+    if validator.detect_xss(payload_str):
+        raise HTTPException(
+            status_code=400,
+            detail="XSS pattern detected in payload"
+        )
+    if validator.detect_command_injection(payload_str):
+        raise HTTPException(
+            status_code=400,
+            detail="Command injection pattern detected in payload"
+        )
+    
+    # Validate JSON structure depth
+    if not validator.validate_json_structure(payload):
+        raise HTTPException(
+            status_code=400,
+            detail="JSON structure exceeds maximum depth"
+        )
+    
+    # Record payload size metrics (for valid requests)
+    try:
+        from app.core.orchestrator_metrics import record_payload_size
+        record_payload_size(http_request.url.path if hasattr(http_request, 'url') else default_path, payload_size)
+    except Exception:
+        pass
+
+
 class GuardRequest(BaseModel):
     """Request model for guard service operations."""
     service_type: str = Field(..., description="Type of guard service to use")
@@ -119,6 +189,46 @@ class GuardResponse(BaseModel):
     metadata: Optional[Dict[str, Any]] = None
 
 
+class MultiGuardRequest(BaseModel):
+    """Request model for dispatching one payload to several guard services."""
+    service_types: List[str] = Field(..., min_length=1, description="Guard services to run concurrently")
+    payload: Dict[str, Any] = Field(..., description="Request payload shared by all guard services")
+    user_id: Optional[str] = Field(None, description="User ID for request tracking")
+    session_id: Optional[str] = Field(None, description="Session ID for request tracking")
+    priority: int = Field(1, description="Request priority (1-10)")
+    timeout: Optional[int] = Field(None, description="Per-guard deadline in seconds")
+    stop_on_block: bool = Field(False, description="Return as soon as one guard blocks the content")
+    client_type: Optional[str] = Field("api", description="Client type: web, vscode, chrome, api")
+
+
+class MultiGuardResponse(BaseModel):
+    """Response model for multi-guard fan-out operations."""
+    request_id: str
+    success: bool
+    blocked: bool = False
+    blocking_service: Optional[str] = None
+    results: Dict[str, GuardResponse] = {}
+    cancelled_services: List[str] = []
+    timed_out_services: List[str] = []
+    processing_time: Optional[float] = None
+
+
+class BatchGuardItem(BaseModel):
+    """One item of a batch scan."""
+    item_id: Optional[str] = Field(None, description="Caller-supplied id echoed in the result (defaults to the item index)")
+    service_type: str = Field(..., description="Type of guard service to use")
+    payload: Dict[str, Any] = Field(..., description="Request payload for the guard service")
+
+
+class BatchGuardRequest(BaseModel):
+    """Request model for scanning many items in one call."""
+    items: List[BatchGuardItem] = Field(..., min_length=1, max_length=1000, description="Items to scan")
+    user_id: Optional[str] = Field(None, description="User ID for request tracking")
+    session_id: Optional[str] = Field(None, description="Session ID for request tracking")
+    timeout: Optional[int] = Field(None, description="Upstream call timeout in seconds")
+    client_type: Optional[str] = Field("api", description="Client type: web, vscode, chrome, api")
+
+
 class HealthResponse(BaseModel):
     """Response model for service health checks."""
     service_name: str
@@ -152,56 +262,7 @@ async def process_guard_request(
     request_id = getattr(http_request.state, "request_id", None) or http_request.headers.get("X-Request-ID") or str(uuid.uuid4())
 
     # Enhanced input validation
-    from app.core.input_validation import get_input_validator
-    validator = get_input_validator()
-    validator.clear_threats()
-    
-    # Validate payload size
-    payload_size = len(json.dumps(request.payload).encode('utf-8'))
-    if not validator.validate_payload_size(request.payload):
-        # Record payload size metric before rejecting
-        try:
-            from app.core.orchestrator_metrics import record_payload_size
-            record_payload_size(http_request.url.path if hasattr(http_request, 'url') else '/process', payload_size)
-        except Exception:
-            pass
-        
-        raise HTTPException(
-            status_code=413,
-            detail=f"Payload exceeds maximum size of {MAX_PAYLOAD_SIZE} bytes (got {payload_size} bytes)"
-        )
-    
-    # Validate payload content for security threats
-    payload_str = json.dumps(request.payload)
-    if validator.detect_sql_injection(payload_str):
-        raise HTTPException(
-            status_code=400,
-            detail="SQL injection pattern detected in payload"
-        )
-    if validator.detect_xss(payload_str):
-        raise HTTPException(
-            status_code=400,
-            detail="XSS pattern detected in payload"
-        )
-    if validator.detect_command_injection(payload_str):
-        raise HTTPException(
-            status_code=400,
-            detail="Command injection pattern detected in payload"
-        )
-    
-    # Validate JSON structure depth
-    if not validator.validate_json_structure(request.payload):
-        raise HTTPException(
-            status_code=400,
-            detail="JSON structure exceeds maximum depth"
-        )
-    
-    # Record payload size metrics (for valid requests)
-    try:
-        from app.core.orchestrator_metrics import record_payload_size
-        record_payload_size(http_request.url.path if hasattr(http_request, 'url') else '/process', payload_size)
-    except Exception:
-        pass
+    _validate_guard_payload(request.payload, http_request, '/process')
 
     # Validate service type
     try:
@@ -260,7 +321,8 @@ async def process_guard_request(
             session_id=request.session_id,
             priority=request.priority,
             timeout=request.timeout,
-            fallback_enabled=request.fallback_enabled
+            fallback_enabled=request.fallback_enabled,
+            tenant_id=_get_tenant_id(http_request)
         )
         
         # If Clerk token is available, use it as unified API key for all services
@@ -360,6 +422,286 @@ async def scan_text(
     return await process_guard_request(request, background_tasks, http_request)
 
 
+@router.post("/process/multi", response_model=MultiGuardResponse)
+@public_rate_limit(requests_per_minute=100)
+async def process_multi_guard_request(
+    request: MultiGuardRequest,
+    background_tasks: BackgroundTasks,
+    http_request: Request
+) -> MultiGuardResponse:
+    """
+    Process one payload through several guard services concurrently.
+    
+    The payload is validated and enriched once, then dispatched to every
+    requested guard at the same time with a per-guard deadline. With
+    stop_on_block the response returns as soon as any guard blocks the
+    content; guards still running are cancelled and listed separately.
+    """
+    request_id = getattr(http_request.state, "request_id", None) or http_request.headers.get("X-Request-ID") or str(uuid.uuid4())
+
+    if not request.payload:
+        raise HTTPException(
+            status_code=400,
+            detail="Payload cannot be empty"
+        )
+
+    # Validate once for all guards
+    _validate_guard_payload(request.payload, http_request, '/process/multi')
+
+    service_types = []
+    for raw_type in request.service_types:
+        try:
+            service_types.append(GuardServiceType(raw_type.lower()))
+        except ValueError:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Invalid service type: {raw_type}. "
+                       f"Valid types: {[t.value for t in GuardServiceType]}"
+            )
+
+    client_type = request.client_type or "api"
+    enhanced_payload = request.payload.copy()
+    enhanced_payload.update({
+        "client_type": client_type,
+        "user_agent": http_request.headers.get("user-agent", ""),
+        "ip_address": http_request.client.host if http_request.client else None
+    })
+
+    orchestration_request = OrchestrationRequest(
+        request_id=request_id,
+        service_type=service_types[0],
+        payload=enhanced_payload,
+        user_id=request.user_id,
+        session_id=request.session_id,
+        priority=request.priority,
+        timeout=request.timeout,
+        tenant_id=_get_tenant_id(http_request)
+    )
+
+    try:
+        fan_out = await orchestrator.orchestrate_fan_out(
+            orchestration_request,
+            service_types,
+            guard_timeout=request.timeout,
+            stop_on_block=request.stop_on_block
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Unexpected error in multi-guard processing: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+    results = {}
+    for service_name, response in fan_out.responses.items():
+        background_tasks.add_task(
+            log_guard_request,
+            response.request_id,
+            service_name,
+            request.user_id,
+            response.success,
+            response.processing_time,
+            client_type,
+            response.data
+        )
+        results[service_name] = GuardResponse(
+            request_id=response.request_id,
+            service_type=response.service_type.value,
+            success=response.success,
+            data=response.data,
+            error=response.error,
+            processing_time=response.processing_time,
+            service_used=response.service_used,
+            fallback_used=response.fallback_used,
+            client_type=client_type,
+            confidence_score=response.data.get("confidence") if response.data else None
+        )
+
+    return MultiGuardResponse(
+        request_id=request_id,
+        success=bool(results) and all(r.success for r in results.values()),
+        blocked=fan_out.blocked,
+        blocking_service=fan_out.blocking_service,
+        results=results,
+        cancelled_services=fan_out.cancelled_services,
+        timed_out_services=fan_out.timed_out_services,
+        processing_time=fan_out.processing_time
+    )
+
+
+@router.post("/process/batch")
+@public_rate_limit(requests_per_minute=20)
+async def process_batch_guard_request(
+    request: BatchGuardRequest,
+    http_request: Request
+) -> StreamingResponse:
+    """
+    Scan many items in one request, streaming results as NDJSON.
+    
+    Items are grouped by guard and packed into one upstream call per chunk
+    where the guard supports batches, so HTTP, auth and middleware overhead
+    is paid once per batch instead of once per item. Each result line is
+    emitted as soon as its guard answers; the last line is a summary.
+    All items are validated before any guard is called.
+    """
+    batch_id = getattr(http_request.state, "request_id", None) or http_request.headers.get("X-Request-ID") or str(uuid.uuid4())
+    tenant_id = _get_tenant_id(http_request)
+    client_type = request.client_type or "api"
+
+    orchestration_requests = []
+    item_ids: Dict[str, str] = {}
+    for index, item in enumerate(request.items):
+        item_id = item.item_id or str(index)
+        if not item.payload:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Payload cannot be empty (item {item_id})"
+            )
+        try:
+            service_type = GuardServiceType(item.service_type.lower())
+        except ValueError:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Invalid service type: {item.service_type} (item {item_id}). "
+                       f"Valid types: {[t.value for t in GuardServiceType]}"
+            )
+        _validate_guard_payload(item.payload, http_request, '/process/batch')
+
+        enhanced_payload = item.payload.copy()
+        enhanced_payload.update({
+            "client_type": client_type,
+            "user_agent": http_request.headers.get("user-agent", ""),
+            "ip_address": http_request.client.host if http_request.client else None
+        })
+
+        request_id = f"{batch_id}-{index}"
+        item_ids[request_id] = item_id
+        orchestration_requests.append(OrchestrationRequest(
+            request_id=request_id,
+            service_type=service_type,
+            payload=enhanced_payload,
+            user_id=request.user_id,
+            session_id=request.session_id,
+            timeout=request.timeout,
+            tenant_id=tenant_id
+        ))
+
+    async def stream_results():
+        succeeded = 0
+        failed = 0
+        start_time = datetime.now()
+        try:
+            async for response in orchestrator.orchestrate_batch(orchestration_requests):
+                if response.success:
+                    succeeded += 1
+                else:
+                    failed += 1
+                yield json.dumps({
+                    "item_id": item_ids.get(response.request_id),
+                    "request_id": response.request_id,
+                    "service_type": response.service_type.value,
+                    "success": response.success,
+                    "data": response.data,
+                    "error": response.error,
+                    "error_code": response.error_code,
+                    "processing_time": response.processing_time,
+                    "cache_hit": response.cache_hit
+                }, default=str) + "\n"
+        except Exception as e:
+            logger.error(f"Batch scan {batch_id} aborted: {e}")
+            yield json.dumps({"batch_id": batch_id, "error": "Batch processing aborted"}) + "\n"
+            return
+
+        processing_time = (datetime.now() - start_time).total_seconds()
+        logger.info(f"Batch scan {batch_id}: {succeeded} succeeded, {failed} failed in {processing_time:.2f}s")
+        yield json.dumps({
+            "summary": {
+                "batch_id": batch_id,
+                "total": len(orchestration_requests),
+                "succeeded": succeeded,
+                "failed": failed,
+                "processing_time": processing_time
+            }
+        }) + "\n"
+
+    return StreamingResponse(
+        stream_results(),
+        media_type="application/x-ndjson",
+        headers={"X-Request-ID": batch_id}
+    )
+
+
+@router.post("/stream/{service_type}")
+@public_rate_limit(requests_per_minute=20)
+async def stream_guard_request(
+    service_type: str,
+    http_request: Request
+) -> StreamingResponse:
+    """
+    Stream a large payload through a guard without buffering it.
+    
+    The request body is the guard's native JSON request (e.g. ContextGuard
+    ``{"current_code": ..., "previous_code": ...}``) and is forwarded to the
+    guard chunk by chunk. The response is NDJSON: ``{"type": "data"}`` frames
+    carrying the guard's response body as it arrives, then a final
+    ``{"type": "verdict"}`` envelope with success, status and timings.
+    """
+    request_id = getattr(http_request.state, "request_id", None) or http_request.headers.get("X-Request-ID") or str(uuid.uuid4())
+
+    try:
+        guard_type = GuardServiceType(service_type.lower())
+    except ValueError:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid service type: {service_type}. "
+                   f"Valid types: {[t.value for t in GuardServiceType]}"
+        )
+
+    content_length = http_request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > MAX_PAYLOAD_SIZE:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Payload exceeds maximum size of {MAX_PAYLOAD_SIZE} bytes (got {content_length} bytes)"
+        )
+
+    orchestration_request = OrchestrationRequest(
+        request_id=request_id,
+        service_type=guard_type,
+        payload={},
+        user_id=http_request.headers.get("X-User-ID"),
+        session_id=http_request.headers.get("X-Session-ID"),
+        tenant_id=_get_tenant_id(http_request)
+    )
+
+    try:
+        stream = await orchestrator.orchestrate_stream(
+            orchestration_request,
+            http_request.stream(),
+            max_bytes=MAX_PAYLOAD_SIZE
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except ValidationError as e:
+        status_code = 413 if e.error_code == "PAYLOAD_TOO_LARGE" else 400
+        raise HTTPException(status_code=status_code, detail=e.message)
+    except ServiceUnavailableError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except GuardServiceError as e:
+        raise HTTPException(status_code=502, detail=str(e))
+
+    try:
+        from app.core.orchestrator_metrics import record_payload_size
+        record_payload_size(http_request.url.path, stream.counters["bytes_in"])
+    except Exception:
+        pass
+
+    return StreamingResponse(
+        stream.frames(),
+        media_type="application/x-ndjson",
+        headers={"X-Request-ID": request_id},
+        background=BackgroundTask(stream.aclose)
+    )
+
+
 @router.get("/health", response_model=Dict[str, HealthResponse])
 async def get_services_health(
     current_user = Depends(get_current_user)
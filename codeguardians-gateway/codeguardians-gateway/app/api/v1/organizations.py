@@ -27,6 +27,7 @@ from app.core.models import (
     User, Organization, OrganizationMember, 
     Subscription, SubscriptionTier, SubscriptionStatus
 )
+from app.core.tenant_cache import get_tenant_cache
 from app.middleware.tenant_context import (
     TenantContext, CurrentTenant, require_permission, require_role, get_current_tenant
 )
@@ -282,6 +283,7 @@ async def invite_member(
                 )
                 db.add(new_member)
                 await db.commit()
+                await get_tenant_cache().invalidate_user(existing_user.id)
             except Exception as e:
                 await db.rollback()
                 logger.error(f"Error adding member to organization: {e}")
@@ -359,6 +361,9 @@ async def update_member(
         member.updated_at = datetime.now(timezone.utc)
         await db.commit()
         
+        # Cached API-key contexts carry the old role
+        await get_tenant_cache().invalidate_user(member.user_id)
+        
         logger.info(f"Updated member {member_id} in organization: {tenant_context.organization_id}")
         
         return {
@@ -419,6 +424,9 @@ async def remove_member(
         member.updated_at = datetime.now(timezone.utc)
         await db.commit()
         
+        # The member's API keys must stop resolving to this organization
+        await get_tenant_cache().invalidate_user(member.user_id)
+        
         logger.info(f"Removed member {member_id} from organization: {tenant_context.organization_id}")
         
         return {
@@ -5,7 +5,10 @@ FULL MONTY EEAaO: Excellence at Every Level
 - Performance metrics
 - Optimization recommendations
 - Cache statistics
+- Guard verdict cache statistics and per-tenant switch
+- Adaptive guard concurrency limits
 - Connection pool stats
+- Per-stage guard orchestration latency and slow-request log
 """
 
 from typing import Dict, Any
@@ -15,6 +18,12 @@ from fastapi.responses import JSONResponse
 from app.core.performance_optimizer import get_performance_optimizer
 from app.core.connection_pool_optimizer import get_connection_optimizer
 from app.core.response_cache import get_cache_client
+from app.core.guard_verdict_cache import get_guard_verdict_cache
+from app.core.guard_orchestrator import orchestrator, REQUEST_COALESCING_ENABLED
+from app.core.adaptive_concurrency import get_concurrency_controller
+from app.core.request_hedging import get_request_hedger
+from app.core.stage_timing import get_stage_timings
+from app.api.dependencies import require_admin_access
 from app.core.query_optimizer import get_query_optimizer
 from app.utils.logging import get_logger
 
@@ -58,6 +67,11 @@ async def get_performance_metrics() -> Dict[str, Any]:
             "redis_pool": "initialized" if connection_optimizer._redis_pool else "not_initialized"
         },
         "cache": cache_stats,
+        "guard_request_coalescing": {
+            "enabled": REQUEST_COALESCING_ENABLED,
+            "in_flight": orchestrator._single_flight.in_flight(),
+            "coalesced_total": orchestrator._single_flight.coalesced_total
+        },
         "optimization_status": "excellent"
     }
 
@@ -98,3 +112,69 @@ async def get_optimization_recommendations() -> Dict[str, Any]:
         "optimization_level": "excellent" if len(recommendations) == 0 else "good"
     }
 
+
+@router.get("/cache/guard-verdicts", summary="Get guard verdict cache statistics")
+async def get_guard_verdict_cache_stats() -> Dict[str, Any]:
+    """
+    Get guard verdict cache statistics (hit rate, entries, TTLs, guard versions).
+    """
+    return get_guard_verdict_cache().get_stats()
+
+
+@router.put("/cache/guard-verdicts/tenants/{tenant_id}", summary="Enable or disable verdict caching for a tenant")
+async def set_guard_verdict_cache_tenant(
+    tenant_id: str,
+    enabled: bool,
+    _admin=Depends(require_admin_access)
+) -> Dict[str, Any]:
+    """
+    Toggle guard verdict caching for a tenant (admin only).
+    """
+    await get_guard_verdict_cache().set_tenant_enabled(tenant_id, enabled)
+    logger.info(f"Guard verdict cache {'enabled' if enabled else 'disabled'} for tenant {tenant_id}")
+    return {"tenant_id": tenant_id, "enabled": enabled}
+
+
+@router.get("/concurrency/guards", summary="Get adaptive guard concurrency limits")
+async def get_guard_concurrency_stats() -> Dict[str, Any]:
+    """
+    Get per-guard adaptive concurrency limits, in-flight and queued calls,
+    and shed counts.
+    """
+    return get_concurrency_controller().get_stats()
+
+
+@router.get("/hedging/guards", summary="Get hedged request statistics")
+async def get_guard_hedging_stats() -> Dict[str, Any]:
+    """
+    Get per-guard hedge rate, hedge win rate and the p95 latency that
+    triggers a hedge.
+    """
+    return get_request_hedger().get_stats()
+
+
+@router.get("/stages", summary="Get per-stage guard latency")
+async def get_guard_stage_latency() -> Dict[str, Any]:
+    """
+    Get p50/p90/p99/max latency of each orchestration stage per guard
+    (validation, transform, cache_lookup, queue_wait, upstream, ...).
+    """
+    stage_timings = get_stage_timings()
+    return {
+        "guards": stage_timings.get_stats(),
+        "slow_threshold_ms": stage_timings.slow_threshold_ns / 1e6
+    }
+
+
+@router.get("/stages/slow", summary="Get sampled slow guard requests")
+async def get_slow_guard_requests() -> Dict[str, Any]:
+    """
+    Get the most recent sampled slow guard requests with their stage
+    breakdown.
+    """
+    stage_timings = get_stage_timings()
+    return {
+        "slow_threshold_ms": stage_timings.slow_threshold_ns / 1e6,
+        "sample_rate": stage_timings.slow_sample_rate,
+        "requests": stage_timings.get_slow_requests()
+    }
@@ -6,9 +6,9 @@ Supports both direct uploads and presigned URL generation for client-side upload
 """
 
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Query
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Query, Request
 from fastapi.security import HTTPBearer
-from fastapi.responses import JSONResponse
+from fastapi.responses import Response, StreamingResponse
 from pydantic import BaseModel
 
 from app.core.config import get_settings
@@ -19,13 +19,25 @@ from app.core.exceptions import (
 )
 from app.core.security import get_current_user_from_db
 from app.core.models import User
-from app.services.s3_service import get_s3_service, S3Service
+from app.services.s3_service import get_s3_service, parse_byte_range, S3Service
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.utils.logging import get_logger
 
 logger = get_logger(__name__)
 router = APIRouter(prefix="/upload", tags=["file-upload"])
 
+# Size of reads from the spooled multipart file
+UPLOAD_READ_CHUNK_SIZE = 1024 * 1024
+
+
+async def _read_upload_chunks(file: UploadFile, chunk_size: int = UPLOAD_READ_CHUNK_SIZE):
+    """Yield an UploadFile's content in chunks instead of reading it whole."""
+    while True:
+        chunk = await file.read(chunk_size)
+        if not chunk:
+            break
+        yield chunk
+
 
 class UploadResponse(BaseModel):
     """Response model for file upload."""
@@ -76,7 +88,8 @@ async def upload_file_direct(
     Upload file directly to the server.
 
     This endpoint accepts multipart form data and uploads the file
-    to storage (S3 or local fallback). Suitable for smaller files.
+    to storage (S3 or local fallback). The file is streamed to storage in
+    chunks, so memory use does not grow with the file size.
     
     Requires authentication to track file ownership.
     """
@@ -93,17 +106,14 @@ async def upload_file_direct(
         raise ServiceUnavailableError(message="File upload service is currently unavailable")
 
     try:
-        # Read file content
-        file_content = await file.read()
-
         # Get organization_id from user if available
         organization_id = getattr(current_user, 'organization_id', None)
         if organization_id:
             organization_id = str(organization_id)
 
         # Upload to storage (S3 or local fallback) with ownership tracking
-        result = await s3_service.upload_file(
-            file_content=file_content,
+        result = await s3_service.upload_stream(
+            _read_upload_chunks(file),
             filename=file.filename or "unknown",
             content_type=file.content_type,
             user_id=current_user.id,
@@ -126,6 +136,59 @@ async def upload_file_direct(
         raise InternalServerError(message="File operation failed due to internal server error")
 
 
+@router.put("/stream", response_model=UploadResponse)
+async def upload_file_stream(
+    request: Request,
+    filename: str = Query(..., min_length=1, max_length=255, description="Original filename"),
+    current_user: Optional[User] = Depends(get_current_user_from_db),
+    s3_service: S3Service = Depends(get_s3_service)
+):
+    """
+    Upload a file sent as the raw request body.
+
+    The body is passed straight from the socket into an S3 multipart upload
+    (or chunked local writes) without multipart parsing or spooling, so
+    large files use constant memory.
+
+    Requires authentication to track file ownership.
+    """
+    if current_user is None:
+        raise HTTPException(status_code=401, detail="Authentication required for file upload")
+
+    # Check if storage service is available
+    if not getattr(s3_service, '_use_local_fallback', False) and not s3_service._client:
+        logger.warning("File upload service is not available")
+        raise ServiceUnavailableError(message="File upload service is currently unavailable")
+
+    try:
+        organization_id = getattr(current_user, 'organization_id', None)
+        if organization_id:
+            organization_id = str(organization_id)
+
+        result = await s3_service.upload_stream(
+            request.stream(),
+            filename=filename,
+            content_type=request.headers.get("content-type"),
+            user_id=current_user.id,
+            organization_id=organization_id,
+            metadata={
+                "upload_method": "stream",
+                "original_filename": filename,
+            }
+        )
+
+        logger.info(f"File streamed successfully: {result['filename']} -> {result['file_id']}")
+
+        return UploadResponse(**result)
+
+    except FileUploadError as e:
+        logger.error(f"File upload failed: {e}")
+        raise FileUploadError(message=f"File upload failed: {str(e)}")
+    except Exception as e:
+        logger.error(f"Unexpected error during upload: {e}")
+        raise InternalServerError(message="File operation failed due to internal server error")
+
+
 @router.post("/presigned", response_model=PresignedUploadResponse)
 async def generate_presigned_upload_url(
     request: PresignedUploadRequest,
@@ -154,14 +217,16 @@ async def generate_presigned_upload_url(
 @router.get("/download/{file_id}")
 async def download_file(
     file_id: str,
+    request: Request,
     current_user: Optional[User] = Depends(get_current_user_from_db),
     s3_service: S3Service = Depends(get_s3_service)
 ):
     """
     Download file from storage.
 
-    This endpoint downloads a file from storage (S3 or local) and returns it as a response.
-    For large files, consider using presigned download URLs instead.
+    This endpoint streams a file from storage (S3 or local). A single-range
+    Range header is honored with a 206 Partial Content response, so clients
+    can resume interrupted downloads.
     """
     if current_user is None:
         from fastapi import HTTPException
@@ -193,18 +258,34 @@ async def download_file(
                         from app.core.exceptions import AuthorizationError
                         raise AuthorizationError("Access denied: You do not have permission to access this file")
         
-        # Download file from S3
-        file_content = await s3_service.download_file(file_id)
+        file_size = metadata['file_size']
+        filename = metadata.get('metadata', {}).get('original_filename', file_id)
+        headers = {
+            'Accept-Ranges': 'bytes',
+            'Content-Disposition': f'attachment; filename="{filename}"',
+            'ETag': f'"{metadata.get("etag", "")}"',
+        }
         
-        logger.info(f"File downloaded successfully: {file_id} by user {current_user.id}")
+        try:
+            byte_range = parse_byte_range(request.headers.get('range'), file_size)
+        except ValueError:
+            return Response(status_code=416, headers={'Content-Range': f'bytes */{file_size}', **headers})
         
-        return JSONResponse(
-            content=file_content,
-            media_type=metadata.get('content_type', 'application/octet-stream'),
-            headers={
-                'Content-Disposition': f'attachment; filename="{metadata.get("original_filename", file_id)}"',
-                'Content-Length': str(metadata['file_size']),
-            }
+        status_code = 200
+        start, end = 0, file_size - 1
+        if byte_range is not None:
+            status_code = 206
+            start, end = byte_range
+            headers['Content-Range'] = f'bytes {start}-{end}/{file_size}'
+        headers['Content-Length'] = str(end - start + 1)
+        
+        logger.info(f"File download started: {file_id} ({start}-{end}/{file_size}) by user {current_user.id}")
+        
+        return StreamingResponse(
+            s3_service.stream_file(file_id, byte_range),
+            status_code=status_code,
+            media_type=metadata.get('content_type') or 'application/octet-stream',
+            headers=headers
         )
         
     except FileUploadError as e:
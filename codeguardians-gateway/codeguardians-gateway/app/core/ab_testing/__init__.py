@@ -37,11 +37,12 @@ class ABTestingFramework:
         # Initialize components
         self.segmentation_engine = UserSegmentationEngine(redis_client)
         self.statistical_analyzer = StatisticalAnalyzer()
+        self.tracker = ExperimentTracker(redis_client)
         self.canary_manager = CanaryDeploymentManager(
             self.segmentation_engine, 
-            self.statistical_analyzer
+            self.statistical_analyzer,
+            tracker=self.tracker
         )
-        self.tracker = ExperimentTracker(redis_client)
         self.business_analyzer = BusinessImpactAnalyzer(self.tracker)
         
         logger.info("A/B Testing Framework initialized")
@@ -277,49 +278,94 @@ class ABTestingFramework:
                 metric_type=metric_type
             )
             
-            return {
-                "experiment_id": analysis.experiment_id,
-                "variant_a": analysis.variant_a,
-                "variant_b": analysis.variant_b,
-                "sample_size_a": analysis.sample_size_a,
-                "sample_size_b": analysis.sample_size_b,
-                "mean_a": analysis.mean_a,
-                "mean_b": analysis.mean_b,
-                "std_a": analysis.std_a,
-                "std_b": analysis.std_b,
-                "primary_test": {
-                    "test_name": analysis.primary_test.test_name,
-                    "statistic": analysis.primary_test.statistic,
-                    "p_value": analysis.primary_test.p_value,
-                    "degrees_of_freedom": analysis.primary_test.degrees_of_freedom,
-                    "confidence_interval": analysis.primary_test.confidence_interval,
-                    "effect_size": analysis.primary_test.effect_size,
-                    "power": analysis.primary_test.power,
-                    "is_significant": analysis.primary_test.is_significant,
-                    "interpretation": analysis.primary_test.interpretation
-                },
-                "secondary_tests": [
-                    {
-                        "test_name": test.test_name,
-                        "statistic": test.statistic,
-                        "p_value": test.p_value,
-                        "is_significant": test.is_significant,
-                        "interpretation": test.interpretation
-                    }
-                    for test in analysis.secondary_tests
-                ],
-                "confidence_interval": analysis.confidence_interval,
-                "effect_size": analysis.effect_size,
-                "power": analysis.power,
-                "is_significant": analysis.is_significant,
-                "recommendation": analysis.recommendation,
-                "analysis_timestamp": analysis.analysis_timestamp.isoformat()
-            }
+            return self._analysis_to_dict(analysis)
             
         except Exception as e:
             logger.error(f"Error analyzing experiment: {e}")
             raise
     
+    async def analyze_tracked_metric(
+        self,
+        experiment_id: str,
+        metric_name: str = "success",
+        variant_a_name: str = "control",
+        variant_b_name: str = "treatment",
+        metric_type: str = "binary"
+    ) -> Dict[str, Any]:
+        """
+        Perform statistical analysis of a tracked metric from its sufficient statistics.
+        
+        Args:
+            experiment_id: Experiment identifier
+            metric_name: Tracked metric name
+            variant_a_name: Name of variant A
+            variant_b_name: Name of variant B
+            metric_type: Type of metric (continuous, binary)
+            
+        Returns:
+            Statistical analysis results
+        """
+        try:
+            variants = await self.tracker.get_variant_statistics(experiment_id)
+            if variant_a_name not in variants or variant_b_name not in variants:
+                raise ValueError(f"No tracked results for {variant_a_name} and {variant_b_name}")
+            
+            analysis = self.statistical_analyzer.analyze_summaries(
+                experiment_id=experiment_id,
+                summary_a=variants[variant_a_name].metric(metric_name),
+                summary_b=variants[variant_b_name].metric(metric_name),
+                variant_a_name=variant_a_name,
+                variant_b_name=variant_b_name,
+                metric_type=metric_type
+            )
+            
+            return self._analysis_to_dict(analysis)
+            
+        except Exception as e:
+            logger.error(f"Error analyzing tracked metric: {e}")
+            raise
+    
+    def _analysis_to_dict(self, analysis) -> Dict[str, Any]:
+        """Serialize an ExperimentAnalysis."""
+        return {
+            "experiment_id": analysis.experiment_id,
+            "variant_a": analysis.variant_a,
+            "variant_b": analysis.variant_b,
+            "sample_size_a": analysis.sample_size_a,
+            "sample_size_b": analysis.sample_size_b,
+            "mean_a": analysis.mean_a,
+            "mean_b": analysis.mean_b,
+            "std_a": analysis.std_a,
+            "std_b": analysis.std_b,
+            "primary_test": {
+                "test_name": analysis.primary_test.test_name,
+                "statistic": analysis.primary_test.statistic,
+                "p_value": analysis.primary_test.p_value,
+                "degrees_of_freedom": analysis.primary_test.degrees_of_freedom,
+                "confidence_interval": analysis.primary_test.confidence_interval,
+                "effect_size": analysis.primary_test.effect_size,
+                "power": analysis.primary_test.power,
+                "is_significant": analysis.primary_test.is_significant,
+                "interpretation": analysis.primary_test.interpretation
+            },
+            "secondary_tests": [
+                {
+                    "test_name": test.test_name,
+                    "statistic": test.statistic,
+                    "p_value": test.p_value,
+                    "is_significant": test.is_significant,
+                    "interpretation": test.interpretation
+                }
+                for test in analysis.secondary_tests
+            ],
+            "confidence_interval": analysis.confidence_interval,
+            "effect_size": analysis.effect_size,
+            "power": analysis.power,
+            "is_significant": analysis.is_significant,
+            "recommendation": analysis.recommendation,
+            "analysis_timestamp": analysis.analysis_timestamp.isoformat()
+        }
+    
     async def analyze_business_impact(
         self,
         experiment_id: str,
@@ -6,6 +6,11 @@ Comprehensive tracking and analytics for A/B testing including:
 - Performance monitoring
 - Business impact analysis
 - Automated reporting
+
+Results are folded into per-variant sufficient statistics (counts, sums,
+sums of squares, quantile sketch buckets) kept in one Redis hash per
+experiment and updated with atomic HINCRBY/HINCRBYFLOAT, so concurrent
+trackers never overwrite each other and no per-result keys are stored.
 """
 
 from typing import Dict, List, Any, Optional, Tuple
@@ -15,10 +20,12 @@ import asyncio
 import json
 import logging
 import redis
+import redis.asyncio
 from collections import defaultdict, Counter
 
-from .models import ExperimentConfig, ExperimentResult, StatisticalAnalysis
+from .models import ExperimentConfig, StatisticalAnalysis
 from .statistical_analysis import StatisticalAnalyzer
+from .sufficient_stats import VariantStatistics, observation_increments, parse_variant_statistics
 
 logger = logging.getLogger(__name__)
 
@@ -72,14 +79,34 @@ class ExperimentTracker:
     
     Provides comprehensive tracking of experiment performance,
     user behavior, and business impact metrics.
+    
+    Works with both redis.Redis and redis.asyncio.Redis clients; calls on a
+    synchronous client run in a worker thread.
     """
     
-    def __init__(self, redis_client: redis.Redis):
+    def __init__(
+        self,
+        redis_client,
+        sketch_metrics: Tuple[str, ...] = ("response_time",),
+        sketch_alpha: float = 0.01,
+        stats_ttl: int = 30 * 24 * 3600,
+        analytics_interval: int = 100
+    ):
         self.redis_client = redis_client
-        self.metrics_prefix = "ab_test:metrics:"
-        self.results_prefix = "ab_test:results:"
         self.analytics_prefix = "ab_test:analytics:"
+        self.stats_prefix = "ab_test:stats:"
         self.cache_ttl = 3600  # 1 hour
+        self.stats_ttl = stats_ttl
+        self.sketch_metrics = sketch_metrics
+        self.sketch_alpha = sketch_alpha
+        self.analytics_interval = analytics_interval
+        self._is_async = isinstance(redis_client, redis.asyncio.Redis)
+    
+    async def _call(self, fn, *args, **kwargs):
+        """Run a Redis call without blocking the event loop."""
+        if self._is_async:
+            return await fn(*args, **kwargs)
+        return await asyncio.to_thread(fn, *args, **kwargs)
     
     async def track_experiment_result(
         self,
@@ -102,30 +129,11 @@ class ExperimentTracker:
             result_metadata: Additional metadata
         """
         try:
-            # Create result record
-            result = ExperimentResult(
-                experiment_id=experiment_id,
-                variant_name=variant_name,
-                user_id=user_id,
-                session_id=session_id,
-                timestamp=datetime.utcnow(),
-                metrics=metrics,
-                result_metadata=result_metadata or {}
-            )
-            
-            # Store in Redis for real-time access
-            result_key = f"{self.results_prefix}{experiment_id}:{user_id}:{session_id}"
-            self.redis_client.setex(
-                result_key, 
-                self.cache_ttl, 
-                json.dumps(asdict(result), default=str)
-            )
-            
             # Update real-time metrics
-            await self._update_real_time_metrics(experiment_id, variant_name, metrics)
+            total = await self._update_real_time_metrics(experiment_id, variant_name, metrics)
             
             # Trigger analytics if needed
-            await self._trigger_analytics_if_needed(experiment_id)
+            await self._trigger_analytics_if_needed(experiment_id, total)
             
             logger.debug(f"Tracked result for experiment {experiment_id}, variant {variant_name}")
             
@@ -137,107 +145,78 @@ class ExperimentTracker:
         experiment_id: str,
         variant_name: str,
         metrics: Dict[str, float]
-    ):
-        """Update real-time metrics for experiment."""
+    ) -> Optional[int]:
+        """
+        Fold one result into the experiment's sufficient statistics.
+        
+        Returns:
+            Total number of tracked results after the update
+        """
         try:
-            metrics_key = f"{self.metrics_prefix}{experiment_id}"
-            
-            # Get current metrics
-            current_metrics = self._get_current_metrics(experiment_id)
-            
-            # Update variant-specific metrics
-            if variant_name not in current_metrics.variant_counts:
-                current_metrics.variant_counts[variant_name] = 0
-                current_metrics.success_counts[variant_name] = 0
-                current_metrics.error_counts[variant_name] = 0
-                current_metrics.conversion_rates[variant_name] = 0.0
-                current_metrics.average_response_times[variant_name] = 0.0
-                current_metrics.throughput[variant_name] = 0.0
-            
-            # Update counts
-            current_metrics.variant_counts[variant_name] += 1
-            current_metrics.total_users += 1
-            
-            # Update success/error counts
-            if metrics.get("success", 0) > 0:
-                current_metrics.success_counts[variant_name] += 1
-            
-            if metrics.get("error", 0) > 0:
-                current_metrics.error_counts[variant_name] += 1
-            
-            # Update conversion rate
-            success_rate = current_metrics.success_counts[variant_name] / current_metrics.variant_counts[variant_name]
-            current_metrics.conversion_rates[variant_name] = success_rate
-            
-            # Update response time (rolling average)
-            response_time = metrics.get("response_time", 0)
-            if response_time > 0:
-                current_avg = current_metrics.average_response_times[variant_name]
-                count = current_metrics.variant_counts[variant_name]
-                current_metrics.average_response_times[variant_name] = (
-                    (current_avg * (count - 1) + response_time) / count
-                )
-            
-            # Update throughput
-            current_metrics.throughput[variant_name] = current_metrics.variant_counts[variant_name] / 60.0  # per minute
-            
-            # Update business metrics
-            for metric_name, value in metrics.items():
-                if metric_name.startswith("business_"):
-                    current_metrics.business_metrics[f"{variant_name}_{metric_name}"] = value
-            
-            # Store updated metrics
-            self.redis_client.setex(
-                metrics_key,
-                self.cache_ttl,
-                json.dumps(asdict(current_metrics), default=str)
+            stats_key = f"{self.stats_prefix}{experiment_id}"
+            int_increments, float_increments = observation_increments(
+                variant_name, metrics, self.sketch_metrics, self.sketch_alpha
             )
             
+            pipe = self.redis_client.pipeline(transaction=True)
+            pipe.hincrby(stats_key, "total", 1)
+            for field_name, amount in int_increments.items():
+                pipe.hincrby(stats_key, field_name, amount)
+            for field_name, amount in float_increments.items():
+                pipe.hincrbyfloat(stats_key, field_name, amount)
+            pipe.expire(stats_key, self.stats_ttl)
+            
+            results = await self._call(pipe.execute)
+            return int(results[0])
+            
         except Exception as e:
             logger.error(f"Error updating real-time metrics: {e}")
+            return None
     
-    def _get_current_metrics(self, experiment_id: str) -> ExperimentMetrics:
-        """Get current metrics for experiment."""
+    async def get_variant_statistics(self, experiment_id: str) -> Dict[str, VariantStatistics]:
+        """Get sufficient statistics per variant."""
         try:
-            metrics_key = f"{self.metrics_prefix}{experiment_id}"
-            cached_metrics = self.redis_client.get(metrics_key)
-            
-            if cached_metrics:
-                metrics_data = json.loads(cached_metrics)
-                return ExperimentMetrics(**metrics_data)
-            else:
-                # Return empty metrics
-                return ExperimentMetrics(
-                    experiment_id=experiment_id,
-                    timestamp=datetime.utcnow(),
-                    total_users=0,
-                    variant_counts={},
-                    success_counts={},
-                    error_counts={},
-                    conversion_rates={},
-                    average_response_times={},
-                    throughput={},
-                    business_metrics={}
-                )
-                
+            fields = await self._call(self.redis_client.hgetall, f"{self.stats_prefix}{experiment_id}")
+            if not isinstance(fields, dict):
+                return {}
+            fields = {k: v for k, v in fields.items() if k not in ("total", b"total")}
+            return parse_variant_statistics(fields, self.sketch_alpha)
         except Exception as e:
-            logger.error(f"Error getting current metrics: {e}")
-            return ExperimentMetrics(
-                experiment_id=experiment_id,
-                timestamp=datetime.utcnow(),
-                total_users=0,
-                variant_counts={},
-                success_counts={},
-                error_counts={},
-                conversion_rates={},
-                average_response_times={},
-                throughput={},
-                business_metrics={}
-            )
+            logger.error(f"Error getting variant statistics: {e}")
+            return {}
+    
+    def _build_metrics(self, experiment_id: str, variants: Dict[str, VariantStatistics]) -> ExperimentMetrics:
+        """Derive experiment metrics from variant statistics."""
+        metrics = ExperimentMetrics(
+            experiment_id=experiment_id,
+            timestamp=datetime.utcnow(),
+            total_users=sum(variant.count for variant in variants.values()),
+            variant_counts={},
+            success_counts={},
+            error_counts={},
+            conversion_rates={},
+            average_response_times={},
+            throughput={},
+            business_metrics={}
+        )
+        
+        for name, variant in variants.items():
+            metrics.variant_counts[name] = variant.count
+            metrics.success_counts[name] = variant.successes
+            metrics.error_counts[name] = variant.errors
+            metrics.conversion_rates[name] = variant.conversion_rate
+            metrics.average_response_times[name] = variant.metric("response_time").mean
+            metrics.throughput[name] = variant.count / 60.0  # per minute
+            for metric_name, summary in variant.metrics.items():
+                if metric_name.startswith("business_"):
+                    metrics.business_metrics[f"{name}_{metric_name}"] = summary.mean
+        
+        return metrics
     
     async def get_experiment_metrics(self, experiment_id: str) -> ExperimentMetrics:
         """Get current experiment metrics."""
-        return self._get_current_metrics(experiment_id)
+        variants = await self.get_variant_statistics(experiment_id)
+        return self._build_metrics(experiment_id, variants)
     
     async def get_experiment_performance_snapshot(self, experiment_id: str) -> PerformanceSnapshot:
         """Get performance snapshot for experiment."""
@@ -314,14 +293,11 @@ class ExperimentTracker:
         
         return alerts
     
-    async def _trigger_analytics_if_needed(self, experiment_id: str):
-        """Trigger analytics if experiment has enough data."""
+    async def _trigger_analytics_if_needed(self, experiment_id: str, total_users: Optional[int]):
+        """Trigger analytics every analytics_interval results once there is enough data."""
         try:
-            metrics = await self.get_experiment_metrics(experiment_id)
-            
             # Check if we have enough data for analysis
-            total_users = metrics.total_users
-            if total_users >= 100:  # Minimum sample size
+            if total_users and total_users >= 100 and total_users % self.analytics_interval == 0:
                 # Trigger background analytics
                 asyncio.create_task(self._perform_analytics(experiment_id))
                 
@@ -342,7 +318,8 @@ class ExperimentTracker:
                 "status": "completed"
             }
             
-            self.redis_client.setex(
+            await self._call(
+                self.redis_client.setex,
                 analytics_key,
                 self.cache_ttl,
                 json.dumps(analytics_data)
@@ -6,6 +6,12 @@ Implements canary deployment capabilities including:
 - Automatic rollback on issues
 - Performance monitoring
 - Risk mitigation
+
+With an ExperimentTracker attached, each stage is monitored continuously:
+the canary is compared with the control every few seconds using
+always-valid sequential tests (mSPRT) on the tracked error rate and
+response time, so a stage rolls back or advances as soon as the evidence
+is conclusive instead of after a fixed duration.
 """
 
 from typing import Dict, List, Any, Optional, Tuple
@@ -19,6 +25,7 @@ import json
 from .models import ExperimentConfig, VariantConfig, ExperimentStatus, VariantType
 from .segmentation import UserSegmentationEngine, TrafficSplitter
 from .statistical_analysis import StatisticalAnalyzer
+from .sequential_testing import MixtureSPRT
 
 logger = logging.getLogger(__name__)
 
@@ -96,10 +103,19 @@ class CanaryDeploymentManager:
     rollback, and promotion based on performance metrics.
     """
     
-    def __init__(self, segmentation_engine: UserSegmentationEngine, statistical_analyzer: StatisticalAnalyzer):
+    def __init__(
+        self,
+        segmentation_engine: UserSegmentationEngine,
+        statistical_analyzer: StatisticalAnalyzer,
+        tracker=None,
+        check_interval_seconds: float = 5.0
+    ):
         self.segmentation_engine = segmentation_engine
         self.statistical_analyzer = statistical_analyzer
+        self.tracker = tracker
+        self.check_interval_seconds = check_interval_seconds
         self.active_deployments: Dict[str, CanaryDeployment] = {}
+        self._sequential_tests: Dict[str, Dict[str, MixtureSPRT]] = {}
         self.stage_traffic_percentages = {
             CanaryStage.INITIAL: 1.0,
             CanaryStage.SMALL: 5.0,
@@ -180,8 +196,9 @@ class CanaryDeploymentManager:
                         deployment.final_recommendation = "Deployment failed - manual intervention required"
                         return
                 
-                # Wait for stage duration
-                await asyncio.sleep(deployment.canary_config.stage_duration_minutes * 60)
+                # Wait for stage duration (monitored stages already waited as long as needed)
+                if self.tracker is None:
+                    await asyncio.sleep(deployment.canary_config.stage_duration_minutes * 60)
             
             # All stages completed successfully
             if deployment.canary_config.auto_promote:
@@ -209,7 +226,7 @@ class CanaryDeploymentManager:
             await self._update_traffic_split(deployment, stage, traffic_percentage)
             
             # Monitor stage performance
-            await asyncio.sleep(60)  # Monitor for 1 minute
+            verdict, sequential_issues = await self._monitor_stage(deployment, stage)
             
             # Collect performance metrics
             performance_metrics = await self._collect_stage_metrics(deployment, stage)
@@ -219,10 +236,10 @@ class CanaryDeploymentManager:
             error_rate = performance_metrics.get("error_rate", 0.0)
             
             # Check for issues
-            issues_detected = self._detect_issues(performance_metrics, deployment.canary_config)
+            issues_detected = sequential_issues + self._detect_issues(performance_metrics, deployment.canary_config)
             
             # Determine if stage is successful
-            is_successful = self._evaluate_stage_success(
+            is_successful = verdict != "rollback" and self._evaluate_stage_success(
                 success_rate, error_rate, issues_detected, deployment.canary_config
             )
             
@@ -278,6 +295,91 @@ class CanaryDeploymentManager:
         except Exception as e:
             logger.error(f"Error updating traffic split: {e}")
     
+    async def _monitor_stage(
+        self,
+        deployment: CanaryDeployment,
+        stage: CanaryStage
+    ) -> Tuple[Optional[str], List[str]]:
+        """
+        Monitor a stage until the sequential tests decide or the stage duration ends.
+        
+        Returns:
+            ("rollback" | "advance" | None, issues found by the sequential tests)
+        """
+        if self.tracker is None:
+            await asyncio.sleep(60)  # Monitor for 1 minute
+            return None, []
+        
+        # Each stage is judged on its own traffic: fresh tests over the
+        # observations tracked since the stage started
+        baseline = await self.tracker.get_variant_statistics(deployment.experiment_id)
+        self._sequential_tests[deployment.deployment_id] = {}
+        
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + deployment.canary_config.stage_duration_minutes * 60
+        verdict, issues = None, []
+        while loop.time() < deadline:
+            await asyncio.sleep(min(self.check_interval_seconds, max(deadline - loop.time(), 0)))
+            variants = await self.tracker.get_variant_statistics(deployment.experiment_id)
+            verdict, issues = self._sequential_decision(deployment, variants, baseline)
+            if verdict is not None:
+                logger.info(f"Canary {deployment.deployment_id} stage {stage.value}: {verdict} after sequential test")
+                break
+        return verdict, issues
+    
+    def _sequential_decision(
+        self,
+        deployment: CanaryDeployment,
+        variants: Dict[str, Any],
+        baseline: Dict[str, Any]
+    ) -> Tuple[Optional[str], List[str]]:
+        """
+        Compare canary and control with always-valid sequential tests.
+        
+        For each lower-is-better metric the mSPRT confidence sequence of
+        (canary - control) is checked against a margin: entirely above it
+        means roll back, entirely below it means the canary is no worse.
+        Only observations tracked after the baseline snapshot are used.
+        """
+        config = deployment.canary_config
+        control_name = config.alert_conditions.get("control_variant", "control")
+        control = variants.get(control_name)
+        canary = variants.get(config.canary_variant)
+        if control is None or canary is None:
+            return None, []
+        
+        def since_baseline(variant_name: str, summarize) -> Any:
+            current = summarize(variants[variant_name])
+            earlier = baseline.get(variant_name)
+            return current.subtract(summarize(earlier)) if earlier is not None else current
+        
+        checks = {
+            "error_rate": (lambda v: v.error_summary(), config.alert_conditions.get("error_rate_margin", 0.01)),
+            "response_time": (lambda v: v.metric("response_time"), config.alert_conditions.get("response_time_margin_ms", 50.0)),
+        }
+        tests = self._sequential_tests.setdefault(deployment.deployment_id, {})
+        alpha = self.statistical_analyzer.alpha
+        
+        issues, passed = [], []
+        for metric, (summarize, margin) in checks.items():
+            summary_control = since_baseline(control_name, summarize)
+            summary_canary = since_baseline(config.canary_variant, summarize)
+            if summary_control.n == 0 or summary_canary.n == 0:
+                continue
+            # Error rates are 0/1 outcomes: with no errors yet the sample
+            # variance is 0 and the interval could never tighten to "advance"
+            test = tests.setdefault(metric, MixtureSPRT(alpha=alpha, bernoulli=metric == "error_rate"))
+            low, high = test.update(summary_control, summary_canary).confidence_interval
+            if low > margin:
+                issues.append(f"Canary {metric} worse than control by more than {margin} (sequential test exceeds threshold)")
+            passed.append(high < margin)
+        
+        if issues:
+            return "rollback", issues
+        if passed and all(passed):
+            return "advance", []
+        return None, []
+    
     async def _collect_stage_metrics(
         self, 
         deployment: CanaryDeployment, 
@@ -290,14 +392,31 @@ class CanaryDeploymentManager:
             import psutil
             import time
             
-            # Get system metrics
-            cpu_usage = psutil.cpu_percent(interval=1)
+            # Get system metrics (cpu_percent blocks for its sampling interval)
+            cpu_usage = await asyncio.to_thread(psutil.cpu_percent, 1)
             memory = psutil.virtual_memory()
             memory_usage = memory.percent
             
             # Get application metrics from Prometheus
             registry = CollectorRegistry()
             
+            if self.tracker is not None:
+                canary = (await self.tracker.get_variant_statistics(deployment.experiment_id)).get(
+                    deployment.canary_config.canary_variant
+                )
+                if canary is not None and canary.count:
+                    sketch = canary.sketches.get("response_time")
+                    return {
+                        "success_rate": canary.conversion_rate,
+                        "error_rate": canary.errors / canary.count,
+                        "response_time_p50": (sketch.quantile(0.5) or 0.0) if sketch else 0.0,
+                        "response_time_p95": (sketch.quantile(0.95) or 0.0) if sketch else 0.0,
+                        "response_time_p99": (sketch.quantile(0.99) or 0.0) if sketch else 0.0,
+                        "throughput": float(canary.count),
+                        "cpu_usage": cpu_usage,
+                        "memory_usage": memory_usage
+                    }
+            
             # These would be populated by the actual metrics collection
             # For now, we'll use system metrics as a baseline
             return {
@@ -461,6 +580,7 @@ class CanaryDeploymentManager:
                 deployment = self.active_deployments[deployment_id]
                 deployment.status = CanaryStatus.FAILED
                 deployment.final_recommendation = "Deployment cancelled by user"
+                self._sequential_tests.pop(deployment_id, None)
                 
                 # Restore original traffic split
                 await self._restore_original_traffic_split(deployment)
@@ -0,0 +1,152 @@
+"""
+Sequential Testing for A/B Experiments
+
+Always-valid inference via the mixture sequential probability ratio test
+(mSPRT, Johari et al. "Always Valid Inference"):
+- The test can be checked after every observation without inflating the
+  false positive rate (no fixed horizon, no peeking penalty)
+- Each update is O(1): it only needs running counts, sums and sums of
+  squares of both variants
+- Results include an always-valid p-value and a confidence sequence for
+  the difference in means (treatment - control)
+
+For a difference estimate d with variance V and a normal mixing
+distribution N(0, tau^2) over the true difference, the mixture
+likelihood ratio against "no difference" is
+
+    Lambda = sqrt(V / (V + tau^2)) * exp(tau^2 d^2 / (2 V (V + tau^2)))
+
+and the null is rejected once Lambda >= 1 / alpha. tau^2 must not depend
+on the data seen at later looks, so when it is derived from the pooled
+variance it is fixed at the first look that can decide and kept for the
+rest of the test.
+"""
+
+from typing import Optional, Tuple
+from dataclasses import dataclass
+import math
+
+from .sufficient_stats import MetricSummary
+
+
+def log_mixture_likelihood_ratio(difference: float, variance: float, tau_sq: float) -> float:
+    """log Lambda of the mSPRT for a difference estimate and its variance."""
+    total = variance + tau_sq
+    return 0.5 * math.log(variance / total) + tau_sq * difference * difference / (2 * variance * total)
+
+
+def confidence_radius(variance: float, tau_sq: float, alpha: float) -> float:
+    """Half-width of the mSPRT confidence sequence (values not rejected at alpha)."""
+    total = variance + tau_sq
+    return math.sqrt(2 * variance * total / tau_sq * (math.log(1 / alpha) + 0.5 * math.log(total / variance)))
+
+
+@dataclass
+class SequentialTestResult:
+    """State of an always-valid sequential test"""
+    n_a: int
+    n_b: int
+    difference: float
+    log_likelihood_ratio: float
+    p_value: float
+    confidence_interval: Tuple[float, float]
+    is_significant: bool
+    decision: str  # "continue", "b_better" (difference > 0) or "a_better" (difference < 0)
+
+
+class MixtureSPRT:
+    """
+    Two-sample mSPRT on the difference in means, updated incrementally.
+
+    The always-valid p-value is the running minimum of 1 / Lambda and the
+    confidence sequence is the running intersection of the per-step
+    intervals, so both stay valid however often they are checked.
+    """
+
+    def __init__(
+        self,
+        alpha: float = 0.05,
+        tau: Optional[float] = None,
+        mixture_scale: float = 0.1,
+        min_samples: int = 30,
+        bernoulli: bool = False
+    ):
+        """
+        Args:
+            alpha: False positive rate over the whole (unbounded) test
+            tau: Mixing standard deviation over the true difference; when
+                None it is mixture_scale times the pooled standard deviation
+                at the first look with min_samples per variant
+            mixture_scale: Effect size (in standard deviations) the test is tuned for
+            min_samples: Observations per variant before the test can decide
+            bernoulli: Observations are 0/1 (e.g. errors); variances use the
+                add-one smoothed rate so a variant with no events (or only
+                events) still has a positive variance
+        """
+        self.alpha = alpha
+        self.tau = tau
+        self.mixture_scale = mixture_scale
+        self.min_samples = min_samples
+        self.bernoulli = bernoulli
+        self.tau_sq: Optional[float] = tau ** 2 if tau is not None else None
+        self.summary_a = MetricSummary()
+        self.summary_b = MetricSummary()
+        self.p_value = 1.0
+        self.confidence_interval = (-math.inf, math.inf)
+        self._result: Optional[SequentialTestResult] = None
+
+    def add(self, variant: str, value: float) -> SequentialTestResult:
+        """Add one observation to variant "a" (control) or "b" (treatment)."""
+        (self.summary_a if variant == "a" else self.summary_b).add(value)
+        return self._step()
+
+    def update(self, summary_a: MetricSummary, summary_b: MetricSummary) -> SequentialTestResult:
+        """Replace the running statistics with newer cumulative summaries."""
+        self.summary_a = MetricSummary(summary_a.n, summary_a.total, summary_a.total_sq)
+        self.summary_b = MetricSummary(summary_b.n, summary_b.total, summary_b.total_sq)
+        return self._step()
+
+    def result(self) -> SequentialTestResult:
+        return self._result if self._result is not None else self._step()
+
+    def _step(self) -> SequentialTestResult:
+        a, b = self.summary_a, self.summary_b
+        difference = b.mean - a.mean
+        log_lr = 0.0
+
+        if a.n >= self.min_samples and b.n >= self.min_samples:
+            variance_a, variance_b = self._variance(a), self._variance(b)
+            variance = variance_a / a.n + variance_b / b.n
+            if self.tau_sq is None and variance > 0:
+                pooled_variance = ((a.n - 1) * variance_a + (b.n - 1) * variance_b) / (a.n + b.n - 2)
+                self.tau_sq = self.mixture_scale ** 2 * pooled_variance
+            if variance > 0 and self.tau_sq:
+                log_lr = log_mixture_likelihood_ratio(difference, variance, self.tau_sq)
+                self.p_value = min(self.p_value, math.exp(-log_lr) if log_lr > 0 else 1.0)
+
+                radius = confidence_radius(variance, self.tau_sq, self.alpha)
+                low, high = self.confidence_interval
+                self.confidence_interval = (max(low, difference - radius), min(high, difference + radius))
+
+        is_significant = self.p_value <= self.alpha
+        decision = "continue"
+        if is_significant:
+            decision = "b_better" if difference > 0 else "a_better"
+
+        self._result = SequentialTestResult(
+            n_a=a.n,
+            n_b=b.n,
+            difference=difference,
+            log_likelihood_ratio=log_lr,
+            p_value=self.p_value,
+            confidence_interval=self.confidence_interval,
+            is_significant=is_significant,
+            decision=decision
+        )
+        return self._result
+
+    def _variance(self, summary: MetricSummary) -> float:
+        if not self.bernoulli:
+            return summary.variance
+        rate = (summary.total + 1) / (summary.n + 2)
+        return rate * (1 - rate)
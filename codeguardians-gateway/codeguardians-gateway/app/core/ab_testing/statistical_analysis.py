@@ -7,12 +7,21 @@ Comprehensive statistical analysis including:
 - Effect size calculation
 - Power analysis
 - Bayesian analysis
+
+Experiments can be analyzed from raw observations (analyze_experiment) or
+from streaming sufficient statistics (analyze_summaries), which needs no
+raw arrays and therefore scales to full production traffic.
+analyze_matrix compares every variant with the control on every metric
+in one vectorized NumPy pass, including mSPRT always-valid p-values.
 """
 
 from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass
 from datetime import datetime
 import logging
+import math
+
+from .sufficient_stats import MetricSummary, VariantStatistics
 
 logger = logging.getLogger(__name__)
 
@@ -69,6 +78,36 @@ class ExperimentAnalysis:
     recommendation: str
     analysis_timestamp: datetime
 
+@dataclass
+class MultiMetricAnalysis:
+    """Vectorized comparison of variants against a control on many metrics"""
+    control: str
+    variants: List[str]  # Rows of every array (control excluded)
+    metrics: List[str]   # Columns of every array
+    difference: Any      # variant mean - control mean
+    std_error: Any
+    statistic: Any       # Welch t statistic
+    degrees_of_freedom: Any
+    p_value: Any
+    adjusted_p_value: Any  # Benjamini-Hochberg across all comparisons
+    ci_lower: Any
+    ci_upper: Any
+    sequential_p_value: Any  # mSPRT p-value for this look
+    is_significant: Any      # adjusted_p_value < alpha
+    analysis_timestamp: datetime
+
+    def to_dict(self) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """Results as {variant: {metric: {field: value}}} (NaN for untestable cells)."""
+        fields = ("difference", "std_error", "statistic", "degrees_of_freedom", "p_value",
+                  "adjusted_p_value", "ci_lower", "ci_upper", "sequential_p_value", "is_significant")
+        return {
+            variant: {
+                metric: {name: getattr(self, name)[i, j].item() for name in fields}
+                for j, metric in enumerate(self.metrics)
+            }
+            for i, variant in enumerate(self.variants)
+        }
+
 class StatisticalAnalyzer:
     """
     Statistical analysis engine for A/B testing.
@@ -172,6 +211,283 @@ class StatisticalAnalyzer:
             logger.error(f"Error analyzing experiment {experiment_id}: {e}")
             raise
     
+    def analyze_summaries(
+        self,
+        experiment_id: str,
+        summary_a: MetricSummary,
+        summary_b: MetricSummary,
+        variant_a_name: str = "control",
+        variant_b_name: str = "treatment",
+        metric_type: str = "continuous"
+    ) -> ExperimentAnalysis:
+        """
+        Perform statistical analysis from sufficient statistics.
+        
+        Continuous metrics use Welch's t-test on the moments; binary metrics
+        a chi-square test on the success counts (the sum of a 0/1 metric).
+        Tests that need raw observations (Mann-Whitney, Shapiro-Wilk) are
+        not run.
+        
+        Args:
+            experiment_id: Experiment identifier
+            summary_a: Count/sum/sum of squares of variant A
+            summary_b: Count/sum/sum of squares of variant B
+            variant_a_name: Name of variant A
+            variant_b_name: Name of variant B
+            metric_type: Type of metric (continuous, binary)
+            
+        Returns:
+            Complete experiment analysis
+        """
+        try:
+            if not HAS_NUMPY or not HAS_SCIPY:
+                return self._fallback_summary_analysis(experiment_id, summary_a, summary_b, variant_a_name, variant_b_name)
+            
+            if metric_type == "binary":
+                primary_test = self._chi_square_test_from_summaries(summary_a, summary_b)
+            else:
+                primary_test = self._t_test_from_summaries(summary_a, summary_b)
+            effect_size = primary_test.effect_size
+            power = primary_test.power
+            
+            confidence_interval, _ = self._welch_interval(summary_a, summary_b)
+            is_significant = primary_test.p_value < self.alpha
+            
+            recommendation = self._generate_recommendation(
+                primary_test, effect_size, power, is_significant
+            )
+            
+            return ExperimentAnalysis(
+                experiment_id=experiment_id,
+                variant_a=variant_a_name,
+                variant_b=variant_b_name,
+                sample_size_a=summary_a.n,
+                sample_size_b=summary_b.n,
+                mean_a=summary_a.mean,
+                mean_b=summary_b.mean,
+                std_a=summary_a.std,
+                std_b=summary_b.std,
+                primary_test=primary_test,
+                secondary_tests=[],
+                confidence_interval=confidence_interval,
+                effect_size=effect_size,
+                power=power,
+                is_significant=is_significant,
+                recommendation=recommendation,
+                analysis_timestamp=datetime.utcnow()
+            )
+            
+        except Exception as e:
+            logger.error(f"Error analyzing experiment {experiment_id} from summaries: {e}")
+            raise
+    
+    def analyze_matrix(
+        self,
+        counts,
+        sums,
+        sums_sq,
+        variant_names: List[str],
+        metric_names: List[str],
+        control: str = "control",
+        mixture_scale: float = 0.1
+    ) -> MultiMetricAnalysis:
+        """
+        Compare every variant with the control on every metric at once.
+        
+        All tests are computed on (variants x metrics) arrays of sufficient
+        statistics, so the cost depends on the number of comparisons, not
+        on the number of observations.
+        
+        Args:
+            counts: Observation counts, shape (variants, metrics)
+            sums: Sums of the metric values, same shape
+            sums_sq: Sums of squared values, same shape
+            variant_names: Row labels (must include control)
+            metric_names: Column labels
+            control: Control variant name
+            mixture_scale: mSPRT mixing scale in pooled standard deviations
+            
+        Returns:
+            Vectorized analysis; cells with fewer than 2 observations in
+            either variant or zero variance are NaN
+        """
+        if not HAS_NUMPY or not HAS_SCIPY:
+            raise RuntimeError("Vectorized analysis requires numpy and scipy")
+        
+        n = np.asarray(counts, dtype=float)
+        total = np.asarray(sums, dtype=float)
+        total_sq = np.asarray(sums_sq, dtype=float)
+        c = variant_names.index(control)
+        rows = [i for i in range(len(variant_names)) if i != c]
+        
+        with np.errstate(divide="ignore", invalid="ignore"):
+            mean = total / n
+            var = np.maximum(total_sq - total * mean, 0.0) / (n - 1)
+            var[n < 2] = np.nan
+            
+            n_t, n_c = n[rows], n[c]
+            se_t, se_c = var[rows] / n_t, var[c] / n_c
+            variance = se_t + se_c
+            variance[variance <= 0] = np.nan
+            
+            difference = mean[rows] - mean[c]
+            std_error = np.sqrt(variance)
+            statistic = difference / std_error
+            df = variance ** 2 / (se_t ** 2 / (n_t - 1) + se_c ** 2 / (n_c - 1))
+            p_value = 2 * stats.t.sf(np.abs(statistic), df)
+            margin = stats.t.ppf(1 - self.alpha / 2, df) * std_error
+            
+            # mSPRT mixture likelihood ratio with tau = mixture_scale * pooled std
+            pooled = ((n_t - 1) * var[rows] + (n_c - 1) * var[c]) / (n_t + n_c - 2)
+            tau_sq = mixture_scale ** 2 * pooled
+            log_lr = 0.5 * np.log(variance / (variance + tau_sq)) + tau_sq * difference ** 2 / (2 * variance * (variance + tau_sq))
+            sequential_p_value = np.minimum(1.0, np.exp(-log_lr))
+        
+        adjusted_p_value = self._benjamini_hochberg(p_value)
+        
+        return MultiMetricAnalysis(
+            control=control,
+            variants=[variant_names[i] for i in rows],
+            metrics=list(metric_names),
+            difference=difference,
+            std_error=std_error,
+            statistic=statistic,
+            degrees_of_freedom=df,
+            p_value=p_value,
+            adjusted_p_value=adjusted_p_value,
+            ci_lower=difference - margin,
+            ci_upper=difference + margin,
+            sequential_p_value=sequential_p_value,
+            is_significant=adjusted_p_value < self.alpha,
+            analysis_timestamp=datetime.utcnow()
+        )
+    
+    def analyze_variant_statistics(
+        self,
+        variants: Dict[str, VariantStatistics],
+        metric_names: List[str],
+        control: str = "control"
+    ) -> MultiMetricAnalysis:
+        """Vectorized analysis of tracked variant statistics (see analyze_matrix)."""
+        variant_names = list(variants)
+        shape = (len(variant_names), len(metric_names))
+        counts, sums, sums_sq = np.zeros(shape), np.zeros(shape), np.zeros(shape)
+        for i, name in enumerate(variant_names):
+            for j, metric in enumerate(metric_names):
+                summary = variants[name].metric(metric)
+                counts[i, j], sums[i, j], sums_sq[i, j] = summary.n, summary.total, summary.total_sq
+        return self.analyze_matrix(counts, sums, sums_sq, variant_names, metric_names, control)
+    
+    def _benjamini_hochberg(self, p_values):
+        """Benjamini-Hochberg adjusted p-values (NaN entries are left out)."""
+        flat = p_values.ravel()
+        adjusted = np.full(flat.shape, np.nan)
+        valid = np.flatnonzero(~np.isnan(flat))
+        if valid.size:
+            order = valid[np.argsort(flat[valid])]
+            ranked = flat[order] * valid.size / np.arange(1, valid.size + 1)
+            adjusted[order] = np.minimum(1.0, np.minimum.accumulate(ranked[::-1])[::-1])
+        return adjusted.reshape(p_values.shape)
+    
+    def _welch_interval(
+        self,
+        summary_a: MetricSummary,
+        summary_b: MetricSummary
+    ) -> Tuple[Tuple[float, float], float]:
+        """Welch confidence interval for the difference in means, and its degrees of freedom."""
+        n_a, n_b = summary_a.n, summary_b.n
+        if n_a < 2 or n_b < 2:
+            raise ValueError("Insufficient data for t-test")
+        
+        se_a = summary_a.variance / n_a
+        se_b = summary_b.variance / n_b
+        se_diff = math.sqrt(se_a + se_b)
+        mean_diff = summary_b.mean - summary_a.mean
+        if se_diff == 0:
+            return (mean_diff, mean_diff), float(n_a + n_b - 2)
+        
+        df = (se_a + se_b) ** 2 / (se_a ** 2 / (n_a - 1) + se_b ** 2 / (n_b - 1))
+        margin_error = stats.t.ppf(1 - self.alpha/2, df) * se_diff
+        return (mean_diff - margin_error, mean_diff + margin_error), df
+    
+    def _t_test_from_summaries(
+        self,
+        summary_a: MetricSummary,
+        summary_b: MetricSummary
+    ) -> StatisticalTestResult:
+        """Perform Welch's t-test from count, sum and sum of squares."""
+        
+        try:
+            confidence_interval, df = self._welch_interval(summary_a, summary_b)
+            statistic, p_value = stats.ttest_ind_from_stats(
+                summary_a.mean, summary_a.std, summary_a.n,
+                summary_b.mean, summary_b.std, summary_b.n,
+                equal_var=False
+            )
+            
+            # Calculate effect size (Cohen's d)
+            n_a, n_b = summary_a.n, summary_b.n
+            pooled_std = math.sqrt(((n_a-1)*summary_a.variance + (n_b-1)*summary_b.variance) / (n_a + n_b - 2))
+            mean_diff = summary_b.mean - summary_a.mean
+            effect_size = mean_diff / pooled_std if pooled_std > 0 else 0
+            
+            power = self._power_from_sizes(n_a, n_b, effect_size)
+            
+            return StatisticalTestResult(
+                test_name="Independent Samples t-test",
+                statistic=float(statistic),
+                p_value=float(p_value),
+                degrees_of_freedom=df,
+                confidence_interval=confidence_interval,
+                effect_size=effect_size,
+                power=power,
+                is_significant=p_value < self.alpha,
+                interpretation=self._interpret_t_test_result(p_value, effect_size)
+            )
+            
+        except Exception as e:
+            logger.error(f"Error performing t-test from summaries: {e}")
+            raise
+    
+    def _chi_square_test_from_summaries(
+        self,
+        summary_a: MetricSummary,
+        summary_b: MetricSummary
+    ) -> StatisticalTestResult:
+        """Perform chi-square test from counts and success totals of a binary metric."""
+        
+        try:
+            success_a = round(summary_a.total)
+            success_b = round(summary_b.total)
+            contingency_table = np.array([
+                [success_a, summary_a.n - success_a],
+                [success_b, summary_b.n - success_b]
+            ])
+            
+            chi2_stat, p_value, dof, expected = chi2_contingency(contingency_table)
+            
+            # Calculate effect size (Cramér's V)
+            n_total = np.sum(contingency_table)
+            effect_size = float(np.sqrt(chi2_stat / (n_total * (min(contingency_table.shape) - 1))))
+            
+            power = self._calculate_chi_square_power(contingency_table, effect_size)
+            
+            return StatisticalTestResult(
+                test_name="Chi-square test",
+                statistic=float(chi2_stat),
+                p_value=float(p_value),
+                degrees_of_freedom=dof,
+                confidence_interval=None,  # Not applicable for chi-square
+                effect_size=effect_size,
+                power=power,
+                is_significant=p_value < self.alpha,
+                interpretation=self._interpret_chi_square_result(p_value, effect_size)
+            )
+            
+        except Exception as e:
+            logger.error(f"Error performing chi-square test from summaries: {e}")
+            raise
+    
     def _fallback_analysis(
         self,
         experiment_id: str,
@@ -181,14 +497,29 @@ class StatisticalAnalyzer:
         variant_b_name: str
     ) -> ExperimentAnalysis:
         """Fallback analysis when numpy/scipy are not available."""
+        return self._fallback_summary_analysis(
+            experiment_id,
+            MetricSummary.from_values(variant_a_data),
+            MetricSummary.from_values(variant_b_data),
+            variant_a_name,
+            variant_b_name
+        )
+    
+    def _fallback_summary_analysis(
+        self,
+        experiment_id: str,
+        summary_a: MetricSummary,
+        summary_b: MetricSummary,
+        variant_a_name: str,
+        variant_b_name: str
+    ) -> ExperimentAnalysis:
+        """Fallback analysis from summaries when numpy/scipy are not available."""
         try:
             # Calculate basic statistics using pure Python
-            mean_a = sum(variant_a_data) / len(variant_a_data) if variant_a_data else 0
-            mean_b = sum(variant_b_data) / len(variant_b_data) if variant_b_data else 0
-            
-            # Calculate standard deviation
-            std_a = (sum((x - mean_a) ** 2 for x in variant_a_data) / (len(variant_a_data) - 1)) ** 0.5 if len(variant_a_data) > 1 else 0
-            std_b = (sum((x - mean_b) ** 2 for x in variant_b_data) / (len(variant_b_data) - 1)) ** 0.5 if len(variant_b_data) > 1 else 0
+            mean_a = summary_a.mean
+            mean_b = summary_b.mean
+            std_a = summary_a.std
+            std_b = summary_b.std
             
             # Simple statistical test (no p-value)
             mean_diff = mean_b - mean_a
@@ -196,7 +527,7 @@ class StatisticalAnalyzer:
             effect_size = mean_diff / pooled_std if pooled_std > 0 else 0
             
             # Simple confidence interval (normal approximation)
-            se_diff = (std_a ** 2 / len(variant_a_data) + std_b ** 2 / len(variant_b_data)) ** 0.5
+            se_diff = (std_a ** 2 / summary_a.n + std_b ** 2 / summary_b.n) ** 0.5
             ci_margin = 1.96 * se_diff  # 95% CI
             
             primary_test = StatisticalTestResult(
@@ -215,8 +546,8 @@ class StatisticalAnalyzer:
                 experiment_id=experiment_id,
                 variant_a=variant_a_name,
                 variant_b=variant_b_name,
-                sample_size_a=len(variant_a_data),
-                sample_size_b=len(variant_b_data),
+                sample_size_a=summary_a.n,
+                sample_size_b=summary_b.n,
                 mean_a=mean_a,
                 mean_b=mean_b,
                 std_a=std_a,
@@ -636,15 +967,12 @@ class StatisticalAnalyzer:
     def _calculate_power(self, data_a, data_b, effect_size: float) -> float:
         """Calculate statistical power."""
         
+        return self._power_from_sizes(len(data_a), len(data_b), effect_size)
+    
+    def _power_from_sizes(self, n_a: int, n_b: int, effect_size: float) -> float:
+        """Calculate two-sided t-test power from sample sizes and Cohen's d."""
+        
         try:
-            n_a = len(data_a)
-            n_b = len(data_b)
-            
-            # Calculate pooled standard deviation
-            var_a = np.var(data_a, ddof=1)
-            var_b = np.var(data_b, ddof=1)
-            pooled_std = np.sqrt(((n_a-1)*var_a + (n_b-1)*var_b) / (n_a + n_b - 2))
-            
             # Calculate non-centrality parameter
             ncp = effect_size * np.sqrt(n_a * n_b / (n_a + n_b))
             
@@ -0,0 +1,223 @@
+"""
+Sufficient Statistics for A/B Testing
+
+Streaming aggregates that let experiments be analyzed without keeping raw
+observations:
+- MetricSummary: count, sum and sum of squares (mean, variance, t-tests)
+- QuantileSketch: relative-error log histogram (percentiles)
+- VariantStatistics: per-variant counters plus the above per metric
+
+Every aggregate is a set of additive counters, so it can be updated with
+atomic Redis HINCRBY/HINCRBYFLOAT and merged across replicas by addition.
+"""
+
+from typing import Dict, Iterable, List, Optional, Tuple
+from dataclasses import dataclass, field
+import math
+
+# Hash field separator: "<variant>|<metric>|<stat>"
+FIELD_SEPARATOR = "|"
+
+
+@dataclass
+class MetricSummary:
+    """Count, sum and sum of squares of one metric"""
+    n: int = 0
+    total: float = 0.0
+    total_sq: float = 0.0
+
+    @classmethod
+    def from_values(cls, values: Iterable[float]) -> "MetricSummary":
+        summary = cls()
+        for value in values:
+            summary.add(value)
+        return summary
+
+    def add(self, value: float) -> None:
+        self.n += 1
+        self.total += value
+        self.total_sq += value * value
+
+    def merge(self, other: "MetricSummary") -> "MetricSummary":
+        return MetricSummary(self.n + other.n, self.total + other.total, self.total_sq + other.total_sq)
+
+    def subtract(self, earlier: "MetricSummary") -> "MetricSummary":
+        """Statistics of the observations added since an earlier snapshot."""
+        return MetricSummary(self.n - earlier.n, self.total - earlier.total, self.total_sq - earlier.total_sq)
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.n if self.n else 0.0
+
+    @property
+    def variance(self) -> float:
+        """Sample variance (ddof=1), clamped at 0 against rounding error."""
+        if self.n < 2:
+            return 0.0
+        return max(0.0, (self.total_sq - self.total * self.total / self.n) / (self.n - 1))
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.variance)
+
+
+@dataclass
+class QuantileSketch:
+    """
+    Log-bucketed histogram with bounded relative error (DDSketch-style).
+
+    A value v > 0 is counted in bucket ceil(log(v) / log(gamma)) with
+    gamma = (1 + alpha) / (1 - alpha); every quantile estimate is within
+    a relative error alpha of a true sample value. Zero and negative
+    values are counted separately and reported as 0.
+    """
+    alpha: float = 0.01
+    bins: Dict[int, int] = field(default_factory=dict)
+    zero_count: int = 0
+
+    @property
+    def gamma(self) -> float:
+        return (1 + self.alpha) / (1 - self.alpha)
+
+    @property
+    def count(self) -> int:
+        return self.zero_count + sum(self.bins.values())
+
+    def bucket(self, value: float) -> Optional[int]:
+        """Bucket index of a value (None for values counted as zero)."""
+        if value <= 0:
+            return None
+        return math.ceil(math.log(value) / math.log(self.gamma))
+
+    def add(self, value: float, count: int = 1) -> None:
+        index = self.bucket(value)
+        if index is None:
+            self.zero_count += count
+        else:
+            self.bins[index] = self.bins.get(index, 0) + count
+
+    def merge(self, other: "QuantileSketch") -> "QuantileSketch":
+        bins = dict(self.bins)
+        for index, count in other.bins.items():
+            bins[index] = bins.get(index, 0) + count
+        return QuantileSketch(self.alpha, bins, self.zero_count + other.zero_count)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimate the q-quantile (0 <= q <= 1); None when empty."""
+        total = self.count
+        if total == 0:
+            return None
+        rank = q * (total - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return 0.0
+        gamma = self.gamma
+        for index in sorted(self.bins):
+            seen += self.bins[index]
+            if rank < seen:
+                return 2 * gamma ** index / (gamma + 1)
+        return 2 * gamma ** max(self.bins) / (gamma + 1)
+
+
+@dataclass
+class VariantStatistics:
+    """Sufficient statistics of one experiment variant"""
+    variant_name: str
+    count: int = 0
+    successes: int = 0
+    errors: int = 0
+    metrics: Dict[str, MetricSummary] = field(default_factory=dict)
+    sketches: Dict[str, QuantileSketch] = field(default_factory=dict)
+
+    @property
+    def conversion_rate(self) -> float:
+        return self.successes / self.count if self.count else 0.0
+
+    def outcome_summary(self) -> MetricSummary:
+        """Success indicator as a binary metric (for chi-square tests)."""
+        return MetricSummary(self.count, float(self.successes), float(self.successes))
+
+    def error_summary(self) -> MetricSummary:
+        """Error indicator as a binary metric."""
+        return MetricSummary(self.count, float(self.errors), float(self.errors))
+
+    def metric(self, name: str) -> MetricSummary:
+        return self.metrics.get(name, MetricSummary())
+
+
+def variant_field(variant_name: str, *parts: str) -> str:
+    """Hash field for a variant counter, e.g. variant_field("control", "response_time", "sum")."""
+    return FIELD_SEPARATOR.join((variant_name,) + parts)
+
+
+def observation_increments(
+    variant_name: str,
+    metrics: Dict[str, float],
+    sketch_metrics: Iterable[str] = (),
+    sketch_alpha: float = 0.01
+) -> Tuple[Dict[str, int], Dict[str, float]]:
+    """
+    Counter increments for one tracked result.
+
+    Returns:
+        (integer increments for HINCRBY, float increments for HINCRBYFLOAT)
+    """
+    int_increments = {variant_field(variant_name, "count"): 1}
+    float_increments: Dict[str, float] = {}
+
+    if metrics.get("success", 0) > 0:
+        int_increments[variant_field(variant_name, "successes")] = 1
+    if metrics.get("error", 0) > 0:
+        int_increments[variant_field(variant_name, "errors")] = 1
+
+    sketch_metrics = set(sketch_metrics)
+    sketch = QuantileSketch(sketch_alpha)
+    for name, value in metrics.items():
+        if FIELD_SEPARATOR in name or isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value):
+            continue
+        int_increments[variant_field(variant_name, name, "n")] = 1
+        float_increments[variant_field(variant_name, name, "sum")] = float(value)
+        float_increments[variant_field(variant_name, name, "sumsq")] = float(value) * float(value)
+        if name in sketch_metrics:
+            index = sketch.bucket(value)
+            bucket = "zero" if index is None else str(index)
+            int_increments[variant_field(variant_name, name, "q", bucket)] = 1
+
+    return int_increments, float_increments
+
+
+def parse_variant_statistics(fields: Dict[str, str], sketch_alpha: float = 0.01) -> Dict[str, VariantStatistics]:
+    """Rebuild per-variant statistics from a statistics hash (HGETALL result)."""
+    variants: Dict[str, VariantStatistics] = {}
+
+    for key, raw in fields.items():
+        if isinstance(key, bytes):
+            key = key.decode("utf-8")
+        if isinstance(raw, bytes):
+            raw = raw.decode("utf-8")
+        parts: List[str] = key.split(FIELD_SEPARATOR)
+        variant = variants.setdefault(parts[0], VariantStatistics(parts[0]))
+
+        if len(parts) == 2:
+            if parts[1] == "count":
+                variant.count = int(raw)
+            elif parts[1] == "successes":
+                variant.successes = int(raw)
+            elif parts[1] == "errors":
+                variant.errors = int(raw)
+        elif len(parts) == 3:
+            summary = variant.metrics.setdefault(parts[1], MetricSummary())
+            if parts[2] == "n":
+                summary.n = int(raw)
+            elif parts[2] == "sum":
+                summary.total = float(raw)
+            elif parts[2] == "sumsq":
+                summary.total_sq = float(raw)
+        elif len(parts) == 4 and parts[2] == "q":
+            sketch = variant.sketches.setdefault(parts[1], QuantileSketch(sketch_alpha))
+            if parts[3] == "zero":
+                sketch.zero_count = int(raw)
+            else:
+                sketch.bins[int(parts[3])] = int(raw)
+
+    return variants
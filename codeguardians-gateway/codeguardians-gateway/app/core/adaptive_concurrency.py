@@ -0,0 +1,342 @@
+"""
+Adaptive Concurrency Limits for Guard Services
+
+Per-guard in-flight limits that follow observed guard behaviour (AIMD):
+- Additive increase while latency stays near the guard's no-load baseline
+- Multiplicative decrease on timeouts, 5xx/429 and unhealthy health checks
+- Excess work waits in a priority queue (higher OrchestrationRequest.priority first)
+- Work is shed when the queue is full or the queue wait times out
+- Every guard has its own limiter, so a slow guard cannot starve the others
+"""
+
+import asyncio
+import heapq
+import itertools
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from app.core.exceptions import GuardOverloadedError, GuardServiceError
+from app.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+try:
+    from app.core.orchestrator_metrics import (
+        update_guard_concurrency,
+        record_guard_shed
+    )
+    METRICS_ENABLED = True
+except ImportError:
+    METRICS_ENABLED = False
+
+
+def is_congestion_error(error: Exception) -> bool:
+    """
+    Check whether a guard error signals overload.
+
+    Timeouts, connection failures, 5xx and 429 responses count as congestion;
+    other 4xx responses are caller errors and leave the limit unchanged.
+    """
+    if not isinstance(error, GuardServiceError):
+        return False
+    status_code = error.details.get("status_code")
+    return status_code is None or status_code >= 500 or status_code == 429
+
+
+class AdaptiveLimiter:
+    """
+    AIMD concurrency limiter for one guard service.
+
+    SAFETY: The limit never drops below min_limit, so a guard always gets probes
+    ASSUMES: Single event loop (no locking needed)
+    VERIFY: in_flight never exceeds the current limit when work is admitted
+    """
+
+    def __init__(
+        self,
+        service_name: str,
+        initial_limit: int = 10,
+        min_limit: int = 1,
+        max_limit: int = 200,
+        backoff_ratio: float = 0.75,
+        latency_tolerance: float = 2.0,
+        max_queue: int = 1000,
+        queue_timeout: float = 10.0
+    ):
+        self.service_name = service_name
+        self.limit = float(initial_limit)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.backoff_ratio = backoff_ratio
+        self.latency_tolerance = latency_tolerance
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+
+        self.in_flight = 0
+        self.baseline_latency: Optional[float] = None
+        self._last_decrease = 0.0
+        self._queued = 0
+        # (-priority, sequence, future): highest priority first, FIFO within a priority
+        self._waiters: List[Tuple[int, int, asyncio.Future]] = []
+        self._sequence = itertools.count()
+        self._stats: Dict[str, int] = {
+            "admitted": 0,
+            "queued": 0,
+            "shed_queue_full": 0,
+            "shed_timeout": 0,
+            "increases": 0,
+            "decreases": 0,
+        }
+
+    # ------------------------------------------------------------------
+    # Admission
+    # ------------------------------------------------------------------
+
+    async def acquire(self, priority: int = 1, timeout: Optional[float] = None) -> None:
+        """
+        Wait for an in-flight slot.
+
+        Raises:
+            GuardOverloadedError: If the queue is full or the wait timed out
+        """
+        if self.in_flight < int(self.limit) and self._queued == 0:
+            self._admit()
+            return
+
+        if self._queued >= self.max_queue and not self._shed_lowest(priority):
+            self._shed("queue_full")
+            raise GuardOverloadedError(self.service_name, "queue full")
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (-priority, next(self._sequence), future))
+        self._queued += 1
+        self._stats["queued"] += 1
+
+        try:
+            await asyncio.wait({future}, timeout=timeout or self.queue_timeout)
+        except asyncio.CancelledError:
+            self._abandon(future)
+            raise
+
+        if not future.done():
+            self._abandon(future)
+            self._shed("timeout")
+            raise GuardOverloadedError(self.service_name, "queue wait timed out")
+
+        # Raises GuardOverloadedError if a higher-priority request displaced us
+        future.result()
+
+    def release(self) -> None:
+        """Return an in-flight slot and admit queued work."""
+        self.in_flight = max(0, self.in_flight - 1)
+        self._wake()
+        self._update_metrics()
+
+    # ------------------------------------------------------------------
+    # Feedback
+    # ------------------------------------------------------------------
+
+    def record(self, latency: float, congested: bool = False) -> None:
+        """
+        Adjust the limit from one completed call.
+
+        Latency well above the guard's baseline counts as congestion even
+        when the call succeeded.
+        """
+        if not congested:
+            if self.baseline_latency is None or latency < self.baseline_latency:
+                self.baseline_latency = latency
+            else:
+                # Drift slowly upwards so a permanent shift becomes the new baseline
+                self.baseline_latency += (latency - self.baseline_latency) * 0.01
+            congested = latency > self.baseline_latency * self.latency_tolerance
+
+        if congested:
+            self._decrease()
+        elif self.in_flight + 1 >= int(self.limit) * 0.5:
+            # Only grow while the current limit is actually being used
+            self.limit = min(float(self.max_limit), self.limit + 1.0 / max(self.limit, 1.0))
+            self._stats["increases"] += 1
+            self._wake()
+        self._update_metrics()
+
+    def record_unhealthy(self) -> None:
+        """Back off after a failed health check."""
+        self._decrease()
+        self._update_metrics()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get limiter statistics."""
+        return {
+            "limit": int(self.limit),
+            "in_flight": self.in_flight,
+            "queued": self._queued,
+            "baseline_latency": self.baseline_latency,
+            "min_limit": self.min_limit,
+            "max_limit": self.max_limit,
+            **self._stats,
+        }
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _admit(self) -> None:
+        self.in_flight += 1
+        self._stats["admitted"] += 1
+
+    def _decrease(self) -> None:
+        # At most one decrease per baseline RTT so one burst of errors
+        # does not collapse the limit
+        now = time.monotonic()
+        if now - self._last_decrease < max(self.baseline_latency or 0.0, 0.1):
+            return
+        self._last_decrease = now
+        self.limit = max(float(self.min_limit), self.limit * self.backoff_ratio)
+        self._stats["decreases"] += 1
+
+    def _wake(self) -> None:
+        while self._waiters and self.in_flight < int(self.limit):
+            _, _, future = heapq.heappop(self._waiters)
+            if future.done():
+                continue
+            self._queued -= 1
+            self._admit()
+            future.set_result(True)
+
+    def _abandon(self, future: asyncio.Future) -> None:
+        """Leave the queue, returning the slot if one was granted meanwhile."""
+        if future.done():
+            if not future.cancelled() and future.exception() is None:
+                self.release()
+            return
+        future.cancel()
+        self._queued -= 1
+
+    def _shed_lowest(self, priority: int) -> bool:
+        """Displace the lowest-priority waiter if the newcomer outranks it."""
+        live = [entry for entry in self._waiters if not entry[2].done()]
+        if not live:
+            return False
+        lowest = max(live, key=lambda entry: (entry[0], entry[1]))
+        if -lowest[0] >= priority:
+            return False
+
+        lowest[2].set_exception(GuardOverloadedError(self.service_name, "displaced by higher priority work"))
+        self._queued -= 1
+        self._shed("queue_full")
+        # Drop finished entries so the heap does not grow without bound
+        self._waiters = [entry for entry in self._waiters if not entry[2].done()]
+        heapq.heapify(self._waiters)
+        return True
+
+    def _shed(self, reason: str) -> None:
+        self._stats[f"shed_{reason}"] += 1
+        if METRICS_ENABLED:
+            try:
+                record_guard_shed(self.service_name, reason)
+            except Exception:
+                pass
+
+    def _update_metrics(self) -> None:
+        if METRICS_ENABLED:
+            try:
+                update_guard_concurrency(self.service_name, int(self.limit), self.in_flight)
+            except Exception:
+                pass
+
+
+class AdaptiveConcurrencyController:
+    """Holds one AdaptiveLimiter per guard service."""
+
+    def __init__(self, enabled: bool = True, **limiter_options: Any):
+        self.enabled = enabled
+        self.limiter_options = limiter_options
+        self.limiters: Dict[str, AdaptiveLimiter] = {}
+
+    @classmethod
+    def from_env(cls) -> "AdaptiveConcurrencyController":
+        """Create a controller configured from environment variables."""
+        return cls(
+            enabled=os.getenv("GUARD_ADAPTIVE_CONCURRENCY_ENABLED", "true").lower() == "true",
+            initial_limit=int(os.getenv("GUARD_CONCURRENCY_INITIAL", "10")),
+            min_limit=int(os.getenv("GUARD_CONCURRENCY_MIN", "1")),
+            max_limit=int(os.getenv("GUARD_CONCURRENCY_MAX", "200")),
+            latency_tolerance=float(os.getenv("GUARD_CONCURRENCY_LATENCY_TOLERANCE", "2.0")),
+            max_queue=int(os.getenv("GUARD_CONCURRENCY_MAX_QUEUE", "1000")),
+            queue_timeout=float(os.getenv("GUARD_CONCURRENCY_QUEUE_TIMEOUT", "10.0"))
+        )
+
+    def get_limiter(self, service_name: str) -> AdaptiveLimiter:
+        """Get (or create) the limiter for a guard."""
+        limiter = self.limiters.get(service_name)
+        if limiter is None:
+            limiter = AdaptiveLimiter(service_name, **self.limiter_options)
+            self.limiters[service_name] = limiter
+        return limiter
+
+    @asynccontextmanager
+    async def slot(
+        self,
+        service_name: str,
+        priority: int = 1,
+        timeout: Optional[float] = None,
+        record_latency: bool = True
+    ) -> AsyncIterator[None]:
+        """
+        Hold an in-flight slot for one upstream guard call.
+
+        The call's latency and outcome feed back into the guard's limit.
+        Cancelled calls (deadlines, early fan-out return) give no feedback.
+        Pass record_latency=False when the slot spans more than one call's
+        latency (a relayed stream, a packed batch): only explicit overload
+        errors then feed back, so long holds are not read as congestion.
+        """
+        if not self.enabled:
+            yield
+            return
+
+        limiter = self.get_limiter(service_name)
+        await limiter.acquire(priority, timeout)
+        start = time.perf_counter()
+        try:
+            yield
+        except asyncio.CancelledError:
+            limiter.release()
+            raise
+        except Exception as e:
+            limiter.release()
+            congested = is_congestion_error(e)
+            if record_latency or congested:
+                limiter.record(time.perf_counter() - start, congested=congested)
+            raise
+        else:
+            limiter.release()
+            if record_latency:
+                limiter.record(time.perf_counter() - start)
+
+    def observe_health(self, service_name: str, healthy: bool) -> None:
+        """Feed a health check result into the guard's limiter."""
+        if self.enabled and not healthy:
+            self.get_limiter(service_name).record_unhealthy()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get per-guard limiter statistics."""
+        return {
+            "enabled": self.enabled,
+            "guards": {name: limiter.get_stats() for name, limiter in self.limiters.items()},
+        }
+
+
+# Global controller instance
+_concurrency_controller: Optional[AdaptiveConcurrencyController] = None
+
+
+def get_concurrency_controller() -> AdaptiveConcurrencyController:
+    """Get global adaptive concurrency controller instance."""
+    global _concurrency_controller
+    if _concurrency_controller is None:
+        _concurrency_controller = AdaptiveConcurrencyController.from_env()
+    return _concurrency_controller
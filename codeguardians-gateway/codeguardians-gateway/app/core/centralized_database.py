@@ -30,6 +30,8 @@ class GuardOperation(Base):
     user_id = Column(String(100), index=True)
     session_id = Column(String(100), index=True)
     created_at = Column(DateTime, default=datetime.utcnow, index=True)
+    # Operations this row stands for (>1 when kept while sampling under backpressure)
+    sample_weight = Column(Float, nullable=False, default=1.0, server_default="1")
 
 
 class GuardMetrics(Base):
@@ -42,6 +44,8 @@ class GuardMetrics(Base):
     metric_value = Column(Float)
     metric_data = Column(JSON)
     timestamp = Column(DateTime, default=datetime.utcnow, index=True)
+    # Operations this row stands for (>1 when kept while sampling under backpressure)
+    sample_weight = Column(Float, nullable=False, default=1.0, server_default="1")
 
 
 class SystemHealth(Base):
@@ -2,60 +2,187 @@
 AI Guardians Circuit Breaker Implementation
 
 Circuit breaker pattern for handling service failures and preventing cascade failures.
+
+- Failure rate and slow-call rate over a rolling, time-bucketed window
+- Minimum call volume before the window can open the circuit
+- Open duration starts short and doubles on repeated re-opens (capped)
+- Half-open probe budget: a bounded number of trial calls decides recovery
+- O(1) per call and lock-free (single event loop, no awaits in bookkeeping)
 """
 
 import asyncio
 import time
+from datetime import datetime, timedelta
 from enum import Enum
-from typing import Any, Callable, Dict, Optional
+from typing import Any, Callable, Dict, List, Optional
 import logging
 
+from app.core.exceptions import CircuitBreakerOpenError
+
 logger = logging.getLogger(__name__)
 
 
-class CircuitState(Enum):
+class CircuitState(str, Enum):
     """Circuit breaker states."""
     CLOSED = "CLOSED"      # Normal operation
     OPEN = "OPEN"          # Circuit is open, requests fail fast
     HALF_OPEN = "HALF_OPEN"  # Testing if service is back
 
+    def __str__(self) -> str:
+        return self.value
+
 
 class CircuitBreaker:
     """
-    Circuit breaker implementation for service failure handling.
+    Sliding-window circuit breaker.
     
-    Prevents cascade failures by opening the circuit when a service
-    fails repeatedly, and gradually testing if the service is back.
+    Opens when, within the rolling window and with at least
+    failure_threshold calls, the failure rate reaches failure_rate_threshold
+    or the slow-call rate reaches slow_call_rate_threshold. After the open
+    duration a limited number of probe calls is admitted; enough successful
+    probes close the circuit, a failed probe reopens it for longer.
     """
     
     def __init__(
         self,
         failure_threshold: int = 5,
-        recovery_timeout: int = 60,
+        recovery_timeout: float = 60,
         expected_exception: type = Exception,
-        name: str = "default"
+        name: str = "default",
+        failure_rate_threshold: float = 0.5,
+        slow_call_duration: Optional[float] = None,
+        slow_call_rate_threshold: float = 0.8,
+        window_seconds: float = 30.0,
+        window_buckets: int = 10,
+        min_open_seconds: float = 5.0,
+        half_open_max_calls: int = 1,
+        half_open_success_threshold: int = 1
     ):
         """
         Initialize circuit breaker.
         
         Args:
-            failure_threshold: Number of failures before opening circuit
-            recovery_timeout: Time in seconds before trying to close circuit
+            failure_threshold: Minimum calls in the window before it can open
+            recovery_timeout: Maximum time in seconds the circuit stays open
             expected_exception: Exception type to count as failures
             name: Name of the circuit breaker
+            failure_rate_threshold: Failure rate (0-1) that opens the circuit
+            slow_call_duration: Calls slower than this (seconds) count as slow
+                (None disables slow-call tracking)
+            slow_call_rate_threshold: Slow-call rate (0-1) that opens the circuit
+            window_seconds: Length of the rolling window
+            window_buckets: Number of buckets the window is split into
+            min_open_seconds: Open duration after the first trip; doubles on
+                every consecutive re-open up to recovery_timeout
+            half_open_max_calls: Probe calls admitted while half-open
+            half_open_success_threshold: Successful probes needed to close
         """
         self.failure_threshold = failure_threshold
         self.recovery_timeout = recovery_timeout
         self.expected_exception = expected_exception
         self.name = name
+        self.failure_rate_threshold = failure_rate_threshold
+        self.slow_call_duration = slow_call_duration
+        self.slow_call_rate_threshold = slow_call_rate_threshold
+        self.min_open_seconds = min_open_seconds
+        self.half_open_max_calls = max(1, half_open_max_calls)
+        self.half_open_success_threshold = max(1, half_open_success_threshold)
         
-        self.failure_count = 0
-        self.last_failure_time = None
         self.state = CircuitState.CLOSED
-        self.success_count = 0
+        self.last_failure_time: Optional[datetime] = None
+        self.opened_at: Optional[datetime] = None  # Start of the current open period
+        self.consecutive_opens = 0
+        self.success_count = 0  # Successful probes while half-open
+        
+        # Rolling window: per-bucket [calls, failures, slow] plus running totals
+        self._bucket_count = max(1, window_buckets)
+        self._bucket_width = window_seconds / self._bucket_count
+        self._buckets: List[List[int]] = [[0, 0, 0] for _ in range(self._bucket_count)]
+        self._head = int(time.monotonic() / self._bucket_width)
+        self._calls = 0
+        self._failures = 0
+        self._slow = 0
+        
+        # Half-open probe budget
+        self._probes_in_flight = 0
+        self._probe_started_at = 0.0
         
         logger.info(f"Circuit breaker '{name}' initialized")
     
+    # ------------------------------------------------------------------
+    # Admission
+    # ------------------------------------------------------------------
+    
+    def can_execute(self) -> bool:
+        """
+        Check whether a call may proceed.
+        
+        While half-open this takes one probe permit; callers that end up not
+        making the call must hand it back with release_permission().
+        """
+        if self.state == CircuitState.CLOSED:
+            return True
+        
+        if self.state == CircuitState.OPEN:
+            if not self._open_elapsed():
+                return False
+            self._transition(CircuitState.HALF_OPEN)
+        
+        # HALF_OPEN: reclaim permits of probes that never reported back
+        now = time.monotonic()
+        if self._probes_in_flight and now - self._probe_started_at > self.recovery_timeout:
+            self._probes_in_flight = 0
+        if self._probes_in_flight >= self.half_open_max_calls:
+            return False
+        self._probes_in_flight += 1
+        self._probe_started_at = now
+        return True
+    
+    def release_permission(self) -> None:
+        """Return a probe permit for a call that was admitted but not made."""
+        if self.state == CircuitState.HALF_OPEN and self._probes_in_flight:
+            self._probes_in_flight -= 1
+    
+    @property
+    def is_open(self) -> bool:
+        """Whether calls are currently rejected (read-only, takes no permit)."""
+        return self.state == CircuitState.OPEN and not self._open_elapsed()
+    
+    # ------------------------------------------------------------------
+    # Outcomes
+    # ------------------------------------------------------------------
+    
+    def record_success(self, duration: Optional[float] = None) -> None:
+        """Record a successful call, optionally with its duration in seconds."""
+        slow = self.slow_call_duration is not None and duration is not None and duration >= self.slow_call_duration
+        
+        if self.state == CircuitState.HALF_OPEN:
+            self.release_permission()
+            if slow:
+                self._trip()
+                return
+            self.success_count += 1
+            if self.success_count >= self.half_open_success_threshold:
+                self._transition(CircuitState.CLOSED)
+            return
+        
+        self._record(failed=False, slow=slow)
+    
+    def record_failure(self, duration: Optional[float] = None) -> None:
+        """Record a failed call."""
+        if self.state == CircuitState.OPEN:
+            # Rejected or late-arriving calls must not keep extending the open period
+            return
+        self.last_failure_time = datetime.now()
+        
+        if self.state == CircuitState.HALF_OPEN:
+            self.release_permission()
+            self._trip()
+            return
+        
+        slow = self.slow_call_duration is not None and duration is not None and duration >= self.slow_call_duration
+        self._record(failed=True, slow=slow)
+    
     async def call(self, func: Callable, *args, **kwargs) -> Any:
         """
         Execute function with circuit breaker protection.
@@ -72,74 +199,138 @@ class CircuitBreaker:
             CircuitBreakerOpenError: When circuit is open
             Exception: Original function exception
         """
-        if self.state == CircuitState.OPEN:
-            if self._should_attempt_reset():
-                self.state = CircuitState.HALF_OPEN
-                logger.info(f"Circuit breaker '{self.name}' moved to HALF_OPEN")
-            else:
-                raise CircuitBreakerOpenError(f"Circuit breaker '{self.name}' is OPEN")
+        if not self.can_execute():
+            raise CircuitBreakerOpenError(self.name)
         
+        start = time.perf_counter()
         try:
             result = await func(*args, **kwargs)
-            await self._on_success()
-            return result
-            
-        except self.expected_exception as e:
-            await self._on_failure()
-            raise e
+        except self.expected_exception:
+            self.record_failure(time.perf_counter() - start)
+            raise
+        except BaseException:
+            self.release_permission()
+            raise
+        self.record_success(time.perf_counter() - start)
+        return result
     
-    def _should_attempt_reset(self) -> bool:
-        """Check if enough time has passed to attempt reset."""
-        if self.last_failure_time is None:
-            return True
-        
-        return time.time() - self.last_failure_time >= self.recovery_timeout
+    # ------------------------------------------------------------------
+    # Introspection
+    # ------------------------------------------------------------------
     
-    async def _on_success(self):
-        """Handle successful call."""
-        if self.state == CircuitState.HALF_OPEN:
-            self.success_count += 1
-            if self.success_count >= 3:  # Require 3 successes to close
-                self.state = CircuitState.CLOSED
-                self.failure_count = 0
-                self.success_count = 0
-                logger.info(f"Circuit breaker '{self.name}' moved to CLOSED")
-        else:
-            # Reset failure count on success
-            self.failure_count = 0
-    
-    async def _on_failure(self):
-        """Handle failed call."""
-        self.failure_count += 1
-        self.last_failure_time = time.time()
-        
-        if self.failure_count >= self.failure_threshold:
-            self.state = CircuitState.OPEN
-            logger.warning(f"Circuit breaker '{self.name}' moved to OPEN after {self.failure_count} failures")
+    @property
+    def failure_count(self) -> int:
+        """Failures in the current window."""
+        self._advance(time.monotonic())
+        return self._failures
     
     def get_state(self) -> Dict[str, Any]:
         """Get current circuit breaker state."""
+        self._advance(time.monotonic())
         return {
             "name": self.name,
             "state": self.state.value,
-            "failure_count": self.failure_count,
+            "calls": self._calls,
+            "failure_count": self._failures,
+            "slow_call_count": self._slow,
+            "failure_rate": self._failures / self._calls if self._calls else 0.0,
+            "slow_call_rate": self._slow / self._calls if self._calls else 0.0,
             "success_count": self.success_count,
-            "last_failure_time": self.last_failure_time,
-            "is_open": self.state == CircuitState.OPEN
+            "probes_in_flight": self._probes_in_flight,
+            "consecutive_opens": self.consecutive_opens,
+            "open_duration": self._open_duration(),
+            "last_failure_time": self.last_failure_time.isoformat() if self.last_failure_time else None,
+            "opened_at": self.opened_at.isoformat() if self.opened_at else None,
+            "is_open": self.is_open
         }
     
     def reset(self):
         """Manually reset circuit breaker."""
-        self.state = CircuitState.CLOSED
-        self.failure_count = 0
-        self.success_count = 0
+        self.consecutive_opens = 0
         self.last_failure_time = None
+        self.opened_at = None
+        self._transition(CircuitState.CLOSED)
         logger.info(f"Circuit breaker '{self.name}' manually reset")
-
-
-class CircuitBreakerOpenError(Exception):
-    """Exception raised when circuit breaker is open."""
-    pass
+    
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+    
+    def _record(self, failed: bool, slow: bool) -> None:
+        """Add one call to the window and open the circuit if a rate is exceeded."""
+        self._advance(time.monotonic())
+        bucket = self._buckets[self._head % self._bucket_count]
+        bucket[0] += 1
+        self._calls += 1
+        if failed:
+            bucket[1] += 1
+            self._failures += 1
+        if slow:
+            bucket[2] += 1
+            self._slow += 1
+        
+        if self.state != CircuitState.CLOSED or self._calls < self.failure_threshold:
+            return
+        if (self._failures >= self._calls * self.failure_rate_threshold
+                or (self.slow_call_duration is not None and self._slow >= self._calls * self.slow_call_rate_threshold)):
+            self._trip()
+    
+    def _advance(self, now: float) -> None:
+        """Expire buckets that slid out of the window (at most one pass over the ring)."""
+        index = int(now / self._bucket_width)
+        if index == self._head:
+            return
+        steps = min(index - self._head, self._bucket_count)
+        for offset in range(1, steps + 1):
+            bucket = self._buckets[(self._head + offset) % self._bucket_count]
+            self._calls -= bucket[0]
+            self._failures -= bucket[1]
+            self._slow -= bucket[2]
+            bucket[0] = bucket[1] = bucket[2] = 0
+        self._head = index
+    
+    def _clear_window(self) -> None:
+        for bucket in self._buckets:
+            bucket[0] = bucket[1] = bucket[2] = 0
+        self._calls = self._failures = self._slow = 0
+    
+    def _open_duration(self) -> float:
+        if self.consecutive_opens <= 0:
+            return 0.0
+        duration = self.min_open_seconds * (2 ** (self.consecutive_opens - 1))
+        return min(float(self.recovery_timeout), duration)
+    
+    def _open_elapsed(self) -> bool:
+        if self.opened_at is None:
+            return True
+        try:
+            return datetime.now() - self.opened_at >= timedelta(seconds=self._open_duration())
+        except (TypeError, OverflowError) as e:
+            logger.error(f"Circuit breaker '{self.name}' has invalid opened_at: {e}")
+            self.opened_at = None
+            return True
+    
+    def _trip(self) -> None:
+        # Every trip starts a full open period, whatever tripped it (slow
+        # calls or a failure long after the previous one)
+        self.opened_at = datetime.now()
+        self.consecutive_opens += 1
+        self._transition(CircuitState.OPEN)
+        logger.warning(
+            f"Circuit breaker '{self.name}' moved to OPEN for {self._open_duration():.0f}s "
+            f"(failure rate {self._failures}/{self._calls}, slow {self._slow}/{self._calls})"
+        )
+    
+    def _transition(self, state: CircuitState) -> None:
+        previous = self.state
+        self.state = state
+        self.success_count = 0
+        self._probes_in_flight = 0
+        if state == CircuitState.CLOSED:
+            self.consecutive_opens = 0
+            self._clear_window()
+        if previous != state and state != CircuitState.OPEN:
+            logger.info(f"Circuit breaker '{self.name}' moved to {state.value}")
 
 
 class CircuitBreakerManager:
@@ -154,6 +345,15 @@ class CircuitBreakerManager:
             self.breakers[name] = CircuitBreaker(name=name, **kwargs)
         return self.breakers[name]
     
+    def register(self, name: str, breaker: CircuitBreaker) -> CircuitBreaker:
+        """Register an externally created breaker so it is exported with the others."""
+        self.breakers[name] = breaker
+        return breaker
+    
+    def unregister(self, name: str) -> None:
+        """Drop a breaker (e.g. when its service is unregistered)."""
+        self.breakers.pop(name, None)
+    
     def get_all_states(self) -> Dict[str, Dict[str, Any]]:
         """Get states of all circuit breakers."""
         return {name: breaker.get_state() for name, breaker in self.breakers.items()}
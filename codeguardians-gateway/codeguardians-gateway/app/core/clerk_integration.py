@@ -4,24 +4,37 @@ import jwt
 import httpx
 from typing import Dict, Any, Optional
 from datetime import datetime, timezone
+from app.core.clerk_jwks_cache import get_jwks_key_ring
 from app.core.config import get_settings
 from app.core.models import User
 from app.core.exceptions import AuthenticationError, ClerkTokenError, ClerkJWKSFetchError, ClerkError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from app.utils.logging import get_logger
-from app.utils.retry import retry_async, circuit_breaker
 
 logger = get_logger(__name__)
 settings = get_settings()
 
 async def verify_clerk_token(token: str) -> Dict[str, Any]:
-    """Verify Clerk JWT token and return user data using proper JWKS verification."""
+    """
+    Verify Clerk JWT token and return user data using proper JWKS verification.
+
+    Tokens verified before are answered from the key ring's verified-token
+    cache until their exp; otherwise the signature is checked against the
+    parsed key for the token's kid.
+    """
 
     if not settings.CLERK_PUBLISHABLE_KEY:
         raise ClerkError("Clerk frontend API key not configured")
 
     try:
+        jwks_url = f"https://{settings.CLERK_PUBLISHABLE_KEY}/.well-known/jwks.json"
+        key_ring = get_jwks_key_ring(jwks_url)
+
+        cached = key_ring.verified.get(token)
+        if cached is not None:
+            return cached
+
         # Extract header to get kid (key ID)
         header = jwt.get_unverified_header(token)
         kid = header.get('kid')
@@ -29,40 +42,8 @@ async def verify_clerk_token(token: str) -> Dict[str, Any]:
         if not kid:
             raise ClerkTokenError("Invalid Clerk token: missing key ID")
 
-        # Get the JWKS endpoint
-        jwks_url = f"https://{settings.CLERK_PUBLISHABLE_KEY}/.well-known/jwks.json"
-
-        # Fetch JWKS with retry and circuit breaker
-        @circuit_breaker("clerk_jwks", failure_threshold=3, recovery_timeout=30.0)
-        async def fetch_jwks():
-            async with httpx.AsyncClient(timeout=httpx.Timeout(10.0)) as client:
-                response = await client.get(jwks_url)
-                response.raise_for_status()
-                return response.json()
-
-        try:
-            jwks = await retry_async(
-                fetch_jwks,
-                max_attempts=2,
-                delay=0.5,
-                exceptions=(httpx.RequestError, httpx.TimeoutException)
-            )
-        except Exception as e:
-            logger.error(f"Failed to fetch JWKS from {jwks_url}: {e}")
-            raise ClerkJWKSFetchError(
-                message="Unable to fetch Clerk public keys",
-                details={"url": jwks_url, "error": str(e)}
-            ) from e
-
-        # Find the key with matching kid
-        key = None
-        for jwk_key in jwks.get('keys', []):
-            if jwk_key.get('kid') == kid:
-                key = jwt.algorithms.RSAAlgorithm.from_jwk(jwk_key)
-                break
-
-        if not key:
-            raise ClerkJWKSFetchError("Invalid Clerk token: key not found in JWKS")
+        # Parsed public key for the kid (refreshed in the background before expiry)
+        key = await key_ring.get_key(kid)
 
         # Verify and decode the token
         payload = jwt.decode(
@@ -88,8 +69,11 @@ async def verify_clerk_token(token: str) -> Dict[str, Any]:
         if payload.get("azp") != settings.CLERK_PUBLISHABLE_KEY:
             raise ClerkTokenError("Invalid Clerk token: invalid authorized party")
 
+        key_ring.verified.put(token, payload, kid)
         return payload
 
+    except (ClerkTokenError, ClerkJWKSFetchError):
+        raise
     except jwt.ExpiredSignatureError:
         raise ClerkTokenError("Clerk token has expired")
     except jwt.InvalidTokenError as e:
@@ -3,94 +3,328 @@ Clerk JWKS Caching Module
 
 Caches JWKS (JSON Web Key Set) responses from Clerk to improve performance
 and reduce API calls. Includes retry logic for resilience.
+
+JWKSKeyRing keeps the keys parsed and ready for verification:
+- Public keys are parsed once per fetch and indexed by `kid`
+- Keys are refreshed in the background before they expire; concurrent
+  refreshes share one fetch
+- An unknown `kid` (key rotation) triggers a rate-limited refresh
+- On fetch failure the previous keys keep being served and the fetch is
+  retried after a minimum interval
+
+VerifiedTokenCache remembers tokens whose signature and claims were already
+verified, until each token's `exp`, so repeat requests skip RSA verification.
 """
 
+import os
 import time
 import asyncio
-from typing import Optional, Dict, Any
-from datetime import datetime, timedelta
+from collections import OrderedDict
+from typing import Optional, Dict, Any, Tuple
 import httpx
+import jwt
 from app.core.config import get_settings
+from app.core.exceptions import ClerkJWKSFetchError, ClerkTokenError
+from app.core.single_flight import SingleFlight
 from app.utils.logging import get_logger
 
 logger = get_logger(__name__)
 settings = get_settings()
 
-# In-memory cache for JWKS
-_jwks_cache: Optional[Dict[str, Any]] = None
-_jwks_cache_time: float = 0.0
-_jwks_cache_ttl: float = 3600.0  # 1 hour default TTL
+JWKS_TTL_SECONDS = float(os.getenv("CLERK_JWKS_TTL_SECONDS", "3600"))
+JWKS_REFRESH_AHEAD_SECONDS = float(os.getenv("CLERK_JWKS_REFRESH_AHEAD_SECONDS", "300"))
+JWKS_MIN_REFRESH_SECONDS = float(os.getenv("CLERK_JWKS_MIN_REFRESH_SECONDS", "30"))
+VERIFIED_TOKEN_CACHE_SIZE = int(os.getenv("CLERK_VERIFIED_TOKEN_CACHE_SIZE", "10000"))
+
+
+class VerifiedTokenCache:
+    """
+    Bounded LRU of verified token payloads, valid until each token's exp.
+
+    Entries are keyed by the full token, so a cached signature is only ever
+    accepted together with the exact header and claims it signed.
+
+    SAFETY: An entry is never returned at or after its token's exp
+    ASSUMES: Only tokens that passed full verification are stored
+    VERIFY: Entries signed by a key that left the JWKS are dropped on refresh
+    """
+
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, str, Dict[str, Any]]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, token: str) -> Optional[Dict[str, Any]]:
+        """Get the payload of an already-verified, unexpired token."""
+        entry = self._entries.get(token)
+        if entry is None:
+            self.misses += 1
+            return None
+        if entry[0] <= time.time():
+            del self._entries[token]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(token)
+        self.hits += 1
+        return entry[2]
+
+    def put(self, token: str, payload: Dict[str, Any], kid: str) -> None:
+        """Remember a verified token until its exp claim."""
+        exp = payload.get("exp")
+        if not isinstance(exp, (int, float)) or self.max_entries <= 0:
+            return
+        self._entries[token] = (float(exp), kid, payload)
+        self._entries.move_to_end(token)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def retain_kids(self, kids) -> None:
+        """Drop tokens signed by keys no longer in the JWKS."""
+        for token in [t for t, entry in self._entries.items() if entry[1] not in kids]:
+            del self._entries[token]
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class JWKSKeyRing:
+    """
+    Parsed JWKS public keys indexed by kid, refreshed ahead of expiry.
+
+    SAFETY: Stale keys are served when a refresh fails (Clerk outages do not fail logins)
+    ASSUMES: One key ring per JWKS URL, used from one event loop
+    VERIFY: At most one JWKS fetch is in flight at a time
+    """
+
+    def __init__(
+        self,
+        jwks_url: str,
+        ttl: float = 3600.0,
+        refresh_ahead: float = 300.0,
+        min_refresh_interval: float = 30.0,
+        verified_cache_size: int = 10000,
+        timeout: float = 5.0,
+        max_retries: int = 3,
+        retry_delay: float = 1.0
+    ):
+        self.jwks_url = jwks_url
+        self.ttl = ttl
+        self.refresh_ahead = min(refresh_ahead, ttl / 2)
+        self.min_refresh_interval = min_refresh_interval
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.keys: Dict[str, Any] = {}
+        self.jwks: Optional[Dict[str, Any]] = None
+        self.fetched_at = 0.0
+        self.attempted_at = float("-inf")
+        self.verified = VerifiedTokenCache(verified_cache_size)
+        self._client: Optional[httpx.AsyncClient] = None
+        self._single_flight = SingleFlight()
+        self._background: Optional[asyncio.Task] = None
+        self.stats = {"fetches": 0, "fetch_failures": 0, "background_refreshes": 0, "unknown_kid_refreshes": 0}
+
+    @classmethod
+    def from_env(cls, jwks_url: str) -> "JWKSKeyRing":
+        """Create a key ring configured from environment variables."""
+        return cls(
+            jwks_url,
+            ttl=JWKS_TTL_SECONDS,
+            refresh_ahead=JWKS_REFRESH_AHEAD_SECONDS,
+            min_refresh_interval=JWKS_MIN_REFRESH_SECONDS,
+            verified_cache_size=VERIFIED_TOKEN_CACHE_SIZE
+        )
+
+    def _age(self) -> float:
+        return time.monotonic() - self.fetched_at
+
+    def _may_refresh(self) -> bool:
+        """True unless a fetch was attempted within min_refresh_interval."""
+        return time.monotonic() - self.attempted_at >= self.min_refresh_interval
+
+    async def get_key(self, kid: str) -> Any:
+        """
+        Get the parsed public key for a kid.
+
+        Raises:
+            ClerkJWKSFetchError: If no JWKS could be fetched
+            ClerkTokenError: If the JWKS has no key for the kid
+        """
+        if self._may_refresh():
+            if self.jwks is None or self._age() >= self.ttl:
+                await self.refresh()
+            elif self._age() >= self.ttl - self.refresh_ahead:
+                self._refresh_in_background()
+
+        key = self.keys.get(kid)
+        if key is None and self.jwks is not None and self._may_refresh():
+            # Possibly a rotated key: refetch, but never more than once per interval
+            self.stats["unknown_kid_refreshes"] += 1
+            await self.refresh()
+            key = self.keys.get(kid)
+
+        if key is None and self.jwks is None:
+            raise ClerkJWKSFetchError(
+                message="Unable to fetch Clerk public keys",
+                details={"url": self.jwks_url}
+            )
+
+        if key is None:
+            raise ClerkTokenError("Invalid Clerk token: key not found in JWKS")
+        return key
+
+    async def get_jwks(self) -> Optional[Dict[str, Any]]:
+        """Get the raw JWKS document (refreshing it if expired)."""
+        if (self.jwks is None or self._age() >= self.ttl) and self._may_refresh():
+            try:
+                await self.refresh()
+            except ClerkJWKSFetchError:
+                pass
+        return self.jwks
+
+    async def refresh(self) -> None:
+        """Fetch and parse the JWKS now (concurrent callers share one fetch)."""
+        await self._single_flight.do(self.jwks_url, self._refresh)
+
+    def _refresh_in_background(self) -> None:
+        if self._background is None or self._background.done():
+            self.stats["background_refreshes"] += 1
+            self._background = asyncio.get_running_loop().create_task(self._background_refresh())
+
+    async def _background_refresh(self) -> None:
+        try:
+            await self.refresh()
+        except ClerkJWKSFetchError as e:
+            logger.warning(f"Background JWKS refresh failed; keeping current keys: {e.message}")
+
+    async def _refresh(self) -> None:
+        self.attempted_at = time.monotonic()
+        try:
+            jwks = await self._fetch()
+        except Exception as e:
+            self.stats["fetch_failures"] += 1
+            if self.jwks is not None:
+                # Serve stale keys; the next attempt waits min_refresh_interval
+                logger.warning("Using stale JWKS cache due to fetch failure")
+                return
+            logger.error("JWKS fetch failed and no cache available")
+            raise ClerkJWKSFetchError(
+                message="Unable to fetch Clerk public keys",
+                details={"url": self.jwks_url, "error": str(e)}
+            ) from e
+
+        self._install(jwks)
+
+    def _install(self, jwks: Dict[str, Any]) -> None:
+        """Parse a JWKS document into keys by kid."""
+        keys = {}
+        for jwk_key in jwks.get("keys", []):
+            kid = jwk_key.get("kid")
+            if not kid:
+                continue
+            try:
+                keys[kid] = jwt.PyJWK(jwk_key).key
+            except jwt.PyJWTError as e:
+                logger.warning(f"Skipping unusable JWKS key {kid}: {e}")
+
+        self.jwks = jwks
+        self.keys = keys
+        self.fetched_at = time.monotonic()
+        self.verified.retain_kids(keys)
+        logger.info(f"JWKS fetched and cached successfully ({len(keys)} keys)")
+
+    async def _fetch(self) -> Dict[str, Any]:
+        """GET the JWKS with retries on timeouts, connection errors and server errors."""
+        if self._client is None:
+            self._client = httpx.AsyncClient(timeout=self.timeout)
+
+        for attempt in range(self.max_retries):
+            self.stats["fetches"] += 1
+            try:
+                response = await self._client.get(self.jwks_url)
+                response.raise_for_status()
+                return response.json()
+            except httpx.TimeoutException:
+                logger.warning(f"JWKS fetch timeout (attempt {attempt + 1}/{self.max_retries})")
+                if attempt == self.max_retries - 1:
+                    raise
+            except httpx.RequestError as e:
+                logger.warning(f"JWKS fetch failed: {e} (attempt {attempt + 1}/{self.max_retries})")
+                if attempt == self.max_retries - 1:
+                    raise
+            except httpx.HTTPStatusError as e:
+                logger.error(f"JWKS fetch failed: HTTP {e.response.status_code}")
+                if e.response.status_code < 500 or attempt == self.max_retries - 1:
+                    raise
+            await asyncio.sleep(self.retry_delay * (attempt + 1))
+
+    def invalidate(self) -> None:
+        """Drop keys and verified tokens so the next lookup refetches."""
+        self.jwks = None
+        self.keys = {}
+        self.fetched_at = 0.0
+        self.attempted_at = float("-inf")
+        self.verified.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get fetch counters and cache sizes."""
+        return {
+            **self.stats,
+            "keys": len(self.keys),
+            "age_seconds": round(self._age(), 1) if self.jwks is not None else None,
+            "verified_tokens": len(self.verified),
+            "verified_hits": self.verified.hits,
+            "verified_misses": self.verified.misses
+        }
+
+    async def close(self) -> None:
+        """Stop any background refresh and close the HTTP client."""
+        if self._background and not self._background.done():
+            self._background.cancel()
+            try:
+                await self._background
+            except asyncio.CancelledError:
+                pass
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+# Key rings by JWKS URL
+_key_rings: Dict[str, JWKSKeyRing] = {}
+
+
+def get_jwks_key_ring(jwks_url: str) -> JWKSKeyRing:
+    """Get the key ring for a JWKS URL."""
+    key_ring = _key_rings.get(jwks_url)
+    if key_ring is None:
+        key_ring = _key_rings[jwks_url] = JWKSKeyRing.from_env(jwks_url)
+    return key_ring
 
 
 async def get_cached_jwks(jwks_url: str, ttl: float = 3600.0) -> Optional[Dict[str, Any]]:
     """
     Get JWKS from cache or fetch from Clerk.
-    
+
     Args:
         jwks_url: Clerk JWKS endpoint URL
         ttl: Time to live in seconds (default: 1 hour)
-        
+
     Returns:
         JWKS dictionary or None if fetch fails
     """
-    global _jwks_cache, _jwks_cache_time, _jwks_cache_ttl
-    
-    current_time = time.time()
-    
-    # Check if cache is valid
-    if _jwks_cache and (current_time - _jwks_cache_time) < ttl:
-        logger.debug("JWKS cache hit")
-        return _jwks_cache
-    
-    # Cache expired or missing, fetch from Clerk
-    logger.debug("JWKS cache miss, fetching from Clerk")
-    
-    max_retries = 3
-    retry_delay = 1.0
-    
-    for attempt in range(max_retries):
-        try:
-            async with httpx.AsyncClient(timeout=5.0) as client:
-                response = await client.get(jwks_url)
-                response.raise_for_status()
-                
-                jwks_data = response.json()
-                
-                # Update cache
-                _jwks_cache = jwks_data
-                _jwks_cache_time = current_time
-                _jwks_cache_ttl = ttl
-                
-                logger.info("JWKS fetched and cached successfully")
-                return jwks_data
-                
-        except httpx.TimeoutException:
-            logger.warning(f"JWKS fetch timeout (attempt {attempt + 1}/{max_retries})")
-            if attempt < max_retries - 1:
-                await asyncio.sleep(retry_delay * (attempt + 1))
-        except httpx.HTTPStatusError as e:
-            logger.error(f"JWKS fetch failed: HTTP {e.response.status_code}")
-            if e.response.status_code >= 500 and attempt < max_retries - 1:
-                await asyncio.sleep(retry_delay * (attempt + 1))
-            else:
-                break
-        except Exception as e:
-            logger.error(f"JWKS fetch failed: {e}")
-            break
-    
-    # If we have stale cache, return it
-    if _jwks_cache:
-        logger.warning("Using stale JWKS cache due to fetch failure")
-        return _jwks_cache
-    
-    logger.error("JWKS fetch failed and no cache available")
-    return None
+    key_ring = get_jwks_key_ring(jwks_url)
+    key_ring.ttl = ttl
+    key_ring.refresh_ahead = min(key_ring.refresh_ahead, ttl / 2)
+    return await key_ring.get_jwks()
 
 
 def invalidate_jwks_cache() -> None:
     """Invalidate JWKS cache to force refresh."""
-    global _jwks_cache, _jwks_cache_time
-    _jwks_cache = None
-    _jwks_cache_time = 0.0
+    for key_ring in _key_rings.values():
+        key_ring.invalidate()
     logger.info("JWKS cache invalidated")
-
@@ -128,6 +128,11 @@ class Settings(BaseSettings):
     TESTING: bool = Field(default=False, env="TESTING")
     TEST_DATABASE_URL: Optional[str] = Field(default=None, env="TEST_DATABASE_URL")
 
+    # Optional subsystems (routers are only imported when enabled)
+    AB_TESTING_ENABLED: bool = Field(default=True, env="AB_TESTING_ENABLED")
+    ENTERPRISE_ENABLED: bool = Field(default=True, env="ENTERPRISE_ENABLED")
+    UPLOAD_ENABLED: bool = Field(default=True, env="UPLOAD_ENABLED")
+
     # Internal Testing
     INTERNAL_TESTING_ENABLED: bool = Field(default=False, env="INTERNAL_TESTING_ENABLED")
     INTERNAL_TESTING_JWT_TOKEN: Optional[str] = Field(default=None, env="INTERNAL_TESTING_JWT_TOKEN")
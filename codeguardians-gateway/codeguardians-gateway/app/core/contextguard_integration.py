@@ -180,7 +180,8 @@ class ContextGuardIntegration:
         guard_name: str,
         payload: Dict[str, Any],
         session_id: Optional[str] = None,
-        user_id: Optional[str] = None
+        user_id: Optional[str] = None,
+        context_data: Optional[Dict[str, Any]] = None
     ) -> Dict[str, Any]:
         """
         Enhance guard payload with context awareness.
@@ -193,15 +194,15 @@ class ContextGuardIntegration:
             payload: Original guard payload
             session_id: Session ID for context continuity (optional)
             user_id: User ID for context continuity (optional)
+            context_data: Pre-fetched context snapshot (optional). Fan-out
+                callers fetch it once via get_context_snapshot() and reuse
+                it for every guard instead of re-reading memory per guard.
             
         Returns:
             Enhanced payload with context awareness
         """
-        # Generate context key
-        context_key = session_id or user_id or "default"
-        
-        # Get context from memory
-        context_data = self.memory.get_context(context_key)
+        if context_data is None:
+            context_data = self.get_context_snapshot(session_id, user_id)
         
         # Enhance payload with context
         enhanced_payload = self._merge_context(payload, context_data, guard_name)
@@ -209,6 +210,26 @@ class ContextGuardIntegration:
         logger.debug(f"ContextGuard enhanced {guard_name} payload with context awareness")
         return enhanced_payload
     
+    def get_context_snapshot(
+        self,
+        session_id: Optional[str] = None,
+        user_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Get the current context snapshot for a session/user.
+        
+        Args:
+            session_id: Session ID for context continuity (optional)
+            user_id: User ID for context continuity (optional)
+            
+        Returns:
+            Context data from persistent memory
+        """
+        # Generate context key
+        context_key = session_id or user_id or "default"
+        
+        return self.memory.get_context(context_key)
+    
     def _merge_context(
         self,
         payload: Dict[str, Any],
@@ -231,6 +252,11 @@ class ContextGuardIntegration:
         # Copy payload (don't mutate original)
         enhanced = payload.copy()
         
+        # Copy nested context too - the caller's dict may be shared between
+        # guards (e.g. one payload fanned out to several guards)
+        if isinstance(enhanced.get("context"), dict):
+            enhanced["context"] = dict(enhanced["context"])
+        
         # Add context metadata
         enhanced["_context"] = {
             "awareness": context_data.get("has_context", False),
@@ -353,11 +379,33 @@ def get_contextguard_integration() -> ContextGuardIntegration:
     return _contextguard_integration
 
 
+def get_guard_context_snapshot(
+    session_id: Optional[str] = None,
+    user_id: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Get the ContextGuard context snapshot for a session/user.
+    
+    Used by multi-guard fan-out to read context memory once per scan and
+    share it across all guards.
+    
+    Args:
+        session_id: Session ID for context continuity (optional)
+        user_id: User ID for personalized context (optional)
+        
+    Returns:
+        Context data from persistent memory
+    """
+    integration = get_contextguard_integration()
+    return integration.get_context_snapshot(session_id, user_id)
+
+
 def enhance_guard_with_context(
     guard_name: str,
     payload: Dict[str, Any],
     session_id: Optional[str] = None,
-    user_id: Optional[str] = None
+    user_id: Optional[str] = None,
+    context_data: Optional[Dict[str, Any]] = None
 ) -> Dict[str, Any]:
     """
     Enhance guard payload with ContextGuard awareness.
@@ -370,12 +418,13 @@ def enhance_guard_with_context(
         payload: Original guard payload
         session_id: Session ID for context continuity (optional)
         user_id: User ID for personalized context (optional)
+        context_data: Pre-fetched context snapshot (optional)
         
     Returns:
         Enhanced payload with context awareness
     """
     integration = get_contextguard_integration()
-    return integration.enhance_with_context(guard_name, payload, session_id, user_id)
+    return integration.enhance_with_context(guard_name, payload, session_id, user_id, context_data)
 
 
 def store_guard_context(
@@ -348,6 +348,19 @@ class ServiceUnavailableError(BaseAPIException):
         )
 
 
+class GuardOverloadedError(ServiceUnavailableError):
+    """Exception raised when a guard call is shed by its concurrency limiter."""
+
+    def __init__(self, service_name: str, reason: str, details: Optional[Dict[str, Any]] = None):
+        BaseAPIException.__init__(
+            self,
+            message=f"Guard service {service_name} is overloaded: {reason}",
+            status_code=503,
+            details=details or {"service": service_name, "reason": reason},
+            error_code="GUARD_OVERLOADED"
+        )
+
+
 # Stripe-specific exceptions
 class StripeError(ExternalServiceError):
     """Exception raised for Stripe API errors."""
@@ -438,11 +451,16 @@ class StripePaymentError(StripeError):
 class ClerkError(ExternalServiceError):
     """Exception raised for Clerk API errors."""
 
-    def __init__(self, message: str = "Clerk API error", details: Optional[Dict[str, Any]] = None):
+    def __init__(
+        self,
+        message: str = "Clerk API error",
+        details: Optional[Dict[str, Any]] = None,
+        error_code: str = "CLERK_ERROR"
+    ):
         super().__init__(
             message=message,
             details=details,
-            error_code="CLERK_ERROR"
+            error_code=error_code
         )
 
 
@@ -486,7 +504,9 @@ class CircuitBreakerOpenError(ExternalServiceError):
     def __init__(self, service_name: str, message: str = None, details: Optional[Dict[str, Any]] = None):
         if message is None:
             message = f"Circuit breaker is open for service: {service_name}"
-        super().__init__(
+        # ExternalServiceError pins status 502; an open circuit is a 503
+        BaseAPIException.__init__(
+            self,
             message=message,
             status_code=503,
             details=details or {"service": service_name},
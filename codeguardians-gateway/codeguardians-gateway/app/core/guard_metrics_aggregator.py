@@ -268,101 +268,75 @@ metrics_aggregator = GuardMetricsAggregator()
 
 # Helper functions for middleware integration
 async def record_guard_operation(guard_name: str, operation_data: Dict[str, Any]) -> None:
-    """Record operation metrics for a specific guard (called from middleware)"""
+    """Record operation metrics for a specific guard (called from middleware).
+
+    Rows are handed to the write-behind metrics buffer, which bulk-inserts
+    them in the background; no database session is opened here.
+    """
     try:
-        from app.core.database import get_session_factory
-        from app.core.centralized_database import GuardOperation, GuardMetrics
+        from app.core.guard_metrics_buffer import get_guard_metrics_buffer
         
         logger.debug(f"Recording operation for {guard_name}: {operation_data}")
         
-        session_factory = get_session_factory()
-        if not session_factory:
-            logger.warning("Database session factory not available for metric recording")
-            return
+        # Extract operation details
+        output_data = operation_data.get("output_data", {})
+        success = operation_data.get("success", True)
+        operation = {
+            "guard_name": guard_name,
+            "operation_type": operation_data.get("operation_type", "unknown"),
+            "input_data": operation_data.get("input_data", {}),
+            "output_data": output_data,
+            "processing_time_ms": operation_data.get("processing_time_ms", 0.0),
+            "success": success,
+            "error_message": operation_data.get("error_message"),
+            "user_id": operation_data.get("user_id"),
+            "session_id": operation_data.get("session_id")
+        }
         
-        async with session_factory() as db:
-            try:
-                # Extract operation details
-                operation_type = operation_data.get("operation_type", "unknown")
-                input_data = operation_data.get("input_data", {})
-                output_data = operation_data.get("output_data", {})
-                processing_time_ms = operation_data.get("processing_time_ms", 0.0)
-                success = operation_data.get("success", True)
-                error_message = operation_data.get("error_message")
-                user_id = operation_data.get("user_id")
-                session_id = operation_data.get("session_id")
+        # Extract metrics based on guard type and output data
+        metrics_to_record = []
+        if success and output_data:
+            # TokenGuard metrics
+            if guard_name == "tokenguard":
+                tokens_saved = output_data.get("tokens_saved") or output_data.get("total_tokens_saved", 0)
+                cost_savings = output_data.get("cost_savings_usd") or output_data.get("cost_savings", 0.0)
+                compression_ratio = output_data.get("compression_ratio", 0.0)
                 
-                # Record operation
-                operation = GuardOperation(
-                    guard_name=guard_name,
-                    operation_type=operation_type,
-                    input_data=input_data,
-                    output_data=output_data,
-                    processing_time_ms=processing_time_ms,
-                    success=success,
-                    error_message=error_message,
-                    user_id=user_id,
-                    session_id=session_id
-                )
-                db.add(operation)
+                if tokens_saved > 0:
+                    metrics_to_record.append({
+                        "metric_type": "tokens_saved",
+                        "metric_value": float(tokens_saved),
+                        "metric_data": {"cost_savings_usd": cost_savings, "compression_ratio": compression_ratio}
+                    })
+            
+            # ContextGuard metrics
+            elif guard_name == "contextguard":
+                context_relevance = output_data.get("relevance_score", 0.0)
+                memory_utilization = output_data.get("memory_utilization", 0.0)
                 
-                # Extract and record metrics based on guard type and output data
-                if success and output_data:
-                    metrics_to_record = []
-                    
-                    # TokenGuard metrics
-                    if guard_name == "tokenguard":
-                        tokens_saved = output_data.get("tokens_saved") or output_data.get("total_tokens_saved", 0)
-                        cost_savings = output_data.get("cost_savings_usd") or output_data.get("cost_savings", 0.0)
-                        compression_ratio = output_data.get("compression_ratio", 0.0)
-                        
-                        if tokens_saved > 0:
-                            metrics_to_record.append({
-                                "metric_type": "tokens_saved",
-                                "metric_value": float(tokens_saved),
-                                "metric_data": {"cost_savings_usd": cost_savings, "compression_ratio": compression_ratio}
-                            })
-                    
-                    # ContextGuard metrics
-                    elif guard_name == "contextguard":
-                        context_relevance = output_data.get("relevance_score", 0.0)
-                        memory_utilization = output_data.get("memory_utilization", 0.0)
-                        
-                        if context_relevance > 0:
-                            metrics_to_record.append({
-                                "metric_type": "context_relevance",
-                                "metric_value": float(context_relevance),
-                                "metric_data": {"memory_utilization": memory_utilization}
-                            })
-                    
-                    # TrustGuard metrics
-                    elif guard_name == "trustguard":
-                        risk_score = output_data.get("risk_score", 0.0)
-                        violations_prevented = output_data.get("violations_prevented", 0)
-                        
-                        if violations_prevented > 0:
-                            metrics_to_record.append({
-                                "metric_type": "violations_prevented",
-                                "metric_value": float(violations_prevented),
-                                "metric_data": {"risk_score": risk_score}
-                            })
-                    
-                    # Record all metrics
-                    for metric_data in metrics_to_record:
-                        metric = GuardMetrics(
-                            guard_name=guard_name,
-                            metric_type=metric_data["metric_type"],
-                            metric_value=metric_data["metric_value"],
-                            metric_data=metric_data.get("metric_data", {})
-                        )
-                        db.add(metric)
+                if context_relevance > 0:
+                    metrics_to_record.append({
+                        "metric_type": "context_relevance",
+                        "metric_value": float(context_relevance),
+                        "metric_data": {"memory_utilization": memory_utilization}
+                    })
+            
+            # TrustGuard metrics
+            elif guard_name == "trustguard":
+                risk_score = output_data.get("risk_score", 0.0)
+                violations_prevented = output_data.get("violations_prevented", 0)
                 
-                await db.commit()
-                logger.debug(f"Recorded operation and metrics for {guard_name}")
-                
-            except Exception as e:
-                await db.rollback()
-                logger.error(f"Error recording guard operation: {e}", exc_info=True)
+                if violations_prevented > 0:
+                    metrics_to_record.append({
+                        "metric_type": "violations_prevented",
+                        "metric_value": float(violations_prevented),
+                        "metric_data": {"risk_score": risk_score}
+                    })
+        
+        get_guard_metrics_buffer().record(
+            operation,
+            [{"guard_name": guard_name, **metric_data} for metric_data in metrics_to_record]
+        )
     except Exception as e:
         logger.error(f"Error recording guard operation: {e}", exc_info=True)
 
@@ -0,0 +1,275 @@
+"""
+Write-Behind Buffer for Guard Operation Metrics
+
+Guard calls used to open a database session and commit a GuardOperation row
+(plus GuardMetrics rows) per call. Records now go into a bounded in-memory
+ring buffer that a background task drains in bulk:
+- record() is synchronous and O(1): no I/O on the request path
+- A flush runs when batch_size rows are waiting or every flush_interval
+  seconds, whichever comes first; each batch is one multi-row
+  INSERT ... VALUES per table and one commit
+- One flush at a time, so a slow database never holds more than one
+  connection for metrics
+- Backpressure: when the buffer fills up or flushes get slow, new guard
+  operations are sampled; kept operation and metric rows carry a
+  sample_weight of 1/rate, which aggregates sum instead of counting rows.
+  When the buffer is full the oldest rows are overwritten and counted as dropped
+"""
+
+import asyncio
+import os
+import random
+import time
+from collections import deque
+from datetime import datetime
+from typing import Any, Callable, Deque, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import insert
+
+from app.core.centralized_database import GuardMetrics, GuardOperation
+from app.core.database import get_session_factory
+from app.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+try:
+    from app.core.orchestrator_metrics import (
+        record_guard_metrics_flush,
+        record_guard_metrics_records,
+        update_guard_metrics_buffer,
+    )
+    METRICS_ENABLED = True
+except ImportError:
+    METRICS_ENABLED = False
+
+# Maximum buffered rows (operations + metrics); the oldest are overwritten beyond it
+GUARD_METRICS_BUFFER_CAPACITY = int(os.getenv("GUARD_METRICS_BUFFER_CAPACITY", "20000"))
+
+# Rows per bulk insert; reaching it wakes the flusher early
+GUARD_METRICS_BATCH_SIZE = int(os.getenv("GUARD_METRICS_BATCH_SIZE", "500"))
+
+# Maximum seconds a row waits before it is written
+GUARD_METRICS_FLUSH_INTERVAL_SECONDS = float(os.getenv("GUARD_METRICS_FLUSH_INTERVAL_SECONDS", "2"))
+
+# Flush latency above which the database is treated as slow and records are sampled
+GUARD_METRICS_SLOW_FLUSH_SECONDS = float(os.getenv("GUARD_METRICS_SLOW_FLUSH_SECONDS", "1"))
+
+# Lowest fraction of guard operations kept under backpressure
+GUARD_METRICS_MIN_SAMPLE_RATE = float(os.getenv("GUARD_METRICS_MIN_SAMPLE_RATE", "0.05"))
+
+# Buffer fill ratio above which sampling starts
+_HIGH_WATERMARK = 0.5
+
+Row = Tuple[Any, Dict[str, Any]]
+
+
+class GuardMetricsBuffer:
+    """
+    Bounded ring buffer of guard operation and metric rows, written in bulk.
+
+    SAFETY: Bounded memory (capacity rows); record() never awaits or raises
+        on database problems
+    ASSUMES: Single event loop; rows are plain column dicts for
+        GuardOperation / GuardMetrics
+    VERIFY: Every kept row is written exactly once on a successful flush;
+        rows lost to overflow or sampling are counted in stats
+    """
+
+    def __init__(
+        self,
+        capacity: int = GUARD_METRICS_BUFFER_CAPACITY,
+        batch_size: int = GUARD_METRICS_BATCH_SIZE,
+        flush_interval: float = GUARD_METRICS_FLUSH_INTERVAL_SECONDS,
+        slow_flush_seconds: float = GUARD_METRICS_SLOW_FLUSH_SECONDS,
+        min_sample_rate: float = GUARD_METRICS_MIN_SAMPLE_RATE,
+        random_source: Callable[[], float] = random.random
+    ):
+        self.capacity = capacity
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.slow_flush_seconds = slow_flush_seconds
+        self.min_sample_rate = min_sample_rate
+        self._random = random_source
+        self._rows: Deque[Row] = deque(maxlen=capacity)
+        self._wakeup = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._flush_task: Optional[asyncio.Task] = None
+        self.last_flush_seconds = 0.0
+        self.stats = {
+            "recorded": 0,
+            "sampled_out": 0,
+            "dropped": 0,
+            "flushed": 0,
+            "flushes": 0,
+            "flush_errors": 0
+        }
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def sample_rate(self) -> float:
+        """Fraction of guard operations currently admitted."""
+        rate = 1.0
+        fill = len(self._rows) / self.capacity
+        if fill > _HIGH_WATERMARK:
+            rate -= (fill - _HIGH_WATERMARK) / (1 - _HIGH_WATERMARK)
+        if self.last_flush_seconds > self.slow_flush_seconds:
+            rate = min(rate, self.slow_flush_seconds / self.last_flush_seconds)
+        return max(self.min_sample_rate, rate)
+
+    def record(self, operation: Dict[str, Any], metrics: Sequence[Dict[str, Any]] = ()) -> bool:
+        """
+        Buffer one guard operation and the metric rows derived from it.
+
+        Args:
+            operation: GuardOperation column values
+            metrics: GuardMetrics column values
+
+        Returns:
+            False if the operation was sampled out under backpressure
+        """
+        rate = self.sample_rate()
+        if rate < 1.0 and self._random() >= rate:
+            self.stats["sampled_out"] += 1
+            if METRICS_ENABLED:
+                record_guard_metrics_records("sampled_out", 1 + len(metrics))
+            return False
+
+        now = datetime.utcnow()
+        # Kept rows stand for 1/rate operations in aggregates (set on every
+        # row so each bulk insert has the same columns)
+        weight = round(1 / rate, 3) if rate < 1.0 else 1.0
+        rows: List[Row] = [(GuardOperation, {
+            **operation,
+            "created_at": operation.get("created_at") or now,
+            "sample_weight": weight
+        })]
+        for metric in metrics:
+            rows.append((GuardMetrics, {**metric, "timestamp": metric.get("timestamp") or now, "sample_weight": weight}))
+
+        overflow = len(self._rows) + len(rows) - self.capacity
+        if overflow > 0:
+            self.stats["dropped"] += overflow
+            if METRICS_ENABLED:
+                record_guard_metrics_records("dropped", overflow)
+        self._rows.extend(rows)
+        self.stats["recorded"] += 1
+
+        if len(self._rows) >= self.batch_size:
+            self._wakeup.set()
+        self._ensure_flusher()
+        return True
+
+    def _ensure_flusher(self) -> None:
+        if self._flush_task is None or self._flush_task.done():
+            try:
+                self._flush_task = asyncio.get_running_loop().create_task(self._flush_loop())
+            except RuntimeError:
+                pass  # No running loop; rows are written on the next flush()
+
+    async def _flush_loop(self) -> None:
+        while self._rows:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            errors = self.stats["flush_errors"]
+            await self.flush()
+            if self.stats["flush_errors"] > errors:
+                # Back off instead of retrying on every size trigger
+                await asyncio.sleep(self.flush_interval)
+
+    async def flush(self) -> int:
+        """
+        Write the rows buffered when the flush started, batch_size rows per insert.
+
+        Returns:
+            Number of rows written
+        """
+        async with self._flush_lock:
+            written = 0
+            remaining = len(self._rows)
+            while remaining > 0 and self._rows:
+                batch = [self._rows.popleft() for _ in range(min(self.batch_size, remaining, len(self._rows)))]
+                remaining -= len(batch)
+                try:
+                    ok = await self._write_batch(batch)
+                except asyncio.CancelledError:
+                    self._requeue(batch)
+                    raise
+                if not ok:
+                    self._requeue(batch)
+                    break
+                written += len(batch)
+
+            if METRICS_ENABLED:
+                update_guard_metrics_buffer(len(self._rows), self.sample_rate())
+            return written
+
+    async def _write_batch(self, batch: List[Row]) -> bool:
+        session_factory = get_session_factory()
+        if not session_factory:
+            logger.warning(f"Database unavailable, dropping {len(batch)} guard metrics rows")
+            self.stats["dropped"] += len(batch)
+            if METRICS_ENABLED:
+                record_guard_metrics_records("dropped", len(batch))
+            return True
+
+        operations = [row for model, row in batch if model is GuardOperation]
+        metrics = [row for model, row in batch if model is GuardMetrics]
+        start = time.perf_counter()
+        try:
+            async with session_factory() as db:
+                if operations:
+                    await db.execute(insert(GuardOperation), operations)
+                if metrics:
+                    await db.execute(insert(GuardMetrics), metrics)
+                await db.commit()
+        except Exception as e:
+            self.last_flush_seconds = time.perf_counter() - start
+            self.stats["flush_errors"] += 1
+            if METRICS_ENABLED:
+                record_guard_metrics_records("flush_error", len(batch))
+            logger.error(f"Error flushing {len(batch)} guard metrics rows: {e}")
+            return False
+
+        self.last_flush_seconds = time.perf_counter() - start
+        self.stats["flushed"] += len(batch)
+        self.stats["flushes"] += 1
+        if METRICS_ENABLED:
+            record_guard_metrics_flush(self.last_flush_seconds, len(batch))
+        logger.debug(f"Flushed {len(operations)} guard operations and {len(metrics)} metrics")
+        return True
+
+    def _requeue(self, batch: List[Row]) -> None:
+        """Put a failed batch back at the front; rows that no longer fit are dropped."""
+        free = self.capacity - len(self._rows)
+        if free < len(batch):
+            self.stats["dropped"] += len(batch) - free
+            if METRICS_ENABLED:
+                record_guard_metrics_records("dropped", len(batch) - free)
+        if free > 0:
+            self._rows.extendleft(reversed(batch[:free]))
+
+    async def close(self) -> None:
+        """Stop the background flusher and write what is left."""
+        if self._flush_task and not self._flush_task.done():
+            self._flush_task.cancel()
+            try:
+                await self._flush_task
+            except asyncio.CancelledError:
+                pass
+        self._flush_task = None
+        await self.flush()
+
+
+_guard_metrics_buffer: Optional[GuardMetricsBuffer] = None
+
+
+def get_guard_metrics_buffer() -> GuardMetricsBuffer:
+    """Get the process-wide guard metrics buffer."""
+    global _guard_metrics_buffer
+    if _guard_metrics_buffer is None:
+        _guard_metrics_buffer = GuardMetricsBuffer()
+    return _guard_metrics_buffer
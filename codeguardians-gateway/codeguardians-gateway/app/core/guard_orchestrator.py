@@ -6,12 +6,15 @@ requests to all guard services in the Code Guardians ecosystem.
 """
 
 import asyncio
+import contextlib
+import copy
 import logging
 import os
-from typing import Dict, List, Optional, Any, Union
+import time
+from typing import AsyncIterator, Callable, Dict, List, Optional, Any, Tuple, Union
 from dataclasses import dataclass, field
 from enum import Enum
-from datetime import datetime, timedelta
+from datetime import datetime
 import httpx
 import json
 from pathlib import Path
@@ -19,9 +22,19 @@ from pathlib import Path
 from app.core.config import get_settings
 from app.core.exceptions import (
     GuardServiceError,
+    GuardOverloadedError,
     ServiceUnavailableError,
     ConfigurationError
 )
+from app.core.adaptive_concurrency import get_concurrency_controller
+from app.core.circuit_breaker import CircuitBreaker as SlidingWindowCircuitBreaker, circuit_breaker_manager
+from app.core.guard_verdict_cache import get_guard_verdict_cache
+from app.core.request_hedging import get_request_hedger
+from app.core.guard_transformers import get_transformer_registry
+from app.core.guard_streaming import GuardStream, STREAMING_SERVICES, guarded_body
+from app.core.health_prober import HealthProber, get_health_prober
+from app.core.single_flight import SingleFlight
+from app.core.stage_timing import StageTimer, current_stage_timer, get_stage_timings, timed_stage
 from app.utils.logging import get_logger
 
 logger = get_logger(__name__)
@@ -34,7 +47,8 @@ try:
         update_circuit_breaker_state,
         update_service_health,
         update_service_availability,
-        record_guardian_zero_request
+        record_guardian_zero_request,
+        record_coalesced_call
     )
     METRICS_ENABLED = True
 except ImportError:
@@ -45,6 +59,26 @@ except ImportError:
 GUARDIAN_ZERO_URL = os.getenv("GUARDIAN_ZERO_URL", "http://guardian-zero:9001")
 GUARDIAN_ZERO_ENABLED = os.getenv("GUARDIAN_ZERO_ENABLED", "true").lower() == "true"
 
+# Share one upstream call between concurrent identical guard requests
+REQUEST_COALESCING_ENABLED = os.getenv("GUARD_REQUEST_COALESCING_ENABLED", "true").lower() == "true"
+
+# Batch scans: items packed into one upstream call
+BATCH_MAX_ITEMS = int(os.getenv("GUARD_BATCH_MAX_ITEMS", "100"))
+
+# Shared connection pool. Per-guard load is bounded by the adaptive
+# concurrency limiter; the pool only protects against socket exhaustion.
+HTTP_MAX_CONNECTIONS = int(os.getenv("GUARD_HTTP_MAX_CONNECTIONS", "1000"))
+HTTP_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("GUARD_HTTP_MAX_KEEPALIVE_CONNECTIONS", "200"))
+
+# Circuit breakers: failure/slow-call rates over a rolling window
+CB_FAILURE_RATE_THRESHOLD = float(os.getenv("GUARD_CB_FAILURE_RATE_THRESHOLD", "0.5"))
+CB_SLOW_CALL_SECONDS = float(os.getenv("GUARD_CB_SLOW_CALL_SECONDS", "10"))
+CB_SLOW_CALL_RATE_THRESHOLD = float(os.getenv("GUARD_CB_SLOW_CALL_RATE_THRESHOLD", "0.8"))
+CB_WINDOW_SECONDS = float(os.getenv("GUARD_CB_WINDOW_SECONDS", "30"))
+CB_MIN_OPEN_SECONDS = float(os.getenv("GUARD_CB_MIN_OPEN_SECONDS", "5"))
+CB_HALF_OPEN_PROBES = int(os.getenv("GUARD_CB_HALF_OPEN_PROBES", "3"))
+CB_HALF_OPEN_SUCCESSES = int(os.getenv("GUARD_CB_HALF_OPEN_SUCCESSES", "2"))
+
 
 class GuardServiceType(Enum):
     """Enumeration of available guard service types."""
@@ -81,6 +115,8 @@ class GuardServiceConfig:
     auth_token: Optional[str] = None
     auth_header_name: str = "Authorization"
     auth_header_format: str = "Bearer {token}"  # Format string for auth header
+    batch_endpoint: Optional[str] = None  # Accepts {"items": [...]}, returns {"results": [...]}
+    replica_urls: List[str] = field(default_factory=list)  # Other instances, used as hedge targets
 
 
 @dataclass
@@ -105,6 +141,7 @@ class OrchestrationRequest:
     priority: int = 1
     timeout: Optional[int] = None
     fallback_enabled: bool = True
+    tenant_id: Optional[str] = None
 
 
 @dataclass
@@ -125,117 +162,99 @@ class OrchestrationResponse:
     processing_time: Optional[float] = None
     service_used: Optional[str] = None
     fallback_used: bool = False
+    cache_hit: bool = False
+
+
+@dataclass
+class FanOutResponse:
+    """Aggregated response from dispatching one request to several guards.
+    
+    SAFETY: Every selected guard appears in exactly one of responses or
+    cancelled_services
+    """
+    request_id: str
+    responses: Dict[str, OrchestrationResponse] = field(default_factory=dict)
+    blocked: bool = False
+    blocking_service: Optional[str] = None
+    cancelled_services: List[str] = field(default_factory=list)
+    timed_out_services: List[str] = field(default_factory=list)
+    timestamp: Optional[str] = None
+    processing_time: Optional[float] = None
+
 
+# Response fields that mean a guard rejected the content, with the value that
+# signals the rejection (callables receive the field value)
+BLOCKING_VERDICT_FIELDS = {
+    "blocked": lambda value: value is True,
+    "is_safe": lambda value: value is False,
+    "is_trusted": lambda value: value is False,
+    "bias_detected": lambda value: value is True,
+    "vulnerabilities_found": lambda value: isinstance(value, (int, float)) and value > 0,
+}
 
-class CircuitBreaker:
+
+def is_blocking_verdict(data: Optional[Dict[str, Any]]) -> bool:
+    """
+    Check whether a guard response represents a blocking verdict.
+    
+    Args:
+        data: Response data returned by a guard service
+        
+    Returns:
+        True if any known verdict field signals the content was rejected
+    """
+    if not isinstance(data, dict):
+        return False
+    
+    for field_name, is_blocking in BLOCKING_VERDICT_FIELDS.items():
+        if field_name in data and is_blocking(data[field_name]):
+            return True
+    return False
+
+
+def _is_answered(response: httpx.Response) -> bool:
+    """Whether an upstream response may win a hedged race (not 5xx or 429)."""
+    return response is not None and response.status_code < 500 and response.status_code != 429
+
+
+class CircuitBreaker(SlidingWindowCircuitBreaker):
     """
     Circuit breaker implementation for service protection.
     
+    Thin adapter over app.core.circuit_breaker.CircuitBreaker that keeps the
+    orchestrator's threshold/timeout interface. threshold is the minimum call
+    volume in the rolling window before the failure rate can open the circuit;
+    timeout caps how long the circuit stays open.
+    
     SAFETY: Prevents cascading failures, validates state transitions
     ASSUMES: Threshold and timeout are positive integers
     VERIFY: State transitions are valid, failure counts are accurate
     """
     
-    def __init__(self, threshold: int = 5, timeout: int = 60):
+    def __init__(self, threshold: int = 5, timeout: int = 60, **kwargs: Any):
         # SAFETY: Validate constructor parameters
         if not isinstance(threshold, int) or threshold <= 0:
             raise ValueError(f"Circuit breaker threshold must be positive integer, got: {threshold}")
         if not isinstance(timeout, int) or timeout <= 0:
             raise ValueError(f"Circuit breaker timeout must be positive integer, got: {timeout}")
         
-        self.threshold = threshold
-        self.timeout = timeout
-        self.failure_count = 0
-        self.last_failure_time: Optional[datetime] = None
-        self.state = "CLOSED"  # CLOSED, OPEN, HALF_OPEN
+        super().__init__(failure_threshold=threshold, recovery_timeout=timeout, **kwargs)
     
-    def can_execute(self) -> bool:
-        """
-        Check if the circuit breaker allows execution.
-        
-        SAFETY: Validates state and time-based transitions
-        VERIFY: Returns True if execution allowed, False otherwise
-        """
-        # SAFETY: Validate state
-        if self.state not in ["CLOSED", "OPEN", "HALF_OPEN"]:
-            logger.error(f"Invalid circuit breaker state: {self.state}, resetting to CLOSED")
-            self.state = "CLOSED"
-            self.failure_count = 0
-            return True
-        
-        if self.state == "CLOSED":
-            return True
-        elif self.state == "OPEN":
-            # SAFETY: Validate last_failure_time before comparison
-            if self.last_failure_time:
-                try:
-                    time_since_failure = datetime.now() - self.last_failure_time
-                    if time_since_failure > timedelta(seconds=self.timeout):
-                        self.state = "HALF_OPEN"
-                        return True
-                except (TypeError, OverflowError) as e:
-                    logger.error(f"Error calculating time since failure: {e}, resetting circuit breaker")
-                    self.last_failure_time = None
-                    self.state = "CLOSED"
-                    return True
-            return False
-        else:  # HALF_OPEN
-            return True
+    @property
+    def threshold(self) -> int:
+        return self.failure_threshold
     
-    def record_success(self):
-        """
-        Record a successful operation.
-        
-        SAFETY: Validates state before transitions
-        VERIFY: State updated correctly, failure count reset
-        """
-        old_state = self.state
-        if self.state == "HALF_OPEN":
-            # Success in half-open state closes the circuit
-            self.state = "CLOSED"
-            self.failure_count = 0
-            self.last_failure_time = None
-        elif self.state == "CLOSED":
-            # Reset failure count on success
-            self.failure_count = 0
-            # Keep last_failure_time for tracking, but reset count
-        # SAFETY: If OPEN state, stay OPEN (requires timeout to transition)
-        
-        # Update metrics if state changed
-        if old_state != self.state and METRICS_ENABLED:
-            try:
-                # Get service name from caller context (will be set by orchestrator)
-                # This is a limitation - we'd need to pass service_name to record_success
-                # For now, metrics are updated in orchestrator after calling record_success
-                pass
-            except Exception:
-                pass
+    @threshold.setter
+    def threshold(self, value: int) -> None:
+        self.failure_threshold = value
     
-    def record_failure(self):
-        """
-        Record a failed operation.
-        
-        SAFETY: Validates failure count and state transitions
-        VERIFY: Failure count incremented, state updated correctly
-        """
-        # SAFETY: Validate failure count
-        if not isinstance(self.failure_count, int):
-            logger.error("Invalid failure count type, resetting")
-            self.failure_count = 0
-        
-        self.failure_count += 1
-        self.last_failure_time = datetime.now()
-        
-        # SAFETY: Prevent integer overflow
-        if self.failure_count > 1000000:
-            logger.warning(f"Circuit breaker failure count very high: {self.failure_count}, resetting")
-            self.failure_count = self.threshold
-        
-        if self.state == "HALF_OPEN":
-            # Failure in half-open state reopens the circuit
-            self.state = "OPEN"
-        elif self.state == "CLOSED" and self.failure_count >= self.threshold:
-            self.state = "OPEN"
+    @property
+    def timeout(self) -> int:
+        return self.recovery_timeout
+    
+    @timeout.setter
+    def timeout(self, value: int) -> None:
+        self.recovery_timeout = value
 
 
 class GuardServiceOrchestrator:
@@ -256,7 +275,10 @@ class GuardServiceOrchestrator:
         self.auto_discovery_enabled = True
         self.discovery_interval = 30  # seconds
         self.discovery_task: Optional[asyncio.Task] = None
-        self.health_check_task: Optional[asyncio.Task] = None
+        self.health_prober: HealthProber = get_health_prober()
+        self._single_flight = SingleFlight()
+        self._hedge_cursor = 0
+        self._transformers = get_transformer_registry()
         
     async def initialize(self):
         """Initialize the orchestrator with service configurations."""
@@ -278,7 +300,10 @@ class GuardServiceOrchestrator:
             # Initialize HTTP client
             self.http_client = httpx.AsyncClient(
                 timeout=httpx.Timeout(30.0),
-                limits=httpx.Limits(max_keepalive_connections=20, max_connections=100)
+                limits=httpx.Limits(
+                    max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                    max_connections=HTTP_MAX_CONNECTIONS
+                )
             )
             
             # Load service configurations
@@ -287,10 +312,14 @@ class GuardServiceOrchestrator:
             # Initialize circuit breakers
             await self._initialize_circuit_breakers()
             
+            # Health probes run on the shared prober; routing reads its results
+            self._register_health_probes()
+            
             # Perform initial health checks (skip if disabled)
             disable_health_checks = os.getenv('DISABLE_HEALTH_CHECKS', 'false').lower() == 'true'
             if not disable_health_checks:
                 await self._perform_health_checks()
+                await self._verify_transformer_schemas()
             else:
                 logger.info("Initial health checks skipped via DISABLE_HEALTH_CHECKS environment variable")
             
@@ -298,13 +327,10 @@ class GuardServiceOrchestrator:
             if self.auto_discovery_enabled:
                 await self._start_auto_discovery()
             
-            # Start periodic health checks (track the task)
-            disable_health_checks = os.getenv('DISABLE_HEALTH_CHECKS', 'false').lower() == 'true'
-            if not disable_health_checks and (self.health_check_task is None or self.health_check_task.done()):
-                self.health_check_task = asyncio.create_task(self._start_health_check_loop())
-                # Add error handler for the task
-                self.health_check_task.add_done_callback(self._handle_health_check_task_error)
-            elif disable_health_checks:
+            # Start periodic health checks (one jittered probe task per service)
+            if not disable_health_checks:
+                self.health_prober.start()
+            else:
                 logger.info("Health checks disabled via DISABLE_HEALTH_CHECKS environment variable")
             
             self._initialized = True
@@ -316,26 +342,6 @@ class GuardServiceOrchestrator:
         finally:
             self._initializing = False
     
-    def _handle_health_check_task_error(self, task: asyncio.Task):
-        """
-        Handle errors in health check background task.
-        
-        SAFETY: Handles CancelledError separately (expected during shutdown)
-        VERIFY: Only restarts on actual errors, not cancellations
-        """
-        try:
-            task.result()  # This will raise if task had an exception
-        except asyncio.CancelledError:
-            # Cancellation is expected during shutdown - don't treat as error
-            logger.debug("Health check task cancelled (expected during shutdown)")
-            return
-        except Exception as e:
-            logger.error(f"Health check background task failed: {e}")
-            # Restart the health check task if it failed (and not shutting down)
-            if not self._initializing and self._initialized:
-                self.health_check_task = asyncio.create_task(self._start_health_check_loop())
-                self.health_check_task.add_done_callback(self._handle_health_check_task_error)
-    
     async def _load_service_configurations(self):
         """Load guard service configurations from central config."""
         # Import dynamic config manager
@@ -402,6 +408,13 @@ class GuardServiceOrchestrator:
         
         # Load configurations from central config and override defaults
         for service_name, config in default_configs.items():
+            # Batch-capable endpoint (optional, enables packing in batch scans)
+            config.batch_endpoint = os.getenv(f"{service_name.upper()}_BATCH_ENDPOINT") or None
+            # Additional instances of the guard (comma separated), used for hedged requests
+            config.replica_urls = [
+                url.strip() for url in os.getenv(f"{service_name.upper()}_REPLICA_URLS", "").split(",") if url.strip()
+            ]
+            
             # Try to get auth token from central config (single unified key)
             if config_manager:
                 try:
@@ -473,13 +486,33 @@ class GuardServiceOrchestrator:
             self.services[service_name] = config
             logger.info(f"Loaded configuration for {config.name} (auth: {'configured' if config.auth_token else 'none'})")
     
+    def _create_circuit_breaker(self, service_name: str) -> CircuitBreaker:
+        """
+        Create a guard's circuit breaker and register it for export.
+        
+        SAFETY: Registered under the service name so /health/circuit-breakers
+        shows every guard breaker
+        """
+        config = self.services.get(service_name)
+        breaker = CircuitBreaker(
+            threshold=config.circuit_breaker_threshold if config else 5,
+            timeout=config.circuit_breaker_timeout if config else 60,
+            name=service_name,
+            failure_rate_threshold=CB_FAILURE_RATE_THRESHOLD,
+            slow_call_duration=CB_SLOW_CALL_SECONDS,
+            slow_call_rate_threshold=CB_SLOW_CALL_RATE_THRESHOLD,
+            window_seconds=CB_WINDOW_SECONDS,
+            min_open_seconds=CB_MIN_OPEN_SECONDS,
+            half_open_max_calls=CB_HALF_OPEN_PROBES,
+            half_open_success_threshold=CB_HALF_OPEN_SUCCESSES
+        )
+        circuit_breaker_manager.register(service_name, breaker)
+        return breaker
+    
     async def _initialize_circuit_breakers(self):
         """Initialize circuit breakers for all services."""
-        for service_name, config in self.services.items():
-            breaker = CircuitBreaker(
-                threshold=config.circuit_breaker_threshold,
-                timeout=config.circuit_breaker_timeout
-            )
+        for service_name in self.services:
+            breaker = self._create_circuit_breaker(service_name)
             self.circuit_breakers[service_name] = breaker
             
             # Initialize metrics for circuit breaker
@@ -489,46 +522,51 @@ class GuardServiceOrchestrator:
                 except Exception as metrics_error:
                     logger.debug(f"Failed to initialize circuit breaker metrics: {metrics_error}")
     
-    async def _perform_health_checks(self):
-        """Perform initial health checks on all services."""
-        tasks = []
-        for service_name in self.services.keys():
-            tasks.append(self._check_service_health(service_name))
-        
-        await asyncio.gather(*tasks, return_exceptions=True)
-    
-    async def _start_health_check_loop(self):
+    async def _verify_transformer_schemas(self):
         """
-        Run periodic health checks in background.
+        Check transformer specs against each guard's OpenAPI document.
         
-        SAFETY: Exits gracefully on shutdown or cancellation
-        VERIFY: Loop terminates when orchestrator is shutdown
+        SAFETY: Best effort - guards without an OpenAPI document are skipped
+        and mismatches are logged, never fatal
         """
-        while self._initialized:  # Exit when not initialized (shutdown)
+        if os.getenv("GUARD_TRANSFORMER_SCHEMA_CHECK", "true").lower() != "true":
+            return
+        
+        async def check(service_name: str, config: GuardServiceConfig):
             try:
-                # Use shorter sleep intervals that can be cancelled more quickly
-                # Split 30 seconds into 6 x 5 second intervals for faster cancellation response
-                for _ in range(6):  # 6 x 5 seconds = 30 seconds total
-                    if not self._initialized:  # Check flag frequently
-                        break
-                    await asyncio.sleep(5)  # Shorter sleep allows faster cancellation
-                
-                # Double-check before performing health checks (may have shutdown during sleep)
-                if not self._initialized:
-                    break
-                await self._perform_health_checks()
-            except asyncio.CancelledError:
-                # Cancellation is expected during shutdown
-                logger.debug("Health check loop cancelled")
-                raise  # Re-raise to properly cancel the task
+                response = await self.http_client.get(
+                    f"{config.base_url.rstrip('/')}/openapi.json",
+                    timeout=httpx.Timeout(5.0)
+                )
+                if response.status_code != 200:
+                    return
+                for problem in self._transformers.check_openapi(service_name, response.json()):
+                    logger.warning(f"Transformer schema mismatch: {problem}")
             except Exception as e:
-                logger.error(f"Health check loop error: {e}")
-                # Continue loop on errors (don't exit)
-                if self._initialized:  # Only sleep if still initialized
-                    await asyncio.sleep(5)  # Brief delay before retrying
+                logger.debug(f"OpenAPI schema check skipped for {service_name}: {e}")
+        
+        await asyncio.gather(*[
+            check(service_name, config)
+            for service_name, config in self.services.items()
+            if config.enabled and self._transformers.get(service_name) is not None
+        ])
+    
+    def _register_health_probes(self):
+        """Register every configured service with the shared health prober."""
+        for service_name in self.services.keys():
+            self.health_prober.register(service_name, self._check_service_health)
+    
+    async def _perform_health_checks(self):
+        """Perform initial health checks on all services."""
+        await self.health_prober.refresh(list(self.services.keys()), max_age=0)
     
     async def _check_service_health(self, service_name: str) -> ServiceHealth:
-        """Check the health of a specific service with retry logic."""
+        """
+        Check the health of a specific service with retry logic.
+        
+        Called by the shared health prober on its schedule; readers use
+        health_status (or get_service_health) instead of calling this.
+        """
         config = self.services.get(service_name)
         if not config:
             return ServiceHealth(
@@ -538,11 +576,6 @@ class GuardServiceOrchestrator:
                 error_message="Service configuration not found"
             )
         
-        # Check if we have recent health data (within 30 seconds)
-        existing_health = self.health_status.get(service_name)
-        if existing_health and (datetime.now() - existing_health.last_check).total_seconds() < 30:
-            return existing_health
-        
         start_time = datetime.now()
         max_retries = 3
         retry_delay = 1.0
@@ -588,6 +621,10 @@ class GuardServiceOrchestrator:
                     except (ValueError, json.JSONDecodeError) as e:
                         logger.debug(f"Failed to parse JSON metadata for {service_name}: {e}")
                         metadata = {}
+                    
+                    # A new guard version invalidates its cached verdicts
+                    if isinstance(metadata, dict) and metadata.get("version"):
+                        get_guard_verdict_cache().observe_guard_version(service_name, str(metadata["version"]))
                 else:
                     status = ServiceStatus.UNHEALTHY
                     error_message = f"HTTP {response.status_code}"
@@ -603,6 +640,7 @@ class GuardServiceOrchestrator:
                 )
                 
                 self.health_status[service_name] = health
+                get_concurrency_controller().observe_health(service_name, status != ServiceStatus.UNHEALTHY)
                 
                 # Update Prometheus metrics
                 if METRICS_ENABLED:
@@ -630,22 +668,61 @@ class GuardServiceOrchestrator:
                         error_message=str(e)
                     )
                     self.health_status[service_name] = health
+                    get_concurrency_controller().observe_health(service_name, False)
                     return health
     
-    async def orchestrate_request(self, request: OrchestrationRequest) -> OrchestrationResponse:
+    async def orchestrate_request(
+        self,
+        request: OrchestrationRequest,
+        context_data: Optional[Dict[str, Any]] = None
+    ) -> OrchestrationResponse:
         """
         Orchestrate a request to the appropriate guard service.
         
         SAFETY: Validates all inputs, handles failures gracefully
         ASSUMES: Request is properly formatted, services are configured
-        VERIFY: Returns OrchestrationResponse with success or error
+        VERIFY: Returns OrchestrationResponse with success or error; the
+        request's stage timings are recorded whatever the outcome
         
         Args:
             request: The orchestration request
+            context_data: Pre-fetched ContextGuard snapshot shared by a
+                fan-out (optional, fetched per request when omitted)
             
         Returns:
             OrchestrationResponse with the result
         """
+        stage_timings = get_stage_timings()
+        token = stage_timings.start()
+        response: Optional[OrchestrationResponse] = None
+        try:
+            response = await self._orchestrate_request(request, context_data, current_stage_timer())
+            return response
+        finally:
+            service_type = getattr(request, "service_type", None)
+            stage_timings.finish(
+                token,
+                getattr(service_type, "value", "unknown"),
+                getattr(request, "request_id", None),
+                {
+                    "success": bool(response and response.success),
+                    "cache_hit": bool(response and response.cache_hit),
+                    "error_code": response.error_code if response else "UNHANDLED_EXCEPTION"
+                }
+            )
+    
+    async def _orchestrate_request(
+        self,
+        request: OrchestrationRequest,
+        context_data: Optional[Dict[str, Any]],
+        timer: StageTimer
+    ) -> OrchestrationResponse:
+        """
+        Validate, fingerprint, serve from cache or route one request.
+        
+        Sequential stages are lapped on timer: validation, transform,
+        cache_lookup, admission, route and post_processing.
+        """
         # OpenTelemetry tracing
         span = None
         try:
@@ -660,6 +737,12 @@ class GuardServiceOrchestrator:
             span.set_attribute("service.type", request.service_type.value)
             span.set_attribute("component", "orchestrator")
         
+        # Breaker that admitted the upstream call; only its outcome is recorded.
+        # Rejections before admission (circuit open, probe budget spent,
+        # service unavailable) must not count as failures, or a half-open
+        # breaker would re-trip on its own rejections
+        admitted_breaker: Optional[CircuitBreaker] = None
+        
         try:
             # SAFETY: Validate request input
             if not isinstance(request, OrchestrationRequest):
@@ -706,10 +789,68 @@ class GuardServiceOrchestrator:
             if not config.enabled:
                 raise ServiceUnavailableError(f"Service {service_name} is disabled")
             
+            # SAFETY: Validate payload structure
+            if not isinstance(request.payload, dict):
+                logger.warning(f"Invalid payload type for {service_name}: {type(request.payload)}")
+                # Use empty dict as fallback
+                request.payload = {}
+            timer.lap("validation")
+            
+            # Fingerprint the scan once, on the exact payload sent upstream
+            # (after ContextGuard enhancement): it keys both the verdict
+            # cache and coalescing of concurrent identical calls
+            verdict_cache = get_guard_verdict_cache()
+            await verdict_cache.refresh_tenants()
+            transformed_payload = self._enhance_payload(request, self._transform_payload(request), context_data)
+            fingerprint = verdict_cache.build_key(
+                service_name,
+                transformed_payload,
+                f"{config.base_url}{self._determine_endpoint(request)}"
+            )
+            cache_key = fingerprint if verdict_cache.is_enabled_for(service_name, request.tenant_id) else None
+            timer.lap("transform")
+            
+            # Serve identical scans from the verdict cache before any network call
+            if cache_key:
+                cached_data = await verdict_cache.get(service_name, cache_key)
+                timer.lap("cache_lookup")
+                if cached_data is not None:
+                    processing_time = (datetime.now() - start_time).total_seconds()
+                    
+                    if METRICS_ENABLED:
+                        try:
+                            record_orchestrator_request(service_name, "cache_hit", processing_time)
+                        except Exception as metrics_error:
+                            logger.debug(f"Failed to record orchestrator metrics: {metrics_error}")
+                    
+                    if span:
+                        add_span_attributes(span, {
+                            "processing.time": processing_time,
+                            "service.success": True,
+                            "cache.hit": True
+                        })
+                        set_span_status(span, True)
+                        span.end()
+                    
+                    return OrchestrationResponse(
+                        request_id=request.request_id,
+                        service_type=request.service_type,
+                        success=True,
+                        data=cached_data,
+                        timestamp=datetime.now().isoformat(),
+                        processing_time=processing_time,
+                        service_used=service_name,
+                        cache_hit=True
+                    )
+            
             # Check if service is available
             if not self._is_service_available(service_name):
                 raise ServiceUnavailableError(f"Service {service_name} is not available")
             
+            # SAFETY: Ensure HTTP client is available and valid
+            if not self.http_client:
+                raise ServiceUnavailableError("HTTP client not initialized")
+            
             # SAFETY: Check circuit breaker with validation
             circuit_breaker = self.circuit_breakers.get(service_name)
             if circuit_breaker:
@@ -719,16 +860,8 @@ class GuardServiceOrchestrator:
                     circuit_breaker = None
                 elif not circuit_breaker.can_execute():
                     raise ServiceUnavailableError(f"Circuit breaker is open for {service_name}")
-            
-            # SAFETY: Ensure HTTP client is available and valid
-            if not self.http_client:
-                raise ServiceUnavailableError("HTTP client not initialized")
-            
-            # SAFETY: Validate payload structure
-            if not isinstance(request.payload, dict):
-                logger.warning(f"Invalid payload type for {service_name}: {type(request.payload)}")
-                # Use empty dict as fallback
-                request.payload = {}
+                else:
+                    admitted_breaker = circuit_breaker
             
             # Route request to service (with tracing)
             service_span = None
@@ -743,7 +876,16 @@ class GuardServiceOrchestrator:
                         "service.url": config.base_url
                     })
                 
-                response_data = await self._route_request(request)
+                timer.lap("admission")
+                route_started = time.perf_counter()
+                response_data = await self._route_coalesced(
+                    request,
+                    fingerprint,
+                    context_data=context_data,
+                    transformed_payload=transformed_payload
+                )
+                route_duration = time.perf_counter() - route_started
+                timer.lap("route")
                 
                 if service_span:
                     set_span_status(service_span, True)
@@ -760,10 +902,13 @@ class GuardServiceOrchestrator:
                 logger.warning(f"Invalid response data type from {service_name}: {type(response_data)}")
                 response_data = {"raw_response": str(response_data)}
             
+            if cache_key:
+                verdict_cache.set(service_name, cache_key, response_data)
+            
             # Record success in circuit breaker
             if circuit_breaker:
                 try:
-                    circuit_breaker.record_success()
+                    circuit_breaker.record_success(route_duration)
                     # Update metrics
                     if METRICS_ENABLED:
                         update_circuit_breaker_state(service_name, circuit_breaker.state, circuit_breaker.failure_count)
@@ -795,14 +940,44 @@ class GuardServiceOrchestrator:
                 processing_time=processing_time,
                 service_used=service_name
             )
+            timer.lap("post_processing")
             
             if span:
                 span.end()
             return response
             
+        except GuardOverloadedError as e:
+            # Shed by the concurrency limiter: the guard is busy, not failing,
+            # so the circuit breaker is left alone (a half-open probe permit
+            # is handed back)
+            if admitted_breaker:
+                admitted_breaker.release_permission()
+            
+            processing_time = (datetime.now() - start_time).total_seconds()
+            
+            if METRICS_ENABLED:
+                try:
+                    record_orchestrator_request(service_name, "shed", processing_time)
+                except Exception as metrics_error:
+                    logger.debug(f"Failed to record orchestrator metrics: {metrics_error}")
+            
+            if span:
+                set_span_status(span, False, str(e))
+                span.end()
+            
+            return OrchestrationResponse(
+                request_id=request.request_id,
+                service_type=request.service_type,
+                success=False,
+                error=str(e),
+                error_code=e.error_code,
+                timestamp=datetime.now().isoformat(),
+                processing_time=processing_time,
+                service_used=service_name
+            )
         except (GuardServiceError, ServiceUnavailableError) as e:
-            # Record failure in circuit breaker
-            circuit_breaker = self.circuit_breakers.get(service_name)
+            # Record failure in circuit breaker (admitted calls only)
+            circuit_breaker = admitted_breaker
             if circuit_breaker:
                 circuit_breaker.record_failure()
                 # Update metrics
@@ -847,8 +1022,8 @@ class GuardServiceOrchestrator:
                 service_used=service_name
             )
         except Exception as e:
-            # Record failure in circuit breaker
-            circuit_breaker = self.circuit_breakers.get(service_name)
+            # Record failure in circuit breaker (admitted calls only)
+            circuit_breaker = admitted_breaker
             if circuit_breaker:
                 circuit_breaker.record_failure()
                 # Update metrics
@@ -983,16 +1158,548 @@ class GuardServiceOrchestrator:
             if hasattr(e, 'error_code') and e.error_code:
                 error_code = e.error_code
             
-            return OrchestrationResponse(
+            return OrchestrationResponse(
+                request_id=request.request_id,
+                service_type=request.service_type,
+                success=False,
+                error=f"Internal error: {str(e)}",
+                error_code=error_code,
+                timestamp=datetime.now().isoformat(),
+                processing_time=processing_time,
+                service_used=service_name
+            )
+    
+    async def orchestrate_fan_out(
+        self,
+        request: OrchestrationRequest,
+        service_types: List[GuardServiceType],
+        guard_timeout: Optional[float] = None,
+        stop_on_block: bool = False,
+        blocking_predicate: Optional[Callable[[Dict[str, Any]], bool]] = None
+    ) -> FanOutResponse:
+        """
+        Dispatch one request to several guard services concurrently.
+        
+        The request is validated and its ContextGuard snapshot fetched once,
+        then every selected guard is called at the same time, so end-to-end
+        latency is that of the slowest guard rather than the sum of all.
+        
+        SAFETY: Each guard runs under its own deadline; a slow guard never
+        delays the verdicts of the others
+        ASSUMES: request.service_type is ignored in favour of service_types
+        VERIFY: Every selected guard is either answered or listed as cancelled
+        
+        Args:
+            request: The orchestration request (payload shared by all guards)
+            service_types: Guards to dispatch to (duplicates are ignored)
+            guard_timeout: Per-guard deadline in seconds (defaults to the
+                request timeout, then the guard's configured timeout)
+            stop_on_block: Return as soon as one guard reports a blocking
+                verdict, cancelling the guards still in flight
+            blocking_predicate: Override for is_blocking_verdict
+            
+        Returns:
+            FanOutResponse with one OrchestrationResponse per completed guard
+        """
+        # SAFETY: Validate shared request input once for all guards
+        if not isinstance(request, OrchestrationRequest):
+            raise ValueError(f"Invalid request type: {type(request)}")
+        
+        if not request.request_id:
+            raise ValueError("Request ID is required")
+        
+        selected: List[GuardServiceType] = []
+        for service_type in service_types or []:
+            if not isinstance(service_type, GuardServiceType):
+                raise ValueError(f"Invalid service type: {service_type}")
+            if service_type not in selected:
+                selected.append(service_type)
+        
+        if not selected:
+            raise ValueError("At least one guard service type is required")
+        
+        if not isinstance(request.payload, dict):
+            logger.warning(f"Invalid payload type for fan-out: {type(request.payload)}")
+            request.payload = {}
+        
+        if not self._initialized:
+            await self.initialize()
+        
+        start_time = time.perf_counter()
+        predicate = blocking_predicate or is_blocking_verdict
+        
+        # Read ContextGuard memory once; each guard only merges its own view
+        context_data = None
+        try:
+            from app.core.contextguard_integration import get_guard_context_snapshot
+            context_data = get_guard_context_snapshot(
+                session_id=request.session_id,
+                user_id=request.user_id
+            )
+        except Exception as e:
+            logger.debug(f"ContextGuard snapshot skipped for fan-out: {e}")
+        
+        tasks: Dict[asyncio.Task, str] = {}
+        for service_type in selected:
+            guard_request = OrchestrationRequest(
+                request_id=f"{request.request_id}-{service_type.value}",
+                service_type=service_type,
+                payload=request.payload,
+                user_id=request.user_id,
+                session_id=request.session_id,
+                priority=request.priority,
+                timeout=request.timeout,
+                fallback_enabled=request.fallback_enabled,
+                tenant_id=request.tenant_id
+            )
+            deadline = self._resolve_guard_deadline(service_type.value, guard_timeout, request.timeout)
+            task = asyncio.create_task(
+                self._orchestrate_with_deadline(guard_request, deadline, context_data)
+            )
+            tasks[task] = service_type.value
+        
+        result = FanOutResponse(request_id=request.request_id)
+        pending = set(tasks)
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    service_name = tasks[task]
+                    response = task.result()
+                    result.responses[service_name] = response
+                    
+                    if response.error_code == "GUARD_DEADLINE_EXCEEDED":
+                        result.timed_out_services.append(service_name)
+                    elif response.success and not result.blocked and predicate(response.data or {}):
+                        result.blocked = True
+                        result.blocking_service = service_name
+                
+                if result.blocked and stop_on_block and pending:
+                    for task in pending:
+                        task.cancel()
+                    await asyncio.gather(*pending, return_exceptions=True)
+                    result.cancelled_services = [tasks[task] for task in pending]
+                    pending = set()
+        finally:
+            # SAFETY: Never leak guard calls if the caller itself is cancelled
+            for task in pending:
+                task.cancel()
+        
+        result.timestamp = datetime.now().isoformat()
+        result.processing_time = time.perf_counter() - start_time
+        
+        logger.debug(
+            f"Fan-out completed for {request.request_id}",
+            extra={
+                "request_id": request.request_id,
+                "services": [service_type.value for service_type in selected],
+                "blocked": result.blocked,
+                "blocking_service": result.blocking_service,
+                "cancelled_services": result.cancelled_services,
+                "timed_out_services": result.timed_out_services,
+                "processing_time": result.processing_time
+            }
+        )
+        
+        return result
+    
+    def _resolve_guard_deadline(
+        self,
+        service_name: str,
+        guard_timeout: Optional[float],
+        request_timeout: Optional[int]
+    ) -> float:
+        """Resolve the per-guard deadline for a fan-out, capped at 300s."""
+        MAX_TIMEOUT = 300  # 5 minutes (matches _route_request)
+        
+        if guard_timeout and guard_timeout > 0:
+            deadline = float(guard_timeout)
+        elif request_timeout and request_timeout > 0:
+            deadline = float(request_timeout)
+        else:
+            config = self.services.get(service_name)
+            deadline = float(config.timeout) if config and config.timeout > 0 else 30.0
+        
+        return min(deadline, MAX_TIMEOUT)
+    
+    async def _orchestrate_with_deadline(
+        self,
+        request: OrchestrationRequest,
+        deadline: float,
+        context_data: Optional[Dict[str, Any]] = None
+    ) -> OrchestrationResponse:
+        """Run orchestrate_request under a deadline, converting expiry to an error response."""
+        try:
+            return await asyncio.wait_for(
+                self.orchestrate_request(request, context_data=context_data),
+                timeout=deadline
+            )
+        except asyncio.TimeoutError:
+            service_name = request.service_type.value
+            logger.warning(f"Guard {service_name} exceeded fan-out deadline of {deadline}s")
+            return OrchestrationResponse(
+                request_id=request.request_id,
+                service_type=request.service_type,
+                success=False,
+                error=f"Guard {service_name} exceeded deadline of {deadline}s",
+                error_code="GUARD_DEADLINE_EXCEEDED",
+                timestamp=datetime.now().isoformat(),
+                processing_time=deadline,
+                service_used=service_name
+            )
+    
+    async def orchestrate_stream(
+        self,
+        request: OrchestrationRequest,
+        body: AsyncIterator[bytes],
+        max_bytes: int
+    ) -> GuardStream:
+        """
+        Open a streaming pass-through call for a large payload.
+        
+        The body must already be in the guard's native request schema; it is
+        forwarded chunk by chunk without being parsed or transformed. Returns
+        once the guard has answered with its status line and headers. The
+        caller relays GuardStream.frames() (data frames, then the verdict
+        envelope) and must call aclose() if it never consumes them.
+        
+        SAFETY: The concurrency slot and circuit breaker permit are released
+        on every failure path
+        ASSUMES: The guard accepts a chunked request body
+        
+        Raises:
+            ValueError: If the guard does not support streaming
+            ValidationError: If the body is too large or unsafe
+            ServiceUnavailableError: If the guard is unavailable or its circuit is open
+            GuardServiceError: If the upstream call fails
+        """
+        service_name = request.service_type.value
+        if service_name not in STREAMING_SERVICES:
+            raise ValueError(f"Streaming is not supported for {service_name}")
+        
+        if not self._initialized:
+            await self.initialize()
+        
+        config = self.services.get(service_name)
+        if not config or not self._is_service_available(service_name):
+            raise ServiceUnavailableError(f"Service {service_name} is not available")
+        if not self.http_client:
+            raise ServiceUnavailableError("HTTP client not initialized")
+        
+        circuit_breaker = self.circuit_breakers.get(service_name)
+        if circuit_breaker and not circuit_breaker.can_execute():
+            raise ServiceUnavailableError(f"Circuit breaker is open for {service_name}")
+        
+        started = time.perf_counter()
+        counters = {"bytes_in": 0, "bytes_out": 0}
+        exit_stack = contextlib.AsyncExitStack()
+        try:
+            await exit_stack.enter_async_context(
+                # Held for the whole relayed stream, so its duration is not a call latency
+                get_concurrency_controller().slot(service_name, request.priority, record_latency=False)
+            )
+            upstream_request = self.http_client.build_request(
+                "POST",
+                f"{config.base_url.rstrip('/')}{self._determine_endpoint(request)}",
+                content=guarded_body(body, max_bytes, counters),
+                headers=self._build_headers(request, config),
+                timeout=httpx.Timeout(self._resolve_timeout(request, config))
+            )
+            response = await self.http_client.send(upstream_request, stream=True)
+        except BaseException as e:
+            await exit_stack.aclose()
+            if circuit_breaker:
+                if isinstance(e, (httpx.HTTPError, GuardServiceError)):
+                    circuit_breaker.record_failure()
+                else:
+                    circuit_breaker.release_permission()
+            if isinstance(e, httpx.TimeoutException):
+                raise GuardServiceError(f"Request to {service_name} timed out") from e
+            if isinstance(e, httpx.HTTPError):
+                raise GuardServiceError(f"Request to {service_name} failed: {e}") from e
+            raise
+        
+        logger.info(
+            f"Streaming {counters['bytes_in']} bytes to {service_name}, upstream status {response.status_code}",
+            extra={"request_id": request.request_id, "service_name": service_name}
+        )
+        return GuardStream(request, service_name, response, exit_stack, circuit_breaker, counters, started)
+    
+    async def orchestrate_batch(
+        self,
+        requests: List[OrchestrationRequest],
+        max_batch_size: Optional[int] = None,
+        max_concurrent: Optional[int] = None
+    ) -> AsyncIterator[OrchestrationResponse]:
+        """
+        Process many independent scans, yielding responses as they complete.
+        
+        Items are grouped by guard. For guards with a configured
+        ``batch_endpoint`` (one result per item) verdict cache hits are
+        yielded first and the remaining items are packed into one upstream
+        call per chunk of max_batch_size. Items for other guards, including
+        HealthGuard whose /analyze returns one aggregate verdict for all
+        samples, go through orchestrate_request individually. Upstream
+        calls are admitted by each guard's adaptive concurrency limiter;
+        max_concurrent optionally caps this batch further.
+        
+        SAFETY: A failing chunk only fails its own items; an item that
+        cannot be transformed only fails itself
+        ASSUMES: Batch endpoints return one result per item, in order
+        VERIFY: Exactly one response is yielded per request
+        """
+        if not self._initialized:
+            await self.initialize()
+        
+        max_batch_size = max(1, max_batch_size or BATCH_MAX_ITEMS)
+        # Per-guard load is governed by the adaptive concurrency limiter; an
+        # explicit max_concurrent additionally caps this batch
+        semaphore = asyncio.Semaphore(max_concurrent) if max_concurrent else None
+        verdict_cache = get_guard_verdict_cache()
+        await verdict_cache.refresh_tenants()
+        
+        async def run_single(request: OrchestrationRequest) -> List[OrchestrationResponse]:
+            if semaphore is None:
+                return [await self.orchestrate_request(request)]
+            async with semaphore:
+                return [await self.orchestrate_request(request)]
+        
+        # service_name -> [(request, transformed payload, cache key)]
+        groups: Dict[str, List[Tuple[OrchestrationRequest, Dict[str, Any], Optional[str]]]] = {}
+        tasks: List[asyncio.Task] = []
+        
+        try:
+            for request in requests:
+                service_name = request.service_type.value
+                if not self._supports_batch(service_name):
+                    tasks.append(asyncio.create_task(run_single(request)))
+                    continue
+            
+                if not isinstance(request.payload, dict):
+                    request.payload = {}
+                cache_key = cached_data = None
+                try:
+                    transformed_payload = self._enhance_payload(request, self._transform_payload(request))
+                    if verdict_cache.is_enabled_for(service_name, request.tenant_id):
+                        config = self.services[service_name]
+                        cache_key = verdict_cache.build_key(
+                            service_name,
+                            transformed_payload,
+                            f"{config.base_url}{self._determine_endpoint(request)}"
+                        )
+                        cached_data = await verdict_cache.get(service_name, cache_key)
+                except Exception as e:
+                    # A malformed item fails alone, as it would in orchestrate_request
+                    logger.warning(f"Batch item {request.request_id} for {service_name} rejected: {e}")
+                    if METRICS_ENABLED:
+                        try:
+                            record_orchestrator_request(service_name, "error", 0.0)
+                        except Exception:
+                            pass
+                    yield OrchestrationResponse(
+                        request_id=request.request_id,
+                        service_type=request.service_type,
+                        success=False,
+                        error=f"Internal error: {str(e)}",
+                        error_code=getattr(e, "error_code", None) or "INTERNAL_ERROR",
+                        timestamp=datetime.now().isoformat(),
+                        processing_time=0.0,
+                        service_used=service_name
+                    )
+                    continue
+                
+                if cached_data is not None:
+                    yield OrchestrationResponse(
+                        request_id=request.request_id,
+                        service_type=request.service_type,
+                        success=True,
+                        data=cached_data,
+                        timestamp=datetime.now().isoformat(),
+                        processing_time=0.0,
+                        service_used=service_name,
+                        cache_hit=True
+                    )
+                    continue
+            
+                groups.setdefault(service_name, []).append((request, transformed_payload, cache_key))
+        
+            for service_name, entries in groups.items():
+                for offset in range(0, len(entries), max_batch_size):
+                    tasks.append(asyncio.create_task(self._orchestrate_batch_chunk(
+                        service_name,
+                        entries[offset:offset + max_batch_size],
+                        semaphore
+                    )))
+        
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    for response in task.result():
+                        yield response
+        finally:
+            # Consumer went away (e.g. client disconnected): stop upstream work
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+    
+    def _supports_batch(self, service_name: str) -> bool:
+        """
+        Check whether a guard returns per-item verdicts for several items in one call.
+        
+        Only configured batch endpoints qualify: an aggregate verdict (such
+        as HealthGuard's /analyze over several samples) cannot be attributed
+        to, or cached for, the individual items.
+        """
+        config = self.services.get(service_name)
+        if not config or not config.enabled:
+            return False
+        return bool(config.batch_endpoint)
+    
+    async def _orchestrate_batch_chunk(
+        self,
+        service_name: str,
+        entries: List[Tuple[OrchestrationRequest, Dict[str, Any], Optional[str]]],
+        semaphore: Optional[asyncio.Semaphore]
+    ) -> List[OrchestrationResponse]:
+        """
+        Send one packed upstream call for a chunk of batch items.
+        
+        SAFETY: Never raises - failures become per-item error responses
+        """
+        start_time = datetime.now()
+        first_request = entries[0][0]
+        payloads = [payload for _, payload, _ in entries]
+        circuit_breaker = self.circuit_breakers.get(service_name)
+        admitted = False
+        
+        try:
+            if not self._is_service_available(service_name):
+                raise ServiceUnavailableError(f"Service {service_name} is not available")
+            if circuit_breaker and not circuit_breaker.can_execute():
+                raise ServiceUnavailableError(f"Circuit breaker is open for {service_name}")
+            admitted = True
+            
+            packed_payload = {"items": payloads}
+            endpoint = self.services[service_name].batch_endpoint
+            
+            carrier = OrchestrationRequest(
+                request_id=f"{first_request.request_id}-batch",
+                service_type=first_request.service_type,
+                payload={},
+                user_id=first_request.user_id,
+                timeout=first_request.timeout,
+                tenant_id=first_request.tenant_id
+            )
+            async with contextlib.AsyncExitStack() as stack:
+                if semaphore is not None:
+                    await stack.enter_async_context(semaphore)
+                await stack.enter_async_context(
+                    # One packed call for many items: its latency is not a single call's
+                    get_concurrency_controller().slot(
+                        service_name, first_request.priority, record_latency=False
+                    )
+                )
+                response_data = await self._route_request(
+                    carrier,
+                    transformed_payload=packed_payload,
+                    endpoint=endpoint
+                )
+            results = self._split_batch_results(service_name, response_data, len(entries))
+        except Exception as e:
+            # Rejections before admission leave the breaker alone
+            if circuit_breaker and admitted:
+                if isinstance(e, GuardOverloadedError):
+                    circuit_breaker.release_permission()
+                else:
+                    circuit_breaker.record_failure()
+            processing_time = (datetime.now() - start_time).total_seconds()
+            if METRICS_ENABLED:
+                try:
+                    record_orchestrator_request(service_name, "error", processing_time)
+                except Exception:
+                    pass
+            
+            logger.warning(f"Batch call to {service_name} failed for {len(entries)} items: {e}")
+            error_code = getattr(e, "error_code", None) or type(e).__name__.upper()
+            return [
+                OrchestrationResponse(
+                    request_id=request.request_id,
+                    service_type=request.service_type,
+                    success=False,
+                    error=str(e),
+                    error_code=error_code,
+                    timestamp=datetime.now().isoformat(),
+                    processing_time=processing_time,
+                    service_used=service_name
+                )
+                for request, _, _ in entries
+            ]
+        
+        if circuit_breaker:
+            # Packed calls are expected to be slow, so no duration is passed
+            circuit_breaker.record_success()
+        processing_time = (datetime.now() - start_time).total_seconds()
+        if METRICS_ENABLED:
+            try:
+                record_orchestrator_request(service_name, "success", processing_time)
+            except Exception as metrics_error:
+                logger.debug(f"Failed to record orchestrator metrics: {metrics_error}")
+        
+        verdict_cache = get_guard_verdict_cache()
+        responses = []
+        for (request, _, cache_key), data in zip(entries, results):
+            if "error" in data and "status_code" in data:
+                # Item rejected by the guard inside an otherwise successful batch
+                responses.append(OrchestrationResponse(
+                    request_id=request.request_id,
+                    service_type=request.service_type,
+                    success=False,
+                    error=str(data["error"]),
+                    error_code="GUARD_BATCH_ITEM_ERROR",
+                    timestamp=datetime.now().isoformat(),
+                    processing_time=processing_time,
+                    service_used=service_name
+                ))
+                continue
+            if cache_key:
+                verdict_cache.set(service_name, cache_key, data)
+            responses.append(OrchestrationResponse(
                 request_id=request.request_id,
                 service_type=request.service_type,
-                success=False,
-                error=f"Internal error: {str(e)}",
-                error_code=error_code,
+                success=True,
+                data=data,
                 timestamp=datetime.now().isoformat(),
                 processing_time=processing_time,
                 service_used=service_name
-            )
+            ))
+        return responses
+    
+    def _split_batch_results(
+        self,
+        service_name: str,
+        response_data: Dict[str, Any],
+        item_count: int
+    ) -> List[Dict[str, Any]]:
+        """
+        Split a packed batch response into one verdict per item.
+        
+        Batch endpoints return {"results": [...]} in item order; an item the
+        guard rejected is reported as {"error": ..., "status_code": ...}.
+        Anything else (including an aggregate verdict) fails the chunk rather
+        than being copied to every item.
+        """
+        if not isinstance(response_data, dict) or "raw_response" in response_data:
+            raise GuardServiceError(f"Invalid batch response from {service_name}")
+        
+        results = response_data.get("results")
+        if isinstance(results, list) and len(results) == item_count:
+            return [result if isinstance(result, dict) else {"result": result} for result in results]
+        
+        raise GuardServiceError(
+            f"Batch response from {service_name} has "
+            f"{len(results) if isinstance(results, list) else 0} results for {item_count} items"
+        )
     
     def _is_service_available(self, service_name: str) -> bool:
         """
@@ -1037,7 +1744,62 @@ class GuardServiceOrchestrator:
         # Also allow requests even if health check failed recently (service might be recovering)
         return health.status in [ServiceStatus.HEALTHY, ServiceStatus.DEGRADED]
     
-    async def _route_request(self, request: OrchestrationRequest) -> Dict[str, Any]:
+    async def _route_coalesced(
+        self,
+        request: OrchestrationRequest,
+        fingerprint: str,
+        context_data: Optional[Dict[str, Any]] = None,
+        transformed_payload: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Route a request, sharing the upstream call with identical in-flight requests.
+
+        SAFETY: Coalescing is scoped per caller identity (tenant, user and
+        session, all of which reach the guard); requests with no tenant or
+        user identity are never coalesced
+        ASSUMES: fingerprint identifies guard, endpoint and normalized payload
+        VERIFY: Each waiter gets its own copy of the shared response
+        """
+        service_name = request.service_type.value
+        
+        async def route() -> Dict[str, Any]:
+            # Only the call that actually goes upstream takes a concurrency slot
+            queued = time.perf_counter_ns()
+            async with get_concurrency_controller().slot(service_name, request.priority):
+                timer = current_stage_timer()
+                if timer:
+                    timer.add("queue_wait", time.perf_counter_ns() - queued)
+                return await self._route_request(
+                    request,
+                    context_data=context_data,
+                    transformed_payload=transformed_payload
+                )
+        
+        if not REQUEST_COALESCING_ENABLED or not (request.tenant_id or request.user_id):
+            return await route()
+        
+        identity = json.dumps([request.tenant_id, request.user_id, request.session_id])
+        flight_key = f"{identity}:{service_name}:{fingerprint}"
+        response_data, shared = await self._single_flight.do(flight_key, route)
+        
+        if shared:
+            logger.debug(f"Coalesced {request.request_id} onto in-flight {service_name} call")
+            if METRICS_ENABLED:
+                try:
+                    record_coalesced_call(service_name)
+                except Exception as metrics_error:
+                    logger.debug(f"Failed to record coalescing metrics: {metrics_error}")
+        
+        # Callers post-process responses in place; never share one dict
+        return copy.deepcopy(response_data)
+    
+    async def _route_request(
+        self,
+        request: OrchestrationRequest,
+        context_data: Optional[Dict[str, Any]] = None,
+        transformed_payload: Optional[Dict[str, Any]] = None,
+        endpoint: Optional[str] = None
+    ) -> Dict[str, Any]:
         """
         Route a request to the appropriate service.
         
@@ -1073,8 +1835,9 @@ class GuardServiceOrchestrator:
         if not isinstance(config.base_url, str):
             raise ConfigurationError(f"Invalid base URL type for {service_name}: {type(config.base_url)}")
         
-        # Determine endpoint based on service type and payload
-        endpoint = self._determine_endpoint(request)
+        # Determine endpoint based on service type and payload (batch calls
+        # pass the guard's batch endpoint explicitly)
+        endpoint = endpoint or self._determine_endpoint(request)
         
         # SAFETY: Validate endpoint
         if not isinstance(endpoint, str):
@@ -1096,78 +1859,17 @@ class GuardServiceOrchestrator:
         except Exception as url_error:
             raise ConfigurationError(f"Failed to construct URL for {service_name}: {url_error}")
 
-        # Transform payload to match service-specific schema
-        transformed_payload = self._transform_payload(request)
-        
-        # Enhance payload with context awareness (invisible to user)
-        # Zero-failure: If ContextGuard unavailable, uses original payload
-        try:
-            from app.core.contextguard_integration import enhance_guard_with_context
-            transformed_payload = enhance_guard_with_context(
-                guard_name=service_name,
-                payload=transformed_payload,
-                session_id=request.session_id,
-                user_id=request.user_id
-            )
-        except Exception as e:
-            # Graceful degradation - continue with original payload if enhancement fails
-            logger.debug(f"ContextGuard enhancement skipped for {service_name}: {e}")
+        # Transform payload to match service-specific schema and enhance it
+        # with context (unless the caller already did so for the verdict
+        # cache key)
+        if transformed_payload is None:
+            transformed_payload = self._enhance_payload(request, self._transform_payload(request), context_data)
 
         # Prepare request
-        headers = {
-            "Content-Type": "application/json",
-            "X-Request-ID": request.request_id,
-            # SAFETY: Ensure X-Gateway-Request header is lowercase "true" for TrustGuard compatibility
-            # TrustGuard checks: gateway_request = request.headers.get("X-Gateway-Request", "").lower() == "true"
-            "X-Gateway-Request": "true"  # Indicate this is a gateway request (used by TrustGuard for service-to-service auth)
-        }
-
-        # Add internal access token for internal service calls
-        # Check if this is an internal service by examining the hostname
-        if self._is_internal_service(config.base_url):
-            headers["X-Internal-Token"] = settings.INTERNAL_ACCESS_TOKEN
-
-        if request.user_id:
-            headers["X-User-ID"] = request.user_id
-
-        if request.session_id:
-            headers["X-Session-ID"] = request.session_id
-
-        # Add authentication header if configured (for services that still require it)
-        # Note: TrustGuard handles service-to-service auth via X-Gateway-Request header
-        # but we still send auth tokens if configured for backward compatibility
-        if config.auth_token:
-            try:
-                # SAFETY: Validate auth token format
-                if not isinstance(config.auth_token, str):
-                    logger.warning(f"Invalid auth token type for {service_name}: {type(config.auth_token)}")
-                else:
-                    # SAFETY: Validate auth header format
-                    try:
-                        auth_header_value = config.auth_header_format.format(token=config.auth_token)
-                        headers[config.auth_header_name] = auth_header_value
-                        # Also add X-API-Key header for services that check it (backward compatibility)
-                        headers["X-API-Key"] = config.auth_token
-                    except KeyError as format_error:
-                        logger.warning(f"Failed to format auth header for {service_name}: {format_error}")
-                        # Fallback: use token directly
-                        headers[config.auth_header_name] = config.auth_token
-                        headers["X-API-Key"] = config.auth_token
-            except Exception as auth_error:
-                logger.warning(f"Failed to add auth headers for {service_name}: {auth_error}")
+        headers = self._build_headers(request, config)
 
         # SAFETY: Validate and set timeout
-        timeout_seconds = request.timeout if request.timeout and request.timeout > 0 else config.timeout
-        if timeout_seconds <= 0:
-            logger.warning(f"Invalid timeout {timeout_seconds}s for {service_name}, using default 30s")
-            timeout_seconds = 30
-        
-        # SAFETY: Limit maximum timeout to prevent resource exhaustion
-        MAX_TIMEOUT = 300  # 5 minutes
-        if timeout_seconds > MAX_TIMEOUT:
-            logger.warning(f"Timeout {timeout_seconds}s exceeds maximum {MAX_TIMEOUT}s for {service_name}, capping")
-            timeout_seconds = MAX_TIMEOUT
-        
+        timeout_seconds = self._resolve_timeout(request, config)
         timeout = httpx.Timeout(timeout_seconds)
 
         try:
@@ -1184,12 +1886,29 @@ class GuardServiceOrchestrator:
                 }
             )
             
-            response = await self.http_client.post(
-                url,
-                json=transformed_payload,
-                headers=headers,
-                timeout=timeout
-            )
+            def post(target_url: str, extensions: Optional[Dict[str, Any]] = None):
+                return lambda: self.http_client.post(
+                    target_url,
+                    json=transformed_payload,
+                    headers=headers,
+                    timeout=timeout,
+                    extensions=extensions
+                )
+            
+            # Only the primary attempt is traced into connect/ttfb/body_read
+            timer = current_stage_timer()
+            trace = {"trace": timer.httpx_trace} if timer else None
+            
+            # Opt-in hedging: a call outliving the guard's p95 is duplicated to
+            # another replica and the first answer wins
+            hedge_url = self._hedge_target(config, endpoint)
+            with timed_stage("upstream"):
+                response = await get_request_hedger().run(
+                    service_name,
+                    post(url, trace),
+                    post(hedge_url) if hedge_url else None,
+                    is_success=_is_answered
+                )
 
             # SAFETY: Validate response object
             if not response:
@@ -1202,7 +1921,8 @@ class GuardServiceOrchestrator:
                         logger.warning(f"Empty response body from {service_name}")
                         return {"status": "success", "message": "Empty response"}
                     
-                    response_data = response.json()
+                    with timed_stage("json_decode"):
+                        response_data = response.json()
                     
                     # SAFETY: Validate response is dict
                     if not isinstance(response_data, dict):
@@ -1284,7 +2004,8 @@ class GuardServiceOrchestrator:
                     )
 
                 raise GuardServiceError(
-                    f"Service returned status {response.status_code}: {error_message}"
+                    f"Service returned status {response.status_code}: {error_message}",
+                    details={"service": service_name, "status_code": response.status_code}
                 )
         except httpx.TimeoutException:
             raise GuardServiceError(f"Request to {service_name} timed out after {timeout_seconds}s")
@@ -1296,6 +2017,90 @@ class GuardServiceOrchestrator:
             logger.error(f"Unexpected error routing request to {service_name}: {e}", exc_info=True)
             raise GuardServiceError(f"Request to {service_name} failed: {str(e)}")
     
+    def _build_headers(self, request: OrchestrationRequest, config: GuardServiceConfig) -> Dict[str, str]:
+        """
+        Build upstream headers (request metadata and guard auth).
+        
+        SAFETY: Auth header formatting failures fall back to the raw token
+        """
+        service_name = request.service_type.value
+        headers = {
+            "Content-Type": "application/json",
+            "X-Request-ID": request.request_id,
+            # SAFETY: Ensure X-Gateway-Request header is lowercase "true" for TrustGuard compatibility
+            # TrustGuard checks: gateway_request = request.headers.get("X-Gateway-Request", "").lower() == "true"
+            "X-Gateway-Request": "true"  # Indicate this is a gateway request (used by TrustGuard for service-to-service auth)
+        }
+
+        # Add internal access token for internal service calls
+        # Check if this is an internal service by examining the hostname
+        if self._is_internal_service(config.base_url):
+            headers["X-Internal-Token"] = settings.INTERNAL_ACCESS_TOKEN
+
+        if request.user_id:
+            headers["X-User-ID"] = request.user_id
+
+        if request.session_id:
+            headers["X-Session-ID"] = request.session_id
+
+        # Add authentication header if configured (for services that still require it)
+        # Note: TrustGuard handles service-to-service auth via X-Gateway-Request header
+        # but we still send auth tokens if configured for backward compatibility
+        if config.auth_token:
+            try:
+                # SAFETY: Validate auth token format
+                if not isinstance(config.auth_token, str):
+                    logger.warning(f"Invalid auth token type for {service_name}: {type(config.auth_token)}")
+                else:
+                    # SAFETY: Validate auth header format
+                    try:
+                        auth_header_value = config.auth_header_format.format(token=config.auth_token)
+                        headers[config.auth_header_name] = auth_header_value
+                        # Also add X-API-Key header for services that check it (backward compatibility)
+                        headers["X-API-Key"] = config.auth_token
+                    except KeyError as format_error:
+                        logger.warning(f"Failed to format auth header for {service_name}: {format_error}")
+                        # Fallback: use token directly
+                        headers[config.auth_header_name] = config.auth_token
+                        headers["X-API-Key"] = config.auth_token
+            except Exception as auth_error:
+                logger.warning(f"Failed to add auth headers for {service_name}: {auth_error}")
+        
+        return headers
+    
+    def _resolve_timeout(self, request: OrchestrationRequest, config: GuardServiceConfig) -> float:
+        """
+        Resolve the upstream timeout for a request.
+        
+        SAFETY: Falls back to 30s for invalid values and caps at 5 minutes
+        """
+        service_name = request.service_type.value
+        timeout_seconds = request.timeout if request.timeout and request.timeout > 0 else config.timeout
+        if timeout_seconds <= 0:
+            logger.warning(f"Invalid timeout {timeout_seconds}s for {service_name}, using default 30s")
+            timeout_seconds = 30
+        
+        # SAFETY: Limit maximum timeout to prevent resource exhaustion
+        MAX_TIMEOUT = 300  # 5 minutes
+        if timeout_seconds > MAX_TIMEOUT:
+            logger.warning(f"Timeout {timeout_seconds}s exceeds maximum {MAX_TIMEOUT}s for {service_name}, capping")
+            timeout_seconds = MAX_TIMEOUT
+        
+        return timeout_seconds
+    
+    def _hedge_target(self, config: GuardServiceConfig, endpoint: str) -> Optional[str]:
+        """
+        Pick another instance of the guard for a hedged request.
+        
+        Replicas are rotated so hedges spread across instances.
+        """
+        primary = config.base_url.rstrip('/')
+        replicas = [url.rstrip('/') for url in config.replica_urls if url.rstrip('/') != primary]
+        if not replicas:
+            return None
+        self._hedge_cursor = (self._hedge_cursor + 1) % len(replicas)
+        return f"{replicas[self._hedge_cursor]}{endpoint}"
+    
     async def _handle_integrated_bias_detection(self, request: OrchestrationRequest) -> Dict[str, Any]:
         """Handle bias detection using the integrated service."""
         try:
@@ -1420,26 +2225,38 @@ class GuardServiceOrchestrator:
         if not isinstance(service_type, GuardServiceType):
             raise ValueError(f"Invalid service type: {service_type}")
 
-        # Default endpoints for each service type
-        # These must match the actual endpoints exposed by each guard service
-        endpoints = {
-            GuardServiceType.TOKEN_GUARD: "/scan",
-            GuardServiceType.TRUST_GUARD: "/validate",  # TrustGuard exposes /validate endpoint
-            GuardServiceType.CONTEXT_GUARD: "/analyze",    # ContextGuard exposes /analyze for context drift
-            GuardServiceType.BIAS_GUARD: "/process",       # BiasGuard exposes /process endpoint (also has /mitigate, /report)
-            GuardServiceType.HEALTH_GUARD: "/analyze",     # HealthGuard uses /analyze endpoint
-            GuardServiceType.SECURITY_GUARD: "/scan",  # SecurityGuard exposes /scan endpoint
-        }
+        # Endpoints come from the declarative transformer specs (format is
+        # validated when the specs are compiled) and must match the actual
+        # endpoints exposed by each guard service
+        return self._transformers.endpoint(service_type.value) or "/api/v1/process"
 
-        endpoint = endpoints.get(service_type, "/api/v1/process")
-        
-        # SAFETY: Validate endpoint format
-        if not isinstance(endpoint, str) or not endpoint.startswith('/'):
-            logger.warning(f"Invalid endpoint format for {service_type}: {endpoint}, using default")
-            endpoint = "/api/v1/process"
+    def _enhance_payload(
+        self,
+        request: OrchestrationRequest,
+        payload: Dict[str, Any],
+        context_data: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Enhance a transformed payload with context awareness (invisible to user).
         
-        return endpoint
-
+        Zero-failure: If ContextGuard is unavailable, returns the payload unchanged.
+        """
+        service_name = request.service_type.value
+        with timed_stage("context_enhancement"):
+            try:
+                from app.core.contextguard_integration import enhance_guard_with_context
+                return enhance_guard_with_context(
+                    guard_name=service_name,
+                    payload=payload,
+                    session_id=request.session_id,
+                    user_id=request.user_id,
+                    context_data=context_data
+                )
+            except Exception as e:
+                # Graceful degradation - continue with original payload if enhancement fails
+                logger.debug(f"ContextGuard enhancement skipped for {service_name}: {e}")
+                return payload
+    
     def _transform_payload(self, request: OrchestrationRequest) -> Dict[str, Any]:
         """
         Transform the generic payload to match service-specific schema.
@@ -1448,11 +2265,12 @@ class GuardServiceOrchestrator:
         ASSUMES: Request has valid service_type and payload
         VERIFY: Returns valid dict matching service schema
         
-        Each service expects different fields:
+        Each service expects different fields; the mappings are declared in
+        app.core.guard_transformers.GUARD_TRANSFORMER_SPECS:
         - TokenGuard (/scan): content, confidence
-        - TrustGuard (/validate): input_text, output_text, context (optional)
+        - TrustGuard (/validate): validation_type, content, context (optional)
         - ContextGuard (/analyze): current_code, previous_code, context (optional)
-        - BiasGuard (/process): text, context (optional), detailed_analysis (optional)
+        - BiasGuard (/process): operation, text, context (optional), detailed_analysis (optional)
         - HealthGuard (/analyze): samples array with DataSample objects
         - SecurityGuard (/scan): content, context (optional), strict_mode (optional)
         """
@@ -1465,220 +2283,20 @@ class GuardServiceOrchestrator:
         if not isinstance(service_type, GuardServiceType):
             raise ValueError(f"Invalid service type: {service_type}")
         
-        # Ensure payload is a dict and create a safe copy
-        if not isinstance(request.payload, dict):
-            logger.warning(f"Invalid payload type: {type(request.payload)}, using empty dict")
-            payload = {}
-        else:
-            # SAFETY: Create deep copy to avoid mutating original
-            try:
-                payload = request.payload.copy()
-            except (AttributeError, TypeError) as e:
-                logger.warning(f"Failed to copy payload: {e}, using empty dict")
-                payload = {}
-        
         # SAFETY: Ensure payload is always a dict
+        payload = request.payload
         if not isinstance(payload, dict):
-            payload = {}
-
-        # Add request metadata to payload early (before service-specific transformations)
-        # This ensures all guards receive consistent metadata
-        if request.user_id and 'user_id' not in payload:
-            payload['user_id'] = request.user_id
-        if request.session_id and 'session_id' not in payload:
-            payload['session_id'] = request.session_id
-        if request.request_id and 'request_id' not in payload:
-            payload['request_id'] = request.request_id
-
-        # Service-specific transformations
-        if service_type == GuardServiceType.TOKEN_GUARD:
-            # TokenGuard /scan expects: content, confidence
-            return {
-                "content": payload.get("content", payload.get("text", "")),
-                "confidence": payload.get("confidence", 0.7),
-                "logprobs_stream": payload.get("logprobs_stream"),
-                "user_id": payload.get("user_id", request.user_id),
-                "session_id": payload.get("session_id", request.session_id),
-                "request_id": payload.get("request_id", request.request_id)
-            }
-
-        elif service_type == GuardServiceType.TRUST_GUARD:
-            # TrustGuard /validate expects: validation_type (required), content (required), context (optional)
-            # Fix: Use validation_type and content fields (not input_text/output_text)
-            # Fix: Remove metadata fields (user_id, session_id, request_id) - services reject them with 422
-            # Fix: Keep context as dict (not JSON string) - matches SecurityGuard pattern
-            
-            # Extract content from various possible locations
-            content = payload.get("content", payload.get("text", payload.get("input_text", "")))
-            
-            # Get validation_type (required field)
-            validation_type = payload.get("validation_type", "general")  # Default to "general"
-            
-            result = {
-                "validation_type": validation_type,
-                "content": content
-            }
-            
-            # Add optional context if provided (keep as dict, not JSON string - matches SecurityGuard)
-            if "context" in payload:
-                context_value = payload.get("context")
-                # Keep context as dict (SecurityGuard accepts dict context, TrustGuard should too)
-                if isinstance(context_value, dict):
-                    result["context"] = context_value
-                elif isinstance(context_value, str):
-                    # If it's already a string, keep it as string
-                    result["context"] = context_value
-                # If context is None or other type, skip it
-            
-            # Add optional validation_level if provided
-            if "validation_level" in payload:
-                result["validation_level"] = payload.get("validation_level")
-            
-            # NOTE: Removed metadata fields (user_id, session_id, request_id)
-            # TrustGuard service rejects these fields with 422 errors
-            # TokenGuard/SecurityGuard accept them, but TrustGuard/BiasGuard don't
-            
-            return result
-
-        elif service_type == GuardServiceType.CONTEXT_GUARD:
-            # ContextGuard /analyze expects: current_code, previous_code (for drift detection)
-            # Transform text/content to ContextDriftRequest format
-            # SAFETY: Check for current_code first (most common), then fall back to text/content
-            current_code = payload.get("current_code", payload.get("text", payload.get("content", "")))
-            
-            # Use previous_code if provided, otherwise use empty string
-            previous_code = payload.get("previous_code", payload.get("previous_content", ""))
-            
-            result = {
-                "current_code": current_code,
-                "previous_code": previous_code
-            }
-            
-            # Add context if provided (ContextDriftRequest includes optional context field)
-            if "context" in payload:
-                result["context"] = payload.get("context")
-            
-            # Preserve metadata
-            if payload.get("user_id"):
-                result["user_id"] = payload["user_id"]
-            if payload.get("session_id"):
-                result["session_id"] = payload["session_id"]
-            if payload.get("request_id"):
-                result["request_id"] = payload["request_id"]
-            
-            return result
-
-        elif service_type == GuardServiceType.SECURITY_GUARD:
-            # SecurityGuard /scan expects: content, context (optional), strict_mode (optional)
-            content = payload.get("text", payload.get("content", ""))
-            result = {
-                "content": content
-            }
-            if "context" in payload:
-                result["context"] = payload.get("context")
-            if "strict_mode" in payload:
-                result["strict_mode"] = payload.get("strict_mode", False)
-            
-            # Preserve metadata
-            if payload.get("user_id"):
-                result["user_id"] = payload["user_id"]
-            if payload.get("session_id"):
-                result["session_id"] = payload["session_id"]
-            if payload.get("request_id"):
-                result["request_id"] = payload["request_id"]
-            
-            return result
-
-        elif service_type == GuardServiceType.BIAS_GUARD:
-            # BiasGuard /process expects: operation (required), text field (not samples array!)
-            # BiasAnalysisRequest requires: operation, text, context (optional), detailed_analysis (optional)
-            # Fix: Add operation field (required) - defaults to "detect_bias"
-            # Fix: Remove metadata fields (user_id, session_id, request_id) - services reject them with 422
-            # Extract text from various possible locations
-            text = payload.get("text", payload.get("content", ""))
-            
-            # Handle samples array format (extract text from first sample)
-            if not text and "samples" in payload and isinstance(payload.get("samples"), list):
-                samples = payload.get("samples", [])
-                if len(samples) > 0:
-                    first_sample = samples[0]
-                    if isinstance(first_sample, dict):
-                        # Try content field first
-                        text = first_sample.get("content", first_sample.get("text", ""))
-            
-            # Handle data field format
-            if not text and "data" in payload:
-                data = payload.get("data", {})
-                if isinstance(data, dict):
-                    text = data.get("text", data.get("content", ""))
-                elif isinstance(data, str):
-                    text = data
-            
-            # Validate text is not empty
-            if not text or not text.strip():
-                raise ValueError("Text content is required for bias detection")
-            
-            # Get operation field (required) - default to "detect_bias"
-            operation = payload.get("operation", "detect_bias")
-            
-            # Build result in BiasGuard expected format
-            result = {
-                "operation": operation,
-                "text": text
-            }
-            
-            # Add optional context field
-            if "context" in payload:
-                result["context"] = payload.get("context")
-            
-            # Add optional detailed_analysis field
-            if "detailed_analysis" in payload:
-                result["detailed_analysis"] = payload.get("detailed_analysis", True)
-            
-            # NOTE: Removed metadata fields (user_id, session_id, request_id)
-            # BiasGuard service rejects these fields with 422 errors
-            # TokenGuard/SecurityGuard accept them, but TrustGuard/BiasGuard don't
-            
-            return result
-
-        elif service_type == GuardServiceType.HEALTH_GUARD:
-            # HealthGuard /analyze expects: samples array with DataSample objects
-            # DataSample requires: id, content, metadata (optional)
-            text = payload.get("text", payload.get("content", ""))
-            sample_id = payload.get("sample_id", f"sample_{hash(text) % 10000}")
-            
-            result = {
-                "samples": [
-                    {
-                        "id": sample_id,
-                        "content": text,  # HealthGuard expects 'content' not 'text'
-                        "metadata": {
-                            "confidence": payload.get("confidence", 0.7),
-                            "metrics": payload.get("metrics", {}),
-                            "checks": payload.get("checks", []),
-                            "alerts": payload.get("alerts", []),
-                            "context": payload.get("context", {})
-                        }
-                    }
-                ]
-            }
-            
-            # Preserve metadata
-            if payload.get("user_id"):
-                result["user_id"] = payload["user_id"]
-            if payload.get("session_id"):
-                result["session_id"] = payload["session_id"]
-            if payload.get("request_id"):
-                result["request_id"] = payload["request_id"]
-            
-            return result
-
-        # Default: return payload as-is with validation
-        # Ensure payload has required fields for unknown service types
-        if not payload:
+            logger.warning(f"Invalid payload type: {type(payload)}, using empty dict")
             payload = {}
         
-        # Add request metadata to payload if not present
+        # Compiled per-guard transformer (see app.core.guard_transformers).
+        # Transformers only read the payload, so no copy is needed.
+        transformer = self._transformers.get(service_type.value)
+        if transformer is not None:
+            return transformer(payload, request)
+
+        # Default: return payload as-is with request metadata added
+        payload = dict(payload)
         if request.user_id and 'user_id' not in payload:
             payload['user_id'] = request.user_id
         if request.session_id and 'session_id' not in payload:
@@ -1700,12 +2318,15 @@ class GuardServiceOrchestrator:
         return self.health_status.copy()
     
     async def refresh_health_checks(self):
-        """Refresh health checks for all services."""
-        tasks = []
-        for service_name in self.services.keys():
-            tasks.append(self._check_service_health(service_name))
+        """
+        Refresh health checks for all services.
         
-        await asyncio.gather(*tasks, return_exceptions=True)
+        Joins probes already in flight and reuses results younger than
+        HEALTH_PROBE_MIN_REFRESH_SECONDS, so repeated refreshes do not
+        multiply probe traffic.
+        """
+        self._register_health_probes()
+        await self.health_prober.refresh(list(self.services.keys()))
     
     async def _start_auto_discovery(self):
         """Start the auto-discovery background task."""
@@ -1755,7 +2376,7 @@ class GuardServiceOrchestrator:
                         )
                         
                         self.services[service_name] = service_config
-                        self.circuit_breakers[service_name] = CircuitBreaker()
+                        self.circuit_breakers[service_name] = self._create_circuit_breaker(service_name)
                         
                         # Perform initial health check
                         await self._check_service_health(service_name)
@@ -1796,10 +2417,11 @@ class GuardServiceOrchestrator:
             )
             
             self.services[service_name] = service_config
-            self.circuit_breakers[service_name] = CircuitBreaker()
+            self.circuit_breakers[service_name] = self._create_circuit_breaker(service_name)
             
             # Perform initial health check
-            await self._check_service_health(service_name)
+            self.health_prober.register(service_name, self._check_service_health)
+            await self.health_prober.probe(service_name)
             
             logger.info(f"Manually registered service: {service_name} at {base_url}")
             return True
@@ -1818,7 +2440,9 @@ class GuardServiceOrchestrator:
             # Safely remove from all dictionaries
             self.services.pop(service_name, None)
             self.health_status.pop(service_name, None)
+            self.health_prober.unregister(service_name, probe=self._check_service_health)
             self.circuit_breakers.pop(service_name, None)
+            circuit_breaker_manager.unregister(service_name)
             logger.info(f"Unregistered service: {service_name}")
             return True
         except Exception as e:
@@ -2139,19 +2763,9 @@ class GuardServiceOrchestrator:
                     logger.error(f"Error cancelling discovery task: {e}")
             self.discovery_task = None
         
-        # Stop health check loop
-        if self.health_check_task:
-            if not self.health_check_task.done():
-                try:
-                    self.health_check_task.cancel()
-                    await asyncio.wait_for(self.health_check_task, timeout=5.0)
-                except asyncio.CancelledError:
-                    pass
-                except asyncio.TimeoutError:
-                    logger.warning("Health check task shutdown timeout")
-                except Exception as e:
-                    logger.error(f"Error cancelling health check task: {e}")
-            self.health_check_task = None
+        # Stop probing our services (the prober itself is stopped by the app)
+        for service_name in list(self.services.keys()):
+            self.health_prober.unregister(service_name, probe=self._check_service_health)
         
         # SAFETY: Cleanup HTTP client with error handling
         if self.http_client:
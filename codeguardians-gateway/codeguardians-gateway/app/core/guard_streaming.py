@@ -0,0 +1,181 @@
+"""
+Streaming Pass-Through for Large Guard Payloads
+
+Large scans (e.g. ContextGuard /analyze with up to 10MB of code) are proxied
+without materializing the body on the gateway:
+- The client's request body is forwarded to the guard chunk by chunk
+- Each chunk is size-checked and scanned with the gateway's input patterns
+  (with an overlap so patterns spanning chunk boundaries are still found)
+- The guard's response is relayed as NDJSON data frames as it arrives
+- The verdict envelope (success, status, timings, byte counts) is the final frame
+
+Peak gateway memory per request is bounded by the chunk size instead of the
+payload size.
+"""
+
+import codecs
+import json
+import os
+import time
+from contextlib import AsyncExitStack
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, Optional
+
+import httpx
+
+from app.core.exceptions import ValidationError
+from app.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Guards whose native request schema clients may stream directly
+STREAMING_SERVICES = frozenset(
+    name.strip() for name in os.getenv("GUARD_STREAMING_SERVICES", "contextguard").split(",") if name.strip()
+)
+
+# Upstream response chunk size relayed per data frame
+STREAM_CHUNK_SIZE = int(os.getenv("GUARD_STREAM_CHUNK_SIZE", str(64 * 1024)))
+
+# Characters carried between chunks so patterns across boundaries are scanned
+SCAN_OVERLAP = 256
+
+
+async def guarded_body(
+    body: AsyncIterator[bytes],
+    max_bytes: int,
+    counters: Dict[str, int]
+) -> AsyncIterator[bytes]:
+    """
+    Forward request chunks, enforcing the size limit and scanning each chunk.
+
+    Raises:
+        ValidationError: PAYLOAD_TOO_LARGE or UNSAFE_PAYLOAD (aborts the upstream request)
+    """
+    from app.core.input_validation import get_input_validator
+    validator = get_input_validator()
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    tail = ""
+
+    async for chunk in body:
+        if not chunk:
+            continue
+        counters["bytes_in"] += len(chunk)
+        if counters["bytes_in"] > max_bytes:
+            raise ValidationError(
+                f"Payload exceeds maximum size of {max_bytes} bytes",
+                error_code="PAYLOAD_TOO_LARGE"
+            )
+
+        text = tail + decoder.decode(chunk)
+        if (validator.detect_sql_injection(text)
+                or validator.detect_xss(text)
+                or validator.detect_command_injection(text)):
+            raise ValidationError("Unsafe pattern detected in payload", error_code="UNSAFE_PAYLOAD")
+        tail = text[-SCAN_OVERLAP:]
+
+        yield chunk
+
+
+class GuardStream:
+    """
+    An open streaming call to a guard.
+
+    SAFETY: aclose() is idempotent and always releases the concurrency slot
+    ASSUMES: frames() is consumed at most once
+    VERIFY: The last frame is always the verdict envelope
+    """
+
+    def __init__(
+        self,
+        request: Any,
+        service_name: str,
+        response: httpx.Response,
+        exit_stack: AsyncExitStack,
+        circuit_breaker: Any,
+        counters: Dict[str, int],
+        started: float
+    ):
+        self.request = request
+        self.service_name = service_name
+        self.response = response
+        self.counters = counters
+        self._exit_stack = exit_stack
+        self._circuit_breaker = circuit_breaker
+        self._started = started
+        self._closed = False
+
+    @property
+    def status_code(self) -> int:
+        return self.response.status_code
+
+    async def frames(self) -> AsyncIterator[str]:
+        """Yield NDJSON data frames followed by the verdict envelope."""
+        success = self.response.status_code == 200
+        error: Optional[str] = None
+        error_code: Optional[str] = None
+        try:
+            if success:
+                decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+                async for chunk in self.response.aiter_bytes(STREAM_CHUNK_SIZE):
+                    self.counters["bytes_out"] += len(chunk)
+                    text = decoder.decode(chunk)
+                    if text:
+                        yield json.dumps({"type": "data", "data": text}) + "\n"
+                text = decoder.decode(b"", final=True)
+                if text:
+                    yield json.dumps({"type": "data", "data": text}) + "\n"
+            else:
+                # SAFETY: Limit error text size
+                preview = b""
+                async for chunk in self.response.aiter_bytes():
+                    preview += chunk
+                    if len(preview) >= 500:
+                        break
+                error = f"Service returned status {self.response.status_code}: {preview[:500].decode('utf-8', 'replace')}"
+                error_code = "GUARD_SERVICE_ERROR"
+        except httpx.HTTPError as e:
+            success = False
+            error = f"Stream from {self.service_name} failed: {e}"
+            error_code = "GUARD_SERVICE_ERROR"
+
+        self._record_outcome(success)
+        await self.aclose()
+        yield json.dumps(self._envelope(success, error, error_code)) + "\n"
+
+    async def aclose(self) -> None:
+        """Close the upstream response and release the concurrency slot."""
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            await self.response.aclose()
+        finally:
+            await self._exit_stack.aclose()
+
+    def _record_outcome(self, success: bool) -> None:
+        if not self._circuit_breaker:
+            return
+        status = self.response.status_code
+        if success:
+            self._circuit_breaker.record_success()
+        elif status >= 500 or status == 429 or status == 200:
+            self._circuit_breaker.record_failure()
+        else:
+            # Client errors are not the guard's fault
+            self._circuit_breaker.release_permission()
+
+    def _envelope(self, success: bool, error: Optional[str], error_code: Optional[str]) -> Dict[str, Any]:
+        return {
+            "type": "verdict",
+            "request_id": self.request.request_id,
+            "service_type": self.request.service_type.value,
+            "success": success,
+            "status_code": self.response.status_code,
+            "error": error,
+            "error_code": error_code,
+            "bytes_in": self.counters["bytes_in"],
+            "bytes_out": self.counters["bytes_out"],
+            "processing_time": time.perf_counter() - self._started,
+            "timestamp": datetime.now().isoformat(),
+            "service_used": self.service_name
+        }
@@ -0,0 +1,313 @@
+"""
+Declarative Guard Request Transformers
+
+One spec per guard describes its upstream endpoint and how the generic scan
+payload maps onto the guard's request schema:
+- Field mappings list source keys in priority order (first key present wins)
+- Defaults, presence rules and accepted types are declared, not coded
+- Specs are compiled once into flat callables (no per-request type dispatch,
+  no payload copy)
+- Specs can be checked against a guard's OpenAPI document at startup
+
+Adding a guard means adding a spec here rather than new branches in the
+orchestrator.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from app.core.exceptions import ConfigurationError
+from app.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Emission rules for a field
+ALWAYS = "always"      # Always emitted (default when no source key is present)
+PRESENT = "present"    # Emitted only when a source key is present
+TRUTHY = "truthy"      # Emitted only when the resolved value is truthy
+
+_MISSING = object()
+
+# Request attributes that fill metadata fields missing from the payload
+METADATA_FIELDS = ("user_id", "session_id", "request_id")
+
+
+@dataclass(frozen=True)
+class FieldSpec:
+    """
+    Mapping of one target field.
+
+    Args:
+        target: Field name in the guard's request body
+        sources: Payload keys tried in order (defaults to (target,))
+        default: Value when no source key is present (ALWAYS fields only)
+        when: Emission rule (ALWAYS, PRESENT or TRUTHY)
+        types: If set, values of other types are dropped
+        request_attr: OrchestrationRequest attribute used when no source key is present
+        compute: Callable(payload) -> value replacing the source lookup
+    """
+    target: str
+    sources: Tuple[str, ...] = ()
+    default: Any = None
+    when: str = ALWAYS
+    types: Optional[Tuple[type, ...]] = None
+    request_attr: Optional[str] = None
+    compute: Optional[Callable[[Dict[str, Any]], Any]] = None
+
+
+@dataclass(frozen=True)
+class TransformerSpec:
+    """Endpoint and field mappings for one guard."""
+    service: str
+    endpoint: str
+    fields: Tuple[FieldSpec, ...] = field(default_factory=tuple)
+
+
+def metadata_fields(when: str) -> Tuple[FieldSpec, ...]:
+    """user_id/session_id/request_id from the payload, falling back to the request."""
+    return tuple(FieldSpec(name, when=when, request_attr=name) for name in METADATA_FIELDS)
+
+
+# ----------------------------------------------------------------------
+# Computed fields
+# ----------------------------------------------------------------------
+
+def bias_text(payload: Dict[str, Any]) -> str:
+    """
+    Extract BiasGuard text from text/content, the first sample or data.
+
+    Raises:
+        ValueError: If no text content is found
+    """
+    text = payload.get("text", payload.get("content", ""))
+
+    samples = payload.get("samples")
+    if not text and isinstance(samples, list) and samples and isinstance(samples[0], dict):
+        text = samples[0].get("content", samples[0].get("text", ""))
+
+    if not text and "data" in payload:
+        data = payload.get("data", {})
+        if isinstance(data, dict):
+            text = data.get("text", data.get("content", ""))
+        elif isinstance(data, str):
+            text = data
+
+    if not text or not text.strip():
+        raise ValueError("Text content is required for bias detection")
+    return text
+
+
+def health_samples(payload: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Wrap the payload text in HealthGuard's DataSample list."""
+    text = payload.get("text", payload.get("content", ""))
+    return [
+        {
+            "id": payload.get("sample_id", f"sample_{hash(text) % 10000}"),
+            "content": text,  # HealthGuard expects 'content' not 'text'
+            "metadata": {
+                "confidence": payload.get("confidence", 0.7),
+                "metrics": payload.get("metrics", {}),
+                "checks": payload.get("checks", []),
+                "alerts": payload.get("alerts", []),
+                "context": payload.get("context", {})
+            }
+        }
+    ]
+
+
+# ----------------------------------------------------------------------
+# Guard specs (endpoints must match the guards' exposed routes)
+# ----------------------------------------------------------------------
+
+GUARD_TRANSFORMER_SPECS: Tuple[TransformerSpec, ...] = (
+    # TokenGuard /scan: content, confidence, logprobs_stream + metadata
+    TransformerSpec("tokenguard", "/scan", (
+        FieldSpec("content", ("content", "text"), default=""),
+        FieldSpec("confidence", default=0.7),
+        FieldSpec("logprobs_stream"),
+    ) + metadata_fields(ALWAYS)),
+    # TrustGuard /validate: validation_type, content, context (optional).
+    # No metadata fields: TrustGuard rejects them with 422
+    TransformerSpec("trustguard", "/validate", (
+        FieldSpec("validation_type", default="general"),
+        FieldSpec("content", ("content", "text", "input_text"), default=""),
+        FieldSpec("context", when=PRESENT, types=(dict, str)),
+        FieldSpec("validation_level", when=PRESENT),
+    )),
+    # ContextGuard /analyze: current_code, previous_code for drift detection
+    TransformerSpec("contextguard", "/analyze", (
+        FieldSpec("current_code", ("current_code", "text", "content"), default=""),
+        FieldSpec("previous_code", ("previous_code", "previous_content"), default=""),
+        FieldSpec("context", when=PRESENT),
+    ) + metadata_fields(TRUTHY)),
+    # SecurityGuard /scan: content, context (optional), strict_mode (optional)
+    TransformerSpec("securityguard", "/scan", (
+        FieldSpec("content", ("text", "content"), default=""),
+        FieldSpec("context", when=PRESENT),
+        FieldSpec("strict_mode", when=PRESENT),
+    ) + metadata_fields(TRUTHY)),
+    # BiasGuard /process: operation (required), text. No metadata fields
+    TransformerSpec("biasguard", "/process", (
+        FieldSpec("operation", default="detect_bias"),
+        FieldSpec("text", compute=bias_text),
+        FieldSpec("context", when=PRESENT),
+        FieldSpec("detailed_analysis", when=PRESENT),
+    )),
+    # HealthGuard /analyze: samples array with DataSample objects
+    TransformerSpec("healthguard", "/analyze", (
+        FieldSpec("samples", compute=health_samples),
+    ) + metadata_fields(TRUTHY)),
+)
+
+
+# ----------------------------------------------------------------------
+# Compilation
+# ----------------------------------------------------------------------
+
+Transformer = Callable[[Dict[str, Any], Any], Dict[str, Any]]
+
+
+def _compile_field(spec: FieldSpec) -> Callable[[Dict[str, Any], Any, Dict[str, Any]], None]:
+    """Specialise one field mapping into a small closure."""
+    target = spec.target
+    sources = spec.sources or (target,)
+    default = spec.default
+    types = spec.types
+    request_attr = spec.request_attr
+    when = spec.when
+
+    if spec.compute is not None:
+        compute = spec.compute
+
+        def computed(payload, request, out):
+            out[target] = compute(payload)
+        return computed
+
+    if len(sources) == 1:
+        key = sources[0]
+
+        def lookup(payload):
+            return payload.get(key, _MISSING)
+    else:
+        def lookup(payload):
+            for key in sources:
+                if key in payload:
+                    return payload[key]
+            return _MISSING
+
+    def apply(payload, request, out):
+        value = lookup(payload)
+        if value is _MISSING:
+            if request_attr is not None:
+                value = getattr(request, request_attr, None)
+            elif when == ALWAYS:
+                value = default
+            else:
+                return
+        if when == TRUTHY and not value:
+            return
+        if types is not None and not isinstance(value, types):
+            return
+        out[target] = value
+    return apply
+
+
+def compile_transformer(spec: TransformerSpec) -> Transformer:
+    """
+    Compile a spec into a transformer(payload, request) -> upstream body.
+
+    Raises:
+        ConfigurationError: If the spec is malformed
+    """
+    if not spec.endpoint.startswith("/"):
+        raise ConfigurationError(f"Transformer endpoint for {spec.service} must start with '/': {spec.endpoint}")
+    targets = [f.target for f in spec.fields]
+    if len(targets) != len(set(targets)):
+        raise ConfigurationError(f"Duplicate target fields in transformer for {spec.service}")
+    for f in spec.fields:
+        if f.when not in (ALWAYS, PRESENT, TRUTHY):
+            raise ConfigurationError(f"Unknown emission rule {f.when!r} for {spec.service}.{f.target}")
+
+    steps = tuple(_compile_field(f) for f in spec.fields)
+
+    def transform(payload: Dict[str, Any], request: Any) -> Dict[str, Any]:
+        out: Dict[str, Any] = {}
+        for step in steps:
+            step(payload, request, out)
+        return out
+
+    transform.__name__ = f"transform_{spec.service}"
+    return transform
+
+
+class TransformerRegistry:
+    """Compiled transformers and endpoints keyed by guard service name."""
+
+    def __init__(self, specs: Tuple[TransformerSpec, ...] = GUARD_TRANSFORMER_SPECS):
+        self.specs: Dict[str, TransformerSpec] = {spec.service: spec for spec in specs}
+        self.transformers: Dict[str, Transformer] = {
+            spec.service: compile_transformer(spec) for spec in specs
+        }
+        self.endpoints: Dict[str, str] = {spec.service: spec.endpoint for spec in specs}
+
+    def get(self, service: str) -> Optional[Transformer]:
+        return self.transformers.get(service)
+
+    def endpoint(self, service: str) -> Optional[str]:
+        return self.endpoints.get(service)
+
+    def check_openapi(self, service: str, openapi: Dict[str, Any]) -> List[str]:
+        """
+        Compare a guard's spec with its OpenAPI document.
+
+        Returns:
+            Human-readable problems (empty when the spec matches)
+        """
+        spec = self.specs.get(service)
+        if spec is None:
+            return [f"No transformer spec for {service}"]
+
+        operation = openapi.get("paths", {}).get(spec.endpoint, {}).get("post")
+        if operation is None:
+            return [f"{service}: POST {spec.endpoint} not found in OpenAPI document"]
+
+        schema = (operation.get("requestBody", {}).get("content", {})
+                  .get("application/json", {}).get("schema", {}))
+        schema = _resolve_ref(openapi, schema)
+        properties = schema.get("properties")
+        if properties is None:
+            return []  # Free-form body, nothing to check
+
+        targets = {f.target for f in spec.fields}
+        problems = [
+            f"{service}: required field '{name}' is not produced by the transformer"
+            for name in schema.get("required", []) if name not in targets
+        ]
+        if schema.get("additionalProperties", True) is False:
+            problems.extend(
+                f"{service}: field '{name}' is not accepted by the guard"
+                for name in sorted(targets) if name not in properties
+            )
+        return problems
+
+
+def _resolve_ref(openapi: Dict[str, Any], schema: Dict[str, Any]) -> Dict[str, Any]:
+    ref = schema.get("$ref")
+    if not ref or not ref.startswith("#/"):
+        return schema
+    node: Any = openapi
+    for part in ref[2:].split("/"):
+        node = node.get(part, {}) if isinstance(node, dict) else {}
+    return node if isinstance(node, dict) else {}
+
+
+# Global registry, compiled at import (startup)
+_transformer_registry: Optional[TransformerRegistry] = None
+
+
+def get_transformer_registry() -> TransformerRegistry:
+    """Get global transformer registry instance."""
+    global _transformer_registry
+    if _transformer_registry is None:
+        _transformer_registry = TransformerRegistry()
+    return _transformer_registry
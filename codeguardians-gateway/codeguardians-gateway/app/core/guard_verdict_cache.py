@@ -0,0 +1,437 @@
+"""
+Guard Verdict Cache
+
+Content-addressed cache for guard service verdicts. Identical scans
+(retries, CI re-runs, shared boilerplate) are answered from cache instead
+of making another network call to the guard.
+
+- Key: hash of (guard, normalized transformed payload, guard version, config)
+- Tier 1: in-process LRU with per-guard TTL
+- Tier 2: shared Redis (same client as app.core.response_cache)
+- Per-tenant opt-out switch, shared by all workers through Redis
+- Automatic invalidation when a guard reports a new version
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Set, Tuple
+
+from app.core.response_cache import get_cache_client
+from app.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+try:
+    from app.core.orchestrator_metrics import (
+        record_verdict_cache_lookup,
+        record_verdict_cache_invalidation
+    )
+    METRICS_ENABLED = True
+except ImportError:
+    METRICS_ENABLED = False
+
+# Default TTLs in seconds per guard (0 disables caching for that guard)
+DEFAULT_GUARD_TTLS = {
+    "tokenguard": 600,
+    "trustguard": 300,
+    "contextguard": 300,
+    "biasguard": 600,
+    "healthguard": 60,
+    "securityguard": 300,
+}
+
+# Request-scoped fields that must not affect the verdict key
+VOLATILE_PAYLOAD_FIELDS = ("user_id", "session_id", "request_id", "_context")
+
+# Fields ContextGuard merges into payload["context"] from conversation
+# memory; that memory changes after every answer, so they must not affect
+# the verdict key either
+CONTEXT_MEMORY_FIELDS = (
+    "drift_detected", "previous_context", "pattern_history", "latest_result", "history",
+    "semantic_context", "continuity", "bias_patterns", "historical_patterns",
+    "security_history", "usage_patterns", "health_history", "health_patterns",
+    "has_memory", "memory_count",
+)
+
+# Responses containing these fields are degraded answers and never cached
+UNCACHEABLE_RESPONSE_FIELDS = ("error", "raw_response")
+
+REDIS_KEY_PREFIX = "cache:guard_verdict"
+REDIS_RETRY_INTERVAL = 30.0  # seconds to skip Redis after a connection failure
+
+# Redis hash of tenant id -> "1" (enabled) / "0" (disabled) set by the admin API
+TENANT_SWITCH_KEY = f"{REDIS_KEY_PREFIX}:tenants"
+# Seconds between re-reads of the shared tenant switches
+TENANT_REFRESH_INTERVAL = float(os.getenv("GUARD_VERDICT_CACHE_TENANT_REFRESH_SECONDS", "10"))
+
+
+def _normalize_payload(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Strip request-scoped fields so identical content maps to one key.
+
+    ContextGuard enhancement (the "_context" block and the memory fields it
+    merges into "context") reflects conversation history rather than the
+    scanned content, so it is dropped. HealthGuard sample ids are derived from Python's per-process string hash,
+    so they are dropped as well to keep keys stable across gateway workers.
+    """
+    normalized = {
+        key: value for key, value in payload.items()
+        if key not in VOLATILE_PAYLOAD_FIELDS
+    }
+
+    if isinstance(normalized.get("context"), dict):
+        normalized["context"] = {
+            k: v for k, v in normalized["context"].items() if k not in CONTEXT_MEMORY_FIELDS
+        }
+
+    samples = normalized.get("samples")
+    if isinstance(samples, list):
+        normalized["samples"] = [
+            {k: v for k, v in sample.items() if k != "id"} if isinstance(sample, dict) else sample
+            for sample in samples
+        ]
+
+    return normalized
+
+
+class GuardVerdictCache:
+    """
+    Two-tier verdict cache in front of GuardServiceOrchestrator.
+
+    SAFETY: Cache failures never fail a request - lookups degrade to misses
+    ASSUMES: Guard verdicts are deterministic for identical payloads per version
+    VERIFY: Version changes purge the in-process tier; Redis keys embed the
+    version so stale entries simply stop matching
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 10000,
+        default_ttl: int = 300,
+        enabled: bool = True
+    ):
+        self.enabled = enabled
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self.guard_ttls: Dict[str, int] = dict(DEFAULT_GUARD_TTLS)
+        self.disabled_tenants: Set[str] = set()
+        # Disabled by configuration; admin switches in Redis override these
+        self.configured_disabled_tenants: Set[str] = set()
+        self._tenants_refreshed_at = float("-inf")
+
+        # key -> (expires_at, service_name, serialized verdict)
+        self._entries: "OrderedDict[str, Tuple[float, str, str]]" = OrderedDict()
+        self._guard_versions: Dict[str, str] = {}
+        self._redis_retry_after = 0.0
+        self._background_tasks: Set[asyncio.Task] = set()
+        self._stats: Dict[str, int] = {
+            "hits_memory": 0,
+            "hits_redis": 0,
+            "misses": 0,
+            "stores": 0,
+            "evictions": 0,
+            "invalidations": 0,
+        }
+
+    @classmethod
+    def from_env(cls) -> "GuardVerdictCache":
+        """Create a cache configured from environment variables."""
+        cache = cls(
+            max_entries=int(os.getenv("GUARD_VERDICT_CACHE_MAX_ENTRIES", "10000")),
+            default_ttl=int(os.getenv("GUARD_VERDICT_CACHE_TTL", "300")),
+            enabled=os.getenv("GUARD_VERDICT_CACHE_ENABLED", "true").lower() == "true"
+        )
+
+        for service_name in DEFAULT_GUARD_TTLS:
+            ttl = os.getenv(f"GUARD_VERDICT_CACHE_TTL_{service_name.upper()}")
+            if ttl is not None:
+                try:
+                    cache.guard_ttls[service_name] = int(ttl)
+                except ValueError:
+                    logger.warning(f"Invalid verdict cache TTL for {service_name}: {ttl}")
+
+        disabled = os.getenv("GUARD_VERDICT_CACHE_DISABLED_TENANTS", "")
+        cache.configured_disabled_tenants = {t.strip() for t in disabled.split(",") if t.strip()}
+        cache.disabled_tenants = set(cache.configured_disabled_tenants)
+        return cache
+
+    # ------------------------------------------------------------------
+    # Switches
+    # ------------------------------------------------------------------
+
+    def get_ttl(self, service_name: str) -> int:
+        """Get the cache TTL for a guard."""
+        return self.guard_ttls.get(service_name, self.default_ttl)
+
+    async def set_tenant_enabled(self, tenant_id: str, enabled: bool) -> None:
+        """
+        Enable or disable verdict caching for a tenant.
+
+        Applied in process immediately and persisted to Redis, from which
+        other workers pick it up within TENANT_REFRESH_INTERVAL.
+        """
+        if enabled:
+            self.disabled_tenants.discard(tenant_id)
+        else:
+            self.disabled_tenants.add(tenant_id)
+
+        client = await self._get_redis()
+        if client is None:
+            logger.warning(f"Verdict cache switch for tenant {tenant_id} not shared: Redis unavailable")
+            return
+        try:
+            await client.hset(TENANT_SWITCH_KEY, tenant_id, "1" if enabled else "0")
+        except Exception as e:
+            logger.warning(f"Failed to persist verdict cache switch for tenant {tenant_id}: {e}")
+            self._redis_retry_after = time.monotonic() + REDIS_RETRY_INTERVAL
+
+    async def refresh_tenants(self, force: bool = False) -> None:
+        """
+        Re-read the shared tenant switches from Redis.
+
+        Cheap to call per request: Redis is read at most once per
+        TENANT_REFRESH_INTERVAL, and failures keep the current switches.
+        """
+        now = time.monotonic()
+        if not force and now - self._tenants_refreshed_at < TENANT_REFRESH_INTERVAL:
+            return
+        self._tenants_refreshed_at = now
+
+        client = await self._get_redis()
+        if client is None:
+            return
+        try:
+            switches = await client.hgetall(TENANT_SWITCH_KEY)
+        except Exception as e:
+            logger.debug(f"Verdict cache tenant refresh failed: {e}")
+            self._redis_retry_after = time.monotonic() + REDIS_RETRY_INTERVAL
+            return
+
+        disabled = set(self.configured_disabled_tenants)
+        for tenant_id, value in (switches or {}).items():
+            tenant_id = tenant_id.decode() if isinstance(tenant_id, bytes) else tenant_id
+            value = value.decode() if isinstance(value, bytes) else value
+            if value == "0":
+                disabled.add(tenant_id)
+            else:
+                disabled.discard(tenant_id)
+        self.disabled_tenants = disabled
+
+    def is_enabled_for(self, service_name: str, tenant_id: Optional[str] = None) -> bool:
+        """Check whether verdicts for this guard and tenant may be cached."""
+        if not self.enabled or self.get_ttl(service_name) <= 0:
+            return False
+        return tenant_id is None or tenant_id not in self.disabled_tenants
+
+    # ------------------------------------------------------------------
+    # Keys and versions
+    # ------------------------------------------------------------------
+
+    def build_key(
+        self,
+        service_name: str,
+        payload: Dict[str, Any],
+        config_fingerprint: str = ""
+    ) -> str:
+        """
+        Build the content-addressed key for a transformed guard payload.
+
+        Args:
+            service_name: Guard service name
+            payload: Transformed (service-specific) payload
+            config_fingerprint: Anything about the guard config that changes
+                its verdicts (e.g. base URL and endpoint)
+        """
+        key_data = {
+            "guard": service_name,
+            "version": self._guard_versions.get(service_name, ""),
+            "config": config_fingerprint,
+            "payload": _normalize_payload(payload),
+        }
+        key_string = json.dumps(key_data, sort_keys=True, separators=(",", ":"), default=str)
+        return hashlib.sha256(key_string.encode("utf-8")).hexdigest()
+
+    def observe_guard_version(self, service_name: str, version: Optional[str]) -> bool:
+        """
+        Record the version a guard reports in its health check.
+
+        Returns:
+            True if the version changed and cached verdicts were invalidated
+        """
+        if not version:
+            return False
+
+        previous = self._guard_versions.get(service_name)
+        self._guard_versions[service_name] = version
+        if previous is None or previous == version:
+            return False
+
+        removed = self.invalidate_guard(service_name)
+        logger.info(
+            f"{service_name} version changed {previous} -> {version}, "
+            f"invalidated {removed} cached verdicts"
+        )
+        return True
+
+    def invalidate_guard(self, service_name: str) -> int:
+        """Drop all in-process verdicts for a guard."""
+        stale = [key for key, entry in self._entries.items() if entry[1] == service_name]
+        for key in stale:
+            del self._entries[key]
+
+        self._stats["invalidations"] += 1
+        if METRICS_ENABLED:
+            try:
+                record_verdict_cache_invalidation(service_name)
+            except Exception:
+                pass
+        return len(stale)
+
+    # ------------------------------------------------------------------
+    # Lookup and store
+    # ------------------------------------------------------------------
+
+    async def get(self, service_name: str, key: str) -> Optional[Dict[str, Any]]:
+        """Look up a cached verdict (memory first, then Redis)."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, _, serialized = entry
+            if expires_at > time.monotonic():
+                self._entries.move_to_end(key)
+                self._record_lookup(service_name, "hit_memory")
+                return json.loads(serialized)
+            del self._entries[key]
+
+        client = await self._get_redis()
+        if client is not None:
+            try:
+                redis_key = self._redis_key(service_name, key)
+                pipe = client.pipeline(transaction=False)
+                pipe.get(redis_key)
+                pipe.pttl(redis_key)
+                serialized, ttl_ms = await pipe.execute()
+                if serialized:
+                    # Expire locally with the Redis entry, not a fresh full TTL
+                    if ttl_ms == -1:
+                        self._store_local(service_name, key, serialized)
+                    elif ttl_ms is not None and ttl_ms > 0:
+                        self._store_local(service_name, key, serialized, ttl_ms / 1000)
+                    self._record_lookup(service_name, "hit_redis")
+                    return json.loads(serialized)
+            except Exception as e:
+                logger.debug(f"Verdict cache Redis get failed: {e}")
+                self._redis_retry_after = time.monotonic() + REDIS_RETRY_INTERVAL
+
+        self._record_lookup(service_name, "miss")
+        return None
+
+    def set(self, service_name: str, key: str, data: Dict[str, Any]) -> bool:
+        """
+        Store a verdict.
+
+        The in-process tier is written synchronously; the Redis write runs in
+        the background so caching never adds latency to the response.
+        """
+        if not isinstance(data, dict) or any(f in data for f in UNCACHEABLE_RESPONSE_FIELDS):
+            return False
+
+        try:
+            serialized = json.dumps(data, default=str)
+        except (TypeError, ValueError) as e:
+            logger.debug(f"Verdict for {service_name} not serializable: {e}")
+            return False
+
+        self._store_local(service_name, key, serialized)
+        self._stats["stores"] += 1
+
+        try:
+            task = asyncio.get_running_loop().create_task(
+                self._store_redis(service_name, key, serialized)
+            )
+            self._background_tasks.add(task)
+            task.add_done_callback(self._background_tasks.discard)
+        except RuntimeError:
+            # No running loop (sync caller) - in-process tier only
+            pass
+        return True
+
+    def clear(self) -> None:
+        """Drop all in-process verdicts."""
+        self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics."""
+        hits = self._stats["hits_memory"] + self._stats["hits_redis"]
+        lookups = hits + self._stats["misses"]
+        return {
+            "enabled": self.enabled,
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "guard_ttls": dict(self.guard_ttls),
+            "guard_versions": dict(self._guard_versions),
+            "disabled_tenants": sorted(self.disabled_tenants),
+            **self._stats,
+        }
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _store_local(self, service_name: str, key: str, serialized: str, ttl: Optional[float] = None) -> None:
+        """Insert into the LRU tier, evicting the least recently used entry."""
+        guard_ttl = self.get_ttl(service_name)
+        expires_at = time.monotonic() + (min(ttl, guard_ttl) if ttl is not None else guard_ttl)
+        self._entries[key] = (expires_at, service_name, serialized)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._stats["evictions"] += 1
+
+    async def _store_redis(self, service_name: str, key: str, serialized: str) -> None:
+        """Write a verdict to the shared Redis tier."""
+        client = await self._get_redis()
+        if client is None:
+            return
+        try:
+            await client.setex(self._redis_key(service_name, key), self.get_ttl(service_name), serialized)
+        except Exception as e:
+            logger.debug(f"Verdict cache Redis set failed: {e}")
+            self._redis_retry_after = time.monotonic() + REDIS_RETRY_INTERVAL
+
+    async def _get_redis(self):
+        """Get the shared Redis client, backing off after connection failures."""
+        if time.monotonic() < self._redis_retry_after:
+            return None
+        client = await get_cache_client()
+        if client is None:
+            self._redis_retry_after = time.monotonic() + REDIS_RETRY_INTERVAL
+        return client
+
+    def _redis_key(self, service_name: str, key: str) -> str:
+        return f"{REDIS_KEY_PREFIX}:{service_name}:{key}"
+
+    def _record_lookup(self, service_name: str, result: str) -> None:
+        stat = {"hit_memory": "hits_memory", "hit_redis": "hits_redis"}.get(result, "misses")
+        self._stats[stat] += 1
+        if METRICS_ENABLED:
+            try:
+                record_verdict_cache_lookup(service_name, result)
+            except Exception:
+                pass
+
+
+# Global cache instance
+_guard_verdict_cache: Optional[GuardVerdictCache] = None
+
+
+def get_guard_verdict_cache() -> GuardVerdictCache:
+    """Get global guard verdict cache instance."""
+    global _guard_verdict_cache
+    if _guard_verdict_cache is None:
+        _guard_verdict_cache = GuardVerdictCache.from_env()
+    return _guard_verdict_cache
@@ -2,6 +2,8 @@
 AI Guardians Health Monitoring
 
 Comprehensive health monitoring for all services with enhanced checks.
+Service probes are scheduled by the shared health prober; reports are built
+from its snapshot.
 """
 
 import asyncio
@@ -13,6 +15,8 @@ from dataclasses import dataclass
 from enum import Enum
 import logging
 
+from app.core.health_prober import HealthProber, get_health_prober
+
 logger = logging.getLogger(__name__)
 
 
@@ -259,6 +263,54 @@ class ServiceHealthMonitor:
                 error=str(e)
             )
     
+    async def _probe(self, service_name: str) -> HealthCheck:
+        """Probe entry point for the shared prober."""
+        return await self.check_service_health(service_name, self.services[service_name])
+    
+    async def get_snapshot_health(self, prober: HealthProber) -> List[HealthCheck]:
+        """
+        Latest health of every service from the shared prober snapshot.
+        
+        Services without a probe are registered (guards already probed by the
+        orchestrator keep its probe); only services never probed yet are
+        probed inline.
+        """
+        for service_name in self.services:
+            prober.register(service_name, self._probe, replace=False)
+        
+        snapshot = prober.snapshot()
+        missing = [name for name in self.services if name not in snapshot]
+        if missing:
+            snapshot.update(await prober.refresh(missing))
+        
+        health_checks = [
+            self._to_health_check(name, snapshot[name])
+            for name in self.services
+            if name in snapshot
+        ]
+        self.health_history.extend(health_checks)
+        if len(self.health_history) > self.max_history:
+            self.health_history = self.health_history[-self.max_history:]
+        
+        return health_checks
+    
+    @staticmethod
+    def _to_health_check(service_name: str, result: Any) -> HealthCheck:
+        """Convert a prober result (HealthCheck or orchestrator ServiceHealth)."""
+        if isinstance(result, HealthCheck):
+            return result
+        
+        status = getattr(getattr(result, "status", None), "value", "unknown")
+        last_check = getattr(result, "last_check", None)
+        return HealthCheck(
+            service=service_name,
+            status=HealthStatus(status) if status in HealthStatus._value2member_map_ else HealthStatus.UNKNOWN,
+            response_time=getattr(result, "response_time", None) or 0.0,
+            timestamp=last_check.timestamp() if last_check else time.time(),
+            details=getattr(result, "metadata", None) or {},
+            error=getattr(result, "error_message", None)
+        )
+    
     async def check_all_services(self) -> List[HealthCheck]:
         """Check health of all services."""
         tasks = []
@@ -337,8 +389,8 @@ class SystemResourceMonitor:
     def get_system_metrics(self) -> Dict[str, Any]:
         """Get current system metrics."""
         try:
-            # CPU usage
-            cpu_percent = psutil.cpu_percent(interval=1)
+            # CPU usage since the previous call (non-blocking)
+            cpu_percent = psutil.cpu_percent(interval=None)
             
             # Memory usage
             memory = psutil.virtual_memory()
@@ -385,14 +437,16 @@ class SystemResourceMonitor:
 class ComprehensiveHealthMonitor:
     """Comprehensive health monitoring combining all checks."""
     
-    def __init__(self):
+    def __init__(self, prober: Optional[HealthProber] = None):
         self.service_monitor = ServiceHealthMonitor()
         self.resource_monitor = SystemResourceMonitor()
+        self._prober = prober
     
     async def get_comprehensive_health(self) -> Dict[str, Any]:
         """Get comprehensive health status."""
-        # Check all services
-        service_health = await self.service_monitor.check_all_services()
+        # Latest service health from the shared prober snapshot
+        prober = self._prober if self._prober is not None else get_health_prober()
+        service_health = await self.service_monitor.get_snapshot_health(prober)
         
         # Get system resources
         system_metrics = self.resource_monitor.get_system_metrics()
@@ -0,0 +1,287 @@
+"""
+Shared Health Prober
+
+One scheduler probes every guard service; everything else reads the result:
+- One probe task per target, on its own interval with jitter so targets
+  (and replicas) never probe in lockstep
+- Results land in an in-memory snapshot and a Redis hash shared by replicas
+- Health endpoints and routing read the snapshot instead of probing inline
+- On-demand refreshes join the in-flight probe and reuse recent results
+"""
+
+import asyncio
+import json
+import os
+import random
+import time
+from dataclasses import asdict, dataclass, is_dataclass
+from datetime import datetime
+from enum import Enum
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional
+
+from app.core.response_cache import get_cache_client
+from app.core.single_flight import SingleFlight
+from app.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Seconds between probes of one target, spread by +/- HEALTH_PROBE_JITTER
+HEALTH_PROBE_INTERVAL_SECONDS = float(os.getenv("HEALTH_PROBE_INTERVAL_SECONDS", "30"))
+HEALTH_PROBE_JITTER = float(os.getenv("HEALTH_PROBE_JITTER", "0.2"))
+
+# On-demand refreshes reuse a result younger than this instead of probing
+HEALTH_PROBE_MIN_REFRESH_SECONDS = float(os.getenv("HEALTH_PROBE_MIN_REFRESH_SECONDS", "5"))
+
+HEALTH_SNAPSHOT_KEY = "health:snapshot"
+REDIS_RETRY_INTERVAL = 30.0  # seconds to skip Redis after a connection failure
+
+ProbeFn = Callable[[str], Awaitable[Any]]
+
+
+@dataclass
+class _Target:
+    """A probed service and its schedule."""
+    probe: ProbeFn
+    interval: float
+    task: Optional[asyncio.Task] = None
+    last_probe: float = 0.0  # monotonic time the last probe started
+
+
+def _encode(value: Any) -> Any:
+    """JSON fallback for enums and timestamps in health results."""
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+def _cancel(task: Optional[asyncio.Task]) -> None:
+    """Cancel a probe task, tolerating one bound to a loop that has closed."""
+    if task is None or task.done():
+        return
+    try:
+        task.cancel()
+    except RuntimeError:
+        pass
+
+
+class HealthProber:
+    """
+    Scheduled health probing with a shared snapshot.
+
+    SAFETY: A failing or slow probe only delays its own target
+    ASSUMES: Probe functions return a result object and handle their own retries
+    VERIFY: At most one probe per target is in flight; readers never probe
+    """
+
+    def __init__(
+        self,
+        interval: Optional[float] = None,
+        jitter: Optional[float] = None,
+        min_refresh_seconds: Optional[float] = None,
+        random_source: Callable[[], float] = random.random
+    ):
+        self.interval = HEALTH_PROBE_INTERVAL_SECONDS if interval is None else interval
+        self.jitter = HEALTH_PROBE_JITTER if jitter is None else jitter
+        self.min_refresh_seconds = HEALTH_PROBE_MIN_REFRESH_SECONDS if min_refresh_seconds is None else min_refresh_seconds
+        self._random = random_source
+        self._targets: Dict[str, _Target] = {}
+        self._snapshot: Dict[str, Any] = {}
+        self._single_flight = SingleFlight()
+        self._running = False
+        self._redis_retry_after = 0.0
+        self.stats = {"probes": 0, "probe_errors": 0, "coalesced": 0, "refresh_reused": 0, "publish_errors": 0}
+
+    @property
+    def running(self) -> bool:
+        return self._running
+
+    def register(self, name: str, probe: ProbeFn, interval: Optional[float] = None, replace: bool = True) -> bool:
+        """
+        Register a probe for a target.
+
+        Args:
+            name: Target name (snapshot key)
+            probe: Coroutine function called with the target name
+            interval: Seconds between probes (default: prober interval)
+            replace: Swap the probe of an already registered target
+
+        Returns:
+            True when the target's probe changed
+        """
+        target = self._targets.get(name)
+        if target is not None:
+            if target.probe == probe or not replace:
+                return False
+            target.probe = probe
+            if interval is not None:
+                target.interval = interval
+            return True
+
+        target = _Target(probe=probe, interval=self.interval if interval is None else interval)
+        self._targets[name] = target
+        if self._running:
+            self._start_target(name, target)
+        return True
+
+    def unregister(self, name: str, probe: Optional[ProbeFn] = None) -> bool:
+        """Stop probing a target (only if its probe matches, when given)."""
+        target = self._targets.get(name)
+        if target is None or (probe is not None and target.probe != probe):
+            return False
+        del self._targets[name]
+        self._snapshot.pop(name, None)
+        _cancel(target.task)
+        return True
+
+    def start(self) -> None:
+        """Start one probe task per registered target."""
+        self._running = True
+        for name, target in self._targets.items():
+            if target.task is None or target.task.done():
+                self._start_target(name, target)
+
+    async def stop(self) -> None:
+        """Cancel all probe tasks."""
+        self._running = False
+        loop = asyncio.get_running_loop()
+        tasks = []
+        for target in self._targets.values():
+            task, target.task = target.task, None
+            _cancel(task)
+            if task is not None and task.get_loop() is loop:
+                tasks.append(task)
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def next_delay(self, interval: float) -> float:
+        """Interval spread uniformly by +/- jitter."""
+        return max(0.0, interval * (1.0 + self.jitter * (2.0 * self._random() - 1.0)))
+
+    async def probe(self, name: str) -> Any:
+        """Probe a target now, joining a probe already in flight for it."""
+        if name not in self._targets:
+            raise KeyError(f"No health probe registered for {name}")
+        result, shared = await self._single_flight.do(name, lambda: self._run_probe(name))
+        if shared:
+            self.stats["coalesced"] += 1
+        return result
+
+    async def refresh(self, names: Optional[Iterable[str]] = None, max_age: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Probe targets on demand, reusing results younger than max_age.
+
+        Args:
+            names: Targets to refresh (default: all registered)
+            max_age: Seconds a result stays reusable (default: min_refresh_seconds)
+
+        Returns:
+            Dict of target name to latest result (failed probes omitted)
+        """
+        max_age = self.min_refresh_seconds if max_age is None else max_age
+        names = [name for name in (self._targets if names is None else names) if name in self._targets]
+
+        async def refresh_one(name: str) -> Any:
+            if name in self._snapshot and time.monotonic() - self._targets[name].last_probe < max_age:
+                self.stats["refresh_reused"] += 1
+                return self._snapshot[name]
+            return await self.probe(name)
+
+        results = await asyncio.gather(*(refresh_one(name) for name in names), return_exceptions=True)
+        return {name: result for name, result in zip(names, results) if not isinstance(result, BaseException)}
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Latest result per target."""
+        return dict(self._snapshot)
+
+    def get(self, name: str) -> Optional[Any]:
+        """Latest result for one target."""
+        return self._snapshot.get(name)
+
+    async def shared_snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Latest results published by any replica, decoded from Redis."""
+        client = await self._get_redis()
+        if client is None:
+            return {}
+        try:
+            entries = await client.hgetall(HEALTH_SNAPSHOT_KEY)
+        except Exception as e:
+            logger.debug(f"Health snapshot Redis read failed: {e}")
+            self._redis_retry_after = time.monotonic() + REDIS_RETRY_INTERVAL
+            return {}
+        return {name: json.loads(value) for name, value in entries.items()}
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _start_target(self, name: str, target: _Target) -> None:
+        target.task = asyncio.create_task(self._probe_loop(name))
+
+    async def _probe_loop(self, name: str) -> None:
+        """Probe one target forever, starting at a random offset in its interval."""
+        target = self._targets.get(name)
+        if target is None:
+            return
+        await asyncio.sleep(target.interval * self._random())
+        while self._running and self._targets.get(name) is target:
+            try:
+                await self.probe(name)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Health probe for {name} failed: {e}")
+            await asyncio.sleep(self.next_delay(target.interval))
+
+    async def _run_probe(self, name: str) -> Any:
+        target = self._targets[name]
+        target.last_probe = time.monotonic()
+        self.stats["probes"] += 1
+        try:
+            result = await target.probe(name)
+        except Exception:
+            self.stats["probe_errors"] += 1
+            raise
+        await self._publish(name, result)
+        return result
+
+    async def _publish(self, name: str, result: Any) -> None:
+        """Store a result in the snapshot and the shared Redis hash."""
+        if name in self._targets:
+            self._snapshot[name] = result
+
+        client = await self._get_redis()
+        if client is None:
+            return
+        try:
+            payload = json.dumps(asdict(result) if is_dataclass(result) else result, default=_encode)
+            pipe = client.pipeline(transaction=False)
+            pipe.hset(HEALTH_SNAPSHOT_KEY, name, payload)
+            pipe.expire(HEALTH_SNAPSHOT_KEY, int(self.interval * 3) + 1)
+            await pipe.execute()
+        except Exception as e:
+            logger.debug(f"Health snapshot Redis publish failed: {e}")
+            self.stats["publish_errors"] += 1
+            self._redis_retry_after = time.monotonic() + REDIS_RETRY_INTERVAL
+
+    async def _get_redis(self):
+        """Get the shared Redis client, backing off after connection failures."""
+        if time.monotonic() < self._redis_retry_after:
+            return None
+        client = await get_cache_client()
+        if client is None:
+            self._redis_retry_after = time.monotonic() + REDIS_RETRY_INTERVAL
+        return client
+
+
+# Global prober instance
+_health_prober: Optional[HealthProber] = None
+
+
+def get_health_prober() -> HealthProber:
+    """Get global health prober instance."""
+    global _health_prober
+    if _health_prober is None:
+        _health_prober = HealthProber()
+    return _health_prober
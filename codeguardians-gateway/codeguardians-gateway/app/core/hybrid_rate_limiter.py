@@ -0,0 +1,281 @@
+"""
+Hybrid Local/Redis Rate Limiting
+
+Rate limit decisions are made in process; Redis only reconciles budgets:
+- Each worker keeps a GCRA token bucket per rate limit key (client + limit type)
+- Consumption is reported to Redis in batches (one pipelined script call per
+  sync for all dirty keys), which returns the shared bucket debt across replicas
+- A key is synced early once it has consumed error_fraction of its limit
+  locally, so the cross-replica overshoot stays below
+  replicas * error_fraction * limit
+- When Redis is slow or down the limiter fails open to local-only buckets and
+  backs off before retrying
+
+Redis stores one float per key (the GCRA theoretical arrival time) instead of
+one sorted-set member per request.
+"""
+
+import asyncio
+import math
+import os
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from app.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Advance a shared GCRA bucket by ARGV[1] seconds of emission interval and
+# return its debt (TAT - now) in seconds. Redis time is used so replica clock
+# skew does not matter.
+RECONCILE_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local tat = tonumber(redis.call('GET', KEYS[1])) or now
+if tat < now then
+    tat = now
+end
+tat = tat + tonumber(ARGV[1])
+redis.call('SET', KEYS[1], string.format('%.6f', tat), 'PX', math.ceil((tat - now) * 1000) + 1000)
+return string.format('%.6f', tat - now)
+"""
+
+
+class TokenBucket:
+    """
+    Local GCRA view of one shared rate limit.
+
+    The bucket allows `limit` requests as a burst and refills at
+    limit/window per second. `debt` is the shared bucket's TAT - now as of
+    the last sync; `unsynced` counts requests admitted locally since then.
+
+    SAFETY: A bucket never admits more than its limit on its own
+    ASSUMES: Single event loop (no locking needed)
+    VERIFY: Admitted requests are reported to Redis exactly once
+    """
+
+    __slots__ = ("limit", "window", "interval", "debt", "synced_at", "unsynced", "last_used")
+
+    def __init__(self, limit: int, window: float, now: float):
+        self.limit = limit
+        self.window = window
+        self.interval = window / limit
+        self.debt = 0.0
+        self.synced_at = now
+        self.unsynced = 0
+        self.last_used = now
+
+    def current_debt(self, now: float) -> float:
+        return max(0.0, self.debt - (now - self.synced_at))
+
+    def available(self, now: float) -> int:
+        """Requests that can still be admitted right now."""
+        free = (self.window - self.current_debt(now)) / self.interval
+        return int(math.floor(free + 1e-9)) - self.unsynced
+
+    def retry_after(self, now: float) -> float:
+        """Seconds until one more request would be admitted."""
+        pending = self.current_debt(now) + (self.unsynced + 1) * self.interval
+        return max(0.0, pending - self.window)
+
+    def apply_sync(self, reported: int, debt: float, now: float) -> None:
+        """Adopt the shared debt after `reported` requests were sent to Redis."""
+        self.debt = debt
+        self.synced_at = now
+        self.unsynced -= reported
+
+    def absorb(self, reported: int, now: float) -> None:
+        """Account `reported` requests locally when Redis could not take them."""
+        self.debt = self.current_debt(now) + reported * self.interval
+        self.synced_at = now
+        self.unsynced -= reported
+
+
+class HybridRateLimiter:
+    """Local token buckets reconciled with Redis in batches."""
+
+    def __init__(
+        self,
+        redis_factory: Optional[Callable[[], Awaitable[Any]]] = None,
+        sync_interval: float = 0.25,
+        error_fraction: float = 0.05,
+        redis_timeout: float = 0.05,
+        failure_backoff: float = 5.0,
+        key_prefix: str = "rl:gcra:"
+    ):
+        self.redis_factory = redis_factory
+        self.sync_interval = sync_interval
+        self.error_fraction = error_fraction
+        self.redis_timeout = redis_timeout
+        self.failure_backoff = failure_backoff
+        self.key_prefix = key_prefix
+        self.buckets: Dict[str, TokenBucket] = {}
+        self._script = None
+        self._sync_task: Optional[asyncio.Task] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._degraded_until = 0.0
+        self.stats = {"allowed": 0, "denied": 0, "syncs": 0, "sync_failures": 0, "evicted": 0}
+
+    @classmethod
+    def from_env(cls, redis_factory: Optional[Callable[[], Awaitable[Any]]] = None) -> "HybridRateLimiter":
+        """Create a limiter configured from environment variables."""
+        return cls(
+            redis_factory=redis_factory,
+            sync_interval=float(os.getenv("RATE_LIMIT_SYNC_INTERVAL_MS", "250")) / 1000,
+            error_fraction=float(os.getenv("RATE_LIMIT_ERROR_FRACTION", "0.05")),
+            redis_timeout=float(os.getenv("RATE_LIMIT_REDIS_TIMEOUT_MS", "50")) / 1000,
+            failure_backoff=float(os.getenv("RATE_LIMIT_FAILURE_BACKOFF_SECONDS", "5"))
+        )
+
+    @property
+    def degraded(self) -> bool:
+        """True while Redis is being bypassed after a slow or failed sync."""
+        return time.monotonic() < self._degraded_until
+
+    def batch_size(self, bucket: TokenBucket) -> int:
+        """Local consumption that triggers an early sync for a bucket."""
+        return max(1, int(bucket.limit * self.error_fraction))
+
+    def acquire(self, key: str, limit: int, window: float) -> Tuple[bool, Dict[str, Any]]:
+        """
+        Try to admit one request against a limit (no I/O).
+
+        Returns:
+            (allowed, info) with limit, remaining, reset_time and retry_after
+        """
+        now = time.monotonic()
+        bucket = self.buckets.get(key)
+        if bucket is None or bucket.limit != limit or bucket.window != window:
+            previous = bucket
+            bucket = self.buckets[key] = TokenBucket(limit, window, now)
+            if previous is not None:
+                bucket.unsynced = previous.unsynced
+        bucket.last_used = now
+
+        available = bucket.available(now)
+        allowed = available >= 1
+        if allowed:
+            bucket.unsynced += 1
+            self.stats["allowed"] += 1
+            if bucket.unsynced >= self.batch_size(bucket):
+                self._schedule_sync(urgent=True)
+            else:
+                self._schedule_sync()
+        else:
+            self.stats["denied"] += 1
+
+        wall = int(time.time())
+        retry_after = 0 if allowed else int(math.ceil(bucket.retry_after(now)))
+        return allowed, {
+            "limit": limit,
+            "remaining": max(0, available - 1) if allowed else 0,
+            "reset_time": wall + int(math.ceil(bucket.current_debt(now) + bucket.unsynced * bucket.interval)),
+            "retry_after": retry_after
+        }
+
+    def _schedule_sync(self, urgent: bool = False) -> None:
+        if self.redis_factory is None:
+            return
+        if self._sync_task is None or self._sync_task.done():
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                return  # No running loop; sync() can be called explicitly
+            self._wake = asyncio.Event()
+            self._sync_task = loop.create_task(self._sync_loop())
+        if urgent and self._wake is not None:
+            self._wake.set()
+
+    async def _sync_loop(self) -> None:
+        while True:
+            # asyncio.wait (unlike wait_for) never swallows a cancellation that
+            # races with the wake-up
+            waiter = asyncio.ensure_future(self._wake.wait())
+            try:
+                await asyncio.wait({waiter}, timeout=self.sync_interval)
+            finally:
+                waiter.cancel()
+            self._wake.clear()
+            await self.sync()
+            if not self.buckets:
+                return  # Idle: restarted by the next acquire()
+
+    async def sync(self) -> int:
+        """
+        Reconcile locally consumed budgets with Redis.
+
+        Returns:
+            Number of buckets synced with Redis
+        """
+        now = time.monotonic()
+        dirty = [(key, bucket, bucket.unsynced) for key, bucket in self.buckets.items() if bucket.unsynced > 0]
+        self._evict_idle(now)
+        if not dirty:
+            return 0
+
+        if self.degraded or self.redis_factory is None:
+            for _, bucket, reported in dirty:
+                bucket.absorb(reported, now)
+            return 0
+
+        try:
+            debts = await asyncio.wait_for(
+                self._redis_sync([(key, reported * bucket.interval) for key, bucket, reported in dirty]),
+                timeout=self.redis_timeout
+            )
+        except Exception as e:
+            # Fail open: keep limiting locally and stop asking Redis for a while
+            now = time.monotonic()
+            for _, bucket, reported in dirty:
+                bucket.absorb(reported, now)
+            self._degraded_until = now + self.failure_backoff
+            self.stats["sync_failures"] += 1
+            logger.warning(f"Rate limit sync with Redis failed ({type(e).__name__}: {e}); "
+                           f"limiting locally for {self.failure_backoff}s")
+            return 0
+
+        now = time.monotonic()
+        for (_, bucket, reported), debt in zip(dirty, debts):
+            bucket.apply_sync(reported, debt, now)
+        self.stats["syncs"] += 1
+        return len(dirty)
+
+    async def _redis_sync(self, increments: List[Tuple[str, float]]) -> List[float]:
+        """Send (key, seconds) increments in one pipeline; returns shared debts."""
+        redis_client = await self.redis_factory()
+        if self._script is None:
+            self._script = redis_client.register_script(RECONCILE_SCRIPT)
+        pipe = redis_client.pipeline(transaction=False)
+        for key, increment in increments:
+            await self._script(keys=[f"{self.key_prefix}{key}"], args=[f"{increment:.6f}"], client=pipe)
+        return [float(debt) for debt in await pipe.execute()]
+
+    def _evict_idle(self, now: float) -> None:
+        idle = [
+            key for key, bucket in self.buckets.items()
+            if bucket.unsynced == 0 and bucket.current_debt(now) == 0.0 and now - bucket.last_used > bucket.window
+        ]
+        for key in idle:
+            del self.buckets[key]
+        self.stats["evicted"] += len(idle)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get decision and reconciliation counters."""
+        return {
+            **self.stats,
+            "buckets": len(self.buckets),
+            "degraded": self.degraded,
+            "error_fraction": self.error_fraction,
+            "sync_interval_seconds": self.sync_interval
+        }
+
+    async def close(self) -> None:
+        """Stop the sync loop after a final sync."""
+        if self._sync_task and not self._sync_task.done():
+            self._sync_task.cancel()
+            try:
+                await self._sync_task
+            except asyncio.CancelledError:
+                pass
+        self._sync_task = None
+        await self.sync()
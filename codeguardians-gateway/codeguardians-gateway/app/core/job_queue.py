@@ -3,14 +3,28 @@ Background Job Queue System
 
 A Redis-based job queue system for processing background tasks asynchronously.
 Provides persistent job processing that survives application restarts.
+
+Architecture:
+- Ready jobs live in one sorted set per queue and priority, scored by the
+  time they became runnable (FIFO within a priority)
+- Workers block in a single BZPOPMIN across all ready keys in priority
+  order, so a job is picked up as soon as it is enqueued and idle workers
+  send no polling traffic
+- Delayed jobs and retries (exponential backoff) wait in a per-queue
+  schedule set and are moved to their ready key by an atomic Lua script
+  when due
+- The worker pool scales between a minimum and maximum from queue depth
+  and pickup latency
 """
 
 import json
+import os
+import time
 import uuid
 import asyncio
 import logging
 from typing import Dict, Any, List, Optional, Callable, Awaitable
-from datetime import datetime, timedelta
+from datetime import datetime
 from enum import Enum
 
 import redis.asyncio as redis
@@ -21,6 +35,46 @@ from app.utils.logging import get_logger
 
 logger = get_logger(__name__)
 
+# Seconds a worker blocks in BZPOPMIN before re-checking shutdown and scaling
+# (must stay below the Redis client's socket timeout)
+JOB_QUEUE_BLOCK_TIMEOUT_SECONDS = float(os.getenv("JOB_QUEUE_BLOCK_TIMEOUT_SECONDS", "2"))
+
+# Worker pool bounds for autoscaling
+JOB_QUEUE_MIN_WORKERS = int(os.getenv("JOB_QUEUE_MIN_WORKERS", "1"))
+JOB_QUEUE_MAX_WORKERS = int(os.getenv("JOB_QUEUE_MAX_WORKERS", "8"))
+
+# Seconds between autoscaling decisions
+JOB_QUEUE_SCALE_INTERVAL_SECONDS = float(os.getenv("JOB_QUEUE_SCALE_INTERVAL_SECONDS", "2"))
+
+# Mean seconds from runnable to picked up above which workers are added
+JOB_QUEUE_TARGET_PICKUP_SECONDS = float(os.getenv("JOB_QUEUE_TARGET_PICKUP_SECONDS", "0.5"))
+
+# Longest the scheduler sleeps before checking the schedule set again
+JOB_QUEUE_SCHEDULER_MAX_SLEEP_SECONDS = float(os.getenv("JOB_QUEUE_SCHEDULER_MAX_SLEEP_SECONDS", "5"))
+
+# Base delay for retries: retry n waits base * 2^n seconds
+JOB_QUEUE_RETRY_BASE_SECONDS = float(os.getenv("JOB_QUEUE_RETRY_BASE_SECONDS", "1"))
+
+# Maximum jobs promoted from a schedule set per script call
+_PROMOTE_BATCH_SIZE = 100
+
+# Move due jobs from a schedule set to their ready keys.
+# KEYS[1]: schedule set, KEYS[2..]: ready keys in _PRIORITY_ORDER
+# Members are "<priority index>|<job id>", scored by due time.
+# ARGV: now, batch size. Returns {promoted, next due time or ""}.
+PROMOTE_DUE_JOBS_SCRIPT = """
+local due = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'WITHSCORES', 'LIMIT', 0, ARGV[2])
+for i = 1, #due, 2 do
+    local member = due[i]
+    local sep = string.find(member, '|', 1, true)
+    local index = tonumber(string.sub(member, 1, sep - 1))
+    redis.call('ZADD', KEYS[index + 2], due[i + 1], string.sub(member, sep + 1))
+    redis.call('ZREM', KEYS[1], member)
+end
+local nxt = redis.call('ZRANGE', KEYS[1], 0, 0, 'WITHSCORES')
+return {#due / 2, nxt[2] or ''}
+"""
+
 
 class JobStatus(str, Enum):
     """Job status enumeration."""
@@ -57,14 +111,52 @@ class Job(BaseModel):
     queue_name: str = "default"
 
 
+# Ready keys are passed to BZPOPMIN in this order
+_PRIORITY_ORDER = [JobPriority.CRITICAL, JobPriority.HIGH, JobPriority.NORMAL, JobPriority.LOW]
+
+
 class JobQueue:
-    """Redis-based job queue for background processing."""
+    """
+    Redis-based job queue for background processing.
 
-    def __init__(self, redis_client: Optional[redis.Redis] = None):
+    SAFETY: Idle workers block in Redis instead of polling; the pool never
+        exceeds max_workers
+    ASSUMES: A redis.asyncio client whose socket timeout exceeds block_timeout
+    VERIFY: A job is popped by exactly one worker; delayed jobs and retries
+        never run before they are due
+    """
+
+    def __init__(
+        self,
+        redis_client: Optional[redis.Redis] = None,
+        block_timeout: float = JOB_QUEUE_BLOCK_TIMEOUT_SECONDS,
+        scale_interval: float = JOB_QUEUE_SCALE_INTERVAL_SECONDS,
+        target_pickup_seconds: float = JOB_QUEUE_TARGET_PICKUP_SECONDS,
+        scheduler_max_sleep: float = JOB_QUEUE_SCHEDULER_MAX_SLEEP_SECONDS,
+        retry_base_delay: float = JOB_QUEUE_RETRY_BASE_SECONDS
+    ):
         self.redis = redis_client
         self.job_handlers: Dict[str, Callable[[Job], Awaitable[None]]] = {}
+        self.block_timeout = block_timeout
+        self.scale_interval = scale_interval
+        self.target_pickup_seconds = target_pickup_seconds
+        self.scheduler_max_sleep = scheduler_max_sleep
+        self.retry_base_delay = retry_base_delay
+        self.min_workers = JOB_QUEUE_MIN_WORKERS
+        self.max_workers = JOB_QUEUE_MAX_WORKERS
         self._running = False
-        self._workers: List[asyncio.Task] = []
+        self._queues: List[str] = ["default"]
+        self._workers: Dict[int, asyncio.Task] = {}
+        self._next_worker_id = 0
+        self._busy_workers = 0
+        self._retire_requests = 0
+        self._background_tasks: List[asyncio.Task] = []
+        self._schedule_changed = asyncio.Event()
+        self._promote_script = None
+        # Pickup waits observed since the last autoscaling decision
+        self._pickup_wait_total = 0.0
+        self._pickup_count = 0
+        self.stats = {"processed": 0, "failed": 0, "retried": 0, "promoted": 0, "last_pickup_seconds": 0.0}
 
     async def initialize(self):
         """Initialize the job queue with Redis connection."""
@@ -83,7 +175,8 @@ class JobQueue:
         payload: Dict[str, Any] = None,
         priority: JobPriority = JobPriority.NORMAL,
         queue_name: str = "default",
-        max_retries: int = 3
+        max_retries: int = 3,
+        delay_seconds: float = 0
     ) -> str:
         """
         Enqueue a job for background processing.
@@ -94,6 +187,7 @@ class JobQueue:
             priority: Job priority level
             queue_name: Queue to add job to
             max_retries: Maximum retry attempts
+            delay_seconds: Run the job no earlier than this many seconds from now
 
         Returns:
             Job ID
@@ -107,12 +201,11 @@ class JobQueue:
         )
 
         if self.redis:
-            # Store job in Redis
-            job_key = f"job:{job.id}"
-            queue_key = f"queue:{queue_name}:{priority.value}"
-
-            await self.redis.set(job_key, job.model_dump_json())
-            await self.redis.zadd(queue_key, {job.id: self._get_priority_score(priority)})
+            # Store job and make it runnable (or schedule it) in one round trip
+            pipe = self.redis.pipeline(transaction=True)
+            pipe.set(f"job:{job.id}", job.model_dump_json())
+            self._add_to_queue(pipe, job, delay_seconds)
+            await pipe.execute()
 
             logger.info(f"Job {job.id} ({name}) enqueued in {queue_name}:{priority.value}")
         else:
@@ -131,35 +224,58 @@ class JobQueue:
         self.job_handlers[job_name] = handler
         logger.info(f"Registered job handler for: {job_name}")
 
-    async def start_workers(self, num_workers: int = 2, queues: List[str] = None):
+    async def start_workers(
+        self,
+        num_workers: int = 2,
+        queues: List[str] = None,
+        min_workers: Optional[int] = None,
+        max_workers: Optional[int] = None
+    ):
         """
         Start background workers to process jobs.
 
         Args:
             num_workers: Number of worker tasks to start
             queues: List of queue names to process (default: all)
+            min_workers: Fewest workers autoscaling keeps (default: JOB_QUEUE_MIN_WORKERS)
+            max_workers: Most workers autoscaling starts (default: JOB_QUEUE_MAX_WORKERS)
         """
         if queues is None:
             queues = ["default"]
 
+        self._queues = queues
+        self.min_workers = min(num_workers, JOB_QUEUE_MIN_WORKERS if min_workers is None else min_workers)
+        self.max_workers = max(num_workers, JOB_QUEUE_MAX_WORKERS if max_workers is None else max_workers)
         self._running = True
 
-        for i in range(num_workers):
-            worker = asyncio.create_task(self._worker_loop(i, queues))
-            self._workers.append(worker)
-            logger.info(f"Started job worker {i}")
+        for _ in range(num_workers):
+            self._start_worker()
+
+        self._background_tasks = [
+            asyncio.create_task(self._scheduler_loop()),
+            asyncio.create_task(self._autoscale_loop())
+        ]
+
+    def _start_worker(self) -> None:
+        worker_id = self._next_worker_id
+        self._next_worker_id += 1
+        self._workers[worker_id] = asyncio.create_task(self._worker_loop(worker_id, self._queues))
+        logger.info(f"Started job worker {worker_id}")
 
     async def stop_workers(self):
         """Stop all background workers."""
         self._running = False
 
-        # Cancel all worker tasks
-        for worker in self._workers:
-            worker.cancel()
+        # Cancel all worker, scheduler and autoscaler tasks
+        tasks = list(self._workers.values()) + self._background_tasks
+        for task in tasks:
+            task.cancel()
 
         # Wait for workers to finish
-        await asyncio.gather(*self._workers, return_exceptions=True)
+        await asyncio.gather(*tasks, return_exceptions=True)
         self._workers.clear()
+        self._background_tasks = []
+        self._retire_requests = 0
 
         logger.info("All job workers stopped")
 
@@ -167,50 +283,179 @@ class JobQueue:
         """Main worker loop that processes jobs."""
         logger.info(f"Worker {worker_id} started processing queues: {queues}")
 
-        while self._running:
-            try:
-                job = await self._dequeue_job(queues)
-                if job:
-                    await self._process_job(job)
-                else:
-                    # No jobs available, wait before checking again
-                    await asyncio.sleep(1)
-            except Exception as e:
-                logger.error(f"Worker {worker_id} error: {e}")
-                await asyncio.sleep(5)  # Back off on errors
+        try:
+            while self._running:
+                try:
+                    job = await self._dequeue_job(queues)
+                    if job:
+                        self._busy_workers += 1
+                        try:
+                            await self._process_job(job)
+                        finally:
+                            self._busy_workers -= 1
+                    elif self._retire_requests > 0:
+                        # Idle while the pool is shrinking: this worker exits
+                        self._retire_requests -= 1
+                        logger.info(f"Worker {worker_id} retired")
+                        return
+                except Exception as e:
+                    logger.error(f"Worker {worker_id} error: {e}")
+                    await asyncio.sleep(5)  # Back off on errors
+        finally:
+            self._workers.pop(worker_id, None)
+
+    def _ready_keys(self, queues: List[str]) -> List[str]:
+        """Ready keys for the given queues, highest priority first."""
+        return [f"queue:{queue_name}:{priority.value}" for priority in _PRIORITY_ORDER for queue_name in queues]
+
+    def _add_to_queue(self, pipe, job: Job, delay_seconds: float = 0) -> None:
+        """Queue the commands that make a job runnable now or schedule it for later."""
+        if delay_seconds > 0:
+            member = f"{_PRIORITY_ORDER.index(job.priority)}|{job.id}"
+            pipe.zadd(f"queue:{job.queue_name}:delayed", {member: time.time() + delay_seconds})
+            self._schedule_changed.set()
+        else:
+            pipe.zadd(f"queue:{job.queue_name}:{job.priority.value}", {job.id: time.time()})
 
-    async def _dequeue_job(self, queues: List[str]) -> Optional[Job]:
-        """Dequeue the highest priority job from available queues."""
+    async def _dequeue_job(self, queues: List[str], timeout: Optional[float] = None) -> Optional[Job]:
+        """Block until the highest priority job in the given queues is available."""
         if not self.redis:
             return None
 
-        # Check queues in priority order
-        priority_order = [JobPriority.CRITICAL, JobPriority.HIGH, JobPriority.NORMAL, JobPriority.LOW]
+        # One blocking call over all ready keys; Redis serves the first non-empty key
+        result = await self.redis.bzpopmin(
+            self._ready_keys(queues),
+            timeout=self.block_timeout if timeout is None else timeout
+        )
+        if not result:
+            return None
 
-        for priority in priority_order:
-            for queue_name in queues:
-                queue_key = f"queue:{queue_name}:{priority.value}"
+        _, job_id, runnable_at = result
+        wait = max(0.0, time.time() - float(runnable_at))
+        self._pickup_wait_total += wait
+        self._pickup_count += 1
+        self.stats["last_pickup_seconds"] = wait
 
-                # Get the job with highest score (lowest score = highest priority)
-                result = await self.redis.zpopmin(queue_key, 1)
+        job_data = await self.redis.get(f"job:{job_id}")
+        if not job_data:
+            return None
 
-                if result:
-                    job_id = result[0][0]
-                    job_data = await self.redis.get(f"job:{job_id}")
+        job = Job(**json.loads(job_data))
 
-                    if job_data:
-                        job_dict = json.loads(job_data)
-                        job = Job(**job_dict)
+        # Mark job as running
+        job.status = JobStatus.RUNNING
+        job.started_at = datetime.utcnow()
+        await self.redis.set(f"job:{job.id}", job.model_dump_json())
 
-                        # Mark job as running
-                        job.status = JobStatus.RUNNING
-                        job.started_at = datetime.utcnow()
-                        await self.redis.set(f"job:{job.id}", job.model_dump_json())
+        logger.info(f"Dequeued job {job.id} ({job.name})")
+        return job
 
-                        logger.info(f"Dequeued job {job.id} ({job.name})")
-                        return job
+    async def _scheduler_loop(self):
+        """Promote due delayed jobs, sleeping until the next one is due."""
+        while self._running:
+            self._schedule_changed.clear()
+            next_due = None
+            try:
+                next_due = await self._promote_due_jobs(self._queues)
+            except Exception as e:
+                logger.error(f"Job scheduler error: {e}")
 
-        return None
+            sleep = self.scheduler_max_sleep
+            if next_due is not None:
+                sleep = min(sleep, max(0.0, next_due - time.time()))
+            try:
+                await asyncio.wait_for(self._schedule_changed.wait(), timeout=sleep)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _promote_due_jobs(self, queues: List[str]) -> Optional[float]:
+        """
+        Move due jobs from the schedule sets to their ready keys.
+
+        Returns:
+            Time the next scheduled job is due, or None if none are scheduled
+        """
+        if not self.redis:
+            return None
+        if self._promote_script is None:
+            self._promote_script = self.redis.register_script(PROMOTE_DUE_JOBS_SCRIPT)
+
+        next_due = None
+        for queue_name in queues:
+            promoted, queue_next_due = await self._promote_script(
+                keys=[f"queue:{queue_name}:delayed"] + self._ready_keys([queue_name]),
+                args=[time.time(), _PROMOTE_BATCH_SIZE]
+            )
+            promoted = int(promoted)
+            if promoted:
+                self.stats["promoted"] += promoted
+                logger.debug(f"Promoted {promoted} scheduled jobs in {queue_name}")
+            if promoted >= _PROMOTE_BATCH_SIZE:
+                queue_next_due = time.time()  # More are due; run again right away
+            if queue_next_due not in (None, ""):
+                due = float(queue_next_due)
+                next_due = due if next_due is None else min(next_due, due)
+        return next_due
+
+    async def _autoscale_loop(self):
+        """Resize the worker pool every scale_interval seconds."""
+        while self._running:
+            await asyncio.sleep(self.scale_interval)
+            try:
+                await self._autoscale()
+            except Exception as e:
+                logger.error(f"Job queue autoscaling error: {e}")
+
+    async def _autoscale(self) -> int:
+        """Apply one scaling decision; returns the new worker target."""
+        depth = await self.get_queue_depth(self._queues)
+        mean_wait = self._pickup_wait_total / self._pickup_count if self._pickup_count else 0.0
+        self._pickup_wait_total, self._pickup_count = 0.0, 0
+
+        current = len(self._workers) - self._retire_requests
+        desired = self._desired_workers(current, depth, mean_wait)
+
+        if desired > current:
+            add = desired - current
+            # Cancel pending retirements before starting new workers
+            cancelled = min(add, self._retire_requests)
+            self._retire_requests -= cancelled
+            for _ in range(add - cancelled):
+                self._start_worker()
+            logger.info(f"Job workers scaled up to {desired} (depth={depth}, wait={mean_wait:.3f}s)")
+        elif desired < current:
+            self._retire_requests += current - desired
+            logger.info(f"Job workers scaling down to {desired} (depth={depth})")
+        return desired
+
+    def _desired_workers(self, current: int, depth: int, mean_wait: float) -> int:
+        """Worker target from queue depth, busy workers and mean pickup wait."""
+        backlog = depth > 0 and self._busy_workers >= current
+        if backlog or mean_wait > self.target_pickup_seconds:
+            # One more worker per queued job, at most doubling per decision
+            return min(self.max_workers, current + max(1, min(depth, current)))
+        if depth == 0 and self._busy_workers < current:
+            return max(self.min_workers, self._busy_workers, current - 1)
+        return max(self.min_workers, min(self.max_workers, current))
+
+    async def get_queue_depth(self, queues: Optional[List[str]] = None) -> int:
+        """Number of runnable jobs waiting in the given queues."""
+        if not self.redis:
+            return 0
+        pipe = self.redis.pipeline(transaction=False)
+        for key in self._ready_keys(queues or self._queues):
+            pipe.zcard(key)
+        return sum(int(count) for count in await pipe.execute())
+
+    def get_worker_stats(self) -> Dict[str, Any]:
+        """Worker pool size and job counters."""
+        return {
+            "workers": len(self._workers),
+            "busy_workers": self._busy_workers,
+            "min_workers": self.min_workers,
+            "max_workers": self.max_workers,
+            **self.stats
+        }
 
     async def _process_job(self, job: Job):
         """Process a single job."""
@@ -227,6 +472,7 @@ class JobQueue:
             # Mark as completed
             job.status = JobStatus.COMPLETED
             job.completed_at = datetime.utcnow()
+            self.stats["processed"] += 1
 
             logger.info(f"Job {job.id} completed successfully")
 
@@ -240,10 +486,12 @@ class JobQueue:
                 # Re-queue for retry
                 job.status = JobStatus.RETRY
                 await self._requeue_job(job)
+                self.stats["retried"] += 1
                 logger.info(f"Job {job.id} re-queued for retry ({job.retry_count}/{job.max_retries})")
             else:
                 # Mark as failed
                 job.status = JobStatus.FAILED
+                self.stats["failed"] += 1
                 logger.error(f"Job {job.id} failed permanently after {job.max_retries} retries")
 
         # Update job status in Redis
@@ -251,26 +499,16 @@ class JobQueue:
             await self.redis.set(f"job:{job.id}", job.model_dump_json())
 
     async def _requeue_job(self, job: Job):
-        """Re-queue a job for retry."""
+        """Schedule a job for retry (exponential backoff)."""
         if not self.redis:
             return
 
-        # Add delay for retry (exponential backoff)
-        delay_seconds = 2 ** job.retry_count
-        retry_at = datetime.utcnow() + timedelta(seconds=delay_seconds)
+        delay_seconds = self.retry_base_delay * 2 ** job.retry_count
 
-        queue_key = f"queue:{job.queue_name}:{job.priority.value}"
-        await self.redis.zadd(queue_key, {job.id: retry_at.timestamp()})
-
-    def _get_priority_score(self, priority: JobPriority) -> float:
-        """Get priority score for Redis sorted set."""
-        priority_scores = {
-            JobPriority.CRITICAL: 0,
-            JobPriority.HIGH: 1,
-            JobPriority.NORMAL: 2,
-            JobPriority.LOW: 3
-        }
-        return priority_scores.get(priority, 2)
+        pipe = self.redis.pipeline(transaction=True)
+        pipe.set(f"job:{job.id}", job.model_dump_json())
+        self._add_to_queue(pipe, job, delay_seconds)
+        await pipe.execute()
 
     async def get_job_status(self, job_id: str) -> Optional[Job]:
         """Get the status of a job."""
@@ -297,9 +535,11 @@ class JobQueue:
                 job.status = JobStatus.CANCELLED
                 await self.redis.set(f"job:{job_id}", job.model_dump_json())
 
-                # Remove from queue
-                queue_key = f"queue:{job.queue_name}:{job.priority.value}"
-                await self.redis.zrem(queue_key, job_id)
+                # Remove from queue (ready or scheduled)
+                pipe = self.redis.pipeline(transaction=True)
+                pipe.zrem(f"queue:{job.queue_name}:{job.priority.value}", job_id)
+                pipe.zrem(f"queue:{job.queue_name}:delayed", f"{_PRIORITY_ORDER.index(job.priority)}|{job_id}")
+                await pipe.execute()
 
                 logger.info(f"Job {job_id} cancelled")
                 return True
@@ -20,6 +20,7 @@ from fastapi.responses import JSONResponse
 
 from app.core.config import get_settings
 from app.core.response_cache import get_cached_health_check, set_cached_health_check
+from app.core.startup_warmup import get_startup_warmup
 from app.utils.logging import get_logger
 
 logger = get_logger(__name__)
@@ -86,7 +87,8 @@ class OptimizedHealthChecker:
         Readiness check with optional dependency checks.
         
         K8s uses this to determine if container can receive traffic.
-        Can check dependencies but should timeout quickly.
+        Can check dependencies but should timeout quickly. Not ready while
+        startup warm-up (pool, Redis and guard connections) is running.
         
         Args:
             check_dependencies: Whether to check database/Redis (default: True)
@@ -103,6 +105,14 @@ class OptimizedHealthChecker:
         
         is_ready = True
         
+        # New workers take traffic only once their connections are warm
+        warmup = get_startup_warmup()
+        if warmup.started_at is not None:
+            health_data["checks"]["warmup"] = warmup.status()
+        if warmup.is_pending:
+            is_ready = False
+            check_dependencies = False  # Warm-up is connecting them right now
+        
         # Check dependencies with timeouts
         if check_dependencies:
             # Database check (with timeout)
@@ -122,7 +132,10 @@ class OptimizedHealthChecker:
         health_data["response_time_ms"] = round(response_time, 2)
         
         status_code = 200 if is_ready else 503
-        health_data["status"] = "ready" if is_ready else "not_ready"
+        if is_ready:
+            health_data["status"] = "ready"
+        else:
+            health_data["status"] = "warming_up" if warmup.is_pending else "not_ready"
         
         return JSONResponse(
             content=health_data,
@@ -2,7 +2,7 @@
 Health Monitor Component - Production Hardened
 
 Manages health checks for all guard services with:
-- Periodic health monitoring
+- Periodic health monitoring on the shared health prober
 - Retry logic with exponential backoff
 - Health status tracking
 - Production-ready error handling
@@ -16,6 +16,7 @@ import httpx
 from prometheus_client import Counter, Histogram, Gauge
 
 from app.core.guard_orchestrator import ServiceHealth, ServiceStatus, GuardServiceConfig
+from app.core.health_prober import HealthProber, get_health_prober
 from app.utils.logging import get_logger
 
 logger = get_logger(__name__)
@@ -51,16 +52,18 @@ class HealthMonitor:
     - Error resilience
     """
     
-    def __init__(self, http_client: httpx.AsyncClient):
+    def __init__(self, http_client: httpx.AsyncClient, prober: Optional[HealthProber] = None):
         """
         Initialize health monitor.
         
         Args:
             http_client: HTTP client for health checks
+            prober: Shared health prober (default: global instance)
         """
         self.http_client = http_client
         self.health_status: Dict[str, ServiceHealth] = {}
-        self.health_check_task: Optional[asyncio.Task] = None
+        self.prober = prober if prober is not None else get_health_prober()
+        self._services: Dict[str, GuardServiceConfig] = {}
         self._initialized = False
         self._running = False
         
@@ -81,66 +84,25 @@ class HealthMonitor:
         """
         Start periodic health monitoring.
         
-        PRODUCTION: Non-blocking background task with proper cancellation
+        PRODUCTION: Probes are scheduled by the shared prober, one jittered
+        task per service, so no second polling loop runs here
         """
         if self._running:
             return
         
         self._running = True
+        self._services = dict(services)
+        for service_name in self._services:
+            self.prober.register(service_name, self._probe, interval=self.check_interval)
         
         # Perform initial health checks
-        await self.check_all_services(services)
-        
-        # Start background monitoring loop
-        if self.health_check_task is None or self.health_check_task.done():
-            self.health_check_task = asyncio.create_task(self._monitoring_loop(services))
-            self.health_check_task.add_done_callback(self._handle_task_error)
-            logger.info("Health monitoring started")
-    
-    async def _monitoring_loop(self, services: Dict[str, GuardServiceConfig]):
-        """
-        Background monitoring loop.
-        
-        PRODUCTION: Short sleep intervals for faster cancellation
-        """
-        while self._running:
-            try:
-                # Use shorter sleep intervals that can be cancelled more quickly
-                # Split interval into smaller chunks for faster cancellation response
-                sleep_chunks = 6  # 6 x 5 seconds = 30 seconds total
-                for _ in range(sleep_chunks):
-                    if not self._running:
-                        break
-                    await asyncio.sleep(5)  # Shorter sleep allows faster cancellation
-                
-                # Double-check before performing health checks
-                if not self._running:
-                    break
-                
-                await self.check_all_services(services)
-                
-            except asyncio.CancelledError:
-                logger.debug("Health monitoring loop cancelled")
-                raise
-            except Exception as e:
-                logger.error(f"Health monitoring loop error: {e}", exc_info=True)
-                # Continue loop on errors (don't exit)
-                if self._running:
-                    await asyncio.sleep(5)  # Brief delay before retrying
+        await self.prober.refresh(list(self._services), max_age=0)
+        self.prober.start()
+        logger.info("Health monitoring started")
     
-    def _handle_task_error(self, task: asyncio.Task):
-        """Handle errors in health check background task."""
-        try:
-            task.result()
-        except asyncio.CancelledError:
-            logger.debug("Health check task cancelled (expected during shutdown)")
-            return
-        except Exception as e:
-            logger.error(f"Health check background task failed: {e}", exc_info=True)
-            # Restart if still running
-            if self._running and self._initialized:
-                # Note: Would need to restart manually if needed
-                pass
+    async def _probe(self, service_name: str) -> ServiceHealth:
+        """Probe entry point for the shared prober."""
+        return await self.check_service(service_name, self._services[service_name])
     
     async def check_all_services(self, services: Dict[str, GuardServiceConfig]):
         """
@@ -245,15 +207,23 @@ class HealthMonitor:
             logger.warning(f"Health check failed for {service_name}: {e}")
             return health
     
+    def _latest(self, service_name: str) -> Optional[ServiceHealth]:
+        """Latest result from the shared snapshot, else our own last check."""
+        health = self.prober.get(service_name)
+        if isinstance(health, ServiceHealth):
+            return health
+        return self.health_status.get(service_name)
+    
     def get_health_status(self, service_name: Optional[str] = None) -> Dict[str, ServiceHealth]:
         """Get health status for services."""
         if service_name:
-            return {service_name: self.health_status.get(service_name)}
-        return self.health_status.copy()
+            return {service_name: self._latest(service_name)}
+        names = set(self.health_status) | set(self._services)
+        return {name: health for name in names if (health := self._latest(name)) is not None}
     
     def is_service_healthy(self, service_name: str) -> bool:
         """Check if service is healthy."""
-        health = self.health_status.get(service_name)
+        health = self._latest(service_name)
         if not health:
             return False
         return health.status in [ServiceStatus.HEALTHY, ServiceStatus.DEGRADED]
@@ -263,18 +233,8 @@ class HealthMonitor:
         logger.info("Shutting down Health Monitor...")
         self._running = False
         
-        if self.health_check_task:
-            if not self.health_check_task.done():
-                try:
-                    self.health_check_task.cancel()
-                    await asyncio.wait_for(self.health_check_task, timeout=5.0)
-                except asyncio.CancelledError:
-                    pass
-                except asyncio.TimeoutError:
-                    logger.warning("Health check task shutdown timeout")
-                except Exception as e:
-                    logger.error(f"Error cancelling health check task: {e}")
-            self.health_check_task = None
+        for service_name in self._services:
+            self.prober.unregister(service_name, probe=self._probe)
         
         self._initialized = False
         logger.info("Health Monitor shutdown complete")
@@ -85,6 +85,83 @@ GUARDIAN_ZERO_ANALYSIS_DURATION_SECONDS = Histogram(
     buckets=(1.0, 5.0, 10.0, 30.0, 60.0)
 )
 
+# Guard verdict cache metrics
+GUARD_VERDICT_CACHE_LOOKUPS_TOTAL = Counter(
+    'guard_verdict_cache_lookups_total',
+    'Total guard verdict cache lookups',
+    ['service_name', 'result']  # result: hit_memory, hit_redis, miss
+)
+
+GUARD_VERDICT_CACHE_INVALIDATIONS_TOTAL = Counter(
+    'guard_verdict_cache_invalidations_total',
+    'Total guard verdict cache invalidations (guard version changes)',
+    ['service_name']
+)
+
+# Request coalescing metrics
+GUARD_COALESCED_CALLS_TOTAL = Counter(
+    'guard_coalesced_calls_total',
+    'Total guard calls served by joining an identical in-flight upstream call',
+    ['service_name']
+)
+
+# Adaptive concurrency metrics
+GUARD_CONCURRENCY_LIMIT = Gauge(
+    'guard_concurrency_limit',
+    'Current adaptive in-flight limit per guard service',
+    ['service_name']
+)
+
+GUARD_IN_FLIGHT_REQUESTS = Gauge(
+    'guard_in_flight_requests',
+    'Upstream guard calls currently in flight',
+    ['service_name']
+)
+
+GUARD_SHED_TOTAL = Counter(
+    'guard_shed_total',
+    'Total guard calls shed by the concurrency limiter',
+    ['service_name', 'reason']  # reason: queue_full, timeout
+)
+
+# Request hedging metrics
+GUARD_HEDGED_REQUESTS_TOTAL = Counter(
+    'guard_hedged_requests_total',
+    'Total guard calls duplicated to another replica after exceeding the p95',
+    ['service_name', 'winner']  # winner: primary, hedge
+)
+
+# Per-stage orchestration latency (validation, transform, upstream, ...)
+ORCHESTRATOR_STAGE_DURATION_SECONDS = Histogram(
+    'orchestrator_stage_duration_seconds',
+    'Time spent in each orchestration stage per guard',
+    ['service_name', 'stage'],
+    buckets=(0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+)
+
+# Guard metrics write-behind buffer
+GUARD_METRICS_FLUSH_DURATION_SECONDS = Histogram(
+    'guard_metrics_flush_duration_seconds',
+    'Time to bulk-insert one batch of buffered guard metrics',
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+)
+
+GUARD_METRICS_RECORDS_TOTAL = Counter(
+    'guard_metrics_records_total',
+    'Guard operation records handled by the metrics buffer',
+    ['outcome']  # outcome: flushed, dropped, sampled_out, flush_error
+)
+
+GUARD_METRICS_BUFFER_SIZE = Gauge(
+    'guard_metrics_buffer_size',
+    'Guard metrics rows waiting to be written'
+)
+
+GUARD_METRICS_SAMPLE_RATE = Gauge(
+    'guard_metrics_sample_rate',
+    'Fraction of guard operations currently admitted to the metrics buffer'
+)
+
 
 def record_orchestrator_request(service_type: str, status: str, duration: float):
     """Record an orchestrator request."""
@@ -129,3 +206,56 @@ def record_guardian_zero_request(trigger_reason: str, status: str, duration: Opt
     if duration is not None:
         GUARDIAN_ZERO_ANALYSIS_DURATION_SECONDS.observe(duration)
 
+
+def record_verdict_cache_lookup(service_name: str, result: str):
+    """Record a guard verdict cache lookup."""
+    GUARD_VERDICT_CACHE_LOOKUPS_TOTAL.labels(service_name=service_name, result=result).inc()
+
+
+def record_verdict_cache_invalidation(service_name: str):
+    """Record a guard verdict cache invalidation."""
+    GUARD_VERDICT_CACHE_INVALIDATIONS_TOTAL.labels(service_name=service_name).inc()
+
+
+def record_coalesced_call(service_name: str):
+    """Record a guard call coalesced onto an in-flight upstream call."""
+    GUARD_COALESCED_CALLS_TOTAL.labels(service_name=service_name).inc()
+
+
+def update_guard_concurrency(service_name: str, limit: int, in_flight: int):
+    """Update adaptive concurrency metrics for a guard."""
+    GUARD_CONCURRENCY_LIMIT.labels(service_name=service_name).set(limit)
+    GUARD_IN_FLIGHT_REQUESTS.labels(service_name=service_name).set(in_flight)
+
+
+def record_guard_shed(service_name: str, reason: str):
+    """Record a guard call shed by the concurrency limiter."""
+    GUARD_SHED_TOTAL.labels(service_name=service_name, reason=reason).inc()
+
+
+def record_hedged_request(service_name: str, winner: str):
+    """Record a hedged guard call and which attempt answered first."""
+    GUARD_HEDGED_REQUESTS_TOTAL.labels(service_name=service_name, winner=winner).inc()
+
+
+def record_stage_durations(service_name: str, stages: Dict[str, int]):
+    """Record one request's stage durations (nanoseconds)."""
+    for stage, duration_ns in stages.items():
+        ORCHESTRATOR_STAGE_DURATION_SECONDS.labels(service_name=service_name, stage=stage).observe(duration_ns / 1e9)
+
+
+def record_guard_metrics_flush(duration: float, rows: int):
+    """Record one bulk insert of buffered guard metrics."""
+    GUARD_METRICS_FLUSH_DURATION_SECONDS.observe(duration)
+    GUARD_METRICS_RECORDS_TOTAL.labels(outcome="flushed").inc(rows)
+
+
+def record_guard_metrics_records(outcome: str, count: int = 1):
+    """Record guard metrics rows that were dropped, sampled out or failed to flush."""
+    GUARD_METRICS_RECORDS_TOTAL.labels(outcome=outcome).inc(count)
+
+
+def update_guard_metrics_buffer(size: int, sample_rate: float):
+    """Update the guard metrics buffer gauges."""
+    GUARD_METRICS_BUFFER_SIZE.set(size)
+    GUARD_METRICS_SAMPLE_RATE.set(sample_rate)
@@ -7,7 +7,6 @@ FULL MONTY EEAaO: Excellence at Every Level
 - Optimized orchestration
 """
 
-import asyncio
 from typing import List, Dict, Any, Optional
 from datetime import datetime, timezone
 import time
@@ -31,7 +30,8 @@ class ParallelGuardExecutor:
     
     def __init__(self, orchestrator: GuardServiceOrchestrator):
         self.orchestrator = orchestrator
-        self.max_concurrent = 10
+        # None: rely on the per-guard adaptive concurrency limits
+        self.max_concurrent: Optional[int] = None
     
     async def execute_parallel_guards(
         self,
@@ -41,104 +41,124 @@ class ParallelGuardExecutor:
         """
         Execute multiple guard requests in parallel.
         
+        Requests are grouped by guard and packed into batch upstream calls
+        where the guard supports it (see
+        GuardServiceOrchestrator.orchestrate_batch). Results are returned in
+        request order.
+        
         EEAaO: Parallel execution for excellence
         """
         max_concurrent = max_concurrent or self.max_concurrent
-        semaphore = asyncio.Semaphore(max_concurrent)
-        
-        async def execute_with_semaphore(request: OrchestrationRequest):
-            async with semaphore:
-                try:
-                    response = await self.orchestrator.orchestrate_request(request)
-                    return {
-                        "request_id": response.request_id,
-                        "success": response.success,
-                        "data": response.data,
-                        "service_type": response.service_type.value if response.service_type else None,
-                        "processing_time": response.processing_time
-                    }
-                except Exception as e:
-                    from app.core.error_exporter import get_error_exporter
-                    error_exporter = get_error_exporter()
-                    error_exporter.export_error(
-                        e,
-                        context={"operation": "parallel_guard_execution", "service_type": request.service_type.value},
-                        error_code="PARALLEL_GUARD_ERROR",
-                        request_id=request.request_id
-                    )
-                    return {
-                        "request_id": request.request_id,
-                        "success": False,
-                        "error": str(e),
-                        "error_code": getattr(e, 'error_code', 'PARALLEL_GUARD_ERROR')
-                    }
+        results: Dict[str, Dict[str, Any]] = {}
         
         start_time = time.time()
-        results = await asyncio.gather(
-            *[execute_with_semaphore(req) for req in requests],
-            return_exceptions=True
-        )
+        try:
+            async for response in self.orchestrator.orchestrate_batch(requests, max_concurrent=max_concurrent):
+                result = {
+                    "request_id": response.request_id,
+                    "success": response.success,
+                    "data": response.data,
+                    "service_type": response.service_type.value if response.service_type else None,
+                    "processing_time": response.processing_time
+                }
+                if not response.success:
+                    result["error"] = response.error
+                    result["error_code"] = response.error_code
+                results[response.request_id] = result
+        except Exception as e:
+            from app.core.error_exporter import get_error_exporter
+            error_exporter = get_error_exporter()
+            error_exporter.export_error(
+                e,
+                context={"operation": "parallel_guard_execution", "requests": len(requests)},
+                error_code="PARALLEL_GUARD_ERROR"
+            )
+            for request in requests:
+                results.setdefault(request.request_id, {
+                    "request_id": request.request_id,
+                    "success": False,
+                    "error": str(e),
+                    "error_code": getattr(e, 'error_code', 'PARALLEL_GUARD_ERROR')
+                })
         total_time = time.time() - start_time
         
         logger.info(
             f"Parallel guard execution completed: {len(requests)} requests in {total_time:.2f}s"
         )
         
-        return [r for r in results if not isinstance(r, Exception)]
+        return [results[request.request_id] for request in requests if request.request_id in results]
     
     async def execute_multi_guard_pipeline(
         self,
         request: OrchestrationRequest,
-        guard_sequence: List[GuardServiceType]
+        guard_sequence: List[GuardServiceType],
+        guard_timeout: Optional[float] = None,
+        stop_on_block: bool = False
     ) -> Dict[str, Any]:
         """
-        Execute multiple guards in sequence with parallel optimization.
+        Execute multiple guards against one request concurrently.
+        
+        The request is validated and enriched once, then fanned out to every
+        guard in guard_sequence at the same time (see
+        GuardServiceOrchestrator.orchestrate_fan_out).
         
         EEAaO: Pipeline optimization for excellence
         """
-        results = {}
         start_time = time.time()
         
-        # Execute guards in sequence but optimize each step
-        for guard_type in guard_sequence:
-            guard_request = OrchestrationRequest(
-                request_id=f"{request.request_id}-{guard_type.value}",
-                service_type=guard_type,
-                payload=request.payload,
-                user_id=request.user_id,
-                session_id=request.session_id,
-                priority=request.priority,
-                timeout=request.timeout,
-                fallback_enabled=request.fallback_enabled
+        try:
+            fan_out = await self.orchestrator.orchestrate_fan_out(
+                request,
+                guard_sequence,
+                guard_timeout=guard_timeout,
+                stop_on_block=stop_on_block
             )
-            
-            try:
-                response = await self.orchestrator.orchestrate_request(guard_request)
-                results[guard_type.value] = {
-                    "success": response.success,
-                    "data": response.data,
-                    "processing_time": response.processing_time
-                }
-            except Exception as e:
-                from app.core.error_exporter import get_error_exporter
-                error_exporter = get_error_exporter()
-                error_exporter.export_error(
-                    e,
-                    context={"operation": "guard_pipeline_step", "guard_type": guard_type.value},
-                    error_code="GUARD_PIPELINE_ERROR",
-                    request_id=request.request_id
-                )
-                results[guard_type.value] = {
-                    "success": False,
-                    "error": str(e),
-                    "error_code": getattr(e, 'error_code', 'GUARD_PIPELINE_ERROR')
-                }
+        except Exception as e:
+            from app.core.error_exporter import get_error_exporter
+            error_exporter = get_error_exporter()
+            error_exporter.export_error(
+                e,
+                context={"operation": "guard_pipeline_fan_out", "guard_sequence": [g.value for g in guard_sequence]},
+                error_code="GUARD_PIPELINE_ERROR",
+                request_id=request.request_id
+            )
+            return {
+                "results": {
+                    guard_type.value: {
+                        "success": False,
+                        "error": str(e),
+                        "error_code": getattr(e, 'error_code', 'GUARD_PIPELINE_ERROR')
+                    }
+                    for guard_type in guard_sequence
+                },
+                "total_time": time.time() - start_time,
+                "sequence": [g.value for g in guard_sequence],
+                "blocked": False,
+                "blocking_service": None,
+                "cancelled": [],
+                "timed_out": []
+            }
+        
+        results = {}
+        for service_name, response in fan_out.responses.items():
+            result = {
+                "success": response.success,
+                "data": response.data,
+                "processing_time": response.processing_time
+            }
+            if not response.success:
+                result["error"] = response.error
+                result["error_code"] = response.error_code
+            results[service_name] = result
         
         total_time = time.time() - start_time
         
         return {
             "results": results,
             "total_time": total_time,
-            "sequence": [g.value for g in guard_sequence]
+            "sequence": [g.value for g in guard_sequence],
+            "blocked": fan_out.blocked,
+            "blocking_service": fan_out.blocking_service,
+            "cancelled": fan_out.cancelled_services,
+            "timed_out": fan_out.timed_out_services
         }
-
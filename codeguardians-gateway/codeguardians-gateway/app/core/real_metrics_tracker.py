@@ -15,6 +15,7 @@ from app.core.database import get_session_factory
 from app.core.models import Base
 from app.core.centralized_database import GuardOperation, GuardMetrics
 from app.core.centralized_redis import CentralizedRedis
+from app.core.guard_metrics_buffer import GuardMetricsBuffer, get_guard_metrics_buffer
 
 import logging
 
@@ -24,8 +25,9 @@ logger = logging.getLogger(__name__)
 class RealMetricsTracker:
     """Tracks real metrics from guard operations."""
     
-    def __init__(self):
-        # Use the existing database session factory
+    def __init__(self, metrics_buffer: Optional[GuardMetricsBuffer] = None):
+        # Operation and metric rows are bulk-inserted by the write-behind buffer
+        self.metrics_buffer = metrics_buffer if metrics_buffer is not None else get_guard_metrics_buffer()
         self._redis = None
     
     async def _get_db_session(self):
@@ -51,7 +53,7 @@ class RealMetricsTracker:
         user_id: Optional[str] = None,
         session_id: Optional[str] = None
     ):
-        """Record a guard operation and extract metrics."""
+        """Record a guard operation and extract metrics (rows are written by the metrics buffer)."""
         try:
             # Normalize response data (handle wrapped responses)
             metrics_data = response_data
@@ -64,157 +66,20 @@ class RealMetricsTracker:
                 elif "data" in response_data:
                     metrics_data = response_data["data"]
             
-            # Store operation in database
-            session = await self._get_db_session()
-            if session:
-                try:
-                    operation = GuardOperation(
-                        guard_name=guard_name,
-                        operation_type="process",
-                        input_data={},
-                        output_data=metrics_data,
-                        processing_time_ms=processing_time,
-                        success=success,
-                        user_id=user_id,
-                        session_id=session_id
-                    )
-                    session.add(operation)
-                    await session.commit()
-                except Exception as e:
-                    await session.rollback()
-                    logger.error(f"Error storing guard operation: {e}", exc_info=True)
-                finally:
-                    try:
-                        await session.close()
-                    except Exception as e:
-                        logger.error(f"Error closing session: {e}")
-            
-            # Extract and store metrics based on guard type
-            if guard_name == "tokenguard":
-                # TokenGuard returns: tokens_saved, cost_savings_usd, compression_ratio
-                tokens_saved = metrics_data.get("tokens_saved") or metrics_data.get("total_tokens_saved", 0)
-                cost_savings = metrics_data.get("cost_savings_usd") or metrics_data.get("cost_savings", 0.0)
-                
-                if tokens_saved > 0:
-                    session = await self._get_db_session()
-                    if session:
-                        try:
-                            metric = GuardMetrics(
-                                guard_name=guard_name,
-                                metric_type="tokens_saved",
-                                metric_value=float(tokens_saved),
-                                metric_data={"cost_savings_usd": cost_savings}
-                            )
-                            session.add(metric)
-                            await session.commit()
-                        except Exception as e:
-                            await session.rollback()
-                            logger.error(f"Error storing metrics: {e}", exc_info=True)
-                        finally:
-                            try:
-                                await session.close()
-                            except Exception as e:
-                                logger.error(f"Error closing session: {e}")
-            
-            elif guard_name == "trustguard":
-                # TrustGuard returns: trust_score, violations_blocked, compliance_score
-                violations_blocked = metrics_data.get("violations_blocked") or (1 if metrics_data.get("trust_score", 0) < 0.5 else 0)
-                compliance_score = metrics_data.get("compliance_score") or metrics_data.get("trust_score", 1.0)
-                
-                if violations_blocked > 0:
-                    session = await self._get_db_session()
-                    if session:
-                        try:
-                            metric = GuardMetrics(
-                                guard_name=guard_name,
-                                metric_type="violations_blocked",
-                                metric_value=float(violations_blocked),
-                                metric_data={"compliance_score": compliance_score}
-                            )
-                            session.add(metric)
-                            await session.commit()
-                        except Exception as e:
-                            await session.rollback()
-                            logger.error(f"Error storing metrics: {e}", exc_info=True)
-                        finally:
-                            try:
-                                await session.close()
-                            except Exception as e:
-                                logger.error(f"Error closing session: {e}")
-            
-            elif guard_name == "biasguard":
-                # BiasGuard returns: bias_detected (bool), bias_score, bias_types
-                bias_detected = 1 if metrics_data.get("bias_detected", False) else 0
-                bias_score = metrics_data.get("bias_score", 0.0)
-                
-                session = await self._get_db_session()
-                if session:
-                    try:
-                        metric = GuardMetrics(
-                            guard_name=guard_name,
-                            metric_type="bias_detected",
-                            metric_value=float(bias_detected),
-                            metric_data={"bias_score": bias_score, "bias_types": metrics_data.get("bias_types", [])}
-                        )
-                        session.add(metric)
-                        await session.commit()
-                    except Exception as e:
-                        await session.rollback()
-                        logger.error(f"Error storing metrics: {e}", exc_info=True)
-                    finally:
-                        try:
-                            await session.close()
-                        except Exception as e:
-                            logger.error(f"Error closing session: {e}")
-            
-            elif guard_name == "contextguard":
-                # ContextGuard returns: success, context_id, stored_data
-                contexts_stored = 1 if metrics_data.get("success", False) else 0
-                relevance_score = metrics_data.get("relevance_score", 0.0)
-                
-                session = await self._get_db_session()
-                if session:
-                    try:
-                        metric = GuardMetrics(
-                            guard_name=guard_name,
-                            metric_type="contexts_stored",
-                            metric_value=float(contexts_stored),
-                            metric_data={"relevance_score": relevance_score}
-                        )
-                        session.add(metric)
-                        await session.commit()
-                    except Exception as e:
-                        await session.rollback()
-                        logger.error(f"Error storing metrics: {e}", exc_info=True)
-                    finally:
-                        try:
-                            await session.close()
-                        except Exception as e:
-                            logger.error(f"Error closing session: {e}")
-            
-            elif guard_name == "healthguard":
-                # HealthGuard returns: is_poisoned, confidence, details
-                health_score = metrics_data.get("confidence", 0.0) if not metrics_data.get("is_poisoned", False) else 0.0
-                
-                session = await self._get_db_session()
-                if session:
-                    try:
-                        metric = GuardMetrics(
-                            guard_name=guard_name,
-                            metric_type="health_score",
-                            metric_value=health_score,
-                            metric_data={"is_poisoned": metrics_data.get("is_poisoned", False)}
-                        )
-                        session.add(metric)
-                        await session.commit()
-                    except Exception as e:
-                        await session.rollback()
-                        logger.error(f"Error storing metrics: {e}", exc_info=True)
-                    finally:
-                        try:
-                            await session.close()
-                        except Exception as e:
-                            logger.error(f"Error closing session: {e}")
+            # Buffer operation and metrics rows; no database round trip here
+            self.metrics_buffer.record(
+                {
+                    "guard_name": guard_name,
+                    "operation_type": "process",
+                    "input_data": {},
+                    "output_data": metrics_data,
+                    "processing_time_ms": processing_time,
+                    "success": success,
+                    "user_id": user_id,
+                    "session_id": session_id
+                },
+                self._extract_metrics(guard_name, metrics_data)
+            )
             
             # Cache metrics in Redis for fast access
             redis = await self._get_redis()
@@ -224,6 +89,69 @@ class RealMetricsTracker:
         except Exception as e:
             logger.error(f"Error recording guard operation metrics: {e}")
     
+    def _extract_metrics(self, guard_name: str, metrics_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Build GuardMetrics rows from a guard response based on guard type."""
+        if guard_name == "tokenguard":
+            # TokenGuard returns: tokens_saved, cost_savings_usd, compression_ratio
+            tokens_saved = metrics_data.get("tokens_saved") or metrics_data.get("total_tokens_saved", 0)
+            cost_savings = metrics_data.get("cost_savings_usd") or metrics_data.get("cost_savings", 0.0)
+            
+            if tokens_saved > 0:
+                return [{
+                    "guard_name": guard_name,
+                    "metric_type": "tokens_saved",
+                    "metric_value": float(tokens_saved),
+                    "metric_data": {"cost_savings_usd": cost_savings}
+                }]
+        
+        elif guard_name == "trustguard":
+            # TrustGuard returns: trust_score, violations_blocked, compliance_score
+            violations_blocked = metrics_data.get("violations_blocked") or (1 if metrics_data.get("trust_score", 0) < 0.5 else 0)
+            compliance_score = metrics_data.get("compliance_score") or metrics_data.get("trust_score", 1.0)
+            
+            if violations_blocked > 0:
+                return [{
+                    "guard_name": guard_name,
+                    "metric_type": "violations_blocked",
+                    "metric_value": float(violations_blocked),
+                    "metric_data": {"compliance_score": compliance_score}
+                }]
+        
+        elif guard_name == "biasguard":
+            # BiasGuard returns: bias_detected (bool), bias_score, bias_types
+            bias_detected = 1 if metrics_data.get("bias_detected", False) else 0
+            return [{
+                "guard_name": guard_name,
+                "metric_type": "bias_detected",
+                "metric_value": float(bias_detected),
+                "metric_data": {
+                    "bias_score": metrics_data.get("bias_score", 0.0),
+                    "bias_types": metrics_data.get("bias_types", [])
+                }
+            }]
+        
+        elif guard_name == "contextguard":
+            # ContextGuard returns: success, context_id, stored_data
+            contexts_stored = 1 if metrics_data.get("success", False) else 0
+            return [{
+                "guard_name": guard_name,
+                "metric_type": "contexts_stored",
+                "metric_value": float(contexts_stored),
+                "metric_data": {"relevance_score": metrics_data.get("relevance_score", 0.0)}
+            }]
+        
+        elif guard_name == "healthguard":
+            # HealthGuard returns: is_poisoned, confidence, details
+            health_score = metrics_data.get("confidence", 0.0) if not metrics_data.get("is_poisoned", False) else 0.0
+            return [{
+                "guard_name": guard_name,
+                "metric_type": "health_score",
+                "metric_value": health_score,
+                "metric_data": {"is_poisoned": metrics_data.get("is_poisoned", False)}
+            }]
+        
+        return []
+    
     async def _update_redis_metrics(self, guard_name: str, response_data: Dict[str, Any]):
         """Update Redis metrics cache."""
         try:
@@ -273,18 +201,19 @@ class RealMetricsTracker:
                 # Get operations count
                 cutoff_time = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(hours=time_window_hours)
                 
-                # Count total requests
-                total_requests_query = select(func.count(GuardOperation.id)).where(
+                # Count total requests (rows kept while sampling stand for
+                # sample_weight operations, so weights are summed, not rows counted)
+                total_requests_query = select(func.sum(GuardOperation.sample_weight)).where(
                     GuardOperation.created_at >= cutoff_time
                 )
                 total_requests_result = await session.execute(total_requests_query)
-                total_requests = total_requests_result.scalar() or 0
+                total_requests = int(round(total_requests_result.scalar() or 0))
                 
                 # Aggregate metrics by guard
                 guard_metrics = {}
                 for guard_name in ["tokenguard", "trustguard", "contextguard", "biasguard", "healthguard"]:
                     # Get operations for this guard
-                    guard_ops_query = select(func.count(GuardOperation.id)).where(
+                    guard_ops_query = select(func.sum(GuardOperation.sample_weight)).where(
                         and_(
                             GuardOperation.guard_name == guard_name,
                             GuardOperation.created_at >= cutoff_time,
@@ -292,7 +221,7 @@ class RealMetricsTracker:
                         )
                     )
                     guard_ops_result = await session.execute(guard_ops_query)
-                    requests_processed = guard_ops_result.scalar() or 0
+                    requests_processed = int(round(guard_ops_result.scalar() or 0))
                     
                     # Get metrics for this guard
                     tokens_saved = 0
@@ -301,7 +230,7 @@ class RealMetricsTracker:
                     bias_detected = 0
                     
                     if guard_name == "tokenguard":
-                        tokens_query = select(func.sum(GuardMetrics.metric_value)).where(
+                        tokens_query = select(func.sum(GuardMetrics.metric_value * GuardMetrics.sample_weight)).where(
                             and_(
                                 GuardMetrics.guard_name == guard_name,
                                 GuardMetrics.metric_type == "tokens_saved",
@@ -322,7 +251,7 @@ class RealMetricsTracker:
                         # Note: JSON extraction may need adjustment based on DB type
                     
                     elif guard_name == "trustguard":
-                        violations_query = select(func.sum(GuardMetrics.metric_value)).where(
+                        violations_query = select(func.sum(GuardMetrics.metric_value * GuardMetrics.sample_weight)).where(
                             and_(
                                 GuardMetrics.guard_name == guard_name,
                                 GuardMetrics.metric_type == "violations_blocked",
@@ -333,7 +262,7 @@ class RealMetricsTracker:
                         violations_blocked = int(violations_result.scalar() or 0)
                     
                     elif guard_name == "biasguard":
-                        bias_query = select(func.sum(GuardMetrics.metric_value)).where(
+                        bias_query = select(func.sum(GuardMetrics.metric_value * GuardMetrics.sample_weight)).where(
                             and_(
                                 GuardMetrics.guard_name == guard_name,
                                 GuardMetrics.metric_type == "bias_detected",
@@ -0,0 +1,249 @@
+"""
+Hedged Requests for Guard Calls
+
+Cuts tail latency caused by occasional slow guard replicas:
+- Each guard's recent upstream latencies give a rolling p95
+- A call still unanswered after the p95 gets a duplicate sent to another replica
+- The first successful answer wins and the other attempt is cancelled; a
+  fast error answer (e.g. HTTP 5xx/429) does not count as success
+- Hedges draw from a budget capped at a percentage of traffic, so hedging
+  cannot double the load on a guard that is slow everywhere
+"""
+
+import asyncio
+import os
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional
+
+from app.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+try:
+    from app.core.orchestrator_metrics import record_hedged_request
+    METRICS_ENABLED = True
+except ImportError:
+    METRICS_ENABLED = False
+
+
+class LatencyTracker:
+    """
+    Rolling latency percentile for one guard.
+
+    SAFETY: No percentile until min_samples calls have been seen (no hedging on cold start)
+    ASSUMES: Single event loop (no locking needed)
+    VERIFY: Percentile is refreshed at least every refresh_every samples
+    """
+
+    def __init__(self, window: int = 200, min_samples: int = 20, refresh_every: int = 10):
+        self.samples: Deque[float] = deque(maxlen=window)
+        self.min_samples = min_samples
+        self.refresh_every = refresh_every
+        self._since_refresh = 0
+        self._p95: Optional[float] = None
+
+    def record(self, latency: float) -> None:
+        self.samples.append(latency)
+        self._since_refresh += 1
+        if self._since_refresh >= self.refresh_every or self._p95 is None:
+            self._refresh()
+
+    def p95(self) -> Optional[float]:
+        if len(self.samples) < self.min_samples:
+            return None
+        return self._p95
+
+    def _refresh(self) -> None:
+        self._since_refresh = 0
+        ordered = sorted(self.samples)
+        self._p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+
+
+class HedgeBudget:
+    """
+    Token bucket limiting hedges to a share of traffic.
+
+    Every call earns budget_percent/100 tokens; a hedge spends one.
+    """
+
+    def __init__(self, budget_percent: float = 5.0, burst: float = 10.0):
+        self.ratio = max(0.0, budget_percent) / 100.0
+        self.burst = burst
+        self.tokens = 0.0
+
+    def earn(self) -> None:
+        self.tokens = min(self.burst, self.tokens + self.ratio)
+
+    def try_spend(self) -> bool:
+        # Tolerance for float accumulation of fractional earnings
+        if self.tokens >= 1.0 - 1e-9:
+            self.tokens = max(0.0, self.tokens - 1.0)
+            return True
+        return False
+
+
+class RequestHedger:
+    """Hedges guard calls using per-guard latency trackers and budgets."""
+
+    def __init__(
+        self,
+        enabled: bool = False,
+        budget_percent: float = 5.0,
+        min_samples: int = 20,
+        min_delay: float = 0.01
+    ):
+        self.enabled = enabled
+        self.budget_percent = budget_percent
+        self.min_samples = min_samples
+        self.min_delay = min_delay
+        self.trackers: Dict[str, LatencyTracker] = {}
+        self.budgets: Dict[str, HedgeBudget] = {}
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    @classmethod
+    def from_env(cls) -> "RequestHedger":
+        """Create a hedger configured from environment variables."""
+        return cls(
+            enabled=os.getenv("GUARD_HEDGING_ENABLED", "false").lower() == "true",
+            budget_percent=float(os.getenv("GUARD_HEDGING_BUDGET_PERCENT", "5")),
+            min_samples=int(os.getenv("GUARD_HEDGING_MIN_SAMPLES", "20")),
+            min_delay=float(os.getenv("GUARD_HEDGING_MIN_DELAY_MS", "10")) / 1000.0
+        )
+
+    async def run(
+        self,
+        service_name: str,
+        primary: Callable[[], Awaitable[Any]],
+        hedge: Optional[Callable[[], Awaitable[Any]]] = None,
+        is_success: Optional[Callable[[Any], bool]] = None
+    ) -> Any:
+        """
+        Run a guard call, hedging it if it outlives the guard's p95.
+
+        Args:
+            service_name: Guard the call goes to
+            primary: Zero-argument coroutine function for the primary attempt
+            hedge: Zero-argument coroutine function sending the duplicate to
+                another replica (None disables hedging for this call)
+            is_success: Predicate on an attempt's result; results it rejects
+                (such as error responses) do not win the race
+
+        Returns:
+            Result of the first attempt that succeeds; if neither does, the
+            primary attempt's result or exception
+        """
+        tracker = self._tracker(service_name)
+        stats = self._service_stats(service_name)
+        stats["requests"] += 1
+        start = time.perf_counter()
+
+        delay = tracker.p95() if self.enabled and hedge is not None else None
+        if delay is None:
+            result = await primary()
+            tracker.record(time.perf_counter() - start)
+            self._budget(service_name).earn()
+            return result
+
+        budget = self._budget(service_name)
+        budget.earn()
+        primary_task = asyncio.ensure_future(primary())
+        try:
+            done, _ = await asyncio.wait({primary_task}, timeout=max(delay, self.min_delay))
+            if done or not budget.try_spend():
+                result = await primary_task
+                tracker.record(time.perf_counter() - start)
+                return result
+
+            stats["hedged"] += 1
+            hedge_task = asyncio.ensure_future(hedge())
+            try:
+                winner = await self._first_success(primary_task, hedge_task, is_success)
+            finally:
+                for task in (primary_task, hedge_task):
+                    if not task.done():
+                        task.cancel()
+        finally:
+            if not primary_task.done():
+                primary_task.cancel()
+
+        won_by_hedge = winner is hedge_task
+        if won_by_hedge:
+            stats["hedge_wins"] += 1
+        tracker.record(time.perf_counter() - start)
+        if METRICS_ENABLED:
+            try:
+                record_hedged_request(service_name, "hedge" if won_by_hedge else "primary")
+            except Exception:
+                pass
+        return winner.result()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get per-guard hedge rate and win rate."""
+        guards = {}
+        for name, stats in self._stats.items():
+            tracker = self.trackers.get(name)
+            guards[name] = {
+                **stats,
+                "hedge_rate": stats["hedged"] / stats["requests"] if stats["requests"] else 0.0,
+                "win_rate": stats["hedge_wins"] / stats["hedged"] if stats["hedged"] else 0.0,
+                "p95_seconds": tracker.p95() if tracker else None,
+            }
+        return {
+            "enabled": self.enabled,
+            "budget_percent": self.budget_percent,
+            "guards": guards,
+        }
+
+    @staticmethod
+    async def _first_success(
+        primary_task: asyncio.Future,
+        hedge_task: asyncio.Future,
+        is_success: Optional[Callable[[Any], bool]] = None
+    ) -> asyncio.Future:
+        """Wait for the first attempt that succeeds (a fast failure does not win)."""
+        pending = {primary_task, hedge_task}
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.cancelled() or task.exception() is not None:
+                    continue
+                if is_success is None or is_success(task.result()):
+                    return task
+        # Both failed: surface the primary attempt's error or error result
+        if not hedge_task.cancelled():
+            hedge_task.exception()
+        return primary_task
+
+    def _tracker(self, service_name: str) -> LatencyTracker:
+        tracker = self.trackers.get(service_name)
+        if tracker is None:
+            tracker = LatencyTracker(min_samples=self.min_samples)
+            self.trackers[service_name] = tracker
+        return tracker
+
+    def _budget(self, service_name: str) -> HedgeBudget:
+        budget = self.budgets.get(service_name)
+        if budget is None:
+            budget = HedgeBudget(self.budget_percent)
+            self.budgets[service_name] = budget
+        return budget
+
+    def _service_stats(self, service_name: str) -> Dict[str, int]:
+        stats = self._stats.get(service_name)
+        if stats is None:
+            stats = {"requests": 0, "hedged": 0, "hedge_wins": 0}
+            self._stats[service_name] = stats
+        return stats
+
+
+# Global hedger instance
+_request_hedger: Optional[RequestHedger] = None
+
+
+def get_request_hedger() -> RequestHedger:
+    """Get global request hedger instance."""
+    global _request_hedger
+    if _request_hedger is None:
+        _request_hedger = RequestHedger.from_env()
+    return _request_hedger
@@ -3,14 +3,26 @@ Response Caching Module
 
 Provides Redis-backed response caching for API endpoints.
 Includes health check caching for optimized Kubernetes probes.
+
+Invalidation:
+- Tags (tenant, guard, endpoint, ...): each tag is a Redis set of the cache
+  keys carrying it; invalidate_cache_tags() unlinks exactly those keys
+- Generations: entries record the generation counter of their generation
+  tags; bump_cache_generation() is one INCR and stale entries simply miss
+- Patterns: invalidate_cache() walks the keyspace with SCAN and batched
+  UNLINK (never KEYS)
+
+cache_response() can serve stale entries for stale_ttl seconds while one
+background task refreshes them, so hot entries do not expire under load.
 """
 
+import asyncio
 import json
 import hashlib
-from typing import Optional, Dict, Any, Callable
+import time
+from typing import Optional, Dict, Any, AsyncIterator, Awaitable, Callable, Iterable, List, Set, Tuple
 from functools import wraps
 import redis.asyncio as redis
-from datetime import timedelta
 
 from app.core.config import get_settings
 from app.utils.logging import get_logger
@@ -21,6 +33,22 @@ settings = get_settings()
 # Global Redis client for caching
 _cache_client: Optional[redis.Redis] = None
 
+# Redis set of cache keys per tag
+CACHE_TAG_PREFIX = "cache:tag:"
+
+# Generation counter per generation tag
+CACHE_GENERATION_PREFIX = "cache:gen:"
+
+# Keys per SCAN/SSCAN page and per UNLINK call during sweeps
+_SWEEP_BATCH_SIZE = 500
+
+# Seconds a replica holds the lock for a background refresh
+_REFRESH_LOCK_SECONDS = 30
+
+# Stale entries being refreshed by this process
+_refreshing: Set[str] = set()
+_refresh_tasks: Set[asyncio.Task] = set()
+
 
 async def get_cache_client() -> Optional[redis.Redis]:
     """Get or create Redis cache client."""
@@ -83,19 +111,32 @@ async def get_cached_response(cache_key: str) -> Optional[Dict[str, Any]]:
 async def set_cached_response(
     cache_key: str,
     data: Dict[str, Any],
-    ttl: int = 300
+    ttl: int = 300,
+    tags: Optional[Iterable[str]] = None
 ) -> bool:
-    """Set cached response."""
+    """
+    Set cached response.
+    
+    Each tag is a Redis set of the cache keys carrying it; the set lives as
+    long as its longest-lived member (EXPIRE NX then GT, Redis >= 7).
+    """
     client = await get_cache_client()
     if not client:
         return False
     
     try:
-        await client.setex(
+        pipe = client.pipeline(transaction=False)
+        pipe.setex(
             cache_key,
             ttl,
             json.dumps(data, default=str)
         )
+        for tag in tags or ():
+            tag_key = f"{CACHE_TAG_PREFIX}{tag}"
+            pipe.sadd(tag_key, cache_key)
+            pipe.expire(tag_key, ttl, nx=True)
+            pipe.expire(tag_key, ttl, gt=True)
+        await pipe.execute()
         return True
     except Exception as e:
         logger.debug(f"Cache set failed: {e}")
@@ -103,28 +144,182 @@ async def set_cached_response(
 
 
 async def invalidate_cache(pattern: str) -> int:
-    """Invalidate cache entries matching pattern."""
+    """
+    Invalidate cache entries matching pattern.
+    
+    Walks the keyspace with SCAN and removes matches with batched UNLINK, so
+    Redis is never blocked by KEYS. Prefer invalidate_cache_tags() or
+    bump_cache_generation() for targeted invalidation; this is the fallback
+    for large sweeps.
+    """
     client = await get_cache_client()
     if not client:
         return 0
     
     try:
-        keys = await client.keys(pattern)
-        if keys:
-            return await client.delete(*keys)
-        return 0
+        return await _unlink_in_batches(client, client.scan_iter(match=pattern, count=_SWEEP_BATCH_SIZE))
     except Exception as e:
         logger.debug(f"Cache invalidation failed: {e}")
         return 0
 
 
-def cache_response(ttl: int = 300, key_params: list = None):
+async def invalidate_cache_tags(*tags: str) -> int:
+    """
+    Remove every cached response carrying any of the given tags.
+    
+    Args:
+        tags: Tags such as "tenant:42", "guard:tokenguard" or "endpoint:<name>"
+        
+    Returns:
+        Number of cache entries removed
+    """
+    client = await get_cache_client()
+    if not client:
+        return 0
+    
+    removed = 0
+    for tag in tags:
+        tag_key = f"{CACHE_TAG_PREFIX}{tag}"
+        try:
+            removed += await _unlink_in_batches(client, client.sscan_iter(tag_key, count=_SWEEP_BATCH_SIZE))
+            await client.unlink(tag_key)
+        except Exception as e:
+            logger.debug(f"Cache tag invalidation failed for {tag}: {e}")
+    return removed
+
+
+async def bump_cache_generation(*tags: str) -> Dict[str, int]:
+    """
+    Invalidate responses cached under the given generation tags in O(1).
+    
+    Entries record the generation of each of their generation tags; after a
+    bump they no longer match and simply miss until they expire.
+    
+    Returns:
+        New generation per tag
+    """
+    client = await get_cache_client()
+    if not client or not tags:
+        return {}
+    
+    try:
+        pipe = client.pipeline(transaction=False)
+        for tag in tags:
+            pipe.incr(f"{CACHE_GENERATION_PREFIX}{tag}")
+        return dict(zip(tags, (int(value) for value in await pipe.execute())))
+    except Exception as e:
+        logger.debug(f"Cache generation bump failed: {e}")
+        return {}
+
+
+async def _unlink_in_batches(client: redis.Redis, keys: AsyncIterator[str]) -> int:
+    """UNLINK keys from an async iterator, _SWEEP_BATCH_SIZE keys per call."""
+    removed = 0
+    batch: List[str] = []
+    async for key in keys:
+        batch.append(key)
+        if len(batch) >= _SWEEP_BATCH_SIZE:
+            removed += await client.unlink(*batch)
+            batch = []
+    if batch:
+        removed += await client.unlink(*batch)
+    return removed
+
+
+def _format_tags(templates: Optional[Iterable[str]], values: Dict[str, Any]) -> List[str]:
+    """Fill tag templates such as "tenant:{organization_id}" from call arguments."""
+    tags = []
+    for template in templates or ():
+        try:
+            tags.append(template.format(**values))
+        except (KeyError, IndexError):
+            logger.debug(f"Cache tag {template} skipped: argument not provided")
+    return tags
+
+
+async def _read_entry(cache_key: str, generation_tags: List[str]) -> Tuple[Optional[Dict[str, Any]], Dict[str, int]]:
+    """Read a cache entry and the current generations of its tags in one round trip."""
+    if not generation_tags:
+        return await get_cached_response(cache_key), {}
+    
+    client = await get_cache_client()
+    if not client:
+        return None, {}
+    
+    try:
+        pipe = client.pipeline(transaction=False)
+        pipe.get(cache_key)
+        pipe.mget([f"{CACHE_GENERATION_PREFIX}{tag}" for tag in generation_tags])
+        cached_data, generations = await pipe.execute()
+    except Exception as e:
+        logger.debug(f"Cache get failed: {e}")
+        return None, {}
+    
+    current = {tag: int(value or 0) for tag, value in zip(generation_tags, generations)}
+    return (json.loads(cached_data) if cached_data else None), current
+
+
+async def _store_response(
+    cache_key: str,
+    response: Any,
+    generations: Dict[str, int],
+    ttl: int,
+    stale_ttl: int,
+    tags: List[str]
+) -> bool:
+    entry = {"response": response, "fresh_until": time.time() + ttl}
+    if generations:
+        entry["generations"] = generations
+    return await set_cached_response(cache_key, entry, ttl + stale_ttl, tags=tags)
+
+
+def _schedule_refresh(cache_key: str, refresh: Callable[[], Awaitable[Any]]) -> None:
+    """Refresh a stale entry in the background (one refresh per key across replicas)."""
+    if cache_key in _refreshing:
+        return
+    _refreshing.add(cache_key)
+    
+    async def run():
+        lock_key = f"cache:refresh:{cache_key}"
+        client = await get_cache_client()
+        try:
+            if client and not await client.set(lock_key, "1", nx=True, ex=_REFRESH_LOCK_SECONDS):
+                return  # Another replica is refreshing this entry
+            await refresh()
+            if client:
+                await client.delete(lock_key)
+        except Exception as e:
+            logger.debug(f"Background cache refresh failed for {cache_key}: {e}")
+        finally:
+            _refreshing.discard(cache_key)
+    
+    task = asyncio.get_running_loop().create_task(run())
+    _refresh_tasks.add(task)
+    task.add_done_callback(_refresh_tasks.discard)
+
+
+def cache_response(
+    ttl: int = 300,
+    key_params: list = None,
+    tags: Optional[List[str]] = None,
+    generation_tags: Optional[List[str]] = None,
+    stale_ttl: int = 0
+):
     """
     Decorator for caching endpoint responses.
     
     Args:
         ttl: Time to live in seconds (default: 5 minutes)
         key_params: List of parameter names to include in cache key
+        tags: Tag templates filled from keyword arguments (e.g.
+            "tenant:{organization_id}"); entries are also tagged
+            "endpoint:<module.function>" for invalidate_cache_tags()
+        generation_tags: Tag templates whose generation counters the entry
+            is built under; bump_cache_generation() on any of them makes it miss
+        stale_ttl: Seconds after ttl during which the stale response is
+            still served while a background task refreshes it. The refresh
+            re-runs the endpoint with the original arguments, so only enable
+            it for endpoints whose arguments outlive the request.
     """
     def decorator(func: Callable):
         @wraps(func)
@@ -138,22 +333,31 @@ def cache_response(ttl: int = 300, key_params: list = None):
                         params[param] = kwargs[param]
             
             cache_key = generate_cache_key(endpoint, params)
+            entry_tags = [f"endpoint:{endpoint}"] + _format_tags(tags, kwargs)
+            generation_keys = _format_tags(generation_tags, kwargs)
             
             # Try to get from cache
-            cached = await get_cached_response(cache_key)
-            if cached:
-                logger.debug(f"Cache hit: {cache_key}")
-                return cached.get("response")
+            cached, generations = await _read_entry(cache_key, generation_keys)
+            if cached and cached.get("generations", {}) == generations:
+                fresh_until = cached.get("fresh_until")
+                if fresh_until is None or time.time() < fresh_until:
+                    logger.debug(f"Cache hit: {cache_key}")
+                    return cached.get("response")
+                if stale_ttl:
+                    # Serve the stale response; refresh it off the request path
+                    async def refresh():
+                        fresh = await func(*args, **kwargs)
+                        await _store_response(cache_key, fresh, generations, ttl, stale_ttl, entry_tags)
+                    
+                    _schedule_refresh(cache_key, refresh)
+                    logger.debug(f"Stale cache hit: {cache_key}")
+                    return cached.get("response")
             
             # Execute function
             response = await func(*args, **kwargs)
             
             # Cache response
-            await set_cached_response(
-                cache_key,
-                {"response": response},
-                ttl
-            )
+            await _store_response(cache_key, response, generations, ttl, stale_ttl, entry_tags)
             
             return response
         
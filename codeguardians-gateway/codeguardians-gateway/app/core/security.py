@@ -7,8 +7,8 @@ Comprehensive security validation and protection for the AI Guardians platform.
 import re
 import html
 import json
-from typing import Any, Dict, List, Optional, Union
-from pydantic import BaseModel, validator
+from typing import Any, Dict, List, Optional, Set, Tuple, Union
+from pydantic import BaseModel, Field, validator
 import logging
 from passlib.context import CryptContext
 from datetime import datetime, timedelta, timezone
@@ -18,6 +18,7 @@ from fastapi.security import HTTPBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.database import get_db
 from app.core.models import User
+from app.core.threat_scanner import ThreatScanner, redact_spans
 
 logger = logging.getLogger(__name__)
 
@@ -29,6 +30,9 @@ class SecurityThreat(BaseModel):
     description: str
     pattern: str
     confidence: float
+    path: List[Union[str, int]] = Field(default_factory=list)  # keys/indexes to the matched string
+    in_key: bool = False  # Matched a dict key rather than a value
+    spans: List[Tuple[int, int]] = Field(default_factory=list)  # (start, end) offsets of matches
 
 
 class BiasGuardPolicy(BaseModel):
@@ -468,6 +472,7 @@ class SecurityValidator:
     def __init__(self):
         """Initialize security validator with threat patterns."""
         self.threat_patterns = self._initialize_threat_patterns()
+        self.scanner = ThreatScanner(self.threat_patterns)
         self.rate_limits = {}
         
     def _initialize_threat_patterns(self) -> Dict[str, List[str]]:
@@ -578,6 +583,9 @@ class SecurityValidator:
         """
         Validate input data for security threats.
         
+        Every string (values and dict keys) is scanned once by the compiled
+        threat scanner; the literal prefilter runs once for the whole payload.
+        
         Args:
             data: Input data to validate
             input_type: Type of input (json, text, url, etc.)
@@ -585,50 +593,69 @@ class SecurityValidator:
         Returns:
             List of detected security threats
         """
-        threats = []
+        strings: List[Tuple[str, List[Union[str, int]], bool]] = []
+        self._collect_strings(data, [], strings)
+        if not strings:
+            return []
         
+        candidates = self.scanner.candidates(text for text, _, _ in strings)
+        threats = []
+        for text, path, in_key in strings:
+            threats.extend(self._scan_string(text, input_type, path, in_key, candidates))
+        return threats
+    
+    def _collect_strings(
+        self,
+        data: Any,
+        path: List[Union[str, int]],
+        strings: List[Tuple[str, List[Union[str, int]], bool]]
+    ) -> None:
+        """Collect (text, path, in_key) for every string in a payload."""
         if isinstance(data, str):
-            threats.extend(await self._validate_string(data, input_type))
+            strings.append((data, path, False))
         elif isinstance(data, dict):
-            threats.extend(await self._validate_dict(data, input_type))
+            for key, value in data.items():
+                key_path = path + [key if isinstance(key, (str, int)) else str(key)]
+                strings.append((str(key), key_path, True))
+                self._collect_strings(value, key_path, strings)
         elif isinstance(data, list):
-            for item in data:
-                threats.extend(await self.validate_input(item, input_type))
-        
+            for index, item in enumerate(data):
+                self._collect_strings(item, path + [index], strings)
+    
+    def _scan_string(
+        self,
+        text: str,
+        input_type: str,
+        path: Optional[List[Union[str, int]]] = None,
+        in_key: bool = False,
+        candidates: Optional[Set[int]] = None
+    ) -> List[SecurityThreat]:
+        """Scan one string; one threat per matching (threat type, pattern) with its spans."""
+        threats: List[SecurityThreat] = []
+        for match in self.scanner.scan(text, candidates):
+            if threats and threats[-1].threat_type == match.threat_type and threats[-1].pattern == match.pattern:
+                threats[-1].spans.append((match.start, match.end))
+                continue
+            threats.append(SecurityThreat(
+                threat_type=match.threat_type,
+                severity=self._get_threat_severity(match.threat_type),
+                description=f"{match.threat_type.replace('_', ' ').title()} pattern detected",
+                pattern=match.pattern,
+                confidence=0.8,
+                path=list(path or []),
+                in_key=in_key,
+                spans=[(match.start, match.end)]
+            ))
+            logger.warning(f"Security threat detected: {match.threat_type} - {match.pattern}")
         return threats
     
     async def _validate_string(self, text: str, input_type: str) -> List[SecurityThreat]:
         """Validate string input for threats."""
-        threats = []
-        text_lower = text.lower()
-        
-        for threat_type, patterns in self.threat_patterns.items():
-            for pattern in patterns:
-                if re.search(pattern, text_lower, re.IGNORECASE):
-                    threat = SecurityThreat(
-                        threat_type=threat_type,
-                        severity=self._get_threat_severity(threat_type),
-                        description=f"{threat_type.replace('_', ' ').title()} pattern detected",
-                        pattern=pattern,
-                        confidence=0.8
-                    )
-                    threats.append(threat)
-                    logger.warning(f"Security threat detected: {threat_type} - {pattern}")
-        
-        return threats
+        return self._scan_string(text, input_type)
     
     async def _validate_dict(self, data: Dict[str, Any], input_type: str) -> List[SecurityThreat]:
         """Validate dictionary input for threats."""
-        threats = []
-        
-        for key, value in data.items():
-            # Validate key
-            threats.extend(await self._validate_string(str(key), input_type))
-            
-            # Validate value
-            threats.extend(await self.validate_input(value, input_type))
-        
-        return threats
+        return await self.validate_input(data, input_type)
     
     def _get_threat_severity(self, threat_type: str) -> str:
         """Get severity level for threat type."""
@@ -645,9 +672,33 @@ class SecurityValidator:
         }
         return severity_map.get(threat_type, "LOW")
     
-    async def sanitize_input(self, data: Any) -> Any:
-        """Sanitize input data to remove potential threats."""
+    async def sanitize_input(self, data: Any, threats: Optional[List[SecurityThreat]] = None) -> Any:
+        """
+        Sanitize input data to remove potential threats.
+        
+        Args:
+            data: Input data to sanitize
+            threats: Result of validate_input() for the same data; matched
+                spans in values are removed without scanning again
+        """
+        if threats:
+            redactions: Dict[Tuple[Union[str, int], ...], List[Tuple[int, int]]] = {}
+            for threat in threats:
+                if not threat.in_key:
+                    redactions.setdefault(tuple(threat.path), []).extend(threat.spans)
+            return self._sanitize(data, (), redactions)
+        return self._sanitize(data, (), {})
+    
+    def _sanitize(
+        self,
+        data: Any,
+        path: Tuple[Union[str, int], ...],
+        redactions: Dict[Tuple[Union[str, int], ...], List[Tuple[int, int]]]
+    ) -> Any:
         if isinstance(data, str):
+            spans = redactions.get(path)
+            if spans:
+                data = redact_spans(data, spans)
             # HTML escape
             data = html.escape(data)
             # Remove null bytes
@@ -655,9 +706,9 @@ class SecurityValidator:
             # Remove control characters
             data = re.sub(r'[\x00-\x08\x0B\x0C\x0E-\x1F\x7F]', '', data)
         elif isinstance(data, dict):
-            return {k: await self.sanitize_input(v) for k, v in data.items()}
+            return {k: self._sanitize(v, path + (k,), redactions) for k, v in data.items()}
         elif isinstance(data, list):
-            return [await self.sanitize_input(item) for item in data]
+            return [self._sanitize(item, path + (i,), redactions) for i, item in enumerate(data)]
         
         return data
     
@@ -723,8 +774,8 @@ class SecurityMiddleware:
             if high_severity_threats:
                 raise SecurityError("High severity security threat detected", threats)
         
-        # Sanitize input
-        sanitized_data = await self.validator.sanitize_input(request_data)
+        # Sanitize input, removing the spans matched above
+        sanitized_data = await self.validator.sanitize_input(request_data, threats)
         
         return sanitized_data
 
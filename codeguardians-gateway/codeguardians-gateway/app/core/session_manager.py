@@ -7,12 +7,12 @@ enabling distributed session storage across multiple service replicas.
 
 import json
 import logging
+import time
 import uuid
-from datetime import datetime, timedelta
+from datetime import datetime
 from typing import Any, Dict, Optional, List
-from threading import RLock
 
-import redis
+import redis.asyncio as redis
 from redis.exceptions import RedisError
 
 from app.core.config import get_settings
@@ -27,6 +27,11 @@ class RedisSessionManager:
     
     Provides distributed session storage with TTL support, serialization,
     and connection pooling for high-performance operations.
+    
+    Each user has a sorted set of their session IDs scored by expiry time,
+    so per-user lookups never walk the keyspace: expired IDs are pruned by
+    score and the live sessions are fetched with one MGET. Admin-wide
+    listings use SCAN.
     """
     
     def __init__(
@@ -34,7 +39,9 @@ class RedisSessionManager:
         redis_url: str = None,
         key_prefix: str = "sessions:",
         default_ttl: int = 3600,  # 1 hour default TTL
-        max_connections: int = 20
+        max_connections: int = 20,
+        index_prefix: str = "user_sessions:",
+        scan_count: int = 500
     ):
         """
         Initialize Redis session manager.
@@ -44,17 +51,19 @@ class RedisSessionManager:
             key_prefix: Prefix for all Redis keys
             default_ttl: Default TTL in seconds for sessions
             max_connections: Maximum number of Redis connections
+            index_prefix: Prefix for per-user session index keys
+            scan_count: SCAN page size hint for admin-wide listings
         """
         self.redis_url = redis_url or f"redis://{settings.REDIS_HOST}:{settings.REDIS_PORT}/{settings.REDIS_DB}"
         self.key_prefix = key_prefix
         self.default_ttl = default_ttl
         self.max_connections = max_connections
+        self.index_prefix = index_prefix
+        self.scan_count = scan_count
         
         # Connection pool
         self._pool: Optional[redis.ConnectionPool] = None
-        
-        # Thread safety
-        self._lock = RLock()
+        self._client: Optional[redis.Redis] = None
         
         # Initialize connection pool
         self._init_connection_pool()
@@ -68,6 +77,7 @@ class RedisSessionManager:
                 retry_on_timeout=True,
                 decode_responses=True
             )
+            self._client = redis.Redis(connection_pool=self._pool)
             logger.info(f"Redis session manager initialized: {self.redis_url}")
             
         except Exception as e:
@@ -76,14 +86,18 @@ class RedisSessionManager:
     
     def _get_client(self) -> redis.Redis:
         """Get Redis client with connection pooling."""
-        if self._pool is None:
+        if self._client is None:
             self._init_connection_pool()
-        return redis.Redis(connection_pool=self._pool)
+        return self._client
     
     def _get_key(self, session_id: str) -> str:
         """Get full Redis key with prefix."""
         return f"{self.key_prefix}{session_id}"
     
+    def _get_index_key(self, user_id: Any) -> str:
+        """Get the Redis key of a user's session index."""
+        return f"{self.index_prefix}{user_id}"
+    
     def _serialize_session_data(self, data: Dict[str, Any]) -> str:
         """Serialize session data for Redis storage."""
         try:
@@ -100,7 +114,17 @@ class RedisSessionManager:
             logger.warning(f"Failed to deserialize session data: {e}")
             return {"error": "deserialization_failed", "raw_data": data}
     
-    def create_session(
+    def _index_session(self, pipe: Any, user_id: Any, session_id: str, ttl: int) -> None:
+        """Queue index updates for a session stored with the given TTL."""
+        index_key = self._get_index_key(user_id)
+        now = time.time()
+        pipe.zadd(index_key, {session_id: now + ttl})
+        pipe.zremrangebyscore(index_key, "-inf", now)
+        # The index lives as long as the user's longest-lived session
+        pipe.expire(index_key, ttl, nx=True)
+        pipe.expire(index_key, ttl, gt=True)
+    
+    async def create_session(
         self, 
         user_id: int, 
         session_data: Optional[Dict[str, Any]] = None,
@@ -118,33 +142,35 @@ class RedisSessionManager:
             Session ID
         """
         try:
-            with self._lock:
-                client = self._get_client()
-                session_id = str(uuid.uuid4())
-                redis_key = self._get_key(session_id)
-                
-                # Prepare session data
-                session_info = {
-                    "session_id": session_id,
-                    "user_id": user_id,
-                    "created_at": datetime.utcnow().isoformat() + "Z",
-                    "last_accessed": datetime.utcnow().isoformat() + "Z",
-                    "data": session_data or {}
-                }
-                
-                # Serialize and store
-                serialized_data = self._serialize_session_data(session_info)
-                ttl = ttl or self.default_ttl
-                
-                result = client.setex(redis_key, ttl, serialized_data)
+            client = self._get_client()
+            session_id = str(uuid.uuid4())
+            redis_key = self._get_key(session_id)
+            
+            # Prepare session data
+            session_info = {
+                "session_id": session_id,
+                "user_id": user_id,
+                "created_at": datetime.utcnow().isoformat() + "Z",
+                "last_accessed": datetime.utcnow().isoformat() + "Z",
+                "data": session_data or {}
+            }
+            
+            # Serialize and store the session with its index entry atomically
+            serialized_data = self._serialize_session_data(session_info)
+            ttl = ttl or self.default_ttl
+            
+            async with client.pipeline(transaction=True) as pipe:
+                pipe.set(redis_key, serialized_data, ex=ttl)
+                self._index_session(pipe, user_id, session_id, ttl)
+                result = (await pipe.execute())[0]
+            
+            if result:
+                logger.info(f"Created session {session_id} for user {user_id}")
+                return session_id
+            else:
+                logger.error(f"Failed to create session for user {user_id}")
+                raise Exception("Failed to create session")
                 
-                if result:
-                    logger.info(f"Created session {session_id} for user {user_id}")
-                    return session_id
-                else:
-                    logger.error(f"Failed to create session for user {user_id}")
-                    raise Exception("Failed to create session")
-                    
         except RedisError as e:
             logger.error(f"Redis error creating session: {e}")
             raise Exception(f"Session creation failed: {e}")
@@ -152,7 +178,7 @@ class RedisSessionManager:
             logger.error(f"Error creating session: {e}")
             raise
     
-    def get_session(self, session_id: str) -> Optional[Dict[str, Any]]:
+    async def get_session(self, session_id: str) -> Optional[Dict[str, Any]]:
         """
         Retrieve a session by its ID.
         
@@ -163,24 +189,23 @@ class RedisSessionManager:
             Session data or None if not found
         """
         try:
-            with self._lock:
-                client = self._get_client()
-                redis_key = self._get_key(session_id)
-                
-                data = client.get(redis_key)
-                if data is None:
-                    logger.debug(f"Session {session_id} not found")
-                    return None
-                
-                session_info = self._deserialize_session_data(data)
-                
-                # Update last accessed time
-                session_info["last_accessed"] = datetime.utcnow().isoformat() + "Z"
-                self._update_session_data(session_id, session_info)
-                
-                logger.debug(f"Retrieved session {session_id}")
-                return session_info
-                
+            client = self._get_client()
+            redis_key = self._get_key(session_id)
+            
+            data = await client.get(redis_key)
+            if data is None:
+                logger.debug(f"Session {session_id} not found")
+                return None
+            
+            session_info = self._deserialize_session_data(data)
+            
+            # Update last accessed time
+            session_info["last_accessed"] = datetime.utcnow().isoformat() + "Z"
+            await self._update_session_data(session_id, session_info)
+            
+            logger.debug(f"Retrieved session {session_id}")
+            return session_info
+            
         except RedisError as e:
             logger.error(f"Redis error retrieving session {session_id}: {e}")
             return None
@@ -188,7 +213,7 @@ class RedisSessionManager:
             logger.error(f"Error retrieving session {session_id}: {e}")
             return None
     
-    def update_session_data(
+    async def update_session_data(
         self, 
         session_id: str, 
         data: Dict[str, Any],
@@ -206,24 +231,24 @@ class RedisSessionManager:
             True if successful, False otherwise
         """
         try:
-            with self._lock:
-                # Get existing session
-                session_info = self.get_session(session_id)
-                if session_info is None:
-                    logger.warning(f"Session {session_id} not found for update")
-                    return False
-                
-                # Update data
-                session_info["data"].update(data)
-                session_info["last_accessed"] = datetime.utcnow().isoformat() + "Z"
-                
-                return self._update_session_data(session_id, session_info, ttl)
-                
+            # Get existing session
+            raw = await self._get_client().get(self._get_key(session_id))
+            if raw is None:
+                logger.warning(f"Session {session_id} not found for update")
+                return False
+            session_info = self._deserialize_session_data(raw)
+            
+            # Update data
+            session_info.setdefault("data", {}).update(data)
+            session_info["last_accessed"] = datetime.utcnow().isoformat() + "Z"
+            
+            return await self._update_session_data(session_id, session_info, ttl)
+            
         except Exception as e:
             logger.error(f"Error updating session {session_id}: {e}")
             return False
     
-    def _update_session_data(
+    async def _update_session_data(
         self, 
         session_id: str, 
         session_info: Dict[str, Any],
@@ -237,7 +262,11 @@ class RedisSessionManager:
             serialized_data = self._serialize_session_data(session_info)
             ttl = ttl or self.default_ttl
             
-            result = client.setex(redis_key, ttl, serialized_data)
+            async with client.pipeline(transaction=True) as pipe:
+                pipe.set(redis_key, serialized_data, ex=ttl)
+                if session_info.get("user_id") is not None:
+                    self._index_session(pipe, session_info["user_id"], session_id, ttl)
+                result = (await pipe.execute())[0]
             
             if result:
                 logger.debug(f"Updated session {session_id}")
@@ -253,7 +282,7 @@ class RedisSessionManager:
             logger.error(f"Error updating session {session_id}: {e}")
             return False
     
-    def delete_session(self, session_id: str) -> bool:
+    async def delete_session(self, session_id: str) -> bool:
         """
         Delete a session.
         
@@ -264,19 +293,28 @@ class RedisSessionManager:
             True if successful, False otherwise
         """
         try:
-            with self._lock:
-                client = self._get_client()
-                redis_key = self._get_key(session_id)
-                
-                result = client.delete(redis_key)
+            client = self._get_client()
+            redis_key = self._get_key(session_id)
+            
+            raw = await client.get(redis_key)
+            if raw is None:
+                logger.warning(f"Session {session_id} not found for deletion")
+                return False
+            user_id = self._deserialize_session_data(raw).get("user_id")
+            
+            async with client.pipeline(transaction=True) as pipe:
+                pipe.delete(redis_key)
+                if user_id is not None:
+                    pipe.zrem(self._get_index_key(user_id), session_id)
+                result = (await pipe.execute())[0]
+            
+            if result:
+                logger.info(f"Deleted session {session_id}")
+                return True
+            else:
+                logger.warning(f"Session {session_id} not found for deletion")
+                return False
                 
-                if result:
-                    logger.info(f"Deleted session {session_id}")
-                    return True
-                else:
-                    logger.warning(f"Session {session_id} not found for deletion")
-                    return False
-                    
         except RedisError as e:
             logger.error(f"Redis error deleting session {session_id}: {e}")
             return False
@@ -284,10 +322,13 @@ class RedisSessionManager:
             logger.error(f"Error deleting session {session_id}: {e}")
             return False
     
-    def get_user_sessions(self, user_id: int) -> List[Dict[str, Any]]:
+    async def get_user_sessions(self, user_id: int) -> List[Dict[str, Any]]:
         """
         Get all sessions for a user.
         
+        Reads the user's session index (pruning expired entries) and fetches
+        the sessions with one MGET.
+        
         Args:
             user_id: The user ID
             
@@ -295,27 +336,33 @@ class RedisSessionManager:
             List of session data
         """
         try:
-            with self._lock:
-                client = self._get_client()
-                pattern = f"{self.key_prefix}*"
-                
-                # Get all session keys
-                keys = client.keys(pattern)
-                if not keys:
-                    return []
-                
-                # Get all session data
-                sessions = []
-                for key in keys:
-                    data = client.get(key)
-                    if data:
-                        session_info = self._deserialize_session_data(data)
-                        if session_info.get("user_id") == user_id:
-                            sessions.append(session_info)
-                
-                logger.debug(f"Retrieved {len(sessions)} sessions for user {user_id}")
-                return sessions
-                
+            client = self._get_client()
+            index_key = self._get_index_key(user_id)
+            
+            async with client.pipeline(transaction=False) as pipe:
+                pipe.zremrangebyscore(index_key, "-inf", time.time())
+                pipe.zrange(index_key, 0, -1)
+                _, session_ids = await pipe.execute()
+            if not session_ids:
+                return []
+            
+            values = await client.mget([self._get_key(session_id) for session_id in session_ids])
+            
+            sessions = []
+            missing = []
+            for session_id, data in zip(session_ids, values):
+                if data is None:
+                    missing.append(session_id)
+                else:
+                    sessions.append(self._deserialize_session_data(data))
+            
+            if missing:
+                # Deleted or expired without going through this manager
+                await client.zrem(index_key, *missing)
+            
+            logger.debug(f"Retrieved {len(sessions)} sessions for user {user_id}")
+            return sessions
+            
         except RedisError as e:
             logger.error(f"Redis error getting sessions for user {user_id}: {e}")
             return []
@@ -323,20 +370,61 @@ class RedisSessionManager:
             logger.error(f"Error getting sessions for user {user_id}: {e}")
             return []
     
-    def cleanup_expired_sessions(self) -> int:
+    async def scan_sessions(self, batch_size: Optional[int] = None):
+        """
+        Iterate over all sessions (admin-wide listing).
+        
+        Uses SCAN and one MGET per page, so Redis is never blocked for the
+        whole keyspace.
+        
+        Yields:
+            Session data dictionaries
         """
-        Clean up expired sessions (Redis handles this automatically with TTL).
-        This method is kept for compatibility and can be used for additional cleanup.
+        client = self._get_client()
+        count = batch_size or self.scan_count
+        cursor = 0
+        while True:
+            cursor, keys = await client.scan(cursor=cursor, match=f"{self.key_prefix}*", count=count)
+            if keys:
+                for data in await client.mget(keys):
+                    if data is not None:
+                        yield self._deserialize_session_data(data)
+            if cursor == 0:
+                break
+    
+    async def cleanup_expired_sessions(self) -> int:
+        """
+        Clean up expired sessions.
+        
+        Redis expires session keys via TTL; this prunes expired IDs from the
+        per-user session indexes.
         
         Returns:
-            Number of sessions cleaned up
+            Number of expired index entries removed
         """
-        # Redis automatically handles TTL expiration
-        # This method can be used for additional cleanup logic if needed
-        logger.debug("Redis handles session expiration automatically via TTL")
-        return 0
+        try:
+            client = self._get_client()
+            now = time.time()
+            removed = 0
+            cursor = 0
+            while True:
+                cursor, keys = await client.scan(cursor=cursor, match=f"{self.index_prefix}*", count=self.scan_count)
+                if keys:
+                    async with client.pipeline(transaction=False) as pipe:
+                        for key in keys:
+                            pipe.zremrangebyscore(key, "-inf", now)
+                        removed += sum(await pipe.execute())
+                if cursor == 0:
+                    break
+            
+            logger.debug(f"Pruned {removed} expired session index entries")
+            return removed
+            
+        except Exception as e:
+            logger.error(f"Error cleaning up session indexes: {e}")
+            return 0
     
-    def extend_session(self, session_id: str, ttl: Optional[int] = None) -> bool:
+    async def extend_session(self, session_id: str, ttl: Optional[int] = None) -> bool:
         """
         Extend session TTL.
         
@@ -348,26 +436,31 @@ class RedisSessionManager:
             True if successful, False otherwise
         """
         try:
-            with self._lock:
-                client = self._get_client()
-                redis_key = self._get_key(session_id)
-                
-                # Check if session exists
-                if not client.exists(redis_key):
-                    logger.warning(f"Session {session_id} not found for extension")
-                    return False
-                
-                # Extend TTL
-                ttl = ttl or self.default_ttl
-                result = client.expire(redis_key, ttl)
+            client = self._get_client()
+            redis_key = self._get_key(session_id)
+            
+            # Check if session exists
+            raw = await client.get(redis_key)
+            if raw is None:
+                logger.warning(f"Session {session_id} not found for extension")
+                return False
+            user_id = self._deserialize_session_data(raw).get("user_id")
+            
+            # Extend TTL
+            ttl = ttl or self.default_ttl
+            async with client.pipeline(transaction=True) as pipe:
+                pipe.expire(redis_key, ttl)
+                if user_id is not None:
+                    self._index_session(pipe, user_id, session_id, ttl)
+                result = (await pipe.execute())[0]
+            
+            if result:
+                logger.debug(f"Extended session {session_id} TTL to {ttl}s")
+                return True
+            else:
+                logger.error(f"Failed to extend session {session_id}")
+                return False
                 
-                if result:
-                    logger.debug(f"Extended session {session_id} TTL to {ttl}s")
-                    return True
-                else:
-                    logger.error(f"Failed to extend session {session_id}")
-                    return False
-                    
         except RedisError as e:
             logger.error(f"Redis error extending session {session_id}: {e}")
             return False
@@ -375,7 +468,7 @@ class RedisSessionManager:
             logger.error(f"Error extending session {session_id}: {e}")
             return False
     
-    def get_session_stats(self) -> Dict[str, Any]:
+    async def get_session_stats(self) -> Dict[str, Any]:
         """
         Get session statistics.
         
@@ -383,33 +476,24 @@ class RedisSessionManager:
             Dictionary with session statistics
         """
         try:
-            with self._lock:
-                client = self._get_client()
-                pattern = f"{self.key_prefix}*"
-                
-                # Get all session keys
-                keys = client.keys(pattern)
-                
-                # Count sessions by user
-                user_counts = {}
-                total_sessions = len(keys)
-                
-                for key in keys:
-                    data = client.get(key)
-                    if data:
-                        session_info = self._deserialize_session_data(data)
-                        user_id = session_info.get("user_id")
-                        if user_id:
-                            user_counts[user_id] = user_counts.get(user_id, 0) + 1
-                
-                return {
-                    "total_sessions": total_sessions,
-                    "unique_users": len(user_counts),
-                    "user_session_counts": user_counts,
-                    "storage_type": "redis",
-                    "key_prefix": self.key_prefix
-                }
-                
+            # Count sessions by user
+            user_counts = {}
+            total_sessions = 0
+            
+            async for session_info in self.scan_sessions():
+                total_sessions += 1
+                user_id = session_info.get("user_id")
+                if user_id:
+                    user_counts[user_id] = user_counts.get(user_id, 0) + 1
+            
+            return {
+                "total_sessions": total_sessions,
+                "unique_users": len(user_counts),
+                "user_session_counts": user_counts,
+                "storage_type": "redis",
+                "key_prefix": self.key_prefix
+            }
+            
         except Exception as e:
             logger.error(f"Error getting session stats: {e}")
             return {
@@ -420,7 +504,7 @@ class RedisSessionManager:
                 "error": str(e)
             }
     
-    def health_check(self) -> bool:
+    async def health_check(self) -> bool:
         """
         Check Redis connection health.
         
@@ -428,19 +512,20 @@ class RedisSessionManager:
             True if Redis is accessible, False otherwise
         """
         try:
-            with self._lock:
-                client = self._get_client()
-                result = client.ping()
-                return bool(result)
+            client = self._get_client()
+            result = await client.ping()
+            return bool(result)
         except Exception as e:
             logger.error(f"Redis health check failed: {e}")
             return False
     
-    def close(self):
+    async def close(self):
         """Close Redis connections."""
         try:
+            if self._client:
+                await self._client.aclose()
             if self._pool:
-                self._pool.disconnect()
+                await self._pool.disconnect()
             logger.info("Redis session manager connections closed")
         except Exception as e:
             logger.error(f"Error closing Redis connections: {e}")
@@ -84,11 +84,11 @@ class SessionService:
             Session ID
         """
         if self.use_redis and self.redis_manager:
-            return self._create_redis_session(user_id, session_data, ttl)
+            return await self._create_redis_session(user_id, session_data, ttl)
         else:
             return await self._create_db_session(user_id, session_data, ip_address, user_agent)
     
-    def _create_redis_session(
+    async def _create_redis_session(
         self, 
         user_id: int, 
         session_data: Optional[Dict[str, Any]] = None,
@@ -106,7 +106,7 @@ class SessionService:
                 "data": session_data or {}
             }
             
-            return self.redis_manager.create_session(user_id, enhanced_data, ttl)
+            return await self.redis_manager.create_session(user_id, enhanced_data, ttl)
         except Exception as e:
             logger.error(f"Failed to create Redis session: {e}")
             raise
@@ -165,14 +165,14 @@ class SessionService:
             Session data or None if not found
         """
         if self.use_redis and self.redis_manager:
-            return self._get_redis_session(session_id)
+            return await self._get_redis_session(session_id)
         else:
             return await self._get_db_session(session_id)
     
-    def _get_redis_session(self, session_id: str) -> Optional[Dict[str, Any]]:
+    async def _get_redis_session(self, session_id: str) -> Optional[Dict[str, Any]]:
         """Get session from Redis."""
         try:
-            return self.redis_manager.get_session(session_id)
+            return await self.redis_manager.get_session(session_id)
         except Exception as e:
             logger.error(f"Failed to get Redis session {session_id}: {e}")
             return None
@@ -241,11 +241,11 @@ class SessionService:
             True if successful, False otherwise
         """
         if self.use_redis and self.redis_manager:
-            return self._update_redis_session(session_id, data, ttl)
+            return await self._update_redis_session(session_id, data, ttl)
         else:
             return await self._update_db_session(session_id, data)
     
-    def _update_redis_session(
+    async def _update_redis_session(
         self, 
         session_id: str, 
         data: Dict[str, Any],
@@ -253,7 +253,7 @@ class SessionService:
     ) -> bool:
         """Update session in Redis."""
         try:
-            return self.redis_manager.update_session_data(session_id, data, ttl)
+            return await self.redis_manager.update_session_data(session_id, data, ttl)
         except Exception as e:
             logger.error(f"Failed to update Redis session {session_id}: {e}")
             return False
@@ -304,14 +304,14 @@ class SessionService:
             True if successful, False otherwise
         """
         if self.use_redis and self.redis_manager:
-            return self._delete_redis_session(session_id)
+            return await self._delete_redis_session(session_id)
         else:
             return await self._delete_db_session(session_id)
     
-    def _delete_redis_session(self, session_id: str) -> bool:
+    async def _delete_redis_session(self, session_id: str) -> bool:
         """Delete session from Redis."""
         try:
-            return self.redis_manager.delete_session(session_id)
+            return await self.redis_manager.delete_session(session_id)
         except Exception as e:
             logger.error(f"Failed to delete Redis session {session_id}: {e}")
             return False
@@ -351,14 +351,14 @@ class SessionService:
             List of session data
         """
         if self.use_redis and self.redis_manager:
-            return self._get_redis_user_sessions(user_id)
+            return await self._get_redis_user_sessions(user_id)
         else:
             return await self._get_db_user_sessions(user_id)
     
-    def _get_redis_user_sessions(self, user_id: int) -> List[Dict[str, Any]]:
+    async def _get_redis_user_sessions(self, user_id: int) -> List[Dict[str, Any]]:
         """Get user sessions from Redis."""
         try:
-            return self.redis_manager.get_user_sessions(user_id)
+            return await self.redis_manager.get_user_sessions(user_id)
         except Exception as e:
             logger.error(f"Failed to get Redis sessions for user {user_id}: {e}")
             return []
@@ -412,8 +412,8 @@ class SessionService:
             Number of sessions cleaned up
         """
         if self.use_redis and self.redis_manager:
-            # Redis handles TTL automatically
-            return self.redis_manager.cleanup_expired_sessions()
+            # Redis expires sessions via TTL; this prunes the per-user indexes
+            return await self.redis_manager.cleanup_expired_sessions()
         else:
             return await self._cleanup_db_sessions()
     
@@ -456,7 +456,7 @@ class SessionService:
             Dictionary with session statistics
         """
         if self.use_redis and self.redis_manager:
-            return self.redis_manager.get_session_stats()
+            return await self.redis_manager.get_session_stats()
         else:
             return await self._get_db_session_stats()
     
@@ -522,7 +522,7 @@ class SessionService:
             True if healthy, False otherwise
         """
         if self.use_redis and self.redis_manager:
-            return self.redis_manager.health_check()
+            return await self.redis_manager.health_check()
         else:
             # Database health check
             try:
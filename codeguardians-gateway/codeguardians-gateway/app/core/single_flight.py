@@ -0,0 +1,82 @@
+"""
+Single-Flight Request Coalescing
+
+Concurrent callers asking for the same key share one in-flight call:
+- The first caller starts the call, later callers await the same result
+- Results and exceptions are delivered to every waiter
+- The shared call is only cancelled when every waiter has gone away
+- Keys are forgotten as soon as the call completes (no result caching)
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Tuple
+
+from app.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class _Call:
+    """An in-flight call and the number of callers waiting on it."""
+
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent identical async calls.
+
+    SAFETY: A cancelled waiter never cancels the call for the others
+    ASSUMES: Callers using the same key expect the same result
+    VERIFY: Exactly one call runs per key at a time
+    """
+
+    def __init__(self):
+        self._calls: Dict[str, _Call] = {}
+        self.coalesced_total = 0
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """
+        Run fn once for all concurrent callers with the same key.
+
+        Args:
+            key: Fingerprint of the call
+            fn: Zero-argument coroutine function performing the call
+
+        Returns:
+            Tuple of (result, shared) where shared is True when this caller
+            joined a call started by another caller
+        """
+        call = self._calls.get(key)
+        shared = call is not None
+
+        if call is None:
+            call = _Call(asyncio.ensure_future(fn()))
+            self._calls[key] = call
+            call.task.add_done_callback(lambda _task: self._forget(key, call))
+        else:
+            self.coalesced_total += 1
+
+        call.waiters += 1
+        try:
+            return await asyncio.shield(call.task), shared
+        finally:
+            call.waiters -= 1
+            if call.waiters == 0 and not call.task.done():
+                # Nobody is left to receive the result
+                call.task.cancel()
+
+    def in_flight(self) -> int:
+        """Number of distinct calls currently in flight."""
+        return len(self._calls)
+
+    def _forget(self, key: str, call: _Call) -> None:
+        if self._calls.get(key) is call:
+            del self._calls[key]
+        # Mark the exception retrieved when every waiter was cancelled
+        if not call.task.cancelled() and call.task.exception() is not None and call.waiters == 0:
+            logger.debug(f"Single-flight call {key} failed with no waiters: {call.task.exception()}")
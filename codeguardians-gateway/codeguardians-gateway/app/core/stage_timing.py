@@ -0,0 +1,279 @@
+"""
+Per-Stage Latency Instrumentation for Guard Orchestration
+
+Breaks gateway time per guard request into stages so overhead can be located:
+- validation, transform, cache_lookup, route, post_processing (sequential laps)
+- queue_wait, context_enhancement, upstream, connect, ttfb, body_read,
+  json_decode (nested inside route, recorded when they happen)
+- All timings use time.perf_counter_ns
+- Each (guard, stage) pair has an HDR-style log-linear histogram (~6% precision)
+- Requests slower than a threshold are sampled into a slow-request log with
+  their full stage breakdown
+"""
+
+import os
+import random
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Any, Deque, Dict, Iterator, List, Optional
+
+from app.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+try:
+    from app.core.orchestrator_metrics import record_stage_durations
+    METRICS_ENABLED = True
+except ImportError:
+    METRICS_ENABLED = False
+
+# 16 sub-buckets per power of two: relative error <= 1/16
+_SUB_BUCKET_BITS = 4
+_SUB_BUCKETS = 1 << _SUB_BUCKET_BITS
+_MAX_EXPONENT = 40  # 2^44 ns ~ 4.9 hours, far above any request
+
+
+class LatencyHistogram:
+    """
+    HDR-style log-linear histogram of nanosecond durations.
+
+    SAFETY: Fixed memory (one int per bucket), O(1) record
+    ASSUMES: Single event loop (no locking needed)
+    VERIFY: Reported percentiles are within one sub-bucket of the true value
+    """
+
+    __slots__ = ("counts", "total", "sum_ns", "min_ns", "max_ns")
+
+    def __init__(self):
+        self.counts = [0] * ((_MAX_EXPONENT + 2) * _SUB_BUCKETS)
+        self.total = 0
+        self.sum_ns = 0
+        self.min_ns = 0
+        self.max_ns = 0
+
+    @staticmethod
+    def _index(value_ns: int) -> int:
+        if value_ns < _SUB_BUCKETS:
+            return max(0, value_ns)
+        exponent = min(value_ns.bit_length() - _SUB_BUCKET_BITS - 1, _MAX_EXPONENT)
+        sub_bucket = (value_ns >> exponent) & (_SUB_BUCKETS - 1)
+        return (exponent + 1) * _SUB_BUCKETS + sub_bucket
+
+    @staticmethod
+    def _upper_bound(index: int) -> int:
+        if index < _SUB_BUCKETS:
+            return index
+        exponent = index // _SUB_BUCKETS - 1
+        sub_bucket = index % _SUB_BUCKETS
+        return ((_SUB_BUCKETS + sub_bucket + 1) << exponent) - 1
+
+    def record(self, value_ns: int) -> None:
+        self.counts[self._index(value_ns)] += 1
+        if self.total == 0 or value_ns < self.min_ns:
+            self.min_ns = value_ns
+        if value_ns > self.max_ns:
+            self.max_ns = value_ns
+        self.total += 1
+        self.sum_ns += value_ns
+
+    def percentile(self, percent: float) -> int:
+        """Highest value equivalent to the given percentile (0-100), in ns."""
+        if self.total == 0:
+            return 0
+        target = max(1, int(self.total * percent / 100.0 + 0.5))
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= target:
+                return min(self._upper_bound(index), self.max_ns)
+        return self.max_ns
+
+    def summary(self) -> Dict[str, Any]:
+        """Count plus p50/p90/p99/max/mean in milliseconds."""
+        to_ms = 1e-6
+        return {
+            "count": self.total,
+            "p50_ms": self.percentile(50) * to_ms,
+            "p90_ms": self.percentile(90) * to_ms,
+            "p99_ms": self.percentile(99) * to_ms,
+            "max_ms": self.max_ns * to_ms,
+            "mean_ms": (self.sum_ns / self.total) * to_ms if self.total else 0.0,
+        }
+
+
+class StageTimer:
+    """
+    Stage timings for one orchestrated request.
+
+    Sequential stages are recorded with lap(); nested stages with stage() or add().
+    """
+
+    __slots__ = ("started_ns", "_last_ns", "stages", "_trace_marks")
+
+    def __init__(self):
+        self.started_ns = time.perf_counter_ns()
+        self._last_ns = self.started_ns
+        self.stages: Dict[str, int] = {}
+        self._trace_marks: Dict[str, int] = {}
+
+    def lap(self, name: str) -> None:
+        """Attribute the time since the previous lap to a stage."""
+        now = time.perf_counter_ns()
+        self.add(name, now - self._last_ns)
+        self._last_ns = now
+
+    def add(self, name: str, duration_ns: int) -> None:
+        self.stages[name] = self.stages.get(name, 0) + duration_ns
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter_ns() - start)
+
+    def total_ns(self) -> int:
+        return time.perf_counter_ns() - self.started_ns
+
+    async def httpx_trace(self, event_name: str, info: Dict[str, Any]) -> None:
+        """
+        httpx/httpcore trace hook splitting the upstream call.
+
+        connect: TCP/TLS setup (zero on a reused pooled connection)
+        ttfb: request sent until response headers arrive
+        body_read: response headers until the body is complete
+        """
+        now = time.perf_counter_ns()
+        marks = self._trace_marks
+        if "begin" not in marks:
+            marks["begin"] = now
+        if event_name.endswith("send_request_headers.started"):
+            marks["sent"] = now
+            self.add("connect", now - marks["begin"])
+        elif event_name.endswith("receive_response_headers.complete") and "sent" in marks:
+            marks["headers"] = now
+            self.add("ttfb", now - marks["sent"])
+        elif event_name.endswith("receive_response_body.complete") and "headers" in marks:
+            self.add("body_read", now - marks["headers"])
+
+
+# Timer of the request being orchestrated in the current task
+_current_timer: ContextVar[Optional[StageTimer]] = ContextVar("guard_stage_timer", default=None)
+
+
+def current_stage_timer() -> Optional[StageTimer]:
+    """Stage timer of the current orchestrated request, if any."""
+    return _current_timer.get()
+
+
+@contextmanager
+def timed_stage(name: str) -> Iterator[None]:
+    """Time a nested stage of the current request (no-op outside a request)."""
+    timer = _current_timer.get()
+    if timer is None:
+        yield
+        return
+    with timer.stage(name):
+        yield
+
+
+class StageTimingRegistry:
+    """Per-guard stage histograms and the sampled slow-request log."""
+
+    def __init__(
+        self,
+        slow_threshold_ms: float = 1000.0,
+        slow_sample_rate: float = 0.1,
+        slow_log_size: int = 100
+    ):
+        self.slow_threshold_ns = int(slow_threshold_ms * 1_000_000)
+        self.slow_sample_rate = slow_sample_rate
+        self.histograms: Dict[str, Dict[str, LatencyHistogram]] = {}
+        self.slow_requests: Deque[Dict[str, Any]] = deque(maxlen=slow_log_size)
+
+    @classmethod
+    def from_env(cls) -> "StageTimingRegistry":
+        """Create a registry configured from environment variables."""
+        return cls(
+            slow_threshold_ms=float(os.getenv("GUARD_SLOW_REQUEST_MS", "1000")),
+            slow_sample_rate=float(os.getenv("GUARD_SLOW_REQUEST_SAMPLE_RATE", "0.1")),
+            slow_log_size=int(os.getenv("GUARD_SLOW_REQUEST_LOG_SIZE", "100"))
+        )
+
+    def start(self) -> Any:
+        """Start timing a request in the current task; returns a token for finish()."""
+        return _current_timer.set(StageTimer())
+
+    def finish(self, token: Any, service_name: str, request_id: str, outcome: Dict[str, Any]) -> None:
+        """Record the current request's stages and stop timing it."""
+        timer = _current_timer.get()
+        _current_timer.reset(token)
+        if timer is None:
+            return
+        total_ns = timer.total_ns()
+        stages = dict(timer.stages)
+        stages["total"] = total_ns
+        self.record(service_name, stages)
+
+        if total_ns >= self.slow_threshold_ns and random.random() < self.slow_sample_rate:
+            breakdown = {name: round(ns / 1e6, 3) for name, ns in stages.items()}
+            entry = {
+                "timestamp": datetime.now().isoformat(),
+                "service_name": service_name,
+                "request_id": request_id,
+                "total_ms": breakdown["total"],
+                "stages_ms": breakdown,
+                **outcome,
+            }
+            self.slow_requests.append(entry)
+            logger.warning(
+                f"Slow guard request {request_id} to {service_name}: {entry['total_ms']:.1f}ms",
+                extra={"stages_ms": breakdown, "request_id": request_id, "service_name": service_name}
+            )
+
+    def record(self, service_name: str, stages: Dict[str, int]) -> None:
+        """Add one request's stage durations (ns) to the histograms."""
+        per_guard = self.histograms.get(service_name)
+        if per_guard is None:
+            per_guard = self.histograms[service_name] = {}
+        for stage, duration_ns in stages.items():
+            histogram = per_guard.get(stage)
+            if histogram is None:
+                histogram = per_guard[stage] = LatencyHistogram()
+            histogram.record(duration_ns)
+        if METRICS_ENABLED:
+            try:
+                record_stage_durations(service_name, stages)
+            except Exception:
+                pass
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Stage percentiles per guard."""
+        return {
+            service_name: {stage: histogram.summary() for stage, histogram in per_guard.items()}
+            for service_name, per_guard in self.histograms.items()
+        }
+
+    def get_slow_requests(self) -> List[Dict[str, Any]]:
+        """Most recent sampled slow requests, newest first."""
+        return list(reversed(self.slow_requests))
+
+    def reset(self) -> None:
+        self.histograms.clear()
+        self.slow_requests.clear()
+
+
+# Global registry instance
+_stage_timings: Optional[StageTimingRegistry] = None
+
+
+def get_stage_timings() -> StageTimingRegistry:
+    """Get global stage timing registry instance."""
+    global _stage_timings
+    if _stage_timings is None:
+        _stage_timings = StageTimingRegistry.from_env()
+    return _stage_timings
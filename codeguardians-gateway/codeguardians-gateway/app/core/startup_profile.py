@@ -0,0 +1,207 @@
+"""
+Startup Profiling
+
+Reports where gateway start time goes, so cold starts and scale-out can be
+kept fast:
+- Import time per module (self and cumulative), via a meta path hook
+- Named startup phases (app creation, lifespan steps, warm-up)
+- Enabled with STARTUP_PROFILE=true; costs nothing when disabled
+
+Run ``python -m app.core.startup_profile`` to print the import profile of
+``app.main`` without starting the server.
+"""
+
+import importlib.abc
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+from app.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+STARTUP_PROFILE_ENABLED = os.getenv("STARTUP_PROFILE", "false").lower() == "true"
+
+# Modules listed in the logged report
+STARTUP_PROFILE_TOP_MODULES = int(os.getenv("STARTUP_PROFILE_TOP_MODULES", "30"))
+
+
+class _TimedLoader(importlib.abc.Loader):
+    """Loader wrapper timing exec_module; everything else is delegated."""
+
+    def __init__(self, loader: Any, profiler: "StartupProfiler"):
+        self._loader = loader
+        self._profiler = profiler
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module) -> None:
+        self._profiler._enter(module.__name__)
+        try:
+            self._loader.exec_module(module)
+        finally:
+            self._profiler._exit(module.__name__)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._loader, name)
+
+
+class _TimingFinder(importlib.abc.MetaPathFinder):
+    """Finds specs with the other finders and wraps their loaders."""
+
+    def __init__(self, profiler: "StartupProfiler"):
+        self._profiler = profiler
+        self._local = threading.local()
+
+    def find_spec(self, fullname, path, target=None):
+        if getattr(self._local, "searching", False):
+            return None
+        self._local.searching = True
+        try:
+            for finder in sys.meta_path:
+                if finder is self or not hasattr(finder, "find_spec"):
+                    continue
+                spec = finder.find_spec(fullname, path, target)
+                if spec is not None:
+                    break
+            else:
+                return None
+        finally:
+            self._local.searching = False
+
+        if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+            spec.loader = _TimedLoader(spec.loader, self._profiler)
+        return spec
+
+
+class StartupProfiler:
+    """
+    Import and phase timings for one process start.
+
+    SAFETY: Only wraps loaders; module contents and import order are unchanged
+    ASSUMES: Installed before the imports it should measure
+    VERIFY: Self times add up to the measured import time
+    """
+
+    def __init__(self):
+        self._finder: Optional[_TimingFinder] = None
+        self._stack: List[List[Any]] = []  # [module, start, child seconds]
+        self._lock = threading.Lock()
+        self.imports: Dict[str, Dict[str, float]] = {}
+        self.phases: Dict[str, float] = {}
+        self.started_at = time.perf_counter()
+
+    @property
+    def installed(self) -> bool:
+        return self._finder is not None
+
+    def install(self) -> None:
+        """Start timing imports."""
+        if self._finder is None:
+            self._finder = _TimingFinder(self)
+            sys.meta_path.insert(0, self._finder)
+
+    def uninstall(self) -> None:
+        """Stop timing imports (already measured modules are kept)."""
+        if self._finder is not None:
+            if self._finder in sys.meta_path:
+                sys.meta_path.remove(self._finder)
+            self._finder = None
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time a named startup phase."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + time.perf_counter() - start
+
+    def report(self, top: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Import and phase timings, slowest modules first.
+
+        Args:
+            top: Number of modules to include (default: all)
+
+        Returns:
+            Dict with total, per-module and per-phase timings in milliseconds
+        """
+        modules = sorted(self.imports.items(), key=lambda item: item[1]["self"], reverse=True)
+        if top is not None:
+            modules = modules[:top]
+        return {
+            "import_total_ms": round(sum(entry["self"] for entry in self.imports.values()) * 1000, 2),
+            "modules_imported": len(self.imports),
+            "modules": [
+                {
+                    "module": name,
+                    "self_ms": round(entry["self"] * 1000, 2),
+                    "cumulative_ms": round(entry["cumulative"] * 1000, 2)
+                }
+                for name, entry in modules
+            ],
+            "phases_ms": {name: round(seconds * 1000, 2) for name, seconds in self.phases.items()},
+            "since_start_ms": round((time.perf_counter() - self.started_at) * 1000, 2)
+        }
+
+    def log_report(self, top: int = STARTUP_PROFILE_TOP_MODULES) -> Dict[str, Any]:
+        """Log the report and return it."""
+        report = self.report(top)
+        logger.info(
+            f"Startup profile: {report['modules_imported']} modules imported in "
+            f"{report['import_total_ms']}ms, phases {report['phases_ms']}"
+        )
+        for entry in report["modules"]:
+            logger.info(f"  import {entry['module']}: self {entry['self_ms']}ms, cumulative {entry['cumulative_ms']}ms")
+        return report
+
+    def _enter(self, module: str) -> None:
+        with self._lock:
+            self._stack.append([module, time.perf_counter(), 0.0])
+
+    def _exit(self, module: str) -> None:
+        with self._lock:
+            if not self._stack or self._stack[-1][0] != module:
+                return
+            _, start, children = self._stack.pop()
+            cumulative = time.perf_counter() - start
+            self.imports[module] = {"self": max(0.0, cumulative - children), "cumulative": cumulative}
+            if self._stack:
+                self._stack[-1][2] += cumulative
+
+
+# Global profiler instance
+_startup_profiler: Optional[StartupProfiler] = None
+
+
+def get_startup_profiler() -> StartupProfiler:
+    """Get global startup profiler instance."""
+    global _startup_profiler
+    if _startup_profiler is None:
+        _startup_profiler = StartupProfiler()
+    return _startup_profiler
+
+
+def install_if_enabled() -> Optional[StartupProfiler]:
+    """Start import timing when STARTUP_PROFILE is set."""
+    if not STARTUP_PROFILE_ENABLED:
+        return None
+    profiler = get_startup_profiler()
+    profiler.install()
+    return profiler
+
+
+if __name__ == "__main__":
+    import json
+
+    profiler = get_startup_profiler()
+    profiler.install()
+    with profiler.phase("import app.main"):
+        importlib.import_module("app.main")
+    profiler.uninstall()
+    print(json.dumps(profiler.report(STARTUP_PROFILE_TOP_MODULES), indent=2))
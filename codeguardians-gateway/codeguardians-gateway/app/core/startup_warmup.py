@@ -0,0 +1,175 @@
+"""
+Startup Warm-up
+
+Brings a new worker to full speed before it takes traffic:
+- Database: opens pool connections up front (SELECT 1 on each)
+- Redis: connects the shared cache client
+- Guards: opens keep-alive connections to every enabled guard service
+
+Readiness stays "warming_up" until every step has finished, so scale-out
+workers are not sent requests while their first calls would still pay for
+connection setup. A failed step is recorded but does not block readiness;
+the dependency checks in the readiness probe still apply.
+"""
+
+import asyncio
+import os
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from app.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Pool connections opened per step (capped by the pool size for the database)
+WARMUP_DB_CONNECTIONS = int(os.getenv("STARTUP_WARMUP_DB_CONNECTIONS", "5"))
+WARMUP_GUARD_CONNECTIONS = int(os.getenv("STARTUP_WARMUP_GUARD_CONNECTIONS", "4"))
+
+# Upper bound on each step so one slow dependency cannot hold readiness
+WARMUP_STEP_TIMEOUT_SECONDS = float(os.getenv("STARTUP_WARMUP_STEP_TIMEOUT_SECONDS", "10"))
+
+
+class StartupWarmup:
+    """
+    Ordered warm-up steps gating readiness.
+
+    SAFETY: Steps time out independently and never raise out of run()
+    ASSUMES: Engine, cache client and orchestrator are created before run()
+    VERIFY: is_complete flips only after every step has finished
+    """
+
+    def __init__(self, step_timeout: float = WARMUP_STEP_TIMEOUT_SECONDS):
+        self.step_timeout = step_timeout
+        self._steps: Dict[str, Callable[[], Awaitable[Any]]] = {}
+        self.results: Dict[str, Dict[str, Any]] = {}
+        self._complete = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self.started_at: Optional[float] = None
+        self.duration_ms: Optional[float] = None
+
+    @property
+    def is_complete(self) -> bool:
+        return self._complete.is_set()
+
+    @property
+    def is_pending(self) -> bool:
+        """Started but not finished (readiness must report not ready)."""
+        return self.started_at is not None and not self.is_complete
+
+    def add_step(self, name: str, step: Callable[[], Awaitable[Any]]) -> None:
+        """Add a warm-up step (run in insertion order)."""
+        self._steps[name] = step
+
+    async def run(self) -> bool:
+        """
+        Run every step, then mark warm-up complete.
+
+        Returns:
+            True when all steps succeeded
+        """
+        if self.started_at is None:
+            self.started_at = time.perf_counter()
+        for name, step in self._steps.items():
+            step_start = time.perf_counter()
+            try:
+                detail = await asyncio.wait_for(step(), timeout=self.step_timeout)
+                self.results[name] = {"ok": True, "detail": detail}
+            except asyncio.TimeoutError:
+                self.results[name] = {"ok": False, "error": "timeout"}
+            except Exception as e:
+                self.results[name] = {"ok": False, "error": str(e)}
+            self.results[name]["duration_ms"] = round((time.perf_counter() - step_start) * 1000, 2)
+            if not self.results[name]["ok"]:
+                logger.warning(f"Warm-up step {name} failed: {self.results[name]['error']}")
+
+        self.duration_ms = round((time.perf_counter() - self.started_at) * 1000, 2)
+        self._complete.set()
+        logger.info(f"Warm-up complete in {self.duration_ms}ms")
+        return all(result["ok"] for result in self.results.values())
+
+    def start(self) -> asyncio.Task:
+        """Run warm-up in the background (liveness answers meanwhile)."""
+        if self._task is None:
+            self.started_at = time.perf_counter()
+            self._task = asyncio.create_task(self.run())
+        return self._task
+
+    async def wait(self, timeout: Optional[float] = None) -> bool:
+        """Wait for warm-up to complete; False on timeout."""
+        try:
+            await asyncio.wait_for(self._complete.wait(), timeout=timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    async def cancel(self) -> None:
+        """Stop a warm-up still running (shutdown during start)."""
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+
+    def status(self) -> Dict[str, Any]:
+        """Warm-up state for the readiness probe."""
+        return {
+            "complete": self.is_complete,
+            "duration_ms": self.duration_ms,
+            "steps": dict(self.results)
+        }
+
+
+async def warm_database(connections: int = WARMUP_DB_CONNECTIONS) -> Dict[str, Any]:
+    """Open pool connections concurrently so first requests skip the connect."""
+    from sqlalchemy import text
+    from app.core.config import get_settings
+    from app.core.database import get_engine
+
+    engine = get_engine()
+    if engine is None:
+        return {"skipped": "database disabled"}
+
+    count = max(1, min(connections, get_settings().DATABASE_POOL_SIZE))
+
+    async def ping():
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    await asyncio.gather(*(ping() for _ in range(count)))
+    return {"connections": count}
+
+
+async def warm_redis() -> Dict[str, Any]:
+    """Connect the shared cache client (connects and pings on first use)."""
+    from app.core.response_cache import get_cache_client
+
+    client = await get_cache_client()
+    if client is None:
+        raise ConnectionError("Redis unavailable")
+    return {"connected": True}
+
+
+async def warm_guards(orchestrator, connections: int = WARMUP_GUARD_CONNECTIONS) -> Dict[str, Any]:
+    """Open keep-alive connections to every enabled guard service."""
+    client = orchestrator.http_client
+    if client is None:
+        return {"skipped": "orchestrator not initialized"}
+
+    async def warm(config) -> int:
+        url = f"{config.base_url}{config.health_endpoint}"
+        results = await asyncio.gather(*(client.get(url) for _ in range(connections)), return_exceptions=True)
+        return sum(not isinstance(result, BaseException) for result in results)
+
+    services = {name: config for name, config in orchestrator.services.items() if config.enabled}
+    opened = await asyncio.gather(*(warm(config) for config in services.values()))
+    return dict(zip(services, opened))
+
+
+# Global warm-up instance
+_startup_warmup: Optional[StartupWarmup] = None
+
+
+def get_startup_warmup() -> StartupWarmup:
+    """Get global startup warm-up instance."""
+    global _startup_warmup
+    if _startup_warmup is None:
+        _startup_warmup = StartupWarmup()
+    return _startup_warmup
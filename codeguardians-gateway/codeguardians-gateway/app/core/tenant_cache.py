@@ -0,0 +1,334 @@
+"""
+Tenant Context Cache for API-Key Authentication
+
+Resolving an API key to its tenant (organization, user, role, permissions)
+is cached so authenticated requests skip the database:
+- Entries are keyed by a SHA-256 hash of the API key (raw keys are never stored)
+- Tier 1: in-process LRU with a short TTL
+- Tier 2: Redis, shared by all gateway replicas
+- Concurrent misses for the same key share one database lookup
+- Unknown keys are negatively cached in process for a few seconds
+- Entries never outlive the API key: a cached expires_at caps both TTLs
+  and is re-checked on every hit
+- Key revocation and membership changes invalidate entries by key, user or
+  organization; other replicas drop their local copies via Redis pub/sub
+"""
+
+import asyncio
+import hashlib
+import json
+import math
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Set, Tuple
+
+import redis.asyncio as redis
+
+from app.core.single_flight import SingleFlight
+from app.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+TENANT_CACHE_ENABLED = os.getenv("TENANT_CACHE_ENABLED", "true").lower() == "true"
+
+# Pub/sub channel carrying invalidations ("key:<hash>", "user:<id>", "org:<id>")
+INVALIDATION_CHANNEL = "tenant-cache:invalidate"
+
+_MISSING = object()
+
+
+def hash_api_key(api_key: str) -> str:
+    """SHA-256 hex digest of an API key (matches APIKey.key_hash)."""
+    return hashlib.sha256(api_key.encode("utf-8")).hexdigest()
+
+
+def _key_lifetime(value: Optional[Dict[str, Any]]) -> Optional[float]:
+    """Seconds until the cached key expires; None if it never does."""
+    if not value or value.get("expires_at") is None:
+        return None
+    return float(value["expires_at"]) - time.time()
+
+
+def _key_expired(value: Optional[Dict[str, Any]]) -> bool:
+    remaining = _key_lifetime(value)
+    return remaining is not None and remaining <= 0
+
+
+class TenantContextCache:
+    """
+    Two-tier cache of resolved API-key tenant contexts.
+
+    SAFETY: Redis failures fall back to the database lookup, never to a stale grant
+    ASSUMES: Cached values are plain dicts with organization_id, user_id and
+             expires_at (epoch seconds or None)
+    VERIFY: A lookup that raced with an invalidation is not cached; an
+            expired key is never served from either tier
+    """
+
+    def __init__(
+        self,
+        redis_url: Optional[str] = None,
+        max_entries: int = 10000,
+        local_ttl: float = 30.0,
+        redis_ttl: int = 300,
+        negative_ttl: float = 5.0,
+        redis_timeout: float = 0.05,
+        key_prefix: str = "tenant:apikey:"
+    ):
+        self.redis_url = redis_url
+        self.max_entries = max_entries
+        self.local_ttl = local_ttl
+        self.redis_ttl = redis_ttl
+        self.negative_ttl = negative_ttl
+        self.redis_timeout = redis_timeout
+        self.key_prefix = key_prefix
+        self.redis_client: Optional[redis.Redis] = None
+        self._local: "OrderedDict[str, Tuple[float, Optional[Dict[str, Any]]]]" = OrderedDict()
+        self._by_user: Dict[str, Set[str]] = {}
+        self._by_org: Dict[str, Set[str]] = {}
+        self._generation = 0
+        self._single_flight = SingleFlight()
+        self._listener_task: Optional[asyncio.Task] = None
+        self.stats = {"local_hits": 0, "redis_hits": 0, "misses": 0, "invalidations": 0, "redis_errors": 0}
+
+    @classmethod
+    def from_env(cls, redis_url: Optional[str] = None) -> "TenantContextCache":
+        """Create a cache configured from environment variables."""
+        return cls(
+            redis_url=redis_url,
+            max_entries=int(os.getenv("TENANT_CACHE_MAX_ENTRIES", "10000")),
+            local_ttl=float(os.getenv("TENANT_CACHE_LOCAL_TTL_SECONDS", "30")),
+            redis_ttl=int(os.getenv("TENANT_CACHE_REDIS_TTL_SECONDS", "300")),
+            negative_ttl=float(os.getenv("TENANT_CACHE_NEGATIVE_TTL_SECONDS", "5")),
+            redis_timeout=float(os.getenv("TENANT_CACHE_REDIS_TIMEOUT_MS", "50")) / 1000
+        )
+
+    def _redis_key(self, key_hash: str) -> str:
+        return f"{self.key_prefix}{key_hash}"
+
+    async def _get_redis(self) -> Optional[redis.Redis]:
+        if self.redis_client is None and self.redis_url:
+            self.redis_client = redis.from_url(
+                self.redis_url,
+                encoding="utf-8",
+                decode_responses=True,
+                socket_connect_timeout=5,
+                socket_timeout=5
+            )
+        if self.redis_client is not None and self._listener_task is None:
+            self._listener_task = asyncio.get_running_loop().create_task(self._listen())
+        return self.redis_client
+
+    async def _redis_call(self, fn: Callable[[redis.Redis], Awaitable[Any]]) -> Any:
+        """Run a Redis operation with the cache timeout; _MISSING on any failure."""
+        try:
+            client = await self._get_redis()
+            if client is None:
+                return _MISSING
+            return await asyncio.wait_for(fn(client), timeout=self.redis_timeout)
+        except Exception as e:
+            self.stats["redis_errors"] += 1
+            logger.debug(f"Tenant cache Redis operation failed: {e}")
+            return _MISSING
+
+    # ------------------------------------------------------------------
+    # Lookup
+    # ------------------------------------------------------------------
+
+    async def get_or_load(
+        self,
+        key_hash: str,
+        loader: Callable[[], Awaitable[Optional[Dict[str, Any]]]]
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Get the tenant context for an API key hash, loading it on a miss.
+
+        Args:
+            key_hash: hash_api_key() of the presented key
+            loader: Zero-argument coroutine function querying the database
+                (returns None for unknown or inactive keys)
+
+        Returns:
+            Tenant context dict or None
+        """
+        entry = self._local.get(key_hash)
+        if entry is not None:
+            expires_at, value = entry
+            if expires_at > time.monotonic() and not _key_expired(value):
+                self._local.move_to_end(key_hash)
+                self.stats["local_hits"] += 1
+                return value
+            self._drop_local(key_hash)
+
+        value, _ = await self._single_flight.do(key_hash, lambda: self._load(key_hash, loader))
+        return value
+
+    async def _load(
+        self,
+        key_hash: str,
+        loader: Callable[[], Awaitable[Optional[Dict[str, Any]]]]
+    ) -> Optional[Dict[str, Any]]:
+        generation = self._generation
+
+        cached = await self._redis_call(lambda client: client.get(self._redis_key(key_hash)))
+        if cached not in (_MISSING, None):
+            value = json.loads(cached)
+            if not _key_expired(value):
+                self.stats["redis_hits"] += 1
+                if generation == self._generation:
+                    self._store_local(key_hash, value)
+                return value
+
+        self.stats["misses"] += 1
+        value = await loader()
+        if generation != self._generation or _key_expired(value):
+            # Invalidated while loading (or expiring now): serve it, do not cache it
+            return value
+
+        self._store_local(key_hash, value)
+        if value is not None:
+            await self._redis_call(lambda client: self._store_redis(client, key_hash, value))
+        return value
+
+    async def _store_redis(self, client: redis.Redis, key_hash: str, value: Dict[str, Any]) -> None:
+        ttl = self.redis_ttl
+        remaining = _key_lifetime(value)
+        if remaining is not None:
+            ttl = max(1, min(ttl, math.ceil(remaining)))
+        pipe = client.pipeline(transaction=False)
+        pipe.set(self._redis_key(key_hash), json.dumps(value), ex=ttl)
+        for index_key in self._index_keys(value):
+            pipe.sadd(index_key, key_hash)
+            pipe.expire(index_key, self.redis_ttl)
+        await pipe.execute()
+
+    def _index_keys(self, value: Dict[str, Any]) -> Tuple[str, str]:
+        return (f"{self.key_prefix}user:{value['user_id']}", f"{self.key_prefix}org:{value['organization_id']}")
+
+    def _store_local(self, key_hash: str, value: Optional[Dict[str, Any]]) -> None:
+        self._drop_local(key_hash)
+        ttl = self.local_ttl if value is not None else self.negative_ttl
+        remaining = _key_lifetime(value)
+        if remaining is not None:
+            ttl = min(ttl, remaining)
+        self._local[key_hash] = (time.monotonic() + ttl, value)
+        if value is not None:
+            self._by_user.setdefault(str(value["user_id"]), set()).add(key_hash)
+            self._by_org.setdefault(str(value["organization_id"]), set()).add(key_hash)
+        while len(self._local) > self.max_entries:
+            self._drop_local(next(iter(self._local)))
+
+    def _drop_local(self, key_hash: str) -> None:
+        entry = self._local.pop(key_hash, None)
+        if entry is None or entry[1] is None:
+            return
+        value = entry[1]
+        for index, owner in ((self._by_user, str(value["user_id"])), (self._by_org, str(value["organization_id"]))):
+            hashes = index.get(owner)
+            if hashes is not None:
+                hashes.discard(key_hash)
+                if not hashes:
+                    del index[owner]
+
+    # ------------------------------------------------------------------
+    # Invalidation
+    # ------------------------------------------------------------------
+
+    async def invalidate_api_key(self, key_hash: str) -> None:
+        """Invalidate one API key (e.g. on revocation)."""
+        await self._invalidate([key_hash], None, f"key:{key_hash}")
+
+    async def invalidate_user(self, user_id: Any) -> None:
+        """Invalidate every API key of a user (membership, role or account changes)."""
+        await self._invalidate(
+            list(self._by_user.get(str(user_id), ())), f"{self.key_prefix}user:{user_id}", f"user:{user_id}"
+        )
+
+    async def invalidate_organization(self, organization_id: Any) -> None:
+        """Invalidate every API key resolving to an organization."""
+        await self._invalidate(
+            list(self._by_org.get(str(organization_id), ())),
+            f"{self.key_prefix}org:{organization_id}",
+            f"org:{organization_id}"
+        )
+
+    async def _invalidate(self, key_hashes: Iterable[str], index_key: Optional[str], message: str) -> None:
+        self._generation += 1
+        self.stats["invalidations"] += 1
+        for key_hash in key_hashes:
+            self._drop_local(key_hash)
+
+        async def purge(client: redis.Redis) -> None:
+            hashes = set(key_hashes)
+            if index_key:
+                hashes.update(await client.smembers(index_key))
+            keys = [self._redis_key(h) for h in hashes] + ([index_key] if index_key else [])
+            if keys:
+                await client.delete(*keys)
+            await client.publish(INVALIDATION_CHANNEL, message)
+
+        await self._redis_call(purge)
+
+    def _apply_remote_invalidation(self, message: str) -> None:
+        kind, _, value = message.partition(":")
+        self._generation += 1
+        if kind == "key":
+            self._drop_local(value)
+        elif kind == "user":
+            for key_hash in list(self._by_user.get(value, ())):
+                self._drop_local(key_hash)
+        elif kind == "org":
+            for key_hash in list(self._by_org.get(value, ())):
+                self._drop_local(key_hash)
+
+    async def _listen(self) -> None:
+        """Apply invalidations published by other replicas."""
+        while True:
+            try:
+                pubsub = self.redis_client.pubsub()
+                await pubsub.subscribe(INVALIDATION_CHANNEL)
+                async for message in pubsub.listen():
+                    if message.get("type") == "message":
+                        self._apply_remote_invalidation(message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Entries still expire after local_ttl while the listener is down
+                logger.warning(f"Tenant cache invalidation listener failed: {e}")
+                await asyncio.sleep(5)
+
+    def clear_local(self) -> None:
+        """Drop every in-process entry."""
+        self._generation += 1
+        self._local.clear()
+        self._by_user.clear()
+        self._by_org.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get hit/miss counters and the in-process entry count."""
+        return {**self.stats, "local_entries": len(self._local)}
+
+    async def close(self) -> None:
+        """Stop the invalidation listener and close Redis."""
+        if self._listener_task and not self._listener_task.done():
+            self._listener_task.cancel()
+            try:
+                await self._listener_task
+            except asyncio.CancelledError:
+                pass
+        if self.redis_client:
+            await self.redis_client.close()
+
+
+# Global tenant cache instance
+_tenant_cache: Optional[TenantContextCache] = None
+
+
+def get_tenant_cache() -> TenantContextCache:
+    """Get global tenant context cache instance."""
+    global _tenant_cache
+    if _tenant_cache is None:
+        from app.core.config import get_settings
+        _tenant_cache = TenantContextCache.from_env(get_settings().REDIS_URL)
+    return _tenant_cache
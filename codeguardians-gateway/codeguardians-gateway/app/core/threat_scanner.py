@@ -0,0 +1,182 @@
+"""
+Compiled Multi-Pattern Threat Scanner
+
+Threat patterns are compiled once and matched in two steps:
+- Prefilter: every pattern's longest mandatory literal is extracted at
+  compile time; a payload is case-folded once and only patterns whose
+  literal occurs in it (plus patterns without a literal) stay candidates
+- Confirmation: candidate patterns run as precompiled regexes and report
+  the span of every match
+
+Substring checks run at C speed, so benign payloads cost one fold plus a
+handful of `in` checks instead of one regex search per pattern. A single
+alternation of all patterns is not used: CPython's backtracking engine
+tries every branch at every position, which benchmarks ~10x slower than
+separate searches.
+
+Spans refer to the original (unfolded) text so callers such as the
+sanitizer can act on matches without scanning again.
+"""
+
+import re
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+try:
+    from re import _parser as sre_parse  # Python 3.11+
+except ImportError:  # pragma: no cover
+    import sre_parse
+
+# Non-ASCII characters that re.IGNORECASE matches against ASCII letters.
+# Mapping them before lower() keeps the prefilter free of false negatives.
+_CASE_FOLD = str.maketrans({"İ": "i", "ı": "i", "ſ": "s", "K": "k"})
+
+
+class ThreatMatch(NamedTuple):
+    """One pattern match in a scanned string."""
+    threat_type: str
+    pattern: str
+    start: int
+    end: int
+
+
+def fold_text(text: str) -> str:
+    """Lowercase text for the literal prefilter (ASCII fast path)."""
+    if text.isascii():
+        return text.lower()
+    return text.translate(_CASE_FOLD).lower()
+
+
+def required_literal(pattern: str) -> Optional[str]:
+    """
+    Longest literal every match of a pattern must contain.
+
+    Only top-level literal runs are considered (never text inside groups,
+    branches, classes or repeats), so the literal is mandatory.
+
+    Returns:
+        Lowercased literal, or None if the pattern has none usable
+    """
+    try:
+        parsed = sre_parse.parse(pattern)
+    except Exception:
+        return None
+
+    best, run = "", []
+    for op, av in list(parsed) + [(None, None)]:
+        if op is sre_parse.LITERAL:
+            run.append(chr(av))
+            continue
+        literal = "".join(run)
+        if len(literal) > len(best):
+            best = literal
+        run = []
+
+    if not best or not best.isascii():
+        return None
+    return best.lower()
+
+
+class ThreatScanner:
+    """
+    Threat patterns compiled into a literal prefilter plus confirming regexes.
+
+    SAFETY: The prefilter only skips patterns that cannot match (no false negatives)
+    ASSUMES: Patterns are matched case-insensitively
+    VERIFY: scan() reports the same (threat_type, pattern) pairs as re.search per pattern
+    """
+
+    def __init__(self, threat_patterns: Dict[str, List[str]], flags: int = re.IGNORECASE):
+        self.threat_patterns = threat_patterns
+        self.patterns: List[str] = []
+        self._compiled: List[re.Pattern] = []
+        self._threat_types: List[List[str]] = []
+        index_of: Dict[str, int] = {}
+
+        # Patterns shared by several threat types are compiled and run once
+        for threat_type, patterns in threat_patterns.items():
+            for pattern in patterns:
+                if pattern not in index_of:
+                    index_of[pattern] = len(self.patterns)
+                    self.patterns.append(pattern)
+                    self._compiled.append(re.compile(pattern, flags))
+                    self._threat_types.append([])
+                self._threat_types[index_of[pattern]].append(threat_type)
+
+        # Report order matches threat_patterns order
+        self._entries: List[Tuple[str, str, int]] = [
+            (threat_type, pattern, index_of[pattern])
+            for threat_type, patterns in threat_patterns.items()
+            for pattern in patterns
+        ]
+
+        literals: Dict[str, List[int]] = {}
+        self._always: List[int] = []
+        for index, pattern in enumerate(self.patterns):
+            literal = required_literal(pattern)
+            if literal is None:
+                self._always.append(index)
+            else:
+                literals.setdefault(literal, []).append(index)
+        self._literals: List[Tuple[str, List[int]]] = sorted(literals.items())
+
+    def candidates(self, texts: Iterable[str]) -> Set[int]:
+        """
+        Indexes of patterns that may match any of the given strings.
+
+        All strings are folded and joined once, so a whole payload needs a
+        single prefilter pass.
+        """
+        haystack = "\x00".join(fold_text(text) for text in texts)
+        found = set(self._always)
+        for literal, indexes in self._literals:
+            if literal in haystack:
+                found.update(indexes)
+        return found
+
+    def scan(self, text: str, candidates: Optional[Set[int]] = None) -> List[ThreatMatch]:
+        """
+        Scan one string.
+
+        Args:
+            text: String to scan
+            candidates: Result of candidates() for a payload containing text;
+                computed from text alone when omitted
+
+        Returns:
+            Matches ordered by threat type and pattern, then position
+        """
+        if candidates is None:
+            candidates = self.candidates((text,))
+
+        spans: Dict[int, List[Tuple[int, int]]] = {}
+        for index in candidates:
+            found = [match.span() for match in self._compiled[index].finditer(text)]
+            if found:
+                spans[index] = found
+
+        if not spans:
+            return []
+        return [
+            ThreatMatch(threat_type, pattern, start, end)
+            for threat_type, pattern, index in self._entries
+            if index in spans
+            for start, end in spans[index]
+        ]
+
+
+def redact_spans(text: str, spans: Iterable[Tuple[int, int]], replacement: str = "") -> str:
+    """Replace (possibly overlapping) spans of text with a replacement."""
+    merged: List[List[int]] = []
+    for start, end in sorted(spans):
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+
+    parts, position = [], 0
+    for start, end in merged:
+        parts.append(text[position:start])
+        parts.append(replacement)
+        position = end
+    parts.append(text[position:])
+    return "".join(parts)
@@ -5,12 +5,19 @@ This module creates and configures the FastAPI application with all
 necessary middleware, routes, and error handlers.
 """
 
+import asyncio
+import importlib
 import logging
 import os
 from contextlib import asynccontextmanager
 from typing import AsyncGenerator
 from datetime import datetime
 
+from app.core.startup_profile import get_startup_profiler, install_if_enabled
+
+# Time every import below when STARTUP_PROFILE is set
+install_if_enabled()
+
 from fastapi import FastAPI, Request, Response, HTTPException, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
@@ -40,8 +47,8 @@ from app.api.v1.bias import router as bias_router
 from app.api.v1.analytics import router as analytics_router
 from app.api.v1.guards_integrated import router as guards_integrated_router
 from app.api.v1.direct_guards import router as direct_guards_router
-from app.api.v1 import auth, users, posts, guards, organizations, subscriptions, enterprise, legal, ab_testing, upload, config, performance
-from app.api.v1.guards import GuardRequest
+from app.api.v1 import auth, users, posts, guards, organizations, subscriptions, legal, config, performance
+from app.api.v1.guards import GuardRequest, BatchGuardRequest
 from app.api.webhooks import stripe_webhooks_router, clerk_webhooks_router, stripe_api_router
 from app.api.internal import guards as internal_guards
 from app.core.guard_orchestrator import orchestrator
@@ -72,6 +79,20 @@ REQUEST_DURATION = Histogram(
 
 settings = get_settings()
 
+# Optional subsystems: imported and mounted only when their setting is enabled
+OPTIONAL_ROUTERS = {
+    "ENTERPRISE_ENABLED": ("app.api.v1.enterprise", [
+        ("router", {"prefix": "/api/v1", "tags": ["Enterprise Setup"]})
+    ]),
+    "AB_TESTING_ENABLED": ("app.api.v1.ab_testing", [
+        ("router", {"tags": ["A/B Testing"]}),
+        ("legacy_router", {"tags": ["A/B Testing (Legacy)"]})
+    ]),
+    "UPLOAD_ENABLED": ("app.api.v1.upload", [
+        ("router", {"prefix": "/api/v1", "tags": ["File Upload"]})
+    ])
+}
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
@@ -88,11 +109,23 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     
     # Register graceful shutdown handlers
     from app.core.graceful_shutdown import register_shutdown_handler, get_request_drainer
+    from app.core.startup_warmup import get_startup_warmup, warm_database, warm_guards, warm_redis
+    warmup = get_startup_warmup()
+    profiler = get_startup_profiler()
+    
+    async def shutdown_warmup():
+        """Stop a warm-up still running."""
+        await warmup.cancel()
     
     async def shutdown_orchestrator():
         """Shutdown guard orchestrator."""
         await orchestrator.shutdown()
     
+    async def shutdown_health_prober():
+        """Stop scheduled health probes."""
+        from app.core.health_prober import get_health_prober
+        await get_health_prober().stop()
+    
     async def shutdown_job_queue():
         """Shutdown job queue."""
         if 'job_queue' in locals():
@@ -110,8 +143,22 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
         optimizer = get_connection_optimizer()
         await optimizer.close_all()
     
+    async def shutdown_usage_metering():
+        """Flush buffered usage records."""
+        from app.middleware.usage_tracking import usage_tracker
+        await usage_tracker.close()
+    
+    async def shutdown_guard_metrics():
+        """Flush buffered guard operation metrics."""
+        from app.core.guard_metrics_buffer import get_guard_metrics_buffer
+        await get_guard_metrics_buffer().close()
+    
+    register_shutdown_handler(shutdown_warmup)
     register_shutdown_handler(shutdown_orchestrator)
+    register_shutdown_handler(shutdown_health_prober)
     register_shutdown_handler(shutdown_job_queue)
+    register_shutdown_handler(shutdown_usage_metering)  # Before the engine is disposed
+    register_shutdown_handler(shutdown_guard_metrics)
     register_shutdown_handler(shutdown_database)
     register_shutdown_handler(shutdown_connection_pools)
     
@@ -119,11 +166,13 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     logger.info(" Starting CodeGuardians Gateway...")
     
     # Initialize database
-    await init_db()
+    with profiler.phase("init_db"):
+        await init_db()
     logger.info(" Database initialized")
     
     # Initialize guard orchestrator
-    await orchestrator.initialize()
+    with profiler.phase("orchestrator"):
+        await orchestrator.initialize()
     logger.info(" Guard orchestrator initialized")
     
     # Initialize performance optimizers
@@ -138,22 +187,40 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
 
     # Run database migrations
     from app.core.database import run_migrations
-    await run_migrations()
+    with profiler.phase("migrations"):
+        await run_migrations()
     logger.info(" Database migrations completed")
     
     # Initialize guard metrics tables
     from app.core.guard_metrics_migration import run_guard_metrics_migration
-    await run_guard_metrics_migration()
+    with profiler.phase("guard_metrics_migration"):
+        await run_guard_metrics_migration()
     logger.info(" Guard metrics tables initialized")
 
     # Initialize job queue
     from app.core.job_queue import initialize_job_queue, register_job_handler
-    job_queue = await initialize_job_queue()
+    with profiler.phase("job_queue"):
+        job_queue = await initialize_job_queue()
 
-    # Register job handlers
-    await _register_job_handlers(job_queue)
+        # Register job handlers
+        await _register_job_handlers(job_queue)
     logger.info(" Job queue initialized")
 
+    # Warm pools in the background; /health/ready reports not ready until done
+    warmup.add_step("database", warm_database)
+    warmup.add_step("redis", warm_redis)
+    warmup.add_step("guards", lambda: warm_guards(orchestrator))
+    warmup.start()
+    
+    if profiler.installed:
+        async def report_startup_profile():
+            await warmup.wait()
+            profiler.phases["warmup"] = (warmup.duration_ms or 0.0) / 1000
+            profiler.uninstall()
+            app.state.startup_profile = profiler.log_report()
+        
+        app.state.startup_profile_task = asyncio.create_task(report_startup_profile())
+
     logger.info(" CodeGuardians Gateway started successfully")
     
     yield
@@ -171,7 +238,6 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     
     # Execute shutdown handlers (registered above) with timeout
     from app.core.graceful_shutdown import _execute_shutdown_handlers
-    import asyncio
     try:
         await asyncio.wait_for(_execute_shutdown_handlers(), timeout=10.0)
     except asyncio.TimeoutError:
@@ -234,7 +300,7 @@ async def _register_job_handlers(job_queue):
         try:
             # Trigger health checks for all services
             from app.core.guard_orchestrator import orchestrator
-            await orchestrator.refresh_health_status()
+            await orchestrator.refresh_health_checks()
             logger.info("Health check job completed")
 
         except Exception as e:
@@ -286,11 +352,15 @@ def create_app() -> FastAPI:
         lifespan=lifespan
     )
     
+    profiler = get_startup_profiler()
+    
     # Add middleware
-    _add_middleware(app)
+    with profiler.phase("middleware"):
+        _add_middleware(app)
     
     # Add routes
-    _add_routes(app)
+    with profiler.phase("routes"):
+        _add_routes(app)
     
     # Add exception handlers
     _add_exception_handlers(app)
@@ -466,13 +536,10 @@ def _add_routes(app: FastAPI) -> None:
     app.include_router(admin_guards.router, tags=["Guard Admin"])
     app.include_router(organizations.router, prefix="/api/v1", tags=["Organizations"])
     app.include_router(subscriptions.router, prefix="/api/v1", tags=["Subscriptions"])
-    app.include_router(enterprise.router, prefix="/api/v1", tags=["Enterprise Setup"])
     app.include_router(legal.router, prefix="/api/v1/legal", tags=["Legal & Compliance"])
     app.include_router(config.router, prefix="/api/v1", tags=["Configuration"])
     app.include_router(performance.router)
-    app.include_router(ab_testing.router, tags=["A/B Testing"])
-    app.include_router(ab_testing.legacy_router, tags=["A/B Testing (Legacy)"])
-    app.include_router(upload.router, prefix="/api/v1", tags=["File Upload"])
+    _add_optional_routers(app)
     app.include_router(stripe_webhooks_router, prefix="/webhooks", tags=["Stripe Webhooks"])
     app.include_router(stripe_api_router, prefix="/stripe", tags=["Stripe API"])
     app.include_router(clerk_webhooks_router, prefix="/webhooks", tags=["Clerk Webhooks"])
@@ -529,6 +596,14 @@ def _add_routes(app: FastAPI) -> None:
         
         return await process_guard_request(request, background_tasks, http_request)
     
+    # Add batch scan endpoint as alias for guards/process/batch
+    @app.post("/api/v1/scan/batch")
+    async def scan_batch_alias(request: BatchGuardRequest, http_request: Request):
+        """Batch scan endpoint - alias for guards/process/batch (NDJSON stream)."""
+        from app.api.v1.guards import process_batch_guard_request
+        
+        return await process_batch_guard_request(request, http_request)
+    
     # Metrics endpoint
     @app.get("/metrics")
     async def metrics():
@@ -564,6 +639,18 @@ def _add_routes(app: FastAPI) -> None:
         }
 
 
+def _add_optional_routers(app: FastAPI) -> None:
+    """Import and mount optional subsystems that are enabled in settings."""
+    for flag, (module_name, routers) in OPTIONAL_ROUTERS.items():
+        if not getattr(settings, flag, True):
+            logger.info(f"{module_name} not loaded ({flag} is disabled)")
+            continue
+        
+        module = importlib.import_module(module_name)
+        for attr, include_kwargs in routers:
+            app.include_router(getattr(module, attr), **include_kwargs)
+
+
 def _add_exception_handlers(app: FastAPI) -> None:
     """Add global exception handlers with standardized format."""
     from app.api.error_handler import (
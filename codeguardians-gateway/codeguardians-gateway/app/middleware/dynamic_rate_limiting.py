@@ -3,6 +3,10 @@ Dynamic rate limiting middleware with runtime configuration support.
 
 This middleware provides dynamic rate limiting that can be adjusted
 at runtime without requiring application restarts.
+
+Decisions are made against in-process token buckets that are reconciled
+with Redis in batches (see app.core.hybrid_rate_limiter), so checking a
+limit costs no Redis round trip.
 """
 
 import time
@@ -13,6 +17,7 @@ from fastapi.responses import JSONResponse
 # Removed dynamic_config dependency - using static config from settings
 from app.core.exceptions import RateLimitError
 from app.core.config import get_settings
+from app.core.hybrid_rate_limiter import HybridRateLimiter
 from app.utils.logging import get_logger
 import redis.asyncio as redis
 import json
@@ -32,6 +37,7 @@ class DynamicRateLimiter:
         self._rate_limit_cache: Dict[str, Dict[str, any]] = {}
         self._cache_ttl = 60  # Cache TTL in seconds
         self._last_config_update = 0
+        self._buckets = HybridRateLimiter.from_env(self._get_redis_client)
     
     async def _get_redis_client(self) -> redis.Redis:
         """Get Redis client with connection pooling."""
@@ -104,54 +110,13 @@ class DynamicRateLimiter:
         window: int,
         identifier: str
     ) -> Tuple[bool, Dict[str, any]]:
-        """Check rate limit using Redis."""
-        try:
-            redis_client = await self._get_redis_client()
-            current_time = int(time.time())
-            
-            # Use sliding window algorithm
-            pipe = redis_client.pipeline()
-            
-            # Remove expired entries
-            pipe.zremrangebyscore(key, 0, current_time - window)
-            
-            # Count current requests
-            pipe.zcard(key)
-            
-            # Add current request
-            pipe.zadd(key, {str(current_time): current_time})
-            
-            # Set expiration
-            pipe.expire(key, window)
-            
-            results = await pipe.execute()
-            current_count = results[1]
-            
-            # Check if limit exceeded
-            if current_count >= limit:
-                return False, {
-                    "limit": limit,
-                    "remaining": 0,
-                    "reset_time": current_time + window,
-                    "retry_after": window
-                }
-            
-            return True, {
-                "limit": limit,
-                "remaining": limit - current_count - 1,
-                "reset_time": current_time + window,
-                "retry_after": 0
-            }
-            
-        except Exception as e:
-            logger.error(f"Redis rate limit check failed: {e}")
-            # Fall back to allowing the request
-            return True, {
-                "limit": limit,
-                "remaining": limit,
-                "reset_time": int(time.time()) + window,
-                "retry_after": 0
-            }
+        """
+        Check rate limit against the local bucket for key.
+        
+        Consumption is reconciled with the other replicas through Redis in the
+        background; if Redis is slow the bucket keeps limiting locally.
+        """
+        return self._buckets.acquire(key, limit, window)
     
     async def _check_memory_rate_limit(
         self, 
@@ -334,8 +299,13 @@ class DynamicRateLimiter:
             # Allow request on error
             return True, {"limit": 0, "remaining": 0, "reset_time": 0, "retry_after": 0}
     
+    def get_stats(self) -> Dict[str, any]:
+        """Get local bucket and Redis reconciliation statistics."""
+        return self._buckets.get_stats()
+    
     async def close(self):
-        """Close Redis connection."""
+        """Reconcile outstanding budgets and close Redis connection."""
+        await self._buckets.close()
         if self.redis_client:
             await self.redis_client.close()
 
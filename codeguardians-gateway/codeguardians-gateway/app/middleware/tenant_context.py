@@ -9,6 +9,8 @@ This middleware enforces multi-tenancy by:
 
 Architecture:
 - Tenant context is stored in request state
+- API-key tenant resolution is cached (in-process LRU + Redis, see
+  app.core.tenant_cache) and resolved with one joined query on a miss
 - All database queries are automatically scoped to tenant
 - Cross-tenant data access is prevented
 - Audit logging tracks tenant-specific actions
@@ -19,7 +21,8 @@ from fastapi import Request, HTTPException, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from starlette.middleware.base import BaseHTTPMiddleware
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_
+from sqlalchemy import select, and_, or_, func
+import json
 import jwt
 from datetime import datetime, timezone
 from pydantic import BaseModel
@@ -27,6 +30,7 @@ from pydantic import BaseModel
 from app.core.config import get_settings
 from app.core.database import get_db
 from app.core.models import User, Organization, OrganizationMember, APIKey
+from app.core.tenant_cache import TENANT_CACHE_ENABLED, get_tenant_cache, hash_api_key
 from app.utils.logging import get_logger
 
 logger = get_logger(__name__)
@@ -115,60 +119,97 @@ async def extract_tenant_from_jwt(token: str) -> Optional[TenantContext]:
         raise HTTPException(status_code=401, detail="Token validation failed")
 
 
-async def extract_tenant_from_api_key(api_key: str, db: AsyncSession) -> Optional[TenantContext]:
+def _parse_key_permissions(raw: Optional[str]) -> List[str]:
+    """Parse APIKey.permissions (JSON list stored as text)."""
+    if not raw:
+        return []
+    try:
+        permissions = json.loads(raw)
+    except (TypeError, ValueError):
+        return []
+    return [str(p) for p in permissions] if isinstance(permissions, list) else []
+
+
+async def load_api_key_tenant(key_hash: str, db: AsyncSession) -> Optional[Dict[str, Any]]:
     """
-    Extract tenant context from API key.
+    Resolve an API key hash to tenant fields with one joined query.
+    
+    The key must be active and unexpired, its user active, and the user an
+    active member of an organization.
     
     Args:
-        api_key: API key string
+        key_hash: hash_api_key() of the presented key
         db: Database session
         
     Returns:
-        TenantContext object or None if invalid
+        Dict of TenantContext fields plus the key's expires_at (epoch
+        seconds or None, so caches can honour it) or None if the key does
+        not resolve
     """
-    try:
-        # Find API key in database
-        api_key_stmt = select(APIKey).where(
+    stmt = (
+        select(
+            APIKey.user_id,
+            APIKey.permissions,
+            APIKey.expires_at,
+            OrganizationMember.organization_id,
+            OrganizationMember.role
+        )
+        .join(User, User.id == APIKey.user_id)
+        .join(
+            OrganizationMember,
             and_(
-                APIKey.key == api_key,
-                APIKey.is_active == True
+                OrganizationMember.user_id == User.id,
+                OrganizationMember.is_active == True
             )
         )
-        api_key_result = await db.execute(api_key_stmt)
-        db_api_key = api_key_result.scalar_one_or_none()
-        
-        if not db_api_key:
-            logger.warning(f"Invalid or inactive API key: {api_key[:8]}...")
-            return None
-        
-        # Get user and organization information
-        user_stmt = select(User).where(User.id == db_api_key.user_id)
-        user_result = await db.execute(user_stmt)
-        user = user_result.scalar_one_or_none()
-        if not user:
-            logger.warning(f"User not found for API key: {api_key[:8]}...")
-            return None
-        
-        # Get user's organization membership
-        membership_stmt = select(OrganizationMember).where(
+        .where(
             and_(
-                OrganizationMember.user_id == user.id,
-                OrganizationMember.is_active == True
+                APIKey.key_hash == key_hash,
+                APIKey.is_active == True,
+                User.is_active == True,
+                or_(APIKey.expires_at.is_(None), APIKey.expires_at > func.now())
             )
         )
-        membership_result = await db.execute(membership_stmt)
-        membership = membership_result.scalar_one_or_none()
+        .order_by(OrganizationMember.id)
+        .limit(1)
+    )
+    row = (await db.execute(stmt)).first()
+    if row is None:
+        return None
+    
+    return {
+        "organization_id": str(row.organization_id),
+        "user_id": str(row.user_id),
+        "role": getattr(row.role, "value", row.role),
+        "permissions": _parse_key_permissions(row.permissions),
+        "expires_at": row.expires_at.timestamp() if row.expires_at else None
+    }
+
+
+async def extract_tenant_from_api_key(api_key: str, db: AsyncSession) -> Optional[TenantContext]:
+    """
+    Extract tenant context from API key.
+    
+    Args:
+        api_key: API key string
+        db: Database session
         
-        if not membership:
-            logger.warning(f"No active organization membership for user: {user.id}")
+    Returns:
+        TenantContext object or None if invalid
+    """
+    try:
+        key_hash = hash_api_key(api_key)
+        
+        if TENANT_CACHE_ENABLED:
+            tenant = await get_tenant_cache().get_or_load(key_hash, lambda: load_api_key_tenant(key_hash, db))
+        else:
+            tenant = await load_api_key_tenant(key_hash, db)
+        
+        if not tenant:
+            logger.warning(f"Invalid or inactive API key: {api_key[:8]}...")
             return None
         
-        return TenantContext(
-            organization_id=membership.organization_id,
-            user_id=user.id,
-            role=membership.role,
-            permissions=membership.permissions or []
-        )
+        return TenantContext(**tenant)
         
     except Exception as e:
         logger.error(f"Error extracting tenant from API key: {e}", exc_info=True)
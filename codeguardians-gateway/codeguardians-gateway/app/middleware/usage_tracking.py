@@ -8,8 +8,10 @@ This middleware tracks API usage for quota enforcement and billing:
 4. Provides usage analytics
 
 Architecture:
-- Real-time tracking in Redis for performance
-- Persistent storage in PostgreSQL for history
+- Real-time tracking in Redis for performance (one atomic Lua script per
+  call: HINCRBY/HINCRBYFLOAT counters plus a per-endpoint counter hash)
+- Persistent storage in PostgreSQL for history (records are buffered in
+  memory, aggregated and bulk-inserted every few seconds)
 - Quota enforcement before request processing
 - Usage analytics and reporting
 """
@@ -18,11 +20,12 @@ from typing import Dict, Any, Optional, List
 from fastapi import Request, Response, HTTPException
 from fastapi.responses import JSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import and_, func, select
+from sqlalchemy import and_, func, insert, select
 from sqlalchemy.orm import selectinload
 from datetime import datetime, timedelta, timezone
-import json
-import redis
+import asyncio
+import os
+import redis.asyncio as redis
 from contextlib import asynccontextmanager
 
 from app.core.config import get_settings
@@ -34,7 +37,8 @@ from app.utils.logging import get_logger
 logger = get_logger(__name__)
 settings = get_settings()
 
-# Redis connection for real-time usage tracking
+# Redis connection for real-time usage tracking (asyncio client: metering
+# never blocks the event loop)
 redis_client = redis.Redis(
     host=settings.REDIS_HOST,
     port=settings.REDIS_PORT,
@@ -42,6 +46,165 @@ redis_client = redis.Redis(
     decode_responses=True
 )
 
+# Seconds between bulk inserts of buffered usage records
+USAGE_FLUSH_INTERVAL_SECONDS = float(os.getenv("USAGE_FLUSH_INTERVAL_SECONDS", "5"))
+
+# Maximum distinct buffered records before new ones are dropped
+USAGE_BUFFER_MAX_RECORDS = int(os.getenv("USAGE_BUFFER_MAX_RECORDS", "10000"))
+
+# Atomically meter one API call.
+# KEYS[1]: usage hash, KEYS[2]: per-endpoint counter hash
+# ARGV: endpoint field, response time, timestamp, seconds until period end
+METER_API_CALL_SCRIPT = """
+local calls = redis.call('HINCRBY', KEYS[1], 'api_calls', 1)
+local total = redis.call('HINCRBYFLOAT', KEYS[1], 'total_response_time', ARGV[2])
+redis.call('HSET', KEYS[1], 'last_updated', ARGV[3])
+redis.call('HINCRBY', KEYS[2], ARGV[1], 1)
+if redis.call('TTL', KEYS[1]) < 0 then
+    redis.call('EXPIRE', KEYS[1], ARGV[4])
+    redis.call('EXPIRE', KEYS[2], ARGV[4])
+end
+return {calls, total}
+"""
+
+
+class UsageRecordBuffer:
+    """
+    In-memory buffer of usage records flushed to PostgreSQL in bulk.
+    
+    Calls with the same organization, endpoint and status code are
+    aggregated into one row (request_count, mean response_time_ms), so a
+    flush is a single multi-row INSERT regardless of traffic.
+    
+    SAFETY: Bounded (records beyond max_records are dropped and counted)
+    ASSUMES: Single event loop; add() is synchronous and never awaits
+    VERIFY: flush() writes every buffered call exactly once on success
+    """
+    
+    def __init__(
+        self,
+        flush_interval: float = USAGE_FLUSH_INTERVAL_SECONDS,
+        max_records: int = USAGE_BUFFER_MAX_RECORDS
+    ):
+        self.flush_interval = flush_interval
+        self.max_records = max_records
+        self._pending: Dict[tuple, List[float]] = {}
+        self._flush_task: Optional[asyncio.Task] = None
+        self._flush_lock = asyncio.Lock()
+        self.stats = {"buffered": 0, "flushed": 0, "dropped": 0, "flush_errors": 0}
+    
+    def add(
+        self,
+        organization_id: str,
+        endpoint: str,
+        method: str,
+        response_time: float,
+        status_code: int
+    ) -> None:
+        """Buffer one API call (starts the background flusher on first use)."""
+        try:
+            org_id = int(organization_id)
+        except (TypeError, ValueError):
+            logger.debug(f"Skipping usage record for non-numeric organization: {organization_id}")
+            return
+        
+        key = (org_id, f"{method}:{endpoint}"[:255], status_code)
+        entry = self._pending.get(key)
+        if entry is None:
+            if len(self._pending) >= self.max_records:
+                self.stats["dropped"] += 1
+                return
+            entry = self._pending[key] = [0, 0.0]
+        entry[0] += 1
+        entry[1] += response_time
+        self.stats["buffered"] += 1
+        self._ensure_flusher()
+    
+    def _ensure_flusher(self) -> None:
+        if self._flush_task is None or self._flush_task.done():
+            try:
+                self._flush_task = asyncio.get_running_loop().create_task(self._flush_loop())
+            except RuntimeError:
+                pass  # No running loop; records are written on the next flush()
+    
+    async def _flush_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+            if not self._pending:
+                # Idle: stop until the next record arrives
+                return
+    
+    def _drain(self) -> List[Dict[str, Any]]:
+        pending, self._pending = self._pending, {}
+        return [
+            {
+                "organization_id": org_id,
+                "endpoint": endpoint,
+                "status_code": status_code,
+                "request_count": count,
+                "response_time_ms": int(total_time / count * 1000),
+                "record_type": "api_call"
+            }
+            for (org_id, endpoint, status_code), (count, total_time) in pending.items()
+        ]
+    
+    async def flush(self) -> int:
+        """
+        Bulk-insert all buffered records.
+        
+        Returns:
+            Number of rows written (0 if nothing was buffered or the insert failed)
+        """
+        async with self._flush_lock:
+            rows = self._drain()
+            if not rows:
+                return 0
+            
+            session_factory = get_session_factory()
+            if not session_factory:
+                logger.warning(f"Database unavailable, dropping {len(rows)} usage records")
+                self.stats["dropped"] += sum(row["request_count"] for row in rows)
+                return 0
+            
+            try:
+                async with session_factory() as db:
+                    await db.execute(insert(UsageRecord), rows)
+                    await db.commit()
+            except Exception as e:
+                self.stats["flush_errors"] += 1
+                self._requeue(rows)
+                logger.error(f"Error flushing {len(rows)} usage records: {e}")
+                return 0
+            
+            self.stats["flushed"] += sum(row["request_count"] for row in rows)
+            logger.debug(f"Flushed {len(rows)} aggregated usage records")
+            return len(rows)
+    
+    def _requeue(self, rows: List[Dict[str, Any]]) -> None:
+        """Put rows from a failed flush back so the next flush retries them."""
+        for row in rows:
+            key = (row["organization_id"], row["endpoint"], row["status_code"])
+            entry = self._pending.get(key)
+            if entry is None:
+                if len(self._pending) >= self.max_records:
+                    self.stats["dropped"] += row["request_count"]
+                    continue
+                entry = self._pending[key] = [0, 0.0]
+            entry[0] += row["request_count"]
+            entry[1] += row["response_time_ms"] / 1000 * row["request_count"]
+    
+    async def close(self) -> None:
+        """Stop the background flusher and write what is left."""
+        if self._flush_task and not self._flush_task.done():
+            self._flush_task.cancel()
+            try:
+                await self._flush_task
+            except asyncio.CancelledError:
+                pass
+        self._flush_task = None
+        await self.flush()
+
 
 class UsageTracker:
     """
@@ -51,15 +214,21 @@ class UsageTracker:
     storage with PostgreSQL for analytics and billing.
     """
     
-    def __init__(self):
+    def __init__(self, record_buffer: Optional[UsageRecordBuffer] = None):
         self.redis_client = redis_client
         self.usage_prefix = "usage:org:"
         self.quota_prefix = "quota:org:"
+        self.record_buffer = record_buffer or UsageRecordBuffer()
+        self._meter_script = self.redis_client.register_script(METER_API_CALL_SCRIPT)
     
     def get_usage_key(self, organization_id: str, period: str = "current") -> str:
         """Generate Redis key for usage tracking."""
         return f"{self.usage_prefix}{organization_id}:{period}"
     
+    def get_endpoints_key(self, organization_id: str, period: str = "current") -> str:
+        """Generate Redis key for the per-endpoint call counters."""
+        return f"{self.get_usage_key(organization_id, period)}:endpoints"
+    
     def get_quota_key(self, organization_id: str) -> str:
         """Generate Redis key for quota limits."""
         return f"{self.quota_prefix}{organization_id}"
@@ -86,41 +255,25 @@ class UsageTracker:
             Current usage statistics
         """
         try:
-            # Get current usage from Redis
-            usage_key = self.get_usage_key(organization_id)
-            current_usage = self.redis_client.hgetall(usage_key)
+            last_updated = datetime.now(timezone.utc).isoformat()
             
-            # Increment API call count
-            api_calls = int(current_usage.get("api_calls", 0)) + 1
-            total_response_time = float(current_usage.get("total_response_time", 0)) + response_time
-            
-            # Update usage in Redis
-            usage_data = {
-                "api_calls": str(api_calls),
-                "total_response_time": str(total_response_time),
-                "last_updated": datetime.now(timezone.utc).isoformat(),
-                "endpoints": json.dumps(
-                    json.loads(current_usage.get("endpoints", "{}")) | 
-                    {f"{method}:{endpoint}": json.loads(current_usage.get("endpoints", "{}")).get(f"{method}:{endpoint}", 0) + 1}
-                )
-            }
-            
-            self.redis_client.hset(usage_key, mapping=usage_data)
-            
-            # Set expiration to end of current month
-            self.redis_client.expire(usage_key, self._get_seconds_until_month_end())
-            
-            # Store detailed record in PostgreSQL (async)
-            await self._store_usage_record(
-                organization_id, endpoint, method, response_time, status_code
+            # One round trip: counters, endpoint hash and expiry updated atomically
+            api_calls, total_response_time = await self._meter_script(
+                keys=[self.get_usage_key(organization_id), self.get_endpoints_key(organization_id)],
+                args=[f"{method}:{endpoint}", response_time, last_updated, self._get_seconds_until_month_end()]
             )
+            api_calls = int(api_calls)
+            total_response_time = float(total_response_time)
+            
+            # Detailed record goes to PostgreSQL with the next bulk flush
+            self.record_buffer.add(organization_id, endpoint, method, response_time, status_code)
             
             logger.debug(f"Tracked API call for organization: {organization_id}")
             
             return {
                 "api_calls": api_calls,
                 "avg_response_time": total_response_time / api_calls,
-                "last_updated": usage_data["last_updated"]
+                "last_updated": last_updated
             }
             
         except Exception as e:
@@ -138,8 +291,10 @@ class UsageTracker:
             Current usage statistics
         """
         try:
-            usage_key = self.get_usage_key(organization_id)
-            usage_data = self.redis_client.hgetall(usage_key)
+            pipe = self.redis_client.pipeline(transaction=False)
+            pipe.hgetall(self.get_usage_key(organization_id))
+            pipe.hgetall(self.get_endpoints_key(organization_id))
+            usage_data, endpoints = await pipe.execute()
             
             if not usage_data:
                 return {
@@ -155,7 +310,7 @@ class UsageTracker:
             return {
                 "api_calls": api_calls,
                 "avg_response_time": total_response_time / api_calls if api_calls > 0 else 0,
-                "endpoints": json.loads(usage_data.get("endpoints", "{}")),
+                "endpoints": {name: int(count) for name, count in endpoints.items()},
                 "last_updated": usage_data.get("last_updated")
             }
             
@@ -163,6 +318,15 @@ class UsageTracker:
             logger.error(f"Error getting current usage: {e}")
             return {}
     
+    async def get_api_call_count(self, organization_id: str) -> int:
+        """Get the API call count for the current period (single HGET)."""
+        try:
+            count = await self.redis_client.hget(self.get_usage_key(organization_id), "api_calls")
+            return int(count or 0)
+        except Exception as e:
+            logger.error(f"Error getting API call count: {e}")
+            return 0
+    
     async def get_quota_limits(self, organization_id: str, db: AsyncSession) -> Dict[str, Any]:
         """
         Get quota limits for an organization based on subscription.
@@ -195,8 +359,8 @@ class UsageTracker:
             
             tier = subscription.subscription_tier
             
-            # Get current usage
-            current_usage = await self.get_current_usage(organization_id)
+            # Get current usage (only the call counter is needed)
+            api_calls_used = await self.get_api_call_count(organization_id)
             
             # Get limits from JSON field
             api_calls_limit = tier.limits.get("api_calls_limit", 0) if tier.limits else 0
@@ -205,28 +369,35 @@ class UsageTracker:
             return {
                 "api_calls_limit": api_calls_limit,
                 "storage_limit": storage_limit,
-                "api_calls_used": current_usage.get("api_calls", 0),
+                "api_calls_used": api_calls_used,
                 "tier": tier.name,
-                "usage_percentage": (current_usage.get("api_calls", 0) / api_calls_limit * 100) if api_calls_limit > 0 else 0
+                "usage_percentage": (api_calls_used / api_calls_limit * 100) if api_calls_limit > 0 else 0
             }
             
         except Exception as e:
             logger.error(f"Error getting quota limits: {e}", exc_info=True)
             return {}
     
-    async def check_quota_exceeded(self, organization_id: str, db: AsyncSession) -> bool:
+    async def check_quota_exceeded(
+        self,
+        organization_id: str,
+        db: AsyncSession,
+        quota_info: Optional[Dict[str, Any]] = None
+    ) -> bool:
         """
         Check if organization has exceeded quota limits.
         
         Args:
             organization_id: Organization identifier
             db: Database session
+            quota_info: Result of get_quota_limits if the caller already has it
             
         Returns:
             True if quota exceeded, False otherwise
         """
         try:
-            quota_info = await self.get_quota_limits(organization_id, db)
+            if quota_info is None:
+                quota_info = await self.get_quota_limits(organization_id, db)
             
             if quota_info.get("api_calls_used", 0) >= quota_info.get("api_calls_limit", 0):
                 logger.warning(f"Quota exceeded for organization: {organization_id}")
@@ -238,28 +409,9 @@ class UsageTracker:
             logger.error(f"Error checking quota: {e}", exc_info=True)
             return False
     
-    async def _store_usage_record(
-        self,
-        organization_id: str,
-        endpoint: str,
-        method: str,
-        response_time: float,
-        status_code: int
-    ):
-        """Store detailed usage record in PostgreSQL."""
-        try:
-            # This would be called asynchronously to avoid blocking the request
-            # For now, we'll just log it
-            logger.debug(
-                f"Storing usage record: {organization_id} - {method} {endpoint} - "
-                f"{response_time}s - {status_code}"
-            )
-            
-            # TODO: Implement actual database storage
-            # This would be done in a background task or separate service
-            
-        except Exception as e:
-            logger.error(f"Error storing usage record: {e}")
+    async def close(self) -> None:
+        """Flush buffered usage records (called on shutdown)."""
+        await self.record_buffer.close()
     
     def _get_seconds_until_month_end(self) -> int:
         """Calculate seconds until end of current month."""
@@ -312,8 +464,9 @@ async def usage_tracking_middleware(request: Request, call_next):
         
         async with session_factory() as db:
             try:
-                # Check if quota exceeded
-                quota_exceeded = await usage_tracker.check_quota_exceeded(organization_id, db)
+                # Check if quota exceeded (limits are reused for the usage headers)
+                quota_info = await usage_tracker.get_quota_limits(organization_id, db)
+                quota_exceeded = await usage_tracker.check_quota_exceeded(organization_id, db, quota_info=quota_info)
                 
                 if quota_exceeded:
                     logger.warning(f"Quota exceeded for organization: {organization_id}")
@@ -332,8 +485,8 @@ async def usage_tracking_middleware(request: Request, call_next):
                 # Calculate response time
                 response_time = (datetime.now(timezone.utc) - start_time).total_seconds()
                 
-                # Track usage
-                await usage_tracker.track_api_call(
+                # Track usage (one Redis round trip; the database write is buffered)
+                current_usage = await usage_tracker.track_api_call(
                     organization_id=organization_id,
                     endpoint=request.url.path,
                     method=request.method,
@@ -342,9 +495,6 @@ async def usage_tracking_middleware(request: Request, call_next):
                 )
                 
                 # Add usage headers to response
-                current_usage = await usage_tracker.get_current_usage(organization_id)
-                quota_info = await usage_tracker.get_quota_limits(organization_id, db)
-                
                 response.headers["X-Usage-Calls"] = str(current_usage.get("api_calls", 0))
                 response.headers["X-Usage-Limit"] = str(quota_info.get("api_calls_limit", 0))
                 response.headers["X-Usage-Remaining"] = str(
@@ -18,6 +18,7 @@ except ImportError:
     svix = None
 
 from app.core.models import User
+from app.core.tenant_cache import get_tenant_cache
 from app.core.exceptions import ClerkWebhookError, ClerkError, EmailRequiredError, ValidationError
 
 logger = logging.getLogger(__name__)
@@ -298,6 +299,9 @@ class ClerkWebhookService:
             await self.db.commit()
             await self.db.refresh(user)
             
+            # Banning deactivates the user's API keys
+            await get_tenant_cache().invalidate_user(user.id)
+            
             logger.info(f"Successfully updated user {clerk_user_id} from Clerk webhook")
             return True
             
@@ -351,6 +355,8 @@ class ClerkWebhookService:
             await self.db.commit()
             await self.db.refresh(user)
             
+            await get_tenant_cache().invalidate_user(user.id)
+            
             logger.info(f"Successfully soft deleted user {clerk_user_id} from Clerk webhook")
             return True
             
@@ -3,14 +3,25 @@ S3 File Storage Service
 
 This module provides S3 file storage operations for the CodeGuardians Gateway.
 It handles file uploads, downloads, presigned URLs, and file management using AWS S3.
+
+Uploads and downloads are streamed with bounded memory:
+- upload_stream() feeds chunks into an S3 multipart upload (one part buffered
+  at a time) or, for the local fallback, appends them to a temporary file
+- stream_file() yields an object (or a byte range of it) chunk by chunk
+- Blocking boto3 calls run in worker threads, never on the event loop
 """
 
+import asyncio
+import hashlib
+import json
 import os
+import re
 import uuid
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any, List, BinaryIO
+from typing import Optional, Dict, Any, List, BinaryIO, AsyncIterator, Tuple
 from urllib.parse import urlparse
 
+import aiofiles
 import boto3
 from botocore.exceptions import ClientError, NoCredentialsError
 from fastapi import HTTPException
@@ -21,6 +32,57 @@ from app.utils.logging import get_logger
 
 logger = get_logger(__name__)
 
+# S3 requires every multipart part except the last to be at least 5 MiB
+MIN_PART_SIZE = 5 * 1024 * 1024
+UPLOAD_PART_SIZE = max(MIN_PART_SIZE, int(os.getenv("S3_MULTIPART_PART_SIZE", str(8 * 1024 * 1024))))
+DOWNLOAD_CHUNK_SIZE = int(os.getenv("S3_DOWNLOAD_CHUNK_SIZE", str(256 * 1024)))
+
+_RANGE_PATTERN = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def parse_byte_range(header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse a single-range HTTP Range header.
+
+    Args:
+        header: Range header value (e.g. "bytes=0-1023", "bytes=-500")
+        size: Total size of the object
+
+    Returns:
+        Inclusive (start, end) offsets, or None to serve the whole object
+        (no header, multiple ranges or an unparseable value)
+
+    Raises:
+        ValueError: If the range cannot be satisfied (respond 416)
+    """
+    if not header:
+        return None
+    match = _RANGE_PATTERN.match(header.strip())
+    if match is None:
+        return None
+
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        # Suffix range: the last N bytes
+        length = int(last)
+        if length == 0 or size == 0:
+            raise ValueError("Unsatisfiable range")
+        return max(0, size - length), size - 1
+
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or (last and int(last) < start):
+        raise ValueError("Unsatisfiable range")
+    return start, end
+
+
+async def iter_bytes(content: bytes, chunk_size: int = UPLOAD_PART_SIZE) -> AsyncIterator[bytes]:
+    """Present in-memory content as an async chunk stream."""
+    for offset in range(0, len(content), chunk_size):
+        yield content[offset:offset + chunk_size]
+
 
 class S3Service:
     """
@@ -143,13 +205,18 @@ class S3Service:
         Raises:
             FileUploadError: If file validation fails
         """
-        # Check file size
-        if len(file_content) > self.settings.MAX_FILE_SIZE:
+        self._check_file_size(len(file_content))
+        self._validate_file_type(filename)
+    
+    def _check_file_size(self, size: int) -> None:
+        """Raise FileUploadError once an upload exceeds MAX_FILE_SIZE."""
+        if size > self.settings.MAX_FILE_SIZE:
             raise FileUploadError(
                 f"File too large. Maximum size: {self.settings.MAX_FILE_SIZE} bytes"
             )
-        
-        # Check file type
+    
+    def _validate_file_type(self, filename: str) -> None:
+        """Raise FileUploadError if the file extension is not allowed."""
         if self.settings.ALLOWED_FILE_TYPES:
             # Get MIME type from filename extension
             file_ext = os.path.splitext(filename)[1].lower()
@@ -188,17 +255,54 @@ class S3Service:
         Returns:
             Dictionary containing file information and storage details
 
+        Raises:
+            FileUploadError: If upload fails
+        """
+        self._validate_file(file_content, filename)
+        return await self.upload_stream(
+            iter_bytes(file_content), filename, content_type, metadata, user_id, organization_id
+        )
+
+    async def upload_stream(
+        self,
+        chunks: AsyncIterator[bytes],
+        filename: str,
+        content_type: Optional[str] = None,
+        metadata: Optional[Dict[str, str]] = None,
+        user_id: Optional[int] = None,
+        organization_id: Optional[str] = None,
+        part_size: int = UPLOAD_PART_SIZE
+    ) -> Dict[str, Any]:
+        """
+        Upload a stream of chunks to S3 or the local filesystem.
+
+        At most one part (part_size bytes) is held in memory. Small uploads
+        use a single PUT; larger ones a multipart upload that is aborted if
+        the stream fails or exceeds MAX_FILE_SIZE.
+
+        Args:
+            chunks: Async iterator of file content chunks
+            filename: Original filename
+            content_type: MIME type of the file
+            metadata: Additional metadata for the file
+            part_size: Multipart part size (at least 5 MiB)
+
+        Returns:
+            Dictionary containing file information and storage details
+
         Raises:
             FileUploadError: If upload fails
         """
         if self._use_local_fallback:
-            return await self._upload_file_local(file_content, filename, content_type, metadata, user_id, organization_id)
+            return await self._upload_stream_local(chunks, filename, content_type, metadata, user_id, organization_id)
         elif not self._client:
             raise FileUploadError("S3 service not initialized")
-        
+
+        upload_id = None
+        s3_key = None
         try:
-            # Validate file
-            self._validate_file(file_content, filename)
+            # Validate file type before reading any content
+            self._validate_file_type(filename)
             
             # Generate S3 key
             s3_key = self._generate_file_key(filename)
@@ -207,7 +311,6 @@ class S3Service:
             file_metadata = {
                 'original_filename': filename,
                 'upload_timestamp': datetime.utcnow().isoformat(),
-                'file_size': str(len(file_content)),
             }
             # Add ownership metadata for authorization checks
             if user_id is not None:
@@ -217,18 +320,46 @@ class S3Service:
             if metadata:
                 file_metadata.update(metadata)
             
-            # Upload to S3
-            upload_kwargs = {
+            object_kwargs = {
                 'Bucket': self._bucket_name,
                 'Key': s3_key,
-                'Body': file_content,
                 'Metadata': file_metadata,
             }
-            
             if content_type:
-                upload_kwargs['ContentType'] = content_type
-            
-            response = self._client.put_object(**upload_kwargs)
+                object_kwargs['ContentType'] = content_type
+
+            part_size = max(part_size, MIN_PART_SIZE)
+            buffer = bytearray()
+            parts: List[Dict[str, Any]] = []
+            file_size = 0
+
+            async for chunk in chunks:
+                file_size += len(chunk)
+                self._check_file_size(file_size)
+                buffer += chunk
+                while len(buffer) >= part_size:
+                    if upload_id is None:
+                        created = await asyncio.to_thread(self._client.create_multipart_upload, **object_kwargs)
+                        upload_id = created['UploadId']
+                    part = bytes(buffer[:part_size])
+                    del buffer[:part_size]
+                    parts.append(await self._upload_part(s3_key, upload_id, len(parts) + 1, part))
+
+            if upload_id is None:
+                # Fits in one part: a single PUT is cheaper than a multipart upload
+                object_kwargs['Metadata']['file_size'] = str(file_size)
+                response = await asyncio.to_thread(self._client.put_object, Body=bytes(buffer), **object_kwargs)
+            else:
+                if buffer:
+                    parts.append(await self._upload_part(s3_key, upload_id, len(parts) + 1, bytes(buffer)))
+                response = await asyncio.to_thread(
+                    self._client.complete_multipart_upload,
+                    Bucket=self._bucket_name,
+                    Key=s3_key,
+                    UploadId=upload_id,
+                    MultipartUpload={'Parts': parts}
+                )
+                upload_id = None
             
             # Generate public URL
             file_url = self._generate_file_url(s3_key)
@@ -237,14 +368,15 @@ class S3Service:
                 'file_id': s3_key,
                 'filename': filename,
                 'file_url': file_url,
-                'file_size': len(file_content),
+                'file_size': file_size,
                 'content_type': content_type,
                 'upload_timestamp': file_metadata['upload_timestamp'],
                 'etag': response.get('ETag', '').strip('"'),
                 's3_key': s3_key,
+                'parts': len(parts) or 1,
             }
             
-            logger.info(f"File uploaded successfully: {filename} -> {s3_key}")
+            logger.info(f"File uploaded successfully: {filename} -> {s3_key} ({file_size} bytes, {len(parts) or 1} parts)")
             return result
             
         except FileUploadError:
@@ -255,10 +387,38 @@ class S3Service:
         except Exception as e:
             logger.error(f"Unexpected error during upload: {e}")
             raise FileUploadError(f"Upload failed: {str(e)}")
+        finally:
+            if upload_id is not None:
+                await self._abort_multipart_upload(s3_key, upload_id)
 
-    async def _upload_file_local(
+    async def _upload_part(self, s3_key: str, upload_id: str, part_number: int, body: bytes) -> Dict[str, Any]:
+        """Upload one multipart part in a worker thread."""
+        response = await asyncio.to_thread(
+            self._client.upload_part,
+            Bucket=self._bucket_name,
+            Key=s3_key,
+            UploadId=upload_id,
+            PartNumber=part_number,
+            Body=body
+        )
+        return {'PartNumber': part_number, 'ETag': response['ETag']}
+
+    async def _abort_multipart_upload(self, s3_key: str, upload_id: str) -> None:
+        """Abort an unfinished multipart upload so S3 discards its parts."""
+        try:
+            await asyncio.to_thread(
+                self._client.abort_multipart_upload,
+                Bucket=self._bucket_name,
+                Key=s3_key,
+                UploadId=upload_id
+            )
+            logger.info(f"Aborted multipart upload {upload_id} for {s3_key}")
+        except Exception as e:
+            logger.error(f"Failed to abort multipart upload {upload_id} for {s3_key}: {e}")
+
+    async def _upload_stream_local(
         self,
-        file_content: bytes,
+        chunks: AsyncIterator[bytes],
         filename: str,
         content_type: Optional[str] = None,
         metadata: Optional[Dict[str, str]] = None,
@@ -267,44 +427,56 @@ class S3Service:
     ) -> Dict[str, Any]:
         """
         Upload file to local filesystem (fallback when S3 is not available).
+
+        Chunks are appended to a temporary file which is renamed into place
+        once the whole stream has been written.
         """
-        import uuid
-        import os
-        import hashlib
+        file_id = str(uuid.uuid4())
+        temp_path = os.path.join(self._local_upload_dir, f"{file_id}.part")
 
         try:
-            # Validate file
-            self._validate_file(file_content, filename)
+            # Validate file type before reading any content
+            self._validate_file_type(filename)
+
+            digest = hashlib.md5()
+            file_size = 0
+            async with aiofiles.open(temp_path, 'wb') as f:
+                async for chunk in chunks:
+                    file_size += len(chunk)
+                    self._check_file_size(file_size)
+                    digest.update(chunk)
+                    await f.write(chunk)
 
-            # Generate unique file ID and path
-            file_id = str(uuid.uuid4())
-            file_hash = hashlib.md5(file_content).hexdigest()[:8]
+            # Generate final path from the content hash
+            file_hash = digest.hexdigest()[:8]
             file_extension = os.path.splitext(filename)[1]
             local_filename = f"{file_id}_{file_hash}{file_extension}"
             file_path = os.path.join(self._local_upload_dir, local_filename)
-
-            # Write file to local filesystem
-            with open(file_path, 'wb') as f:
-                f.write(file_content)
+            os.replace(temp_path, file_path)
 
             # Generate file URL (relative path for local access)
             file_url = f"/uploads/{local_filename}"
+            upload_timestamp = datetime.utcnow().isoformat()
 
             # Prepare result
             result = {
                 'file_id': file_id,
                 'filename': filename,
                 'file_url': file_url,
-                'file_size': len(file_content),
+                'file_size': file_size,
                 'content_type': content_type or 'application/octet-stream',
-                'upload_timestamp': datetime.utcnow().isoformat(),
+                'upload_timestamp': upload_timestamp,
                 'etag': f'"{file_hash}"',
                 'storage_type': 'local',
                 'local_path': file_path
             }
             
             # Store ownership metadata for local files (in a metadata file)
-            local_metadata = {}
+            local_metadata = {
+                'original_filename': filename,
+                'content_type': result['content_type'],
+                'upload_timestamp': upload_timestamp,
+            }
             if user_id is not None:
                 local_metadata['user_id'] = str(user_id)
             if organization_id is not None:
@@ -313,20 +485,33 @@ class S3Service:
                 local_metadata.update(metadata)
             
             # Save metadata to a separate file for local storage
-            metadata_path = file_path + '.meta'
-            import json
-            with open(metadata_path, 'w') as f:
-                json.dump(local_metadata, f)
+            async with aiofiles.open(file_path + '.meta', 'w') as f:
+                await f.write(json.dumps(local_metadata))
 
             if metadata:
                 result.update(metadata)
 
-            logger.info(f"File uploaded to local storage: {filename} -> {file_path}")
+            logger.info(f"File uploaded to local storage: {filename} -> {file_path} ({file_size} bytes)")
             return result
 
         except Exception as e:
             logger.error(f"Local file upload failed: {e}")
+            if isinstance(e, FileUploadError):
+                raise
             raise FileUploadError(f"Upload failed: {str(e)}")
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    def _local_file_path(self, file_id: str) -> Optional[str]:
+        """Find a local fallback file by its file ID."""
+        if not re.fullmatch(r"[0-9a-f-]{36}", file_id):
+            return None
+        prefix = f"{file_id}_"
+        for name in os.listdir(self._local_upload_dir):
+            if name.startswith(prefix) and not name.endswith(('.meta', '.part')):
+                return os.path.join(self._local_upload_dir, name)
+        return None
 
     async def download_file(self, file_id: str) -> bytes:
         """
@@ -341,17 +526,43 @@ class S3Service:
         Raises:
             FileUploadError: If download fails
         """
+        chunks = []
+        async for chunk in self.stream_file(file_id):
+            chunks.append(chunk)
+        return b"".join(chunks)
+    
+    async def stream_file(
+        self,
+        file_id: str,
+        byte_range: Optional[Tuple[int, int]] = None,
+        chunk_size: int = DOWNLOAD_CHUNK_SIZE
+    ) -> AsyncIterator[bytes]:
+        """
+        Stream a file (or an inclusive byte range of it) in chunks.
+        
+        Args:
+            file_id: S3 key or file ID
+            byte_range: Inclusive (start, end) offsets, e.g. from parse_byte_range()
+            chunk_size: Size of yielded chunks
+            
+        Yields:
+            File content chunks
+            
+        Raises:
+            FileUploadError: If the file cannot be read
+        """
+        if self._use_local_fallback:
+            async for chunk in self._stream_file_local(file_id, byte_range, chunk_size):
+                yield chunk
+            return
         if not self._client:
             raise FileUploadError("S3 service not initialized")
         
         try:
-            response = self._client.get_object(
-                Bucket=self._bucket_name,
-                Key=file_id
-            )
-            
-            return response['Body'].read()
-            
+            request = {'Bucket': self._bucket_name, 'Key': file_id}
+            if byte_range is not None:
+                request['Range'] = f"bytes={byte_range[0]}-{byte_range[1]}"
+            response = await asyncio.to_thread(self._client.get_object, **request)
         except ClientError as e:
             error_code = e.response['Error']['Code']
             if error_code == 'NoSuchKey':
@@ -359,9 +570,39 @@ class S3Service:
             else:
                 logger.error(f"S3 download failed: {e}")
                 raise FileUploadError(f"Download failed: {e}")
-        except Exception as e:
-            logger.error(f"Unexpected error during download: {e}")
-            raise FileUploadError(f"Download failed: {str(e)}")
+        
+        body = response['Body']
+        try:
+            while True:
+                chunk = await asyncio.to_thread(body.read, chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+        finally:
+            body.close()
+    
+    async def _stream_file_local(
+        self,
+        file_id: str,
+        byte_range: Optional[Tuple[int, int]],
+        chunk_size: int
+    ) -> AsyncIterator[bytes]:
+        """Stream a local fallback file in chunks."""
+        file_path = self._local_file_path(file_id)
+        if file_path is None:
+            raise FileUploadError("File not found")
+        
+        start, end = byte_range if byte_range is not None else (0, None)
+        remaining = None if end is None else end - start + 1
+        async with aiofiles.open(file_path, 'rb') as f:
+            await f.seek(start)
+            while remaining is None or remaining > 0:
+                chunk = await f.read(chunk_size if remaining is None else min(chunk_size, remaining))
+                if not chunk:
+                    break
+                if remaining is not None:
+                    remaining -= len(chunk)
+                yield chunk
     
     def generate_presigned_upload_url(
         self, 
@@ -492,7 +733,8 @@ class S3Service:
             raise FileUploadError("S3 service not initialized")
         
         try:
-            self._client.delete_object(
+            await asyncio.to_thread(
+                self._client.delete_object,
                 Bucket=self._bucket_name,
                 Key=file_id
             )
@@ -522,7 +764,8 @@ class S3Service:
             raise FileUploadError("S3 service not initialized")
         
         try:
-            response = self._client.list_objects_v2(
+            response = await asyncio.to_thread(
+                self._client.list_objects_v2,
                 Bucket=self._bucket_name,
                 Prefix=prefix,
                 MaxKeys=limit
@@ -557,11 +800,14 @@ class S3Service:
         Returns:
             File metadata dictionary
         """
+        if self._use_local_fallback:
+            return await self._get_file_metadata_local(file_id)
         if not self._client:
             raise FileUploadError("S3 service not initialized")
         
         try:
-            response = self._client.head_object(
+            response = await asyncio.to_thread(
+                self._client.head_object,
                 Bucket=self._bucket_name,
                 Key=file_id
             )
@@ -586,6 +832,29 @@ class S3Service:
         except Exception as e:
             logger.error(f"Unexpected error getting file metadata: {e}")
             raise FileUploadError(f"Failed to get file metadata: {str(e)}")
+    
+    async def _get_file_metadata_local(self, file_id: str) -> Dict[str, Any]:
+        """Get metadata of a local fallback file from its .meta sidecar."""
+        file_path = self._local_file_path(file_id)
+        if file_path is None:
+            raise FileUploadError("File not found")
+        
+        stat = os.stat(file_path)
+        local_metadata: Dict[str, str] = {}
+        if os.path.exists(file_path + '.meta'):
+            async with aiofiles.open(file_path + '.meta', 'r') as f:
+                local_metadata = json.loads(await f.read())
+        
+        local_filename = os.path.basename(file_path)
+        return {
+            'file_id': file_id,
+            'file_url': f"/uploads/{local_filename}",
+            'file_size': stat.st_size,
+            'content_type': local_metadata.get('content_type', 'application/octet-stream'),
+            'last_modified': datetime.utcfromtimestamp(stat.st_mtime).isoformat(),
+            'etag': os.path.splitext(local_filename)[0].rsplit('_', 1)[-1],
+            'metadata': local_metadata,
+        }
 
 
 # Global S3 service instance
@@ -9,85 +9,52 @@ import asyncio
 import logging
 import time
 from functools import wraps
-from typing import Callable, Any, Optional, Dict, List
-from dataclasses import dataclass, field
+from typing import Callable, Any, Dict, List
 from contextlib import asynccontextmanager
 
+from app.core.circuit_breaker import CircuitBreaker, circuit_breaker_manager
 from app.core.exceptions import CircuitBreakerOpenError, RetryExhaustedError, ExternalServiceError
 from app.utils.logging import get_logger
 
 logger = get_logger(__name__)
 
 
-@dataclass
-class CircuitBreakerState:
-    """Circuit breaker state tracking."""
-    service_name: str
-    failure_threshold: int = 5
-    recovery_timeout: float = 60.0  # seconds
-    expected_exception: tuple = (Exception,)
-
-    # Internal state
-    failures: int = 0
-    last_failure_time: Optional[float] = None
-    state: str = "closed"  # "closed", "open", "half_open"
-
-    def record_success(self):
-        """Record a successful call."""
-        self.failures = 0
-        self.state = "closed"
-        logger.debug(f"Circuit breaker for {self.service_name}: success recorded, state={self.state}")
-
-    def record_failure(self):
-        """Record a failed call."""
-        self.failures += 1
-        self.last_failure_time = time.time()
-
-        if self.failures >= self.failure_threshold:
-            self.state = "open"
-            logger.warning(f"Circuit breaker for {self.service_name}: opened after {self.failures} failures")
-
-    def can_attempt_call(self) -> bool:
-        """Check if a call can be attempted."""
-        if self.state == "closed":
-            return True
-
-        if self.state == "open":
-            if self.last_failure_time and (time.time() - self.last_failure_time) > self.recovery_timeout:
-                self.state = "half_open"
-                logger.info(f"Circuit breaker for {self.service_name}: attempting recovery")
-                return True
-            return False
-
-        # half_open state
-        return True
-
-    def is_call_permitted(self) -> bool:
-        """Check if the circuit breaker allows the call."""
-        if not self.can_attempt_call():
-            raise CircuitBreakerOpenError(self.service_name)
-        return True
-
-
 class CircuitBreakerRegistry:
-    """Registry for managing circuit breakers."""
+    """
+    Registry for external service circuit breakers.
 
-    def __init__(self):
-        self._breakers: Dict[str, CircuitBreakerState] = {}
+    Breakers are the shared sliding-window implementation from
+    app.core.circuit_breaker and live in circuit_breaker_manager, so they are
+    exported on /health/circuit-breakers together with the guard breakers.
+    """
 
-    def get_or_create(self, service_name: str, **kwargs) -> CircuitBreakerState:
+    def __init__(self):
+        self._breakers: Dict[str, CircuitBreaker] = {}
+
+    def get_or_create(
+        self,
+        service_name: str,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 60.0,
+        expected_exception: tuple = (Exception,)
+    ) -> CircuitBreaker:
         """Get or create a circuit breaker for a service."""
         if service_name not in self._breakers:
-            self._breakers[service_name] = CircuitBreakerState(service_name=service_name, **kwargs)
+            self._breakers[service_name] = circuit_breaker_manager.get_breaker(
+                service_name,
+                failure_threshold=failure_threshold,
+                recovery_timeout=recovery_timeout,
+                expected_exception=expected_exception
+            )
         return self._breakers[service_name]
 
     def get_all_states(self) -> Dict[str, Dict[str, Any]]:
         """Get the state of all circuit breakers."""
         return {
             name: {
-                "state": breaker.state,
-                "failures": breaker.failures,
-                "last_failure_time": breaker.last_failure_time
+                "state": breaker.state.value.lower(),
+                "failures": breaker.failure_count,
+                "last_failure_time": breaker.last_failure_time.timestamp() if breaker.last_failure_time else None
             }
             for name, breaker in self._breakers.items()
         }
@@ -108,8 +75,8 @@ def circuit_breaker(
 
     Args:
         service_name: Name of the service for monitoring
-        failure_threshold: Number of failures before opening circuit
-        recovery_timeout: Time in seconds to wait before attempting recovery
+        failure_threshold: Minimum calls in the window before the circuit can open
+        recovery_timeout: Maximum time in seconds the circuit stays open
         expected_exception: Tuple of exceptions that count as failures
     """
     def decorator(func):
@@ -120,29 +87,40 @@ def circuit_breaker(
             expected_exception=expected_exception
         )
 
+        def before_call():
+            if not breaker.can_execute():
+                raise CircuitBreakerOpenError(service_name)
+            return time.perf_counter()
+
         @wraps(func)
         async def async_wrapper(*args, **kwargs):
-            breaker.is_call_permitted()
+            start = before_call()
 
             try:
                 result = await func(*args, **kwargs)
-                breaker.record_success()
-                return result
-            except expected_exception as e:
-                breaker.record_failure()
+            except expected_exception:
+                breaker.record_failure(time.perf_counter() - start)
                 raise
+            except BaseException:
+                breaker.release_permission()
+                raise
+            breaker.record_success(time.perf_counter() - start)
+            return result
 
         @wraps(func)
         def sync_wrapper(*args, **kwargs):
-            breaker.is_call_permitted()
+            start = before_call()
 
             try:
                 result = func(*args, **kwargs)
-                breaker.record_success()
-                return result
-            except expected_exception as e:
-                breaker.record_failure()
+            except expected_exception:
+                breaker.record_failure(time.perf_counter() - start)
+                raise
+            except BaseException:
+                breaker.release_permission()
                 raise
+            breaker.record_success(time.perf_counter() - start)
+            return result
 
         if asyncio.iscoroutinefunction(func):
             return async_wrapper
@@ -0,0 +1,10 @@
+"""
+Gateway benchmarks.
+
+Self-contained load test for the gateway: mock guard services with
+configurable latency and error rates, an in-process gateway, and baseline
+comparison to catch throughput and latency regressions before release.
+
+Run from the gateway root:
+    python -m benchmarks.load_test --help
+"""
@@ -0,0 +1,293 @@
+"""
+Gateway Load Test
+
+Drives the gateway in-process against mock guard services:
+- Mock TokenGuard, TrustGuard, ContextGuard, BiasGuard and HealthGuard with
+  configurable latency distributions and error rates (separate process)
+- /api/v1/scan and /api/v1/analyze at fixed concurrency levels
+- Throughput, p50/p90/p99/p999 latency, error rate and CPU per request
+- Baseline file to catch regressions in the orchestrator and middleware
+
+CPU per request is process CPU time (gateway plus load generator, which
+share the process) divided by completed requests; the mocks are excluded.
+
+Usage (from the gateway root):
+    python -m benchmarks.load_test --concurrency 1,8,32 --duration 20
+    python -m benchmarks.load_test --save-baseline
+    python -m benchmarks.load_test --guard-profile biasguard:latency=80,errors=0.02
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import math
+import os
+import platform
+import subprocess
+import sys
+import time
+from collections import Counter
+from contextlib import nullcontext
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+from benchmarks.mock_guards import DEFAULT_GUARDS, GuardProfile, mock_guards_process
+
+DEFAULT_ENDPOINTS = "/api/v1/scan,/api/v1/analyze"
+DEFAULT_CONCURRENCY = "1,8,32"
+
+# Committed reference results compared against on every run
+BASELINE_PATH = Path(__file__).with_name("baseline.json")
+
+# Relative change in throughput, p99 or CPU per request counted as a regression
+DEFAULT_REGRESSION_THRESHOLD = 0.10
+
+PERCENTILES = {"p50": 50.0, "p90": 90.0, "p99": 99.0, "p999": 99.9}
+
+
+def percentile(sorted_values: Sequence[float], q: float) -> float:
+    """Nearest-rank percentile of already sorted values (0 when empty)."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(round(len(sorted_values) * q / 100, 9)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def summarize(latencies_ms: List[float], statuses: List[int], elapsed: float, cpu_seconds: float) -> Dict[str, Any]:
+    """Throughput, latency percentiles, errors and CPU cost of one scenario."""
+    ordered = sorted(latencies_ms)
+    count = len(ordered)
+    errors = sum(1 for status in statuses if status >= 400)
+    latency = {name: round(percentile(ordered, q), 3) for name, q in PERCENTILES.items()}
+    latency["mean"] = round(sum(ordered) / count, 3) if count else 0.0
+    latency["max"] = round(ordered[-1], 3) if count else 0.0
+    return {
+        "requests": count,
+        "duration_seconds": round(elapsed, 3),
+        "throughput_rps": round(count / elapsed, 2) if elapsed > 0 else 0.0,
+        "latency_ms": latency,
+        "error_rate": round(errors / count, 4) if count else 0.0,
+        "status_codes": {str(status): n for status, n in sorted(Counter(statuses).items())},
+        "cpu_ms_per_request": round(cpu_seconds * 1000 / count, 3) if count else 0.0
+    }
+
+
+def parse_guard_profile(spec: str, base: GuardProfile) -> GuardProfile:
+    """
+    Parse a ``name:latency=MS,sigma=S,errors=RATE`` override.
+
+    Raises:
+        ValueError: If the spec is malformed
+    """
+    name, _, options = spec.partition(":")
+    profile = GuardProfile(name.strip().lower(), base.latency_ms, base.latency_sigma, base.error_rate)
+    fields = {"latency": "latency_ms", "sigma": "latency_sigma", "errors": "error_rate"}
+    for option in filter(None, options.split(",")):
+        key, _, value = option.partition("=")
+        if key.strip() not in fields:
+            raise ValueError(f"Unknown guard profile option '{key}' (expected {', '.join(fields)})")
+        setattr(profile, fields[key.strip()], float(value))
+    return profile
+
+
+def build_profiles(args: argparse.Namespace) -> List[GuardProfile]:
+    """Default profile for every guard, with per-guard overrides applied."""
+    base = GuardProfile("default", args.latency_ms, args.latency_sigma, args.error_rate)
+    profiles = {name: GuardProfile(name, base.latency_ms, base.latency_sigma, base.error_rate) for name in DEFAULT_GUARDS}
+    for spec in args.guard_profile:
+        profile = parse_guard_profile(spec, base)
+        profiles[profile.name] = profile
+    return list(profiles.values())
+
+
+def configure_environment(urls: Dict[str, str]) -> None:
+    """Point the orchestrator at the mocks (must run before importing the app)."""
+    for name, url in urls.items():
+        os.environ[f"{name.upper()}_URL"] = url
+
+
+def compare_to_baseline(results: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """
+    Scenarios that got worse than the baseline by more than the threshold.
+
+    Returns:
+        Human readable regression descriptions (empty when none)
+    """
+    reference = {(s["endpoint"], s["concurrency"]): s for s in baseline.get("scenarios", [])}
+    regressions = []
+    for scenario in results["scenarios"]:
+        base = reference.get((scenario["endpoint"], scenario["concurrency"]))
+        if base is None:
+            continue
+        label = f"{scenario['endpoint']} @ {scenario['concurrency']}"
+        checks = (
+            ("throughput_rps", base["throughput_rps"], scenario["throughput_rps"], -1),
+            ("p99 latency_ms", base["latency_ms"]["p99"], scenario["latency_ms"]["p99"], 1),
+            ("cpu_ms_per_request", base["cpu_ms_per_request"], scenario["cpu_ms_per_request"], 1)
+        )
+        for metric, old, new, direction in checks:
+            if old and direction * (new - old) / old > threshold:
+                regressions.append(f"{label}: {metric} {old} -> {new} ({(new - old) / old:+.1%})")
+    return regressions
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5, check=True
+        ).stdout.strip()
+    except Exception:
+        return None
+
+
+async def run_scenario(client, endpoint: str, concurrency: int, duration: float, warmup: float,
+                       guards: Sequence[str], unique_payloads: bool, headers: Dict[str, str]) -> Dict[str, Any]:
+    """Run one endpoint at one concurrency level: warm-up, then measurement."""
+    counter = itertools.count()
+    guard_cycle = itertools.cycle(guards)
+    latencies: List[float] = []
+    statuses: List[int] = []
+
+    def next_body() -> Dict[str, Any]:
+        n = next(counter)
+        text = f"Load test request {n} for the gateway" if unique_payloads else "Load test request for the gateway"
+        return {"service_type": next(guard_cycle), "payload": {"text": text}, "client_type": "api"}
+
+    async def worker(deadline: float, record: bool) -> None:
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            try:
+                response = await client.post(endpoint, json=next_body(), headers=headers)
+                status = response.status_code
+            except Exception:
+                status = 599
+            if record:
+                latencies.append((time.perf_counter() - start) * 1000)
+                statuses.append(status)
+
+    if warmup > 0:
+        deadline = time.perf_counter() + warmup
+        await asyncio.gather(*(worker(deadline, False) for _ in range(concurrency)))
+
+    cpu_start, start = time.process_time(), time.perf_counter()
+    deadline = start + duration
+    await asyncio.gather(*(worker(deadline, True) for _ in range(concurrency)))
+    elapsed, cpu = time.perf_counter() - start, time.process_time() - cpu_start
+
+    return {"endpoint": endpoint, "concurrency": concurrency, **summarize(latencies, statuses, elapsed, cpu)}
+
+
+async def run_load_test(args: argparse.Namespace, profiles: List[GuardProfile]) -> Dict[str, Any]:
+    """Start the gateway in-process and run every scenario."""
+    import httpx
+    from app.main import app
+
+    headers = {"Authorization": f"Bearer {args.token}"} if args.token else {}
+    guards = args.guards.split(",") if args.guards else [profile.name for profile in profiles]
+
+    if args.no_lifespan:
+        from app.core.guard_orchestrator import orchestrator
+        await orchestrator.initialize()
+        lifespan = nullcontext()
+    else:
+        lifespan = app.router.lifespan_context(app)
+
+    scenarios = []
+    try:
+        async with lifespan:
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://gateway", timeout=args.timeout) as client:
+                for endpoint in args.endpoints.split(","):
+                    for concurrency in (int(level) for level in args.concurrency.split(",")):
+                        scenario = await run_scenario(
+                            client, endpoint, concurrency, args.duration, args.warmup,
+                            guards, not args.repeat_payloads, headers
+                        )
+                        scenarios.append(scenario)
+                        print(_format_scenario(scenario), file=sys.stderr)
+    finally:
+        if args.no_lifespan:
+            await orchestrator.shutdown()
+
+    return {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "git_commit": _git_commit(),
+            "python": platform.python_version(),
+            "duration_seconds": args.duration,
+            "warmup_seconds": args.warmup,
+            "guards": guards,
+            "unique_payloads": not args.repeat_payloads,
+            "profiles": [vars(profile) for profile in profiles]
+        },
+        "scenarios": scenarios
+    }
+
+
+def _format_scenario(scenario: Dict[str, Any]) -> str:
+    latency = scenario["latency_ms"]
+    return (
+        f"{scenario['endpoint']:<18} c={scenario['concurrency']:<4} "
+        f"{scenario['throughput_rps']:>9.1f} req/s  "
+        f"p50 {latency['p50']:.1f}ms  p99 {latency['p99']:.1f}ms  p999 {latency['p999']:.1f}ms  "
+        f"errors {scenario['error_rate']:.2%}  cpu {scenario['cpu_ms_per_request']:.2f}ms/req"
+    )
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Load test the gateway in-process against mock guard services")
+    parser.add_argument("--endpoints", default=DEFAULT_ENDPOINTS, help="Comma separated endpoints to drive")
+    parser.add_argument("--concurrency", default=DEFAULT_CONCURRENCY, help="Comma separated concurrency levels")
+    parser.add_argument("--duration", type=float, default=10.0, help="Measured seconds per scenario")
+    parser.add_argument("--warmup", type=float, default=2.0, help="Unmeasured seconds before each scenario")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Client timeout per request in seconds")
+    parser.add_argument("--guards", default="", help="Guards to send requests to, round-robin (default: all mocked)")
+    parser.add_argument("--repeat-payloads", action="store_true", help="Send identical payloads (allows cache hits)")
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="Median mock guard latency")
+    parser.add_argument("--latency-sigma", type=float, default=0.5, help="Log-normal latency spread (0 = fixed)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of mock guard calls failing with 500")
+    parser.add_argument("--guard-profile", action="append", default=[],
+                        help="Per-guard override, e.g. biasguard:latency=80,sigma=0.3,errors=0.02")
+    parser.add_argument("--token", default=os.getenv("LOAD_TEST_TOKEN"), help="Bearer token for authenticated setups")
+    parser.add_argument("--no-lifespan", action="store_true",
+                        help="Skip the app lifespan (no database/Redis); only initialize the orchestrator")
+    parser.add_argument("--output", type=Path, help="Write results JSON to this file")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH, help="Baseline results to compare against")
+    parser.add_argument("--save-baseline", action="store_true", help="Write results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_REGRESSION_THRESHOLD,
+                        help="Relative change counted as a regression")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Run the load test; exit status 1 on regression against the baseline."""
+    args = parse_args(argv)
+    profiles = build_profiles(args)
+
+    with mock_guards_process(profiles) as urls:
+        configure_environment(urls)
+        results = asyncio.run(run_load_test(args, profiles))
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2))
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(results, indent=2))
+        print(f"Baseline saved to {args.baseline}", file=sys.stderr)
+        return 0
+
+    if not args.baseline.exists():
+        print(f"No baseline at {args.baseline}; run with --save-baseline to create one", file=sys.stderr)
+        return 0
+
+    regressions = compare_to_baseline(results, json.loads(args.baseline.read_text()), args.threshold)
+    for regression in regressions:
+        print(f"REGRESSION {regression}", file=sys.stderr)
+    if not regressions:
+        print(f"No regressions against {args.baseline} (threshold {args.threshold:.0%})", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,171 @@
+"""
+Mock Guard Services for Load Testing
+
+Minimal HTTP/1.1 servers standing in for the guard services:
+- One server per guard, on an ephemeral local port
+- Keep-alive connections, like the real guards behind the gateway pool
+- Latency drawn from a log-normal distribution (median and spread)
+- Injected HTTP 500 errors at a configurable rate
+
+Built on asyncio streams rather than FastAPI so the mocks cost little CPU
+and run in their own process, away from the gateway being measured.
+"""
+
+import asyncio
+import json
+import math
+import multiprocessing
+import random
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# Guards the harness starts by default
+DEFAULT_GUARDS = ("tokenguard", "trustguard", "contextguard", "biasguard", "healthguard")
+
+HEALTH_PATHS = ("/health", "/health/live", "/health/ready")
+
+# Canned verdicts, shaped like mock-services/mock_guard_service.py
+GUARD_RESPONSES: Dict[str, Dict[str, Any]] = {
+    "tokenguard": {"optimized_text": "optimized", "confidence": 0.95, "tokens_saved": 42},
+    "trustguard": {"is_trusted": True, "confidence": 0.95, "validation_result": "valid", "details": {}},
+    "contextguard": {"drift_detected": False, "drift_score": 0.1, "context_similarity": 0.95, "analysis": {}},
+    "biasguard": {"bias_detected": False, "bias_score": 0.1, "bias_types": [], "mitigation_suggestions": []},
+    "healthguard": {"health_score": 0.95, "issues_detected": [], "recommendations": [], "analysis": {}},
+    "securityguard": {"vulnerabilities_found": 0, "vulnerabilities": [], "security_score": 0.95, "recommendations": []}
+}
+
+_REASONS = {200: "OK", 404: "Not Found", 500: "Internal Server Error"}
+
+
+@dataclass
+class GuardProfile:
+    """Latency and error behaviour of one mock guard."""
+    name: str
+    latency_ms: float = 20.0  # Median latency
+    latency_sigma: float = 0.5  # Log-normal spread (0 = fixed latency)
+    error_rate: float = 0.0  # Fraction of requests answered with HTTP 500
+
+    def sample_latency_ms(self, rng: random.Random) -> float:
+        if self.latency_sigma <= 0:
+            return self.latency_ms
+        return self.latency_ms * math.exp(self.latency_sigma * rng.gauss(0.0, 1.0))
+
+
+class MockGuardServer:
+    """
+    One mock guard on a local port.
+
+    SAFETY: Malformed or dropped connections only end that connection
+    ASSUMES: Clients send Content-Length bodies (no chunked uploads)
+    VERIFY: Every POST is delayed by a sampled latency before answering
+    """
+
+    def __init__(self, profile: GuardProfile, host: str = "127.0.0.1", port: int = 0, seed: Optional[int] = None):
+        self.profile = profile
+        self.host = host
+        self.port = port
+        self._rng = random.Random(seed)
+        self._server: Optional[asyncio.AbstractServer] = None
+        self.stats = {"requests": 0, "errors": 0}
+
+    async def start(self) -> int:
+        """Start listening; returns the bound port."""
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self.port
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, path, _ = request_line.decode("latin-1").split(" ", 2)
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    key, _, value = line.decode("latin-1").partition(":")
+                    headers[key.strip().lower()] = value.strip()
+
+                length = int(headers.get("content-length") or 0)
+                if length:
+                    await reader.readexactly(length)
+
+                status, body = await self.respond(method, path.split("?", 1)[0])
+                payload = json.dumps(body).encode()
+                writer.write(
+                    f"HTTP/1.1 {status} {_REASONS.get(status, 'OK')}\r\n"
+                    f"Content-Type: application/json\r\n"
+                    f"Content-Length: {len(payload)}\r\n\r\n".encode("latin-1") + payload
+                )
+                await writer.drain()
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def respond(self, method: str, path: str) -> Tuple[int, Dict[str, Any]]:
+        """Status and JSON body for one request."""
+        if method == "GET" and path in HEALTH_PATHS:
+            return 200, {"status": "healthy", "service": self.profile.name, "version": "mock"}
+        if method != "POST":
+            return 404, {"detail": "Not Found"}
+
+        self.stats["requests"] += 1
+        await asyncio.sleep(self.profile.sample_latency_ms(self._rng) / 1000)
+        if self._rng.random() < self.profile.error_rate:
+            self.stats["errors"] += 1
+            return 500, {"detail": "Injected failure"}
+        return 200, GUARD_RESPONSES.get(self.profile.name, {"status": "ok"})
+
+
+def run_mock_guards(profiles: List[GuardProfile], ready, stop) -> None:
+    """Process entry point: serve every profile until stop is set."""
+    asyncio.run(_serve(profiles, ready, stop))
+
+
+async def _serve(profiles: List[GuardProfile], ready, stop) -> None:
+    servers = [MockGuardServer(profile) for profile in profiles]
+    ready.put({server.profile.name: await server.start() for server in servers})
+    while not stop.is_set():
+        await asyncio.sleep(0.2)
+    for server in servers:
+        await server.stop()
+
+
+@contextmanager
+def mock_guards_process(profiles: List[GuardProfile], host: str = "127.0.0.1") -> Iterator[Dict[str, str]]:
+    """
+    Run the mock guards in a child process.
+
+    Yields:
+        Dict of guard name to base URL
+    """
+    context = multiprocessing.get_context("spawn")
+    ready, stop = context.Queue(), context.Event()
+    process = context.Process(target=run_mock_guards, args=(profiles, ready, stop), daemon=True)
+    process.start()
+    try:
+        ports = ready.get(timeout=30)
+        yield {name: f"http://{host}:{port}" for name, port in ports.items()}
+    finally:
+        stop.set()
+        process.join(timeout=5)
+        if process.is_alive():
+            process.terminate()
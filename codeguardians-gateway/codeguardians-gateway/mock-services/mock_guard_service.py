@@ -344,6 +344,48 @@ async def handle_securityguard(payload: Dict[str, Any]) -> Dict[str, Any]:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post(f"{SERVICE_ENDPOINT}/batch")
+async def process_batch(
+    request: Request,
+    x_api_key: Optional[str] = Header(None, alias="X-API-Key")
+):
+    """
+    Batch endpoint: {"items": [payload, ...]} -> {"results": [result, ...]}.
+    Results are returned in item order, one per item.
+    """
+    if API_KEY_REQUIRED:
+        await verify_api_key(request, x_api_key)
+    
+    try:
+        body = await request.json()
+    except Exception as e:
+        logger.error(f"Failed to parse JSON body: {e}")
+        raise HTTPException(status_code=400, detail=f"Invalid JSON: {str(e)}")
+    
+    items = body.get("items")
+    if not isinstance(items, list):
+        raise HTTPException(status_code=400, detail="items list required")
+    
+    handlers = {
+        "/optimize": handle_tokenguard,
+        "/validate": handle_trustguard,
+        "/process": handle_biasguard,
+        "/scan": handle_securityguard,
+        "/analyze": handle_contextguard if SERVICE_NAME == "ContextGuard" else handle_healthguard,
+    }
+    handler = handlers.get(SERVICE_ENDPOINT)
+    if handler is None:
+        raise HTTPException(status_code=404, detail="Endpoint not found")
+    
+    results = []
+    for item in items:
+        try:
+            results.append(await handler(item))
+        except HTTPException as e:
+            results.append({"error": e.detail, "status_code": e.status_code})
+    return {"results": results}
+
+
 @app.get("/")
 async def root():
     """Root endpoint."""
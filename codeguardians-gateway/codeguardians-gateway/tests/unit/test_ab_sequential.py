@@ -0,0 +1,302 @@
+"""
+Unit tests for sequential testing and vectorized multi-metric analysis.
+
+Covers the mSPRT (error control under continuous peeking, O(1) state,
+tau fixed at the first look, 0/1 metrics without events), the vectorized
+variant x metric analysis, canary stages that roll back or advance on
+sequential evidence, and (slow-marked, reporting only) benchmarks of
+analysis cost as the sample count grows.
+"""
+
+import asyncio
+import random
+import time
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from app.core.ab_testing.canary_deployment import (
+    CanaryConfig,
+    CanaryDeploymentManager,
+    CanaryStage,
+    CanaryStatus,
+)
+from app.core.ab_testing.sequential_testing import MixtureSPRT
+from app.core.ab_testing.statistical_analysis import StatisticalAnalyzer
+from app.core.ab_testing.sufficient_stats import MetricSummary, VariantStatistics
+
+
+class TestMixtureSPRT:
+    """Test the always-valid sequential test."""
+
+    def test_false_positive_rate_under_continuous_peeking(self):
+        rng = random.Random(3)
+        runs, rejections = 100, 0
+        for _ in range(runs):
+            test = MixtureSPRT(alpha=0.05)
+            for _ in range(1000):
+                test.add("a", rng.gauss(0, 1))
+                if test.add("b", rng.gauss(0, 1)).is_significant:
+                    rejections += 1
+                    break
+
+        assert rejections / runs <= 0.08
+
+    def test_detects_real_difference_early(self):
+        rng = random.Random(5)
+        test = MixtureSPRT(alpha=0.05)
+        for step in range(5000):
+            test.add("a", rng.gauss(0, 1))
+            result = test.add("b", rng.gauss(0.5, 1))
+            if result.is_significant:
+                break
+
+        assert result.decision == "b_better"
+        assert step < 500
+        low, high = result.confidence_interval
+        assert low < 0.5 < high or low > 0
+
+    def test_update_from_summaries_matches_incremental(self):
+        rng = random.Random(9)
+        a = [rng.gauss(10, 2) for _ in range(200)]
+        b = [rng.gauss(10.5, 2) for _ in range(200)]
+
+        # Explicit tau: a derived one is fixed at the (different) first look
+        incremental = MixtureSPRT(tau=0.2)
+        for x, y in zip(a, b):
+            incremental.add("a", x)
+            incremental.add("b", y)
+        batched = MixtureSPRT(tau=0.2).update(MetricSummary.from_values(a), MetricSummary.from_values(b))
+
+        assert batched.log_likelihood_ratio == pytest.approx(incremental.result().log_likelihood_ratio)
+
+    def test_p_value_never_increases(self):
+        rng = random.Random(11)
+        test = MixtureSPRT()
+        previous = 1.0
+        for _ in range(500):
+            test.add("a", rng.gauss(0, 1))
+            p_value = test.add("b", rng.gauss(0.1, 1)).p_value
+            assert p_value <= previous
+            previous = p_value
+
+    def test_state_does_not_grow_with_sample_count(self):
+        n = 10_000_000
+        test = MixtureSPRT()
+        test.update(MetricSummary(n, n * 1.0, n * 2.0), MetricSummary(n, n * 1.1, n * 2.3))
+        for _ in range(1_000):
+            test.add("b", 1.0)
+
+        assert test.summary_b.n == n + 1_000
+        assert not any(isinstance(value, (list, dict)) for value in vars(test).values())
+
+    def test_tau_fixed_at_first_look(self):
+        test = MixtureSPRT(min_samples=2)
+        test.update(MetricSummary.from_values([0.0, 2.0]), MetricSummary.from_values([0.0, 2.0]))
+        tau_sq = test.tau_sq
+
+        test.update(MetricSummary.from_values([0.0, 20.0] * 50), MetricSummary.from_values([0.0, 20.0] * 50))
+
+        assert tau_sq == pytest.approx(0.01 * 2.0)
+        assert test.tau_sq == tau_sq
+
+    def test_bernoulli_without_events_can_exclude_margin(self):
+        test = MixtureSPRT(bernoulli=True)
+
+        result = test.update(MetricSummary(5000), MetricSummary(5000))
+
+        low, high = result.confidence_interval
+        assert low < 0 < high < 0.01
+
+
+class TestVectorizedAnalysis:
+    """Test analyze_matrix against per-pair analysis."""
+
+    @pytest.fixture
+    def analyzer(self):
+        return StatisticalAnalyzer()
+
+    @staticmethod
+    def simulate(variants, metrics, n, seed=1):
+        rng = np.random.default_rng(seed)
+        counts = np.full((variants, metrics), float(n))
+        sums = np.zeros((variants, metrics))
+        sums_sq = np.zeros((variants, metrics))
+        for i in range(variants):
+            for j in range(metrics):
+                values = rng.normal(100 + i * (j % 3), 10, n)
+                sums[i, j], sums_sq[i, j] = values.sum(), (values ** 2).sum()
+        return counts, sums, sums_sq
+
+    def test_matches_pairwise_welch_tests(self, analyzer):
+        counts, sums, sums_sq = self.simulate(3, 4, 500)
+        names = ["control", "b", "c"]
+
+        result = analyzer.analyze_matrix(counts, sums, sums_sq, names, ["m0", "m1", "m2", "m3"])
+
+        assert result.variants == ["b", "c"]
+        for i, row in enumerate((1, 2)):
+            for j in range(4):
+                pair = analyzer.analyze_summaries(
+                    "exp",
+                    MetricSummary(int(counts[0, j]), sums[0, j], sums_sq[0, j]),
+                    MetricSummary(int(counts[row, j]), sums[row, j], sums_sq[row, j])
+                )
+                assert result.p_value[i, j] == pytest.approx(pair.primary_test.p_value, rel=1e-6, abs=1e-300)
+                assert result.ci_lower[i, j] == pytest.approx(pair.confidence_interval[0], rel=1e-6)
+                sequential = MixtureSPRT().update(
+                    MetricSummary(int(counts[0, j]), sums[0, j], sums_sq[0, j]),
+                    MetricSummary(int(counts[row, j]), sums[row, j], sums_sq[row, j])
+                )
+                assert result.sequential_p_value[i, j] == pytest.approx(sequential.p_value, rel=1e-6, abs=1e-300)
+
+        assert np.all(result.adjusted_p_value >= result.p_value)
+
+    def test_insufficient_cells_are_nan(self, analyzer):
+        counts, sums, sums_sq = self.simulate(2, 2, 50)
+        counts[1, 1] = 1
+
+        result = analyzer.analyze_matrix(counts, sums, sums_sq, ["control", "b"], ["m0", "m1"])
+
+        assert np.isnan(result.p_value[0, 1])
+        assert not np.isnan(result.p_value[0, 0])
+        assert result.to_dict()["b"]["m0"]["p_value"] == result.p_value[0, 0]
+
+    def test_analyze_variant_statistics(self, analyzer):
+        rng = np.random.default_rng(2)
+        variants = {}
+        for name, shift in (("control", 0.0), ("treatment", 5.0)):
+            values = rng.normal(100 + shift, 10, 400)
+            variants[name] = VariantStatistics(name, count=400, metrics={
+                "response_time": MetricSummary(400, values.sum(), (values ** 2).sum())
+            })
+
+        result = analyzer.analyze_variant_statistics(variants, ["response_time"])
+
+        assert bool(result.is_significant[0, 0])
+        assert result.difference[0, 0] > 0
+
+
+@pytest.mark.slow
+class TestAnalysisCostBenchmark:
+    """Analysis cost as the sample count grows (reports, never asserts timings)."""
+
+    def test_update_cost_vs_sample_count(self):
+        for n in (1_000, 100_000, 10_000_000):
+            test = MixtureSPRT()
+            test.update(MetricSummary(n, n * 1.0, n * 2.0), MetricSummary(n, n * 1.1, n * 2.3))
+            start = time.perf_counter()
+            for _ in range(10_000):
+                test.add("b", 1.0)
+            per_update_us = (time.perf_counter() - start) / 10_000 * 1e6
+            print(f"n={n}: mSPRT {per_update_us:.2f}us per update")
+
+    def test_analysis_cost_vs_sample_count(self):
+        analyzer = StatisticalAnalyzer()
+        for n in (1_000, 10_000, 100_000):
+            rng = np.random.default_rng(n)
+            a, b = rng.normal(100, 10, n), rng.normal(101, 10, n)
+
+            start = time.perf_counter()
+            analyzer.analyze_experiment("exp", a.tolist(), b.tolist())
+            raw_ms = (time.perf_counter() - start) * 1000
+
+            counts, sums, sums_sq = TestVectorizedAnalysis.simulate(5, 50, 10)
+            counts *= n / 10
+            start = time.perf_counter()
+            analyzer.analyze_matrix(counts, sums * n / 10, sums_sq * n / 10, [f"v{i}" for i in range(5)],
+                                    [f"m{j}" for j in range(50)], control="v0")
+            matrix_ms = (time.perf_counter() - start) * 1000
+            print(f"n={n}: raw single-metric {raw_ms:.1f}ms, vectorized 4x50 comparisons {matrix_ms:.2f}ms")
+
+
+class FakeTracker:
+    """Serves growing variant statistics, one batch of traffic per poll."""
+
+    def __init__(self, control_error_rate, canary_error_rate, batch=200, seed=0):
+        self.rates = {"control": control_error_rate, "canary": canary_error_rate}
+        self.batch = batch
+        self.rng = random.Random(seed)
+        self.stats = {name: VariantStatistics(name) for name in self.rates}
+        self.polls = 0
+
+    async def get_variant_statistics(self, experiment_id):
+        self.polls += 1
+        for name, rate in self.rates.items():
+            variant = self.stats[name]
+            errors = sum(self.rng.random() < rate for _ in range(self.batch))
+            variant.count += self.batch
+            variant.errors += errors
+            variant.successes += self.batch - errors
+        return {
+            name: VariantStatistics(name, v.count, v.successes, v.errors)
+            for name, v in self.stats.items()
+        }
+
+
+def canary_config(**alert_conditions):
+    return CanaryConfig(
+        experiment_id="exp",
+        canary_variant="canary",
+        stages=[CanaryStage.INITIAL, CanaryStage.SMALL],
+        stage_duration_minutes=30,
+        success_threshold=0.0,
+        failure_threshold=1.0,
+        rollback_threshold=1.0,
+        monitoring_metrics=[],
+        alert_conditions=alert_conditions,
+        auto_promote=True,
+        auto_rollback=True,
+        created_at=datetime.utcnow(),
+        updated_at=datetime.utcnow()
+    )
+
+
+class TestSequentialCanary:
+    """Test canary stages decided by sequential tests."""
+
+    @staticmethod
+    async def run(tracker, config):
+        manager = CanaryDeploymentManager(None, StatisticalAnalyzer(), tracker=tracker, check_interval_seconds=0.001)
+
+        async def collect(deployment, stage):
+            return {"success_rate": 1.0, "error_rate": 0.0}
+
+        manager._collect_stage_metrics = collect
+        deployment = await manager.start_canary_deployment("exp", "canary", config)
+        for _ in range(2000):
+            if deployment.status in (CanaryStatus.COMPLETED, CanaryStatus.FAILED):
+                break
+            await asyncio.sleep(0.001)
+        return deployment
+
+    @pytest.mark.asyncio
+    async def test_rolls_back_worse_canary_before_stage_duration(self):
+        tracker = FakeTracker(control_error_rate=0.01, canary_error_rate=0.10)
+
+        deployment = await self.run(tracker, canary_config())
+
+        assert deployment.status == CanaryStatus.FAILED
+        assert deployment.final_recommendation == "Deployment rolled back due to issues"
+        assert len(deployment.stage_results) == 1
+        assert any("error_rate" in issue for issue in deployment.stage_results[0].issues_detected)
+
+    @pytest.mark.asyncio
+    async def test_promotes_equivalent_canary_without_waiting_for_stage_duration(self):
+        tracker = FakeTracker(control_error_rate=0.01, canary_error_rate=0.01)
+
+        deployment = await self.run(tracker, canary_config(error_rate_margin=0.02))
+
+        assert deployment.status == CanaryStatus.COMPLETED
+        assert [result.stage for result in deployment.stage_results] == [CanaryStage.INITIAL, CanaryStage.SMALL]
+        assert all(result.is_successful for result in deployment.stage_results)
+
+    @pytest.mark.asyncio
+    async def test_promotes_canary_when_neither_variant_errors(self):
+        tracker = FakeTracker(control_error_rate=0.0, canary_error_rate=0.0)
+
+        deployment = await self.run(tracker, canary_config())
+
+        assert deployment.status == CanaryStatus.COMPLETED
+        assert len(deployment.stage_results) == 2
@@ -0,0 +1,273 @@
+"""
+Unit tests for A/B testing sufficient statistics.
+
+Covers the streaming aggregates, summary-based hypothesis tests and the
+Redis hash the experiment tracker keeps them in (in-memory stand-ins for
+synchronous and asyncio Redis clients).
+"""
+
+import asyncio
+import random
+import threading
+
+import numpy as np
+import pytest
+import redis.asyncio
+from scipy.stats import chi2_contingency, ttest_ind
+
+from app.core.ab_testing.analytics import ExperimentTracker
+from app.core.ab_testing.statistical_analysis import StatisticalAnalyzer
+from app.core.ab_testing.sufficient_stats import (
+    MetricSummary,
+    QuantileSketch,
+    observation_increments,
+    parse_variant_statistics,
+)
+
+
+class FakeHashStore:
+    """Hash commands shared by the sync and async fakes."""
+
+    def __init__(self):
+        self.hashes = {}
+        self.expiries = {}
+        self.lock = threading.Lock()
+
+    def apply(self, commands):
+        with self.lock:
+            results = []
+            for name, args in commands:
+                if name == "hincrby":
+                    key, field, amount = args
+                    value = int(self.hashes.setdefault(key, {}).get(field, 0)) + amount
+                    self.hashes[key][field] = str(value)
+                    results.append(value)
+                elif name == "hincrbyfloat":
+                    key, field, amount = args
+                    value = float(self.hashes.setdefault(key, {}).get(field, 0)) + amount
+                    self.hashes[key][field] = repr(value)
+                    results.append(value)
+                elif name == "expire":
+                    self.expiries[args[0]] = args[1]
+                    results.append(True)
+            return results
+
+
+class FakePipeline:
+    def __init__(self, store, is_async):
+        self.store = store
+        self.is_async = is_async
+        self.commands = []
+
+    def hincrby(self, *args):
+        self.commands.append(("hincrby", args))
+
+    def hincrbyfloat(self, *args):
+        self.commands.append(("hincrbyfloat", args))
+
+    def expire(self, *args):
+        self.commands.append(("expire", args))
+
+    def execute(self):
+        if self.is_async:
+            async def run():
+                await asyncio.sleep(0)
+                return self.store.apply(self.commands)
+            return run()
+        return self.store.apply(self.commands)
+
+
+class FakeSyncRedis:
+    def __init__(self):
+        self.store = FakeHashStore()
+        self.calls = 0
+
+    def pipeline(self, transaction=True):
+        self.calls += 1
+        return FakePipeline(self.store, is_async=False)
+
+    def hgetall(self, key):
+        return dict(self.store.hashes.get(key, {}))
+
+    def setex(self, key, ttl, value):
+        return True
+
+
+class FakeAsyncRedis(redis.asyncio.Redis):
+    def __init__(self):
+        self.store = FakeHashStore()
+
+    def pipeline(self, transaction=True, shard_hint=None):
+        return FakePipeline(self.store, is_async=True)
+
+    async def hgetall(self, key):
+        return dict(self.store.hashes.get(key, {}))
+
+    async def setex(self, key, ttl, value):
+        return True
+
+
+class TestMetricSummary:
+    """Test streaming moments."""
+
+    def test_matches_numpy(self):
+        rng = random.Random(1)
+        values = [rng.gauss(100, 15) for _ in range(1000)]
+        summary = MetricSummary.from_values(values)
+
+        assert summary.n == 1000
+        assert summary.mean == pytest.approx(np.mean(values))
+        assert summary.variance == pytest.approx(np.var(values, ddof=1))
+
+    def test_merge_equals_combined(self):
+        a, b = [1.0, 2.0, 3.0], [10.0, 20.0]
+        merged = MetricSummary.from_values(a).merge(MetricSummary.from_values(b))
+
+        assert merged == MetricSummary.from_values(a + b)
+
+    def test_small_samples(self):
+        assert MetricSummary().mean == 0.0
+        assert MetricSummary.from_values([5.0]).variance == 0.0
+
+
+class TestQuantileSketch:
+    """Test the relative-error quantile sketch."""
+
+    def test_quantiles_within_relative_error(self):
+        rng = random.Random(7)
+        values = [rng.lognormvariate(4, 1) for _ in range(20000)]
+        sketch = QuantileSketch(alpha=0.01)
+        for value in values:
+            sketch.add(value)
+
+        ordered = sorted(values)
+        for q in (0.5, 0.9, 0.99):
+            exact = ordered[int(q * (len(ordered) - 1))]
+            assert sketch.quantile(q) == pytest.approx(exact, rel=0.011)
+
+    def test_zero_values_and_merge(self):
+        a, b = QuantileSketch(), QuantileSketch()
+        a.add(0)
+        a.add(10)
+        b.add(10)
+
+        merged = a.merge(b)
+        assert merged.count == 3
+        assert merged.quantile(0) == 0.0
+        assert merged.quantile(1) == pytest.approx(10, rel=0.01)
+        assert QuantileSketch().quantile(0.5) is None
+
+    def test_round_trip_through_hash_fields(self):
+        fields = {}
+        for value in (5.0, 50.0, 500.0):
+            ints, floats = observation_increments("control", {"response_time": value}, ("response_time",))
+            for field, amount in list(ints.items()) + list(floats.items()):
+                fields[field] = fields.get(field, 0) + amount
+
+        variant = parse_variant_statistics({k: str(v) for k, v in fields.items()})["control"]
+        assert variant.count == 3
+        assert variant.metric("response_time").mean == pytest.approx(185.0)
+        assert variant.sketches["response_time"].quantile(0.5) == pytest.approx(50.0, rel=0.01)
+
+
+class TestSummaryAnalysis:
+    """Test hypothesis tests computed from aggregates."""
+
+    @pytest.fixture
+    def analyzer(self):
+        return StatisticalAnalyzer()
+
+    def test_t_test_matches_raw_data(self, analyzer):
+        rng = np.random.default_rng(42)
+        control = rng.normal(100, 10, 500)
+        treatment = rng.normal(102, 12, 400)
+
+        analysis = analyzer.analyze_summaries(
+            "exp", MetricSummary.from_values(control), MetricSummary.from_values(treatment)
+        )
+        raw = analyzer.analyze_experiment("exp", control.tolist(), treatment.tolist())
+        statistic, p_value = ttest_ind(control, treatment, equal_var=False)
+
+        assert analysis.primary_test.statistic == pytest.approx(statistic, rel=1e-6)
+        assert analysis.primary_test.p_value == pytest.approx(p_value, rel=1e-6)
+        assert analysis.confidence_interval[0] == pytest.approx(raw.confidence_interval[0], rel=1e-6)
+        assert analysis.confidence_interval[1] == pytest.approx(raw.confidence_interval[1], rel=1e-6)
+        assert analysis.effect_size == pytest.approx(raw.effect_size, rel=1e-6)
+        assert analysis.secondary_tests == []
+
+    def test_chi_square_matches_contingency_table(self, analyzer):
+        control = [1] * 120 + [0] * 880
+        treatment = [1] * 160 + [0] * 840
+
+        analysis = analyzer.analyze_summaries(
+            "exp", MetricSummary.from_values(control), MetricSummary.from_values(treatment), metric_type="binary"
+        )
+        chi2, p_value, _, _ = chi2_contingency([[120, 880], [160, 840]])
+
+        assert analysis.primary_test.test_name == "Chi-square test"
+        assert analysis.primary_test.statistic == pytest.approx(chi2)
+        assert analysis.primary_test.p_value == pytest.approx(p_value)
+        assert analysis.mean_b == pytest.approx(0.16)
+
+    def test_insufficient_data_raises(self, analyzer):
+        with pytest.raises(ValueError):
+            analyzer.analyze_summaries("exp", MetricSummary.from_values([1.0]), MetricSummary.from_values([2.0, 3.0]))
+
+
+class TestExperimentTrackerStatistics:
+    """Test the tracker's Redis-backed sufficient statistics."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("client_factory", [FakeSyncRedis, FakeAsyncRedis])
+    async def test_concurrent_tracking_loses_no_updates(self, client_factory):
+        tracker = ExperimentTracker(client_factory())
+
+        await asyncio.gather(*[
+            tracker.track_experiment_result(
+                "exp", "control" if i % 2 else "treatment", f"user_{i}", f"session_{i}",
+                {"success": i % 3 == 0, "response_time": 100.0 + i}
+            )
+            for i in range(200)
+        ])
+
+        metrics = await tracker.get_experiment_metrics("exp")
+        assert metrics.total_users == 200
+        assert metrics.variant_counts == {"control": 100, "treatment": 100}
+        assert sum(metrics.success_counts.values()) == 67
+
+    @pytest.mark.asyncio
+    async def test_metrics_derived_from_statistics(self):
+        client = FakeAsyncRedis()
+        tracker = ExperimentTracker(client)
+
+        for i, (variant, success, response_time) in enumerate([
+            ("control", 1, 100.0), ("control", 0, 300.0), ("treatment", 1, 50.0)
+        ]):
+            await tracker.track_experiment_result(
+                "exp", variant, f"user_{i}", f"session_{i}",
+                {"success": success, "response_time": response_time, "business_revenue": 10.0 * (i + 1)}
+            )
+
+        metrics = await tracker.get_experiment_metrics("exp")
+        assert metrics.success_counts == {"control": 1, "treatment": 1}
+        assert metrics.conversion_rates["control"] == 0.5
+        assert metrics.average_response_times == {"control": 200.0, "treatment": 50.0}
+        assert metrics.business_metrics["control_business_revenue"] == 15.0
+
+        # One hash per experiment; no per-user or per-session keys
+        assert list(client.store.hashes) == ["ab_test:stats:exp"]
+        assert client.store.expiries["ab_test:stats:exp"] == tracker.stats_ttl
+
+        variants = await tracker.get_variant_statistics("exp")
+        assert variants["control"].sketches["response_time"].quantile(1) == pytest.approx(300.0, rel=0.01)
+
+    @pytest.mark.asyncio
+    async def test_redis_failure_is_logged_not_raised(self):
+        class BrokenRedis(FakeSyncRedis):
+            def hgetall(self, key):
+                raise ConnectionError("down")
+
+        tracker = ExperimentTracker(BrokenRedis())
+        metrics = await tracker.get_experiment_metrics("exp")
+
+        assert metrics.total_users == 0
@@ -0,0 +1,181 @@
+"""
+Unit tests for per-guard adaptive concurrency limits.
+
+Covers AIMD limit adjustment, priority queueing, load shedding, guard
+isolation and shedding through orchestrate_request.
+"""
+
+import asyncio
+import pytest
+import pytest_asyncio
+from unittest.mock import AsyncMock, patch
+
+from app.core.adaptive_concurrency import (
+    AdaptiveConcurrencyController,
+    AdaptiveLimiter,
+    is_congestion_error
+)
+from app.core.exceptions import GuardOverloadedError, GuardServiceError
+from app.core.guard_orchestrator import (
+    GuardServiceOrchestrator,
+    GuardServiceType,
+    OrchestrationRequest
+)
+from app.core.guard_verdict_cache import GuardVerdictCache
+
+
+class TestLimitAdjustment:
+    """Test AIMD feedback."""
+
+    def test_limit_grows_while_latency_at_baseline(self):
+        limiter = AdaptiveLimiter("tokenguard", initial_limit=4)
+        limiter.in_flight = 4
+        for _ in range(20):
+            limiter.record(0.05)
+        assert limiter.limit > 4
+
+    def test_limit_not_grown_when_underused(self):
+        limiter = AdaptiveLimiter("tokenguard", initial_limit=10)
+        for _ in range(20):
+            limiter.record(0.05)
+        assert int(limiter.limit) == 10
+
+    def test_congestion_backs_off_to_floor(self):
+        limiter = AdaptiveLimiter("biasguard", initial_limit=10, min_limit=2)
+        for _ in range(20):
+            limiter._last_decrease = 0.0
+            limiter.record(0.05, congested=True)
+        assert limiter.limit == 2
+
+    def test_latency_spike_counts_as_congestion(self):
+        limiter = AdaptiveLimiter("biasguard", initial_limit=10, latency_tolerance=2.0)
+        limiter.record(0.05)
+        limiter.record(1.0)
+        assert limiter.limit < 10
+
+    def test_client_errors_are_not_congestion(self):
+        assert is_congestion_error(GuardServiceError("bad", details={"status_code": 422})) is False
+        assert is_congestion_error(GuardServiceError("busy", details={"status_code": 503})) is True
+        assert is_congestion_error(GuardServiceError("timed out")) is True
+
+
+class TestAdmission:
+    """Test queueing and shedding."""
+
+    @pytest.mark.asyncio
+    async def test_higher_priority_admitted_first(self):
+        limiter = AdaptiveLimiter("tokenguard", initial_limit=1)
+        await limiter.acquire()
+        order = []
+
+        async def waiter(priority):
+            await limiter.acquire(priority)
+            order.append(priority)
+            limiter.release()
+
+        tasks = [asyncio.create_task(waiter(1)), asyncio.create_task(waiter(5))]
+        await asyncio.sleep(0)
+        limiter.release()
+        await asyncio.gather(*tasks)
+
+        assert order == [5, 1]
+
+    @pytest.mark.asyncio
+    async def test_full_queue_sheds_lower_priority(self):
+        limiter = AdaptiveLimiter("tokenguard", initial_limit=1, max_queue=1)
+        await limiter.acquire()
+        low = asyncio.create_task(limiter.acquire(priority=1))
+        await asyncio.sleep(0)
+
+        with pytest.raises(GuardOverloadedError):
+            await limiter.acquire(priority=1)
+
+        high = asyncio.create_task(limiter.acquire(priority=9))
+        await asyncio.sleep(0)
+        with pytest.raises(GuardOverloadedError):
+            await low
+
+        limiter.release()
+        await high
+        assert limiter.in_flight == 1
+
+    @pytest.mark.asyncio
+    async def test_queue_timeout_sheds(self):
+        limiter = AdaptiveLimiter("tokenguard", initial_limit=1)
+        await limiter.acquire()
+
+        with pytest.raises(GuardOverloadedError):
+            await limiter.acquire(timeout=0.01)
+
+        assert limiter.get_stats()["shed_timeout"] == 1
+        assert limiter.get_stats()["queued"] == 1
+
+    @pytest.mark.asyncio
+    async def test_slow_guard_does_not_starve_others(self):
+        controller = AdaptiveConcurrencyController(initial_limit=1)
+        release = asyncio.Event()
+
+        async def slow_bias_call():
+            async with controller.slot("biasguard"):
+                await release.wait()
+
+        blocker = asyncio.create_task(slow_bias_call())
+        await asyncio.sleep(0)
+
+        async with controller.slot("tokenguard"):
+            assert controller.get_limiter("tokenguard").in_flight == 1
+
+        release.set()
+        await blocker
+
+    @pytest.mark.asyncio
+    async def test_long_held_slot_without_latency_feedback(self):
+        controller = AdaptiveConcurrencyController(initial_limit=10, latency_tolerance=2.0)
+        limiter = controller.get_limiter("healthguard")
+        limiter.record(0.001)
+
+        # A relayed stream or packed batch holds its slot far beyond one call
+        async with controller.slot("healthguard", record_latency=False):
+            await asyncio.sleep(0.02)
+        assert int(limiter.limit) == 10
+        assert limiter.baseline_latency == 0.001
+
+        with pytest.raises(GuardServiceError):
+            async with controller.slot("healthguard", record_latency=False):
+                raise GuardServiceError("busy", details={"status_code": 503})
+        assert limiter.limit < 10
+
+
+@pytest_asyncio.fixture
+async def orchestrator():
+    """Create an initialized orchestrator without network access or verdict cache."""
+    orch = GuardServiceOrchestrator()
+    orch.http_client = AsyncMock()
+    await orch._load_service_configurations()
+    await orch._initialize_circuit_breakers()
+    orch._initialized = True
+    with patch("app.core.guard_orchestrator.get_guard_verdict_cache",
+               return_value=GuardVerdictCache(enabled=False)):
+        yield orch
+
+
+class TestOrchestratorShedding:
+    """Test shedding through orchestrate_request."""
+
+    @pytest.mark.asyncio
+    async def test_shed_request_leaves_circuit_breaker_closed(self, orchestrator):
+        controller = AdaptiveConcurrencyController(initial_limit=1, max_queue=0)
+        await controller.get_limiter("tokenguard").acquire()
+
+        with patch("app.core.guard_orchestrator.get_concurrency_controller", return_value=controller), \
+             patch.object(orchestrator, "_route_request", AsyncMock(return_value={"ok": True})) as route:
+            response = await orchestrator.orchestrate_request(OrchestrationRequest(
+                request_id="shed-1",
+                service_type=GuardServiceType.TOKEN_GUARD,
+                payload={"text": "x"}
+            ))
+
+        assert response.success is False
+        assert response.error_code == "GUARD_OVERLOADED"
+        assert route.await_count == 0
+        assert orchestrator.circuit_breakers["tokenguard"].failure_count == 0
@@ -64,8 +64,8 @@ class TestCircuitBreakerCascadingErrors:
         for _ in range(circuit_breaker.threshold):
             circuit_breaker.record_failure()
         
-        # Simulate time passing (set last_failure_time to past)
-        circuit_breaker.last_failure_time = datetime.now() - timedelta(seconds=circuit_breaker.timeout + 1)
+        # Simulate time passing (set opened_at to past)
+        circuit_breaker.opened_at = datetime.now() - timedelta(seconds=circuit_breaker.timeout + 1)
         
         # Act - Check if can execute (should move to half-open)
         can_execute = circuit_breaker.can_execute()
@@ -79,7 +79,7 @@ class TestCircuitBreakerCascadingErrors:
         # Arrange - Move to half-open
         for _ in range(circuit_breaker.threshold):
             circuit_breaker.record_failure()
-        circuit_breaker.last_failure_time = datetime.now() - timedelta(seconds=circuit_breaker.timeout + 1)
+        circuit_breaker.opened_at = datetime.now() - timedelta(seconds=circuit_breaker.timeout + 1)
         circuit_breaker.can_execute()  # Moves to half-open
         
         # Act - Record success
@@ -94,7 +94,7 @@ class TestCircuitBreakerCascadingErrors:
         # Arrange - Move to half-open
         for _ in range(circuit_breaker.threshold):
             circuit_breaker.record_failure()
-        circuit_breaker.last_failure_time = datetime.now() - timedelta(seconds=circuit_breaker.timeout + 1)
+        circuit_breaker.opened_at = datetime.now() - timedelta(seconds=circuit_breaker.timeout + 1)
         circuit_breaker.can_execute()  # Moves to half-open
         
         # Act - Record failure in half-open
@@ -0,0 +1,186 @@
+"""
+Unit tests for the sliding-window circuit breaker.
+
+Covers failure-rate and slow-call-rate tripping, the half-open probe budget,
+escalating open durations, window expiry and export of guard breakers.
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+import pytest_asyncio
+from unittest.mock import AsyncMock, patch
+
+from app.core.circuit_breaker import CircuitBreaker, CircuitState, circuit_breaker_manager
+from app.core.exceptions import CircuitBreakerOpenError
+from app.core.guard_orchestrator import GuardServiceOrchestrator, GuardServiceType, OrchestrationRequest
+
+
+def expire_open_period(breaker):
+    breaker.opened_at = datetime.now() - timedelta(seconds=breaker.recovery_timeout + 1)
+
+
+class TestFailureRateWindow:
+    """Test tripping on rates instead of consecutive failures."""
+
+    def test_isolated_failure_among_successes_stays_closed(self):
+        breaker = CircuitBreaker(failure_threshold=5, name="blip")
+        for _ in range(20):
+            breaker.record_success()
+        for _ in range(3):
+            breaker.record_failure()
+        breaker.record_success()
+
+        assert breaker.state == CircuitState.CLOSED
+
+    def test_sustained_partial_failure_opens(self):
+        breaker = CircuitBreaker(failure_threshold=10, name="degraded")
+        # Alternating outcomes never produce consecutive failures
+        for _ in range(5):
+            breaker.record_failure()
+            breaker.record_success()
+
+        assert breaker.state == CircuitState.OPEN
+        assert breaker.can_execute() is False
+
+    def test_minimum_calls_required(self):
+        breaker = CircuitBreaker(failure_threshold=5, name="low-volume")
+        for _ in range(4):
+            breaker.record_failure()
+
+        assert breaker.state == CircuitState.CLOSED
+
+    def test_slow_calls_open_circuit(self):
+        breaker = CircuitBreaker(
+            failure_threshold=4, name="slow", slow_call_duration=1.0, slow_call_rate_threshold=0.75
+        )
+        for _ in range(4):
+            breaker.record_success(duration=2.5)
+
+        assert breaker.state == CircuitState.OPEN
+
+    def test_old_buckets_expire(self):
+        breaker = CircuitBreaker(failure_threshold=5, name="expiry", window_seconds=10, window_buckets=10)
+        with patch("app.core.circuit_breaker.time.monotonic", return_value=1000.0):
+            breaker._head = int(1000.0 / breaker._bucket_width)
+            for _ in range(4):
+                breaker.record_failure()
+        with patch("app.core.circuit_breaker.time.monotonic", return_value=1011.0):
+            assert breaker.failure_count == 0
+            breaker.record_failure()
+
+        assert breaker.state == CircuitState.CLOSED
+
+
+class TestRecovery:
+    """Test open duration and half-open probing."""
+
+    def test_probe_budget_limits_half_open_calls(self):
+        breaker = CircuitBreaker(failure_threshold=2, name="probes", half_open_max_calls=2)
+        breaker.record_failure()
+        breaker.record_failure()
+        expire_open_period(breaker)
+
+        assert [breaker.can_execute() for _ in range(3)] == [True, True, False]
+        breaker.release_permission()
+        assert breaker.can_execute() is True
+
+    def test_enough_successful_probes_close(self):
+        breaker = CircuitBreaker(
+            failure_threshold=2, name="close", half_open_max_calls=2, half_open_success_threshold=2
+        )
+        breaker.record_failure()
+        breaker.record_failure()
+        expire_open_period(breaker)
+
+        breaker.can_execute()
+        breaker.record_success()
+        assert breaker.state == CircuitState.HALF_OPEN
+        breaker.can_execute()
+        breaker.record_success()
+        assert breaker.state == CircuitState.CLOSED
+        assert breaker.failure_count == 0
+
+    def test_open_duration_escalates_on_reopen(self):
+        breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=60, min_open_seconds=5, name="backoff")
+        breaker.record_failure()
+        breaker.record_failure()
+        assert breaker.get_state()["open_duration"] == 5
+
+        expire_open_period(breaker)
+        breaker.can_execute()
+        breaker.record_failure()
+        assert breaker.state == CircuitState.OPEN
+        assert breaker.get_state()["open_duration"] == 10
+
+    def test_slow_trip_after_old_failure_gets_full_open_period(self):
+        breaker = CircuitBreaker(
+            failure_threshold=4, name="stale", slow_call_duration=1.0, slow_call_rate_threshold=0.75
+        )
+        breaker.record_failure()
+        breaker.last_failure_time = datetime.now() - timedelta(seconds=breaker.recovery_timeout + 1)
+        for _ in range(3):
+            breaker.record_success(duration=2.5)
+
+        assert breaker.state == CircuitState.OPEN
+        assert breaker.can_execute() is False
+
+    def test_failures_while_open_do_not_extend_open_period(self):
+        breaker = CircuitBreaker(failure_threshold=2, name="late")
+        breaker.record_failure()
+        breaker.record_failure()
+        opened_at = breaker.opened_at
+
+        breaker.record_failure()
+
+        assert breaker.opened_at == opened_at
+
+    @pytest.mark.asyncio
+    async def test_call_raises_when_open(self):
+        breaker = CircuitBreaker(failure_threshold=1, name="call")
+        breaker.record_failure()
+
+        with pytest.raises(CircuitBreakerOpenError):
+            await breaker.call(AsyncMock())
+
+
+@pytest_asyncio.fixture
+async def orchestrator():
+    """Create an orchestrator with configured services and breakers."""
+    orch = GuardServiceOrchestrator()
+    orch.http_client = AsyncMock()
+    await orch._load_service_configurations()
+    await orch._initialize_circuit_breakers()
+    yield orch
+
+
+class TestGuardBreakerExport:
+    """Test guard breakers in the shared manager."""
+
+    @pytest.mark.asyncio
+    async def test_guard_breakers_registered(self, orchestrator):
+        states = circuit_breaker_manager.get_all_states()
+
+        assert circuit_breaker_manager.breakers["tokenguard"] is orchestrator.circuit_breakers["tokenguard"]
+        assert states["tokenguard"]["state"] == "CLOSED"
+        assert "failure_rate" in states["tokenguard"]
+
+    @pytest.mark.asyncio
+    async def test_rejections_do_not_retrip_half_open_breaker(self, orchestrator):
+        orchestrator._initialized = True
+        breaker = orchestrator.circuit_breakers["tokenguard"]
+        for _ in range(breaker.failure_threshold):
+            breaker.record_failure()
+        expire_open_period(breaker)
+        for _ in range(breaker.half_open_max_calls):
+            assert breaker.can_execute() is True
+
+        response = await orchestrator.orchestrate_request(OrchestrationRequest(
+            request_id="over-budget",
+            service_type=GuardServiceType.TOKEN_GUARD,
+            payload={"text": "probe"}
+        ))
+
+        assert response.success is False
+        assert "Circuit breaker is open" in response.error
+        assert breaker.state == CircuitState.HALF_OPEN
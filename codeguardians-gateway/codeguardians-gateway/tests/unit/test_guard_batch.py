@@ -0,0 +1,212 @@
+"""
+Unit tests for batch scans in GuardServiceOrchestrator.
+
+Covers grouping by guard, configured batch endpoints, chunking, malformed
+items failing alone, per-item fallback (including HealthGuard's aggregate
+/analyze) and verdict cache hits.
+"""
+
+import pytest
+import pytest_asyncio
+from unittest.mock import AsyncMock, patch
+
+from app.core.guard_orchestrator import (
+    GuardServiceOrchestrator,
+    GuardServiceType,
+    OrchestrationRequest
+)
+from app.core.guard_verdict_cache import GuardVerdictCache
+from app.core.parallel_guard_executor import ParallelGuardExecutor
+
+
+@pytest.fixture
+def verdict_cache():
+    """In-process verdict cache without Redis."""
+    with patch("app.core.guard_verdict_cache.get_cache_client", AsyncMock(return_value=None)):
+        yield GuardVerdictCache()
+
+
+@pytest_asyncio.fixture
+async def orchestrator(verdict_cache):
+    """Create an initialized orchestrator without network access."""
+    orch = GuardServiceOrchestrator()
+    orch.http_client = AsyncMock()
+    await orch._load_service_configurations()
+    await orch._initialize_circuit_breakers()
+    orch._initialized = True
+    with patch("app.core.guard_orchestrator.get_guard_verdict_cache", return_value=verdict_cache):
+        yield orch
+
+
+def make_requests(service_type, count, prefix="item"):
+    return [
+        OrchestrationRequest(
+            request_id=f"{prefix}-{i}",
+            service_type=service_type,
+            payload={"text": f"snippet {i}"}
+        )
+        for i in range(count)
+    ]
+
+
+async def collect(orchestrator, requests, **kwargs):
+    return [response async for response in orchestrator.orchestrate_batch(requests, **kwargs)]
+
+
+async def echo_batch(request, context_data=None, transformed_payload=None, endpoint=None):
+    """Batch endpoint answering one result per item, in order."""
+    return {"results": [{"content": item["content"]} for item in transformed_payload["items"]]}
+
+
+class TestBatchPacking:
+    """Test packing items into one upstream call per guard."""
+
+    @pytest.mark.asyncio
+    async def test_batch_endpoint_items_packed_into_one_call(self, orchestrator):
+        orchestrator.services["tokenguard"].batch_endpoint = "/scan/batch"
+        route = AsyncMock(side_effect=echo_batch)
+
+        with patch.object(orchestrator, "_route_request", route):
+            responses = await collect(orchestrator, make_requests(GuardServiceType.TOKEN_GUARD, 5))
+
+        assert route.await_count == 1
+        assert len(route.await_args.kwargs["transformed_payload"]["items"]) == 5
+        assert len(responses) == 5
+        assert all(r.success for r in responses)
+
+    @pytest.mark.asyncio
+    async def test_batch_endpoint_results_mapped_in_order(self, orchestrator):
+        orchestrator.services["tokenguard"].batch_endpoint = "/scan/batch"
+
+        async def fake_route(request, context_data=None, transformed_payload=None, endpoint=None):
+            assert endpoint == "/scan/batch"
+            return {"results": [{"content": item["content"]} for item in transformed_payload["items"]]}
+
+        with patch.object(orchestrator, "_route_request", side_effect=fake_route):
+            responses = await collect(orchestrator, make_requests(GuardServiceType.TOKEN_GUARD, 3))
+
+        by_id = {r.request_id: r for r in responses}
+        assert by_id["item-2"].data == {"content": "snippet 2"}
+
+    @pytest.mark.asyncio
+    async def test_items_chunked_by_max_batch_size(self, orchestrator):
+        orchestrator.services["tokenguard"].batch_endpoint = "/scan/batch"
+        route = AsyncMock(side_effect=echo_batch)
+
+        with patch.object(orchestrator, "_route_request", route):
+            responses = await collect(
+                orchestrator, make_requests(GuardServiceType.TOKEN_GUARD, 5), max_batch_size=2
+            )
+
+        assert route.await_count == 3
+        assert len(responses) == 5
+
+    @pytest.mark.asyncio
+    async def test_item_error_inside_batch(self, orchestrator):
+        orchestrator.services["securityguard"].batch_endpoint = "/scan/batch"
+        route = AsyncMock(return_value={"results": [
+            {"vulnerabilities_found": 0},
+            {"error": "Content required", "status_code": 400}
+        ]})
+
+        with patch.object(orchestrator, "_route_request", route):
+            responses = await collect(orchestrator, make_requests(GuardServiceType.SECURITY_GUARD, 2))
+
+        by_id = {r.request_id: r for r in responses}
+        assert by_id["item-0"].success is True
+        assert by_id["item-1"].success is False
+        assert by_id["item-1"].error_code == "GUARD_BATCH_ITEM_ERROR"
+
+    @pytest.mark.asyncio
+    async def test_malformed_item_fails_alone_in_mixed_batch(self, orchestrator):
+        orchestrator.services["biasguard"].batch_endpoint = "/process/batch"
+        orchestrator.services["tokenguard"].batch_endpoint = "/scan/batch"
+        requests = make_requests(GuardServiceType.BIAS_GUARD, 3, prefix="bias")
+        requests[1].payload = {}  # BiasGuard requires text
+        requests += make_requests(GuardServiceType.TOKEN_GUARD, 2, prefix="token")
+
+        async def answer_each(request, context_data=None, transformed_payload=None, endpoint=None):
+            return {"results": [{"ok": True} for _ in transformed_payload["items"]]}
+
+        with patch.object(orchestrator, "_route_request", AsyncMock(side_effect=answer_each)) as route:
+            responses = await collect(orchestrator, requests)
+
+        by_id = {r.request_id: r for r in responses}
+        assert len(responses) == 5
+        assert by_id["bias-1"].success is False
+        assert "Text content is required" in by_id["bias-1"].error
+        assert all(by_id[i].success for i in ("bias-0", "bias-2", "token-0", "token-1"))
+        packed = [call.kwargs["transformed_payload"]["items"] for call in route.await_args_list]
+        assert sorted(len(items) for items in packed) == [2, 2]
+
+    @pytest.mark.asyncio
+    async def test_mismatched_result_count_fails_chunk(self, orchestrator):
+        orchestrator.services["tokenguard"].batch_endpoint = "/scan/batch"
+        route = AsyncMock(return_value={"results": [{"ok": True}]})
+
+        with patch.object(orchestrator, "_route_request", route):
+            responses = await collect(orchestrator, make_requests(GuardServiceType.TOKEN_GUARD, 3))
+
+        assert len(responses) == 3
+        assert not any(r.success for r in responses)
+
+    @pytest.mark.asyncio
+    async def test_aggregate_response_fails_chunk_and_is_not_cached(self, orchestrator, verdict_cache):
+        orchestrator.services["tokenguard"].batch_endpoint = "/scan/batch"
+        route = AsyncMock(return_value={"optimized_text": "one verdict for everything"})
+
+        with patch.object(orchestrator, "_route_request", route):
+            responses = await collect(orchestrator, make_requests(GuardServiceType.TOKEN_GUARD, 3))
+
+        assert not any(r.success for r in responses)
+        assert verdict_cache.get_stats()["stores"] == 0
+
+
+class TestBatchFallback:
+    """Test guards without batch support and cache hits."""
+
+    @pytest.mark.asyncio
+    async def test_guard_without_batch_endpoint_called_per_item(self, orchestrator):
+        route = AsyncMock(side_effect=lambda request, **kwargs: {"is_trusted": True, "id": request.request_id})
+
+        with patch.object(orchestrator, "_route_request", route):
+            responses = await collect(orchestrator, make_requests(GuardServiceType.TRUST_GUARD, 3))
+
+        assert route.await_count == 3
+        assert {r.request_id for r in responses} == {"item-0", "item-1", "item-2"}
+
+    @pytest.mark.asyncio
+    async def test_healthguard_samples_analyzed_individually(self, orchestrator):
+        # /analyze returns one aggregate verdict, so samples are never packed
+        route = AsyncMock(side_effect=lambda request, **kwargs: {"health_score": 0.9, "id": request.request_id})
+
+        with patch.object(orchestrator, "_route_request", route):
+            responses = await collect(orchestrator, make_requests(GuardServiceType.HEALTH_GUARD, 3))
+
+        assert route.await_count == 3
+        assert {r.data["id"] for r in responses} == {"item-0", "item-1", "item-2"}
+
+    @pytest.mark.asyncio
+    async def test_cached_items_not_sent_upstream(self, orchestrator):
+        orchestrator.services["tokenguard"].batch_endpoint = "/scan/batch"
+        route = AsyncMock(side_effect=echo_batch)
+
+        with patch.object(orchestrator, "_route_request", route):
+            await collect(orchestrator, make_requests(GuardServiceType.TOKEN_GUARD, 2, prefix="first"))
+            responses = await collect(orchestrator, make_requests(GuardServiceType.TOKEN_GUARD, 3, prefix="second"))
+
+        assert route.await_count == 2
+        assert [r.cache_hit for r in responses].count(True) == 2
+        assert len(route.await_args.kwargs["transformed_payload"]["items"]) == 1
+
+    @pytest.mark.asyncio
+    async def test_parallel_executor_returns_request_order(self, orchestrator):
+        orchestrator.services["tokenguard"].batch_endpoint = "/scan/batch"
+        route = AsyncMock(side_effect=echo_batch)
+        requests = make_requests(GuardServiceType.TOKEN_GUARD, 4)
+
+        with patch.object(orchestrator, "_route_request", route):
+            results = await ParallelGuardExecutor(orchestrator).execute_parallel_guards(requests)
+
+        assert [r["request_id"] for r in results] == [r.request_id for r in requests]
+        assert route.await_count == 1
@@ -0,0 +1,175 @@
+"""
+Unit tests for multi-guard fan-out in GuardServiceOrchestrator.
+
+Covers concurrent dispatch, per-guard deadlines, early return on a
+blocking verdict and single ContextGuard snapshot per scan.
+"""
+
+import asyncio
+import time
+import pytest
+import pytest_asyncio
+from unittest.mock import AsyncMock, patch
+
+from app.core.guard_orchestrator import (
+    GuardServiceOrchestrator,
+    GuardServiceType,
+    OrchestrationRequest,
+    is_blocking_verdict
+)
+from app.core.guard_verdict_cache import GuardVerdictCache
+
+
+GUARD_DELAYS = {
+    "tokenguard": 0.2,
+    "trustguard": 0.2,
+    "biasguard": 0.2,
+}
+
+
+@pytest_asyncio.fixture
+async def orchestrator():
+    """Create an initialized orchestrator without network access."""
+    orch = GuardServiceOrchestrator()
+    orch.http_client = AsyncMock()
+    await orch._load_service_configurations()
+    await orch._initialize_circuit_breakers()
+    orch._initialized = True
+    # Every scan must reach the (patched) guard route
+    with patch("app.core.guard_orchestrator.get_guard_verdict_cache",
+               return_value=GuardVerdictCache(enabled=False)):
+        yield orch
+
+
+def make_request(**kwargs):
+    """Build a fan-out request with a shared payload."""
+    return OrchestrationRequest(
+        request_id="fan-out-123",
+        service_type=GuardServiceType.TOKEN_GUARD,
+        payload={"text": "scan me"},
+        **kwargs
+    )
+
+
+class TestBlockingVerdict:
+    """Test blocking verdict detection."""
+
+    def test_blocked_flag(self):
+        assert is_blocking_verdict({"blocked": True}) is True
+
+    def test_untrusted_content(self):
+        assert is_blocking_verdict({"is_trusted": False}) is True
+
+    def test_vulnerabilities_found(self):
+        assert is_blocking_verdict({"vulnerabilities_found": 2}) is True
+
+    def test_clean_verdict(self):
+        assert is_blocking_verdict({"is_trusted": True, "bias_detected": False}) is False
+
+    def test_non_dict_data(self):
+        assert is_blocking_verdict(None) is False
+
+
+class TestFanOut:
+    """Test concurrent dispatch to several guards."""
+
+    @pytest.mark.asyncio
+    async def test_guards_run_concurrently(self, orchestrator):
+        """Latency should track the slowest guard, not the sum."""
+        async def fake_route(request, context_data=None, **kwargs):
+            await asyncio.sleep(GUARD_DELAYS[request.service_type.value])
+            return {"guard": request.service_type.value}
+
+        with patch.object(orchestrator, "_route_request", side_effect=fake_route):
+            start = time.perf_counter()
+            result = await orchestrator.orchestrate_fan_out(
+                make_request(),
+                [GuardServiceType.TOKEN_GUARD, GuardServiceType.TRUST_GUARD, GuardServiceType.BIAS_GUARD]
+            )
+            elapsed = time.perf_counter() - start
+
+        assert set(result.responses) == {"tokenguard", "trustguard", "biasguard"}
+        assert all(r.success for r in result.responses.values())
+        assert elapsed < sum(GUARD_DELAYS.values())
+        assert result.blocked is False
+
+    @pytest.mark.asyncio
+    async def test_duplicate_guards_dispatched_once(self, orchestrator):
+        """Duplicate service types should only be called once."""
+        route = AsyncMock(return_value={"ok": True})
+
+        with patch.object(orchestrator, "_route_request", route):
+            result = await orchestrator.orchestrate_fan_out(
+                make_request(),
+                [GuardServiceType.TOKEN_GUARD, GuardServiceType.TOKEN_GUARD]
+            )
+
+        assert list(result.responses) == ["tokenguard"]
+        assert route.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_per_guard_deadline(self, orchestrator):
+        """A slow guard times out without delaying the others."""
+        async def fake_route(request, context_data=None, **kwargs):
+            if request.service_type == GuardServiceType.BIAS_GUARD:
+                await asyncio.sleep(5)
+            return {"ok": True}
+
+        with patch.object(orchestrator, "_route_request", side_effect=fake_route):
+            result = await orchestrator.orchestrate_fan_out(
+                make_request(),
+                [GuardServiceType.TOKEN_GUARD, GuardServiceType.BIAS_GUARD],
+                guard_timeout=0.1
+            )
+
+        assert result.responses["tokenguard"].success is True
+        assert result.responses["biasguard"].success is False
+        assert result.responses["biasguard"].error_code == "GUARD_DEADLINE_EXCEEDED"
+        assert result.timed_out_services == ["biasguard"]
+
+    @pytest.mark.asyncio
+    async def test_stop_on_block_cancels_pending_guards(self, orchestrator):
+        """The first blocking verdict returns early and cancels the rest."""
+        async def fake_route(request, context_data=None, **kwargs):
+            if request.service_type == GuardServiceType.TRUST_GUARD:
+                return {"is_trusted": False}
+            await asyncio.sleep(5)
+            return {"ok": True}
+
+        with patch.object(orchestrator, "_route_request", side_effect=fake_route):
+            start = time.perf_counter()
+            result = await orchestrator.orchestrate_fan_out(
+                make_request(),
+                [GuardServiceType.TOKEN_GUARD, GuardServiceType.TRUST_GUARD, GuardServiceType.BIAS_GUARD],
+                stop_on_block=True
+            )
+            elapsed = time.perf_counter() - start
+
+        assert result.blocked is True
+        assert result.blocking_service == "trustguard"
+        assert sorted(result.cancelled_services) == ["biasguard", "tokenguard"]
+        assert elapsed < 1.0
+
+    @pytest.mark.asyncio
+    async def test_context_snapshot_fetched_once(self, orchestrator):
+        """ContextGuard memory is read once and shared by all guards."""
+        route = AsyncMock(return_value={"ok": True})
+        snapshot = {"has_context": False, "previous_count": 0}
+
+        with patch.object(orchestrator, "_route_request", route), \
+             patch("app.core.contextguard_integration.get_guard_context_snapshot",
+                   return_value=snapshot) as get_snapshot:
+            await orchestrator.orchestrate_fan_out(
+                make_request(session_id="session-1"),
+                [GuardServiceType.TOKEN_GUARD, GuardServiceType.TRUST_GUARD]
+            )
+
+        get_snapshot.assert_called_once()
+        for call in route.await_args_list:
+            assert call.kwargs["context_data"] is snapshot
+
+    @pytest.mark.asyncio
+    async def test_empty_service_types_rejected(self, orchestrator):
+        """At least one guard must be selected."""
+        with pytest.raises(ValueError):
+            await orchestrator.orchestrate_fan_out(make_request(), [])
@@ -0,0 +1,241 @@
+"""
+Unit tests for the guard metrics write-behind buffer.
+
+Covers size- and time-triggered bulk flushes, the bounded ring buffer,
+sampling under backpressure, retry of failed flushes and the recorders
+that feed the buffer instead of committing per call.
+"""
+
+import asyncio
+import time
+
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from unittest.mock import AsyncMock, patch
+
+from app.core.centralized_database import Base as CentralizedBase, GuardMetrics, GuardOperation
+from app.core.guard_metrics_buffer import GuardMetricsBuffer
+from app.core.real_metrics_tracker import RealMetricsTracker
+
+
+class FakeSession:
+    """Async session recording bulk inserts per table."""
+
+    def __init__(self, database):
+        self.database = database
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute(self, statement, rows):
+        if self.database.fail:
+            raise RuntimeError("database down")
+        if self.database.delay:
+            await asyncio.sleep(self.database.delay)
+        self.database.inserts.append((statement.table.name, list(rows)))
+
+    async def commit(self):
+        self.database.commits += 1
+
+
+class FakeDatabase:
+    def __init__(self, fail=False, delay=0.0):
+        self.fail = fail
+        self.delay = delay
+        self.inserts = []
+        self.commits = 0
+
+    def session_factory(self):
+        return lambda: FakeSession(self)
+
+    def rows(self, table):
+        return [row for name, rows in self.inserts if name == table for row in rows]
+
+
+def operation(i=0):
+    return {"guard_name": "tokenguard", "operation_type": "process", "output_data": {"i": i}, "success": True}
+
+
+def metric(value=1.0):
+    return {"guard_name": "tokenguard", "metric_type": "tokens_saved", "metric_value": value, "metric_data": {}}
+
+
+@pytest.fixture
+def database():
+    db = FakeDatabase()
+    with patch("app.core.guard_metrics_buffer.get_session_factory", return_value=db.session_factory()):
+        yield db
+
+
+class TestGuardMetricsBuffer:
+    """Test buffering and bulk flushing."""
+
+    @pytest.mark.asyncio
+    async def test_flush_is_one_insert_per_table(self, database):
+        buffer = GuardMetricsBuffer(flush_interval=60)
+        for i in range(50):
+            buffer.record(operation(i), [metric(i)])
+
+        assert await buffer.flush() == 100
+
+        assert [name for name, _ in database.inserts] == ["guard_operations", "guard_metrics"]
+        assert database.commits == 1
+        assert len(database.rows("guard_operations")) == 50
+        assert all(row["created_at"] is not None for row in database.rows("guard_operations"))
+        assert all(row["timestamp"] is not None for row in database.rows("guard_metrics"))
+        await buffer.close()
+
+    @pytest.mark.asyncio
+    async def test_batch_size_triggers_flush_before_interval(self, database):
+        buffer = GuardMetricsBuffer(batch_size=20, flush_interval=60)
+        for i in range(10):
+            buffer.record(operation(i), [metric()])
+
+        await asyncio.sleep(0.05)
+
+        assert buffer.stats["flushed"] == 20
+        assert len(buffer) == 0
+        await buffer.close()
+
+    @pytest.mark.asyncio
+    async def test_interval_triggers_flush(self, database):
+        buffer = GuardMetricsBuffer(batch_size=1000, flush_interval=0.02)
+        buffer.record(operation())
+
+        await asyncio.sleep(0.1)
+
+        assert len(database.rows("guard_operations")) == 1
+
+    @pytest.mark.asyncio
+    async def test_full_buffer_overwrites_oldest_rows(self):
+        buffer = GuardMetricsBuffer(capacity=10, batch_size=100, flush_interval=60, min_sample_rate=1.0)
+        for i in range(14):
+            buffer.record(operation(i))
+
+        assert len(buffer) == 10
+        assert buffer.stats["dropped"] == 4
+        assert buffer._rows[0][1]["output_data"] == {"i": 4}
+
+    def test_samples_when_buffer_fills(self):
+        draws = iter([0.9, 0.1] * 10)
+        buffer = GuardMetricsBuffer(capacity=100, batch_size=1000, random_source=lambda: next(draws))
+        for i in range(75):
+            buffer._rows.append((GuardOperation, operation(i)))
+
+        assert buffer.sample_rate() == pytest.approx(0.5)
+        assert buffer.record(operation(), [metric()]) is False
+        assert buffer.record(operation(), [metric()]) is True
+        assert buffer.stats["sampled_out"] == 1
+        operation_row, metric_row = buffer._rows[-2][1], buffer._rows[-1][1]
+        assert operation_row["sample_weight"] == pytest.approx(2.0, rel=0.05)
+        assert metric_row["sample_weight"] == operation_row["sample_weight"]
+
+    def test_samples_when_flushes_are_slow(self):
+        buffer = GuardMetricsBuffer(slow_flush_seconds=0.5, min_sample_rate=0.1)
+        assert buffer.sample_rate() == 1.0
+
+        buffer.last_flush_seconds = 2.0
+        assert buffer.sample_rate() == 0.25
+
+        buffer.last_flush_seconds = 60.0
+        assert buffer.sample_rate() == 0.1
+
+    @pytest.mark.asyncio
+    async def test_failed_flush_is_retried(self):
+        database = FakeDatabase(fail=True)
+        buffer = GuardMetricsBuffer(flush_interval=60)
+        with patch("app.core.guard_metrics_buffer.get_session_factory", return_value=database.session_factory()):
+            buffer.record(operation(), [metric()])
+            assert await buffer.flush() == 0
+            assert len(buffer) == 2
+            assert buffer.stats["flush_errors"] == 1
+
+            database.fail = False
+            assert await buffer.flush() == 2
+            await buffer.close()
+
+        assert [row["output_data"] for row in database.rows("guard_operations")] == [{"i": 0}]
+
+    @pytest.mark.asyncio
+    async def test_record_does_not_wait_for_slow_database(self):
+        database = FakeDatabase(delay=0.2)
+        buffer = GuardMetricsBuffer(batch_size=1000, flush_interval=60)
+        with patch("app.core.guard_metrics_buffer.get_session_factory", return_value=database.session_factory()):
+            buffer.record(operation())
+            buffer._wakeup.set()
+            await asyncio.sleep(0.01)  # Flush now in progress
+
+            start = time.perf_counter()
+            for i in range(1000):
+                buffer.record(operation(i), [metric()])
+            elapsed = time.perf_counter() - start
+
+            assert elapsed < 0.25
+            await buffer.close()
+
+        assert len(database.rows("guard_operations")) == 1001
+
+
+class TestRecorders:
+    """Test that guard recorders buffer rows instead of committing."""
+
+    @pytest.mark.asyncio
+    async def test_real_metrics_tracker_buffers_operation_and_metrics(self):
+        buffer = GuardMetricsBuffer(flush_interval=60)
+        tracker = RealMetricsTracker(metrics_buffer=buffer)
+        tracker._redis = AsyncMock()
+
+        with patch("app.core.real_metrics_tracker.get_session_factory") as session_factory:
+            await tracker.record_guard_operation(
+                "tokenguard", {"data": {"tokens_saved": 120, "cost_savings_usd": 0.3}}, 12.5, True, user_id="u1"
+            )
+            session_factory.assert_not_called()
+
+        rows = [(model, row) for model, row in buffer._rows]
+        assert rows[0][0] is GuardOperation
+        assert rows[0][1]["processing_time_ms"] == 12.5
+        assert rows[1][0] is GuardMetrics
+        assert rows[1][1]["metric_value"] == 120.0
+        tracker._redis.set_guard_metrics.assert_awaited_once()
+        await buffer.close()
+
+    @pytest.mark.asyncio
+    async def test_real_metrics_sum_sample_weights(self):
+        engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+        async with engine.begin() as conn:
+            await conn.run_sync(CentralizedBase.metadata.create_all)
+        session_factory = async_sessionmaker(engine, expire_on_commit=False)
+
+        # One unsampled operation, then one kept at a 25% sample rate
+        draws = iter([0.1])
+        buffer = GuardMetricsBuffer(capacity=100, batch_size=1000, flush_interval=60, random_source=lambda: next(draws))
+        buffer.record(operation(), [metric(100.0)])
+        buffer.last_flush_seconds = buffer.slow_flush_seconds * 4
+        buffer.record(operation(), [metric(100.0)])
+
+        with patch("app.core.guard_metrics_buffer.get_session_factory", return_value=session_factory), \
+                patch("app.core.real_metrics_tracker.get_session_factory", return_value=session_factory):
+            await buffer.close()
+            report = await RealMetricsTracker(metrics_buffer=buffer).get_real_metrics()
+        await engine.dispose()
+
+        assert report["total_requests"] == 5
+        assert report["guard_breakdown"]["tokenguard"]["requests_processed"] == 5
+        assert report["total_tokens_saved"] == 500
+
+    @pytest.mark.asyncio
+    async def test_aggregator_records_into_shared_buffer(self):
+        from app.core import guard_metrics_aggregator
+
+        buffer = GuardMetricsBuffer(flush_interval=60)
+        with patch("app.core.guard_metrics_buffer._guard_metrics_buffer", buffer):
+            await guard_metrics_aggregator.record_guard_operation("trustguard", {
+                "operation_type": "validate",
+                "output_data": {"violations_prevented": 2, "risk_score": 0.8}
+            })
+
+        assert [row["metric_type"] for model, row in buffer._rows if model is GuardMetrics] == ["violations_prevented"]
+        await buffer.close()
@@ -0,0 +1,116 @@
+"""
+Unit tests for the streaming pass-through mode for large guard payloads.
+
+Covers chunked forwarding, data and verdict frames, size limits, chunk
+scanning across boundaries and slot release.
+"""
+
+import json
+
+import httpx
+import pytest
+import pytest_asyncio
+from unittest.mock import patch
+
+from app.core.adaptive_concurrency import AdaptiveConcurrencyController
+from app.core.exceptions import ValidationError
+from app.core.guard_orchestrator import (
+    GuardServiceOrchestrator,
+    GuardServiceType,
+    OrchestrationRequest
+)
+
+
+async def body_of(*chunks):
+    for chunk in chunks:
+        yield chunk
+
+
+def make_request(service_type=GuardServiceType.CONTEXT_GUARD):
+    return OrchestrationRequest(request_id="stream-1", service_type=service_type, payload={})
+
+
+async def read_frames(stream):
+    return [json.loads(line) async for line in stream.frames()]
+
+
+@pytest_asyncio.fixture
+async def orchestrator():
+    """Orchestrator whose ContextGuard answers through an in-memory transport."""
+    received = {}
+
+    async def handler(request):
+        received["body"] = b"".join([chunk async for chunk in request.stream])
+        received["path"] = request.url.path
+        if received["body"].startswith(b"reject"):
+            return httpx.Response(422, text="current_code is required")
+        return httpx.Response(200, json={"drift_score": 0.1, "size": len(received["body"])})
+
+    orch = GuardServiceOrchestrator()
+    await orch._load_service_configurations()
+    await orch._initialize_circuit_breakers()
+    orch.http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    orch._initialized = True
+    orch.received = received
+    controller = AdaptiveConcurrencyController(initial_limit=4)
+    orch.controller = controller
+    with patch("app.core.guard_orchestrator.get_concurrency_controller", return_value=controller):
+        yield orch
+    await orch.http_client.aclose()
+
+
+class TestStreamingProxy:
+    """Test streaming through orchestrate_stream."""
+
+    @pytest.mark.asyncio
+    async def test_body_forwarded_and_verdict_is_last_frame(self, orchestrator):
+        chunks = [b'{"current_code": "', b"x = 1\n" * 1000, b'", "previous_code": ""}']
+
+        stream = await orchestrator.orchestrate_stream(make_request(), body_of(*chunks), max_bytes=1_000_000)
+        frames = await read_frames(stream)
+
+        assert orchestrator.received["body"] == b"".join(chunks)
+        assert orchestrator.received["path"] == "/analyze"
+        assert json.loads("".join(f["data"] for f in frames if f["type"] == "data"))["drift_score"] == 0.1
+        verdict = frames[-1]
+        assert verdict["type"] == "verdict"
+        assert verdict["success"] is True
+        assert verdict["bytes_in"] == sum(len(c) for c in chunks)
+        assert orchestrator.controller.get_limiter("contextguard").in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_guard_error_reported_in_verdict(self, orchestrator):
+        stream = await orchestrator.orchestrate_stream(make_request(), body_of(b"reject"), max_bytes=1000)
+        frames = await read_frames(stream)
+
+        assert len(frames) == 1
+        assert frames[0]["success"] is False
+        assert frames[0]["status_code"] == 422
+        assert "current_code is required" in frames[0]["error"]
+        assert orchestrator.circuit_breakers["contextguard"].failure_count == 0
+
+    @pytest.mark.asyncio
+    async def test_oversized_body_aborted(self, orchestrator):
+        with pytest.raises(ValidationError) as exc_info:
+            await orchestrator.orchestrate_stream(
+                make_request(), body_of(b"a" * 600, b"a" * 600), max_bytes=1000
+            )
+
+        assert exc_info.value.error_code == "PAYLOAD_TOO_LARGE"
+        assert orchestrator.controller.get_limiter("contextguard").in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_pattern_split_across_chunks_detected(self, orchestrator):
+        with pytest.raises(ValidationError) as exc_info:
+            await orchestrator.orchestrate_stream(
+                make_request(), body_of(b'{"current_code": "<scr', b'ipt>alert(1)"}'), max_bytes=1000
+            )
+
+        assert exc_info.value.error_code == "UNSAFE_PAYLOAD"
+
+    @pytest.mark.asyncio
+    async def test_non_streaming_guard_rejected(self, orchestrator):
+        with pytest.raises(ValueError):
+            await orchestrator.orchestrate_stream(
+                make_request(GuardServiceType.TOKEN_GUARD), body_of(b"{}"), max_bytes=1000
+            )
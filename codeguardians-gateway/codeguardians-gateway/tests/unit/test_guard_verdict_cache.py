@@ -0,0 +1,291 @@
+"""
+Unit tests for the guard verdict cache.
+
+Covers key normalization (including ContextGuard memory), LRU eviction, TTL expiry, the per-tenant switch
+shared through Redis, guard version invalidation and the orchestrator cache
+path.
+"""
+
+import json
+
+import httpx
+import pytest
+import pytest_asyncio
+from unittest.mock import AsyncMock, patch
+
+from app.core.contextguard_integration import ContextGuardIntegration
+from app.core.guard_orchestrator import (
+    GuardServiceOrchestrator,
+    GuardServiceType,
+    OrchestrationRequest
+)
+from app.core.guard_verdict_cache import GuardVerdictCache
+
+
+@pytest.fixture(autouse=True)
+def no_redis():
+    """Keep every test on the in-process tier."""
+    with patch("app.core.guard_verdict_cache.get_cache_client", AsyncMock(return_value=None)):
+        yield
+
+
+class FakeRedis:
+    """In-memory stand-in for the few Redis commands the cache uses."""
+
+    def __init__(self):
+        self.values = {}
+        self.ttls_ms = {}
+        self.hashes = {}
+
+    async def hset(self, key, field, value):
+        self.hashes.setdefault(key, {})[field] = value
+
+    async def hgetall(self, key):
+        return dict(self.hashes.get(key, {}))
+
+    async def setex(self, key, ttl, value):
+        self.values[key] = value
+        self.ttls_ms[key] = ttl * 1000
+
+    def pipeline(self, transaction=True):
+        redis = self
+        commands = []
+
+        class Pipeline:
+            def get(self, key):
+                commands.append(lambda: redis.values.get(key))
+
+            def pttl(self, key):
+                commands.append(lambda: redis.ttls_ms.get(key, -2))
+
+            async def execute(self):
+                return [command() for command in commands]
+
+        return Pipeline()
+
+
+@pytest.fixture
+def cache():
+    """Create a small verdict cache."""
+    return GuardVerdictCache(max_entries=2, default_ttl=300)
+
+
+class TestVerdictKeys:
+    """Test content-addressed keys."""
+
+    def test_request_scoped_fields_ignored(self, cache):
+        first = cache.build_key("tokenguard", {"content": "x", "request_id": "a", "user_id": "u1"})
+        second = cache.build_key("tokenguard", {"content": "x", "request_id": "b", "user_id": "u2"})
+        assert first == second
+
+    def test_healthguard_sample_ids_ignored(self, cache):
+        first = cache.build_key("healthguard", {"samples": [{"id": "1", "content": "x"}]})
+        second = cache.build_key("healthguard", {"samples": [{"id": "2", "content": "x"}]})
+        assert first == second
+
+    def test_context_memory_ignored(self, cache):
+        first = cache.build_key("trustguard", {
+            "content": "x", "context": {"language": "python", "memory_count": 0},
+            "_context": {"previous_count": 0}
+        })
+        second = cache.build_key("trustguard", {
+            "content": "x", "context": {"language": "python", "memory_count": 3, "previous_context": {"a": 1}},
+            "_context": {"previous_count": 3}
+        })
+        assert first == second
+        assert first != cache.build_key("trustguard", {"content": "x", "context": {"language": "go"}})
+
+    def test_content_guard_and_config_change_key(self, cache):
+        base = cache.build_key("tokenguard", {"content": "x"}, "http://a/scan")
+        assert base != cache.build_key("tokenguard", {"content": "y"}, "http://a/scan")
+        assert base != cache.build_key("biasguard", {"content": "x"}, "http://a/scan")
+        assert base != cache.build_key("tokenguard", {"content": "x"}, "http://b/scan")
+
+
+class TestVerdictCache:
+    """Test lookup, store and invalidation."""
+
+    @pytest.mark.asyncio
+    async def test_store_and_hit(self, cache):
+        cache.set("tokenguard", "k1", {"score": 0.9})
+        assert await cache.get("tokenguard", "k1") == {"score": 0.9}
+        assert cache.get_stats()["hits_memory"] == 1
+
+    @pytest.mark.asyncio
+    async def test_degraded_responses_not_cached(self, cache):
+        assert cache.set("tokenguard", "k1", {"error": "boom"}) is False
+        assert await cache.get("tokenguard", "k1") is None
+
+    @pytest.mark.asyncio
+    async def test_lru_eviction(self, cache):
+        cache.set("tokenguard", "k1", {"n": 1})
+        cache.set("tokenguard", "k2", {"n": 2})
+        await cache.get("tokenguard", "k1")
+        cache.set("tokenguard", "k3", {"n": 3})
+
+        assert await cache.get("tokenguard", "k2") is None
+        assert await cache.get("tokenguard", "k1") == {"n": 1}
+        assert cache.get_stats()["evictions"] == 1
+
+    @pytest.mark.asyncio
+    async def test_ttl_expiry(self, cache):
+        cache.set("tokenguard", "k1", {"n": 1})
+        with patch("app.core.guard_verdict_cache.time.monotonic", return_value=10 ** 9):
+            assert await cache.get("tokenguard", "k1") is None
+
+    @pytest.mark.asyncio
+    async def test_tenant_switch(self, cache):
+        await cache.set_tenant_enabled("org-1", False)
+        assert cache.is_enabled_for("tokenguard", "org-1") is False
+        assert cache.is_enabled_for("tokenguard", "org-2") is True
+        await cache.set_tenant_enabled("org-1", True)
+        assert cache.is_enabled_for("tokenguard", "org-1") is True
+
+    @pytest.mark.asyncio
+    async def test_tenant_switch_shared_between_workers(self):
+        worker_a, worker_b = GuardVerdictCache(), GuardVerdictCache()
+        worker_b.configured_disabled_tenants = {"org-2"}
+
+        with patch("app.core.guard_verdict_cache.get_cache_client", AsyncMock(return_value=FakeRedis())):
+            await worker_a.set_tenant_enabled("org-1", False)
+            await worker_a.set_tenant_enabled("org-2", True)
+            await worker_b.refresh_tenants(force=True)
+
+        assert worker_b.is_enabled_for("tokenguard", "org-1") is False
+        assert worker_b.is_enabled_for("tokenguard", "org-2") is True
+
+    @pytest.mark.asyncio
+    async def test_redis_hit_keeps_remaining_ttl(self, cache):
+        redis = FakeRedis()
+        await redis.setex("cache:guard_verdict:tokenguard:k1", 300, '{"n": 1}')
+        redis.ttls_ms["cache:guard_verdict:tokenguard:k1"] = 5000
+
+        with patch("app.core.guard_verdict_cache.get_cache_client", AsyncMock(return_value=redis)):
+            assert await cache.get("tokenguard", "k1") == {"n": 1}
+
+        expires_at = cache._entries["k1"][0]
+        with patch("app.core.guard_verdict_cache.time.monotonic", return_value=expires_at - 6):
+            assert await cache.get("tokenguard", "k1") == {"n": 1}
+        with patch("app.core.guard_verdict_cache.time.monotonic", return_value=expires_at + 1):
+            assert await cache.get("tokenguard", "k1") is None
+        assert cache.get_stats()["hits_redis"] == 1
+
+    @pytest.mark.asyncio
+    async def test_version_change_invalidates(self, cache):
+        cache.observe_guard_version("tokenguard", "1.0")
+        key = cache.build_key("tokenguard", {"content": "x"})
+        cache.set("tokenguard", key, {"n": 1})
+
+        assert cache.observe_guard_version("tokenguard", "1.1") is True
+        assert await cache.get("tokenguard", key) is None
+        assert cache.build_key("tokenguard", {"content": "x"}) != key
+
+
+@pytest_asyncio.fixture
+async def orchestrator():
+    """Create an initialized orchestrator without network access."""
+    orch = GuardServiceOrchestrator()
+    orch.http_client = AsyncMock()
+    await orch._load_service_configurations()
+    await orch._initialize_circuit_breakers()
+    orch._initialized = True
+    return orch
+
+
+class TestOrchestratorVerdictCache:
+    """Test the cache in front of orchestrate_request."""
+
+    @pytest.mark.asyncio
+    async def test_repeat_scan_served_from_cache(self, orchestrator, cache):
+        route = AsyncMock(return_value={"score": 0.1})
+
+        with patch("app.core.guard_orchestrator.get_guard_verdict_cache", return_value=cache), \
+             patch.object(orchestrator, "_route_request", route):
+            responses = []
+            for request_id in ("req-1", "req-2"):
+                responses.append(await orchestrator.orchestrate_request(OrchestrationRequest(
+                    request_id=request_id,
+                    service_type=GuardServiceType.TOKEN_GUARD,
+                    payload={"text": "same content"}
+                )))
+
+        assert route.await_count == 1
+        assert responses[0].cache_hit is False
+        assert responses[1].cache_hit is True
+        assert responses[1].data == {"score": 0.1}
+
+    @pytest.mark.asyncio
+    async def test_disabled_tenant_bypasses_cache(self, orchestrator, cache):
+        await cache.set_tenant_enabled("org-1", False)
+        route = AsyncMock(return_value={"score": 0.1})
+
+        with patch("app.core.guard_orchestrator.get_guard_verdict_cache", return_value=cache), \
+             patch.object(orchestrator, "_route_request", route):
+            for request_id in ("req-1", "req-2"):
+                await orchestrator.orchestrate_request(OrchestrationRequest(
+                    request_id=request_id,
+                    service_type=GuardServiceType.TOKEN_GUARD,
+                    payload={"text": "same content"},
+                    tenant_id="org-1"
+                ))
+
+        assert route.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_enhanced_payload_sent_upstream(self, orchestrator, cache):
+        route = AsyncMock(return_value={"score": 0.1})
+
+        def enhance(guard_name, payload, session_id=None, user_id=None, context_data=None):
+            return {**payload, "_context": {"session": session_id}}
+
+        with patch("app.core.guard_orchestrator.get_guard_verdict_cache", return_value=cache), \
+             patch("app.core.contextguard_integration.enhance_guard_with_context", enhance), \
+             patch.object(orchestrator, "_route_request", route):
+            await orchestrator.orchestrate_request(OrchestrationRequest(
+                request_id="req-1",
+                service_type=GuardServiceType.TOKEN_GUARD,
+                payload={"text": "same content"},
+                session_id="s1"
+            ))
+
+        assert route.await_args.kwargs["transformed_payload"]["_context"]["session"] == "s1"
+
+    @pytest.mark.asyncio
+    async def test_conversation_memory_does_not_change_key(self, cache):
+        """enhance -> store_guard_context -> enhance must map to the same key."""
+        calls = []
+
+        async def handler(request):
+            calls.append(json.loads(request.content))
+            return httpx.Response(200, json={"score": 0.1})
+
+        orch = GuardServiceOrchestrator()
+        await orch._load_service_configurations()
+        await orch._initialize_circuit_breakers()
+        orch._initialized = True
+        orch.http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+        with patch("app.core.guard_orchestrator.get_guard_verdict_cache", return_value=cache), \
+             patch("app.core.contextguard_integration._contextguard_integration", ContextGuardIntegration()):
+            responses = [
+                await orch.orchestrate_request(OrchestrationRequest(
+                    request_id=request_id,
+                    service_type=GuardServiceType.TOKEN_GUARD,
+                    payload={"text": "same content"},
+                    session_id="s1"
+                ))
+                for request_id in ("req-1", "req-2")
+            ]
+            third = await orch.orchestrate_request(OrchestrationRequest(
+                request_id="req-3",
+                service_type=GuardServiceType.TOKEN_GUARD,
+                payload={"text": "other content"},
+                session_id="s1"
+            ))
+        await orch.http_client.aclose()
+
+        assert [r.cache_hit for r in responses] == [False, True]
+        assert third.cache_hit is False
+        assert len(calls) == 2
+        # The second upstream call carried the memory stored after the first
+        assert calls[1]["context"]["memory_count"] == 1
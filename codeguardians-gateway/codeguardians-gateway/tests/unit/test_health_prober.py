@@ -0,0 +1,227 @@
+"""
+Unit tests for the shared health prober.
+
+Covers jittered per-target scheduling, coalescing of on-demand refreshes,
+the Redis-published snapshot (in-memory stand-in for the asyncio Redis
+client) and the health readers that now serve from the snapshot.
+"""
+
+import asyncio
+import json
+from datetime import datetime
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.core import health_prober
+from app.core.guard_orchestrator import GuardServiceOrchestrator, ServiceHealth, ServiceStatus
+from app.core.health_monitor import ComprehensiveHealthMonitor, HealthStatus
+from app.core.health_prober import HEALTH_SNAPSHOT_KEY, HealthProber
+
+
+class FakeRedis:
+    """Hashes with the commands the prober uses."""
+
+    def __init__(self):
+        self.hashes = {}
+        self.ttls = {}
+
+    async def hset(self, key, field, value):
+        self.hashes.setdefault(key, {})[field] = value
+
+    async def hgetall(self, key):
+        return dict(self.hashes.get(key, {}))
+
+    async def expire(self, key, ttl):
+        self.ttls[key] = ttl
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+
+class FakePipeline:
+    def __init__(self, client):
+        self.client = client
+        self.calls = []
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self.calls.append((name, args, kwargs))
+        return queue
+
+    async def execute(self):
+        return [await getattr(self.client, name)(*args, **kwargs) for name, args, kwargs in self.calls]
+
+
+@pytest.fixture
+def redis_client():
+    client = FakeRedis()
+    with patch.object(health_prober, "get_cache_client", AsyncMock(return_value=client)):
+        yield client
+
+
+def counting_probe(calls, delay=0.0, status=ServiceStatus.HEALTHY):
+    async def probe(name):
+        calls.append(name)
+        await asyncio.sleep(delay)
+        return ServiceHealth(service_name=name, status=status, last_check=datetime.now(), response_time=delay)
+    return probe
+
+
+class TestScheduling:
+    """Test jittered per-target probing."""
+
+    def test_jitter_spreads_interval(self):
+        draws = iter([0.0, 0.5, 1.0])
+        prober = HealthProber(interval=10, jitter=0.2, random_source=lambda: next(draws))
+
+        assert [prober.next_delay(10) for _ in range(3)] == pytest.approx([8.0, 10.0, 12.0])
+
+    @pytest.mark.asyncio
+    async def test_each_target_probed_once_per_interval(self, redis_client):
+        calls = []
+        prober = HealthProber(interval=0.1, jitter=0.0)
+        for name in ("tokenguard", "trustguard", "biasguard"):
+            prober.register(name, counting_probe(calls))
+
+        prober.start()
+        await asyncio.sleep(0.35)
+        await prober.stop()
+
+        for name in ("tokenguard", "trustguard", "biasguard"):
+            assert 3 <= calls.count(name) <= 4
+
+    @pytest.mark.asyncio
+    async def test_first_probes_are_offset_within_interval(self, redis_client):
+        started = {}
+        draws = iter([0.1, 0.9])
+        prober = HealthProber(interval=0.2, jitter=0.0, random_source=lambda: next(draws, 0.5))
+
+        async def probe(name):
+            started.setdefault(name, asyncio.get_running_loop().time())
+        prober.register("tokenguard", probe)
+        prober.register("trustguard", probe)
+
+        prober.start()
+        await asyncio.sleep(0.25)
+        await prober.stop()
+
+        assert started["trustguard"] - started["tokenguard"] >= 0.12
+
+    @pytest.mark.asyncio
+    async def test_failing_probe_keeps_its_schedule(self, redis_client):
+        attempts = []
+        prober = HealthProber(interval=0.05, jitter=0.0)
+
+        async def probe(name):
+            attempts.append(name)
+            raise RuntimeError("connection refused")
+        prober.register("tokenguard", probe)
+
+        prober.start()
+        await asyncio.sleep(0.2)
+        await prober.stop()
+
+        assert len(attempts) >= 3
+        assert prober.stats["probe_errors"] == len(attempts)
+        assert prober.get("tokenguard") is None
+
+
+class TestOnDemand:
+    """Test refreshes triggered by endpoints."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_refreshes_share_one_probe(self, redis_client):
+        calls = []
+        prober = HealthProber(min_refresh_seconds=0)
+        prober.register("tokenguard", counting_probe(calls, delay=0.05))
+
+        results = await asyncio.gather(*[prober.refresh() for _ in range(10)])
+
+        assert calls == ["tokenguard"]
+        assert all(result["tokenguard"] is results[0]["tokenguard"] for result in results)
+        assert prober.stats["coalesced"] == 9
+
+    @pytest.mark.asyncio
+    async def test_recent_result_is_reused(self, redis_client):
+        calls = []
+        prober = HealthProber(min_refresh_seconds=60)
+        prober.register("tokenguard", counting_probe(calls))
+
+        await prober.refresh()
+        await prober.refresh()
+        await prober.refresh(max_age=0)
+
+        assert calls == ["tokenguard", "tokenguard"]
+        assert prober.stats["refresh_reused"] == 1
+
+    @pytest.mark.asyncio
+    async def test_register_keeps_or_replaces_probe(self):
+        prober = HealthProber()
+        first, second = counting_probe([]), counting_probe([])
+
+        assert prober.register("tokenguard", first) is True
+        assert prober.register("tokenguard", first) is False
+        assert prober.register("tokenguard", second, replace=False) is False
+        assert prober.register("tokenguard", second) is True
+
+        assert prober.unregister("tokenguard", probe=first) is False
+        assert prober.unregister("tokenguard", probe=second) is True
+
+
+class TestSnapshot:
+    """Test the published snapshot."""
+
+    @pytest.mark.asyncio
+    async def test_result_published_to_redis(self, redis_client):
+        prober = HealthProber(interval=30)
+        prober.register("tokenguard", counting_probe([]))
+
+        await prober.probe("tokenguard")
+
+        entry = json.loads(redis_client.hashes[HEALTH_SNAPSHOT_KEY]["tokenguard"])
+        assert entry["status"] == "healthy"
+        assert redis_client.ttls[HEALTH_SNAPSHOT_KEY] == 91
+        assert (await prober.shared_snapshot())["tokenguard"]["service_name"] == "tokenguard"
+
+    @pytest.mark.asyncio
+    async def test_snapshot_kept_when_redis_unavailable(self):
+        prober = HealthProber()
+        prober.register("tokenguard", counting_probe([]))
+
+        with patch.object(health_prober, "get_cache_client", AsyncMock(return_value=None)):
+            health = await prober.probe("tokenguard")
+
+        assert prober.snapshot() == {"tokenguard": health}
+
+    @pytest.mark.asyncio
+    async def test_comprehensive_health_served_from_snapshot(self, redis_client):
+        calls = []
+        prober = HealthProber(min_refresh_seconds=60)
+        monitor = ComprehensiveHealthMonitor(prober=prober)
+        monitor.service_monitor.services = {"tokenguard": "http://tokenguard:8000/health"}
+        prober.register("tokenguard", counting_probe(calls, status=ServiceStatus.UNHEALTHY))
+
+        with patch.object(monitor.resource_monitor, "get_system_metrics", return_value={"error": "n/a"}):
+            first = await monitor.get_comprehensive_health()
+            second = await monitor.get_comprehensive_health()
+
+        assert calls == ["tokenguard"]
+        assert second["services"][0]["status"] == HealthStatus.UNHEALTHY.value
+        assert first["alerts"][0]["type"] == "service_down"
+
+    @pytest.mark.asyncio
+    async def test_orchestrator_refresh_goes_through_prober(self, redis_client):
+        prober = HealthProber(min_refresh_seconds=60)
+        orchestrator = GuardServiceOrchestrator()
+        orchestrator.health_prober = prober
+        await orchestrator._load_service_configurations()
+        response = MagicMock(status_code=200, headers={}, content=b"")
+        orchestrator.http_client = AsyncMock()
+        orchestrator.http_client.get.return_value = response
+
+        await asyncio.gather(*[orchestrator.refresh_health_checks() for _ in range(5)])
+
+        assert orchestrator.http_client.get.call_count == len(orchestrator.services)
+        assert prober.snapshot().keys() == orchestrator.services.keys()
+        assert orchestrator.health_status["tokenguard"].status == ServiceStatus.HEALTHY
@@ -0,0 +1,131 @@
+"""
+Unit tests for the hybrid local/Redis rate limiter.
+
+Covers local GCRA decisions, batched reconciliation across replicas, the
+cross-replica error bound and fail-open behaviour when Redis is slow.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from app.core.hybrid_rate_limiter import HybridRateLimiter, TokenBucket
+
+
+class SharedStore:
+    """In-memory stand-in for the Redis reconcile script (shared TAT per key)."""
+
+    def __init__(self):
+        self.tats = {}
+        self.calls = 0
+
+    async def sync(self, increments):
+        self.calls += 1
+        now = time.monotonic()
+        debts = []
+        for key, increment in increments:
+            tat = max(self.tats.get(key, now), now) + increment
+            self.tats[key] = tat
+            debts.append(tat - now)
+        return debts
+
+
+async def no_redis():
+    return None
+
+
+def replica(store, **kwargs):
+    limiter = HybridRateLimiter(redis_factory=no_redis, **kwargs)
+    limiter._redis_sync = store.sync
+    return limiter
+
+
+class TestTokenBucket:
+    """Test the local GCRA bucket."""
+
+    def test_burst_then_denied(self):
+        limiter = HybridRateLimiter()
+        results = [limiter.acquire("client", 3, 60)[0] for _ in range(4)]
+
+        assert results == [True, True, True, False]
+        allowed, info = limiter.acquire("client", 3, 60)
+        assert not allowed
+        assert info["retry_after"] == 20
+
+    def test_refills_with_time(self):
+        bucket = TokenBucket(limit=10, window=10, now=0.0)
+        bucket.unsynced = 10
+        bucket.absorb(10, now=0.0)
+
+        assert bucket.available(0.0) == 0
+        assert bucket.available(2.5) == 2
+        assert bucket.available(20.0) == 10
+
+
+class TestReconciliation:
+    """Test batched syncs across replicas."""
+
+    @pytest.mark.asyncio
+    async def test_replicas_share_the_limit_within_error_bound(self):
+        store = SharedStore()
+        replicas = [replica(store, sync_interval=0.01, error_fraction=0.05) for _ in range(3)]
+
+        admitted = 0
+        for i in range(600):
+            allowed, _ = replicas[i % 3].acquire("user:1", 100, 60)
+            admitted += allowed
+            await asyncio.sleep(0)
+        for limiter in replicas:
+            await limiter.close()
+
+        # Overshoot bounded by replicas * error_fraction * limit (+1 in-flight each)
+        assert 100 <= admitted <= 100 + 3 * 5 + 3
+        assert store.calls < admitted
+
+    @pytest.mark.asyncio
+    async def test_consumption_reported_once(self):
+        store = SharedStore()
+        limiter = replica(store, sync_interval=60)
+        for _ in range(7):
+            limiter.acquire("user:2", 100, 100)
+
+        assert await limiter.sync() == 1
+        assert await limiter.sync() == 0
+        await limiter.close()
+        assert store.tats["user:2"] - time.monotonic() == pytest.approx(7.0, abs=0.1)
+
+
+class TestFailOpen:
+    """Test behaviour when Redis is slow or unavailable."""
+
+    @pytest.mark.asyncio
+    async def test_slow_redis_degrades_to_local_limits(self):
+        async def slow_sync(increments):
+            await asyncio.sleep(1)
+
+        limiter = HybridRateLimiter(redis_factory=no_redis, sync_interval=60, redis_timeout=0.01)
+        limiter._redis_sync = slow_sync
+        for _ in range(5):
+            assert limiter.acquire("user:3", 5, 60)[0]
+
+        assert await limiter.sync() == 0
+        assert limiter.degraded
+        assert limiter.stats["sync_failures"] == 1
+        # Consumption is kept locally: the bucket is still exhausted
+        assert not limiter.acquire("user:3", 5, 60)[0]
+        await limiter.close()
+
+    @pytest.mark.asyncio
+    async def test_redis_errors_never_raise(self):
+        async def broken_sync(increments):
+            raise ConnectionError("redis down")
+
+        limiter = HybridRateLimiter(redis_factory=no_redis, sync_interval=0.01)
+        limiter._redis_sync = broken_sync
+        for _ in range(3):
+            limiter.acquire("user:4", 10, 60)
+            await asyncio.sleep(0.02)
+
+        assert limiter.get_stats()["degraded"]
+        await limiter.close()
@@ -0,0 +1,269 @@
+"""
+Unit tests for the background job queue.
+
+Covers blocking pickup across priority keys, the schedule set for delayed
+jobs and retries, and worker autoscaling (in-memory stand-in for the
+asyncio Redis client).
+"""
+
+import asyncio
+import time
+
+import pytest
+import pytest_asyncio
+
+from app.core.job_queue import JobPriority, JobQueue, JobStatus, _PRIORITY_ORDER
+
+
+class FakeRedis:
+    """Sorted sets, strings, pipelines, BZPOPMIN and the promotion script."""
+
+    def __init__(self):
+        self.strings = {}
+        self.zsets = {}
+        self.changed = asyncio.Condition()
+        self.commands = []
+
+    async def set(self, key, value):
+        self.commands.append("set")
+        self.strings[key] = value
+
+    async def get(self, key):
+        self.commands.append("get")
+        return self.strings.get(key)
+
+    async def zadd(self, key, mapping):
+        self.commands.append("zadd")
+        self.zsets.setdefault(key, {}).update(mapping)
+        async with self.changed:
+            self.changed.notify_all()
+
+    async def zrem(self, key, member):
+        self.commands.append("zrem")
+        return int(self.zsets.get(key, {}).pop(member, None) is not None)
+
+    async def zcard(self, key):
+        self.commands.append("zcard")
+        return len(self.zsets.get(key, {}))
+
+    def _pop(self, keys):
+        for key in keys:
+            zset = self.zsets.get(key)
+            if zset:
+                member = min(zset, key=lambda m: (zset[m], m))
+                return key, member, zset.pop(member)
+        return None
+
+    async def bzpopmin(self, keys, timeout=0):
+        self.commands.append("bzpopmin")
+        deadline = time.monotonic() + timeout
+        async with self.changed:
+            while True:
+                result = self._pop(keys)
+                if result:
+                    return result
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return None
+                try:
+                    await asyncio.wait_for(self.changed.wait(), remaining)
+                except asyncio.TimeoutError:
+                    return None
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    def register_script(self, source):
+        async def promote(keys, args):
+            self.commands.append("evalsha")
+            schedule, ready_keys = self.zsets.setdefault(keys[0], {}), keys[1:]
+            now, limit = float(args[0]), int(args[1])
+            due = sorted((score, member) for member, score in schedule.items() if score <= now)[:limit]
+            for score, member in due:
+                index, job_id = member.split("|", 1)
+                self.zsets.setdefault(ready_keys[int(index)], {})[job_id] = score
+                del schedule[member]
+            if due:
+                async with self.changed:
+                    self.changed.notify_all()
+            return [len(due), str(min(schedule.values())) if schedule else ""]
+        return promote
+
+
+class FakePipeline:
+    def __init__(self, client):
+        self.client = client
+        self.calls = []
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self.calls.append((name, args, kwargs))
+        return queue
+
+    async def execute(self):
+        return [await getattr(self.client, name)(*args, **kwargs) for name, args, kwargs in self.calls]
+
+
+@pytest_asyncio.fixture
+async def queue():
+    job_queue = JobQueue(
+        FakeRedis(), block_timeout=0.2, scale_interval=3600, scheduler_max_sleep=0.5, retry_base_delay=0.05
+    )
+    yield job_queue
+    await job_queue.stop_workers()
+
+
+def recorder(log):
+    async def handler(job):
+        log.append((job.payload.get("n"), time.monotonic()))
+    return handler
+
+
+class TestBlockingPickup:
+    """Test BZPOPMIN-based dequeue."""
+
+    @pytest.mark.asyncio
+    async def test_idle_worker_picks_up_job_immediately(self, queue):
+        log = []
+        await queue.register_handler("work", recorder(log))
+        await queue.start_workers(num_workers=1)
+        await asyncio.sleep(0.05)  # Worker is now blocked in BZPOPMIN
+
+        enqueued = time.monotonic()
+        await queue.enqueue_job("work", {"n": 1})
+        while not log:
+            await asyncio.sleep(0.0005)
+
+        assert log[0][1] - enqueued < 0.01
+        assert queue.stats["last_pickup_seconds"] < 0.01
+
+    @pytest.mark.asyncio
+    async def test_priority_order_then_fifo(self, queue):
+        log = []
+        await queue.register_handler("work", recorder(log))
+        await queue.enqueue_job("work", {"n": "low"}, priority=JobPriority.LOW)
+        await queue.enqueue_job("work", {"n": "normal-1"})
+        await queue.enqueue_job("work", {"n": "normal-2"})
+        await queue.enqueue_job("work", {"n": "critical"}, priority=JobPriority.CRITICAL)
+
+        await queue.start_workers(num_workers=1)
+        while len(log) < 4:
+            await asyncio.sleep(0.005)
+
+        assert [n for n, _ in log] == ["critical", "normal-1", "normal-2", "low"]
+
+    @pytest.mark.asyncio
+    async def test_idle_workers_do_not_poll(self, queue):
+        await queue.start_workers(num_workers=2)
+        await asyncio.sleep(0.05)
+        queue.redis.commands.clear()
+
+        await asyncio.sleep(0.5)
+
+        # Each worker re-issues one blocking call per block_timeout, nothing else
+        assert set(queue.redis.commands) <= {"bzpopmin", "evalsha"}
+        assert queue.redis.commands.count("bzpopmin") <= 2 * (0.5 / 0.2 + 1)
+
+
+class TestScheduling:
+    """Test the schedule set for delayed jobs and retries."""
+
+    @pytest.mark.asyncio
+    async def test_delayed_job_waits_until_due(self, queue):
+        log = []
+        await queue.register_handler("work", recorder(log))
+        await queue.start_workers(num_workers=1)
+
+        enqueued = time.monotonic()
+        job_id = await queue.enqueue_job("work", {"n": 1}, delay_seconds=0.15)
+        await asyncio.sleep(0.05)
+        assert log == []
+        assert "queue:default:delayed" in queue.redis.zsets
+
+        while not log:
+            await asyncio.sleep(0.005)
+        assert 0.15 <= log[0][1] - enqueued < 0.3
+        assert (await queue.get_job_status(job_id)).status == JobStatus.COMPLETED
+
+    @pytest.mark.asyncio
+    async def test_retry_is_delayed_with_backoff(self, queue):
+        attempts = []
+
+        async def flaky(job):
+            attempts.append(time.monotonic())
+            if len(attempts) < 3:
+                raise RuntimeError("transient")
+
+        await queue.register_handler("flaky", flaky)
+        await queue.start_workers(num_workers=2)
+        job_id = await queue.enqueue_job("flaky")
+
+        while len(attempts) < 3:
+            await asyncio.sleep(0.005)
+        await asyncio.sleep(0.02)
+
+        # Backoff: 0.05 * 2^1 then 0.05 * 2^2 seconds
+        assert attempts[1] - attempts[0] >= 0.1
+        assert attempts[2] - attempts[1] >= 0.2
+        job = await queue.get_job_status(job_id)
+        assert job.status == JobStatus.COMPLETED
+        assert job.retry_count == 2
+
+    @pytest.mark.asyncio
+    async def test_cancel_removes_scheduled_job(self, queue):
+        job_id = await queue.enqueue_job("work", delay_seconds=60)
+
+        assert await queue.cancel_job(job_id)
+        assert queue.redis.zsets["queue:default:delayed"] == {}
+
+
+class TestAutoscaling:
+    """Test worker pool sizing."""
+
+    @pytest.mark.asyncio
+    async def test_scales_up_on_backlog_and_down_when_idle(self, queue):
+        release = asyncio.Event()
+
+        async def slow(job):
+            await release.wait()
+
+        await queue.register_handler("slow", slow)
+        await queue.start_workers(num_workers=1, min_workers=1, max_workers=4)
+        for _ in range(10):
+            await queue.enqueue_job("slow")
+        await asyncio.sleep(0.02)
+
+        assert await queue._autoscale() == 2
+        await asyncio.sleep(0.02)
+        assert await queue._autoscale() == 4
+        await asyncio.sleep(0.02)
+        assert await queue._autoscale() == 4
+        assert queue.get_worker_stats()["busy_workers"] == 4
+
+        release.set()
+        while await queue.get_queue_depth() or queue._busy_workers:
+            await asyncio.sleep(0.01)
+        for _ in range(4):
+            await queue._autoscale()
+        await asyncio.sleep(0.5)
+
+        assert len(queue._workers) == 1
+
+    def test_desired_workers(self):
+        queue = JobQueue(target_pickup_seconds=0.5)
+        queue.min_workers, queue.max_workers = 1, 8
+
+        queue._busy_workers = 2
+        assert queue._desired_workers(2, 5, 0.0) == 4
+        assert queue._desired_workers(4, 1, 0.0) == 4
+        queue._busy_workers = 1
+        assert queue._desired_workers(2, 0, 1.0) == 3
+        assert queue._desired_workers(2, 0, 0.0) == 1
+        assert queue._desired_workers(8, 3, 0.0) == 8
+
+    def test_ready_keys_in_priority_order(self):
+        keys = JobQueue()._ready_keys(["default", "analytics"])
+
+        assert keys[:2] == ["queue:default:critical", "queue:analytics:critical"]
+        assert keys[-1] == "queue:analytics:low"
+        assert len(keys) == 2 * len(_PRIORITY_ORDER)
@@ -0,0 +1,193 @@
+"""
+Unit tests for the Clerk JWKS key ring and verified-token cache.
+
+Covers single-flight fetches, background refresh ahead of expiry, key
+rotation, retries, stale keys on failure and the cached verification hot path.
+"""
+
+import asyncio
+import time
+from types import SimpleNamespace
+
+import httpx
+import jwt
+import pytest
+from cryptography.hazmat.primitives.asymmetric import rsa
+from unittest.mock import patch
+
+from app.core import clerk_integration
+from app.core.clerk_jwks_cache import JWKSKeyRing, VerifiedTokenCache
+from app.core.exceptions import ClerkJWKSFetchError, ClerkTokenError
+
+ISSUER_HOST = "clerk.example.com"
+JWKS_URL = f"https://{ISSUER_HOST}/.well-known/jwks.json"
+PRIVATE_KEY = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+
+def jwks_document(*kids):
+    keys = []
+    for kid in kids:
+        jwk = jwt.algorithms.RSAAlgorithm.to_jwk(PRIVATE_KEY.public_key(), as_dict=True)
+        keys.append({**jwk, "kid": kid, "alg": "RS256", "use": "sig"})
+    return {"keys": keys}
+
+
+def make_token(kid="k1", **claims):
+    now = int(time.time())
+    payload = {"sub": "user_1", "iat": now, "exp": now + 300, "iss": f"https://{ISSUER_HOST}",
+               "azp": ISSUER_HOST, **claims}
+    return jwt.encode(payload, PRIVATE_KEY, algorithm="RS256", headers={"kid": kid})
+
+
+class FakeJWKS:
+    """JWKS endpoint served through httpx.MockTransport."""
+
+    def __init__(self, *kids, delay=0.0):
+        self.kids = kids
+        self.delay = delay
+        self.fail = False
+        self.connect_errors = 0
+        self.requests = 0
+
+    async def handler(self, request):
+        self.requests += 1
+        await asyncio.sleep(self.delay)
+        if self.connect_errors:
+            self.connect_errors -= 1
+            raise httpx.ConnectError("connection refused", request=request)
+        if self.fail:
+            return httpx.Response(503)
+        return httpx.Response(200, json=jwks_document(*self.kids))
+
+    def key_ring(self, **kwargs):
+        key_ring = JWKSKeyRing(JWKS_URL, retry_delay=0, **kwargs)
+        key_ring._client = httpx.AsyncClient(transport=httpx.MockTransport(self.handler))
+        return key_ring
+
+
+class TestKeyRing:
+    """Test fetching, refreshing and rotating keys."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_cold_lookups_share_one_fetch(self):
+        server = FakeJWKS("k1", delay=0.01)
+        key_ring = server.key_ring()
+
+        keys = await asyncio.gather(*(key_ring.get_key("k1") for _ in range(20)))
+
+        assert server.requests == 1
+        assert all(key is keys[0] for key in keys)
+        await key_ring.close()
+
+    @pytest.mark.asyncio
+    async def test_refreshes_in_background_before_expiry(self):
+        server = FakeJWKS("k1")
+        key_ring = server.key_ring(ttl=100, refresh_ahead=10, min_refresh_interval=0)
+        await key_ring.get_key("k1")
+        key_ring.fetched_at -= 95
+
+        await key_ring.get_key("k1")
+        assert server.requests == 1  # Served without waiting for the network
+        await key_ring._background
+
+        assert server.requests == 2
+        assert key_ring._age() < 1
+        await key_ring.close()
+
+    @pytest.mark.asyncio
+    async def test_unknown_kid_refresh_is_rate_limited(self):
+        server = FakeJWKS("k1")
+        key_ring = server.key_ring(min_refresh_interval=60)
+        await key_ring.get_key("k1")
+        key_ring.attempted_at -= 60
+        server.kids = ("k1", "k2")
+
+        assert await key_ring.get_key("k2") is not None
+        with pytest.raises(ClerkTokenError):
+            await key_ring.get_key("k3")
+
+        assert server.requests == 2
+        await key_ring.close()
+
+    @pytest.mark.asyncio
+    async def test_stale_keys_served_when_refresh_fails(self):
+        server = FakeJWKS("k1")
+        key_ring = server.key_ring(ttl=100, min_refresh_interval=0)
+        await key_ring.get_key("k1")
+        key_ring.fetched_at -= 200
+        server.fail = True
+
+        assert await key_ring.get_key("k1") is not None
+        assert key_ring.stats["fetch_failures"] == 1
+        await key_ring.close()
+
+    @pytest.mark.asyncio
+    async def test_connection_errors_are_retried(self):
+        server = FakeJWKS("k1")
+        server.connect_errors = 1
+        key_ring = server.key_ring()
+
+        assert await key_ring.get_key("k1") is not None
+        assert server.requests == 2
+        await key_ring.close()
+
+    @pytest.mark.asyncio
+    async def test_no_keys_raises_fetch_error(self):
+        server = FakeJWKS("k1")
+        server.fail = True
+        key_ring = server.key_ring()
+
+        with pytest.raises(ClerkJWKSFetchError):
+            await key_ring.get_key("k1")
+        await key_ring.close()
+
+
+class TestVerifiedTokenCache:
+    """Test the verified-token LRU."""
+
+    def test_entries_expire_and_follow_key_rotation(self):
+        cache = VerifiedTokenCache(max_entries=2)
+        cache.put("a", {"exp": time.time() - 1}, "k1")
+        cache.put("b", {"exp": time.time() + 60}, "k1")
+        cache.put("c", {"exp": time.time() + 60}, "k2")
+
+        assert cache.get("a") is None
+        assert cache.get("b")["exp"] > time.time()
+        cache.retain_kids({"k2"})
+        assert cache.get("b") is None
+        assert cache.get("c") is not None
+
+
+class TestVerifyClerkToken:
+    """Test the verification hot path."""
+
+    @pytest.fixture
+    def server(self):
+        server = FakeJWKS("k1")
+        key_ring = server.key_ring()
+        settings = SimpleNamespace(CLERK_PUBLISHABLE_KEY=ISSUER_HOST)
+        with patch.object(clerk_integration, "settings", settings), \
+                patch.object(clerk_integration, "get_jwks_key_ring", return_value=key_ring):
+            yield server
+
+    @pytest.mark.asyncio
+    async def test_repeat_token_skips_signature_check(self, server):
+        token = make_token()
+
+        first = await clerk_integration.verify_clerk_token(token)
+        with patch.object(clerk_integration.jwt, "decode", side_effect=AssertionError("decoded again")):
+            second = await clerk_integration.verify_clerk_token(token)
+
+        assert first == second
+        assert first["sub"] == "user_1"
+        assert server.requests == 1
+
+    @pytest.mark.asyncio
+    async def test_cached_signature_not_reused_for_other_claims(self, server):
+        token = make_token()
+        await clerk_integration.verify_clerk_token(token)
+        header, _, signature = token.split(".")
+        forged_body = make_token(sub="admin").split(".")[1]
+
+        with pytest.raises(ClerkTokenError):
+            await clerk_integration.verify_clerk_token(f"{header}.{forged_body}.{signature}")
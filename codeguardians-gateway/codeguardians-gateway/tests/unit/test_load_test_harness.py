@@ -0,0 +1,126 @@
+"""
+Unit tests for the gateway load-test harness.
+
+Covers latency statistics, the mock guard servers' latency and error
+injection, per-guard profile overrides, and baseline regression detection.
+"""
+
+import time
+
+import httpx
+import pytest
+import pytest_asyncio
+
+from benchmarks.load_test import compare_to_baseline, parse_guard_profile, percentile, summarize
+from benchmarks.mock_guards import GuardProfile, MockGuardServer
+
+
+@pytest_asyncio.fixture
+async def guard_server():
+    """Start mock guard servers on ephemeral ports; stopped after the test."""
+    servers = []
+
+    async def start(profile: GuardProfile) -> MockGuardServer:
+        server = MockGuardServer(profile, seed=1)
+        await server.start()
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        await server.stop()
+
+
+def scenario(throughput=100.0, p99=50.0, cpu=2.0, endpoint="/api/v1/scan", concurrency=8):
+    return {
+        "endpoint": endpoint,
+        "concurrency": concurrency,
+        "throughput_rps": throughput,
+        "latency_ms": {"p99": p99},
+        "cpu_ms_per_request": cpu
+    }
+
+
+class TestStatistics:
+    """Test percentile and scenario summaries."""
+
+    def test_nearest_rank_percentiles(self):
+        values = [float(n) for n in range(1, 1001)]
+
+        assert percentile(values, 50) == 500
+        assert percentile(values, 99) == 990
+        assert percentile(values, 99.9) == 999
+        assert percentile(values, 100) == 1000
+        assert percentile([], 99) == 0.0
+
+    def test_summarize(self):
+        summary = summarize([10.0, 20.0, 30.0, 40.0], [200, 200, 500, 200], elapsed=2.0, cpu_seconds=0.02)
+
+        assert summary["requests"] == 4
+        assert summary["throughput_rps"] == 2.0
+        assert summary["latency_ms"]["p50"] == 20.0
+        assert summary["latency_ms"]["mean"] == 25.0
+        assert summary["error_rate"] == 0.25
+        assert summary["status_codes"] == {"200": 3, "500": 1}
+        assert summary["cpu_ms_per_request"] == 5.0
+
+
+class TestMockGuards:
+    """Test mock guard latency, errors and health."""
+
+    @pytest.mark.asyncio
+    async def test_latency_is_applied_over_keep_alive(self, guard_server):
+        server = await guard_server(GuardProfile("tokenguard", latency_ms=50, latency_sigma=0))
+
+        async with httpx.AsyncClient(base_url=server.url) as client:
+            start = time.perf_counter()
+            first = await client.post("/scan", json={"content": "hello"})
+            second = await client.post("/scan", json={"content": "again"})
+            elapsed = time.perf_counter() - start
+
+        assert first.status_code == second.status_code == 200
+        assert first.json()["confidence"] == 0.95
+        assert elapsed >= 0.1
+        assert server.stats == {"requests": 2, "errors": 0}
+
+    @pytest.mark.asyncio
+    async def test_error_rate_and_health(self, guard_server):
+        server = await guard_server(GuardProfile("biasguard", latency_ms=0, latency_sigma=0, error_rate=1.0))
+
+        async with httpx.AsyncClient(base_url=server.url) as client:
+            failed = await client.post("/process", json={"text": "hello"})
+            health = await client.get("/health")
+
+        assert failed.status_code == 500
+        assert health.status_code == 200
+        assert health.json()["status"] == "healthy"
+        assert server.stats == {"requests": 1, "errors": 1}
+
+    def test_profile_override(self):
+        base = GuardProfile("default", latency_ms=20, latency_sigma=0.5, error_rate=0.0)
+
+        profile = parse_guard_profile("BiasGuard:latency=80,errors=0.02", base)
+
+        assert (profile.name, profile.latency_ms, profile.latency_sigma, profile.error_rate) == ("biasguard", 80, 0.5, 0.02)
+        with pytest.raises(ValueError):
+            parse_guard_profile("biasguard:jitter=1", base)
+
+
+class TestBaselineComparison:
+    """Test regression detection against a saved baseline."""
+
+    def test_regressions_beyond_threshold(self):
+        baseline = {"scenarios": [scenario()]}
+        results = {"scenarios": [scenario(throughput=85.0, p99=60.0, cpu=2.1)]}
+
+        regressions = compare_to_baseline(results, baseline, threshold=0.10)
+
+        assert len(regressions) == 2
+        assert regressions[0].startswith("/api/v1/scan @ 8: throughput_rps")
+        assert "p99 latency_ms" in regressions[1]
+
+    def test_improvements_and_unknown_scenarios_pass(self):
+        baseline = {"scenarios": [scenario()]}
+        results = {"scenarios": [scenario(throughput=150.0, p99=30.0, cpu=1.0), scenario(concurrency=64, p99=500.0)]}
+
+        assert compare_to_baseline(results, baseline, threshold=0.10) == []
@@ -0,0 +1,185 @@
+"""
+Unit tests for hedged guard requests.
+
+Covers the latency percentile, hedge budget, first-success selection and
+hedging through GuardServiceOrchestrator._route_request.
+"""
+
+import asyncio
+import httpx
+import pytest
+import pytest_asyncio
+from unittest.mock import AsyncMock, patch
+
+from app.core.guard_orchestrator import (
+    GuardServiceOrchestrator,
+    GuardServiceType,
+    OrchestrationRequest
+)
+from app.core.request_hedging import HedgeBudget, LatencyTracker, RequestHedger
+
+
+def warmed_hedger(service_name="tokenguard", latency=0.01, **kwargs):
+    hedger = RequestHedger(enabled=True, min_samples=5, **kwargs)
+    for _ in range(5):
+        hedger._tracker(service_name).record(latency)
+    return hedger
+
+
+def delayed(result, delay):
+    async def call():
+        await asyncio.sleep(delay)
+        if isinstance(result, Exception):
+            raise result
+        return result
+    return call
+
+
+class TestLatencyTracking:
+    """Test percentile and budget bookkeeping."""
+
+    def test_no_percentile_before_min_samples(self):
+        tracker = LatencyTracker(min_samples=5)
+        for _ in range(4):
+            tracker.record(0.1)
+        assert tracker.p95() is None
+        tracker.record(0.1)
+        assert tracker.p95() == pytest.approx(0.1)
+
+    def test_budget_caps_hedge_share(self):
+        budget = HedgeBudget(budget_percent=10)
+        hedges = 0
+        for _ in range(100):
+            budget.earn()
+            hedges += budget.try_spend()
+        assert hedges == 10
+
+
+class TestHedger:
+    """Test hedging decisions."""
+
+    @pytest.mark.asyncio
+    async def test_slow_primary_is_hedged_and_hedge_wins(self):
+        hedger = warmed_hedger(budget_percent=100)
+
+        result = await hedger.run("tokenguard", delayed("primary", 0.5), delayed("hedge", 0.01))
+
+        stats = hedger.get_stats()["guards"]["tokenguard"]
+        assert result == "hedge"
+        assert stats["hedged"] == 1
+        assert stats["win_rate"] == 1.0
+
+    @pytest.mark.asyncio
+    async def test_fast_primary_not_hedged(self):
+        hedger = warmed_hedger(latency=0.2, budget_percent=100)
+        hedge = AsyncMock(return_value="hedge")
+
+        result = await hedger.run("tokenguard", delayed("primary", 0.0), hedge)
+
+        assert result == "primary"
+        assert hedge.await_count == 0
+
+    @pytest.mark.asyncio
+    async def test_exhausted_budget_waits_for_primary(self):
+        hedger = warmed_hedger(budget_percent=0)
+        hedge = AsyncMock(return_value="hedge")
+
+        result = await hedger.run("tokenguard", delayed("primary", 0.05), hedge)
+
+        assert result == "primary"
+        assert hedge.await_count == 0
+
+    @pytest.mark.asyncio
+    async def test_failed_hedge_does_not_win(self):
+        hedger = warmed_hedger(budget_percent=100)
+
+        result = await hedger.run(
+            "tokenguard", delayed("primary", 0.1), delayed(RuntimeError("replica down"), 0.0)
+        )
+
+        assert result == "primary"
+        assert hedger.get_stats()["guards"]["tokenguard"]["hedge_wins"] == 0
+
+    @pytest.mark.asyncio
+    async def test_fast_error_result_does_not_win(self):
+        hedger = warmed_hedger(budget_percent=100)
+
+        result = await hedger.run(
+            "tokenguard",
+            delayed("primary", 0.1),
+            delayed("overloaded", 0.0),
+            is_success=lambda value: value != "overloaded"
+        )
+
+        assert result == "primary"
+        assert hedger.get_stats()["guards"]["tokenguard"]["hedge_wins"] == 0
+
+    @pytest.mark.asyncio
+    async def test_disabled_hedger_never_hedges(self):
+        hedger = RequestHedger(enabled=False, min_samples=1)
+        hedger._tracker("tokenguard").record(0.001)
+        hedge = AsyncMock(return_value="hedge")
+
+        result = await hedger.run("tokenguard", delayed("primary", 0.05), hedge)
+
+        assert result == "primary"
+        assert hedge.await_count == 0
+
+
+@pytest_asyncio.fixture
+async def orchestrator():
+    """Orchestrator whose guards answer through an in-memory transport."""
+    async def handler(request):
+        if request.url.host == "slow-replica":
+            await asyncio.sleep(0.5)
+        if request.url.host == "failing-replica":
+            return httpx.Response(503, json={"detail": "overloaded"})
+        return httpx.Response(200, json={"served_by": request.url.host})
+
+    orch = GuardServiceOrchestrator()
+    await orch._load_service_configurations()
+    orch.http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    yield orch
+    await orch.http_client.aclose()
+
+
+class TestOrchestratorHedging:
+    """Test hedging in _route_request."""
+
+    @pytest.mark.asyncio
+    async def test_slow_replica_hedged_to_other_instance(self, orchestrator):
+        config = orchestrator.services["tokenguard"]
+        config.base_url = "http://slow-replica:8000"
+        config.replica_urls = ["http://fast-replica:8000"]
+        hedger = warmed_hedger(budget_percent=100)
+
+        with patch("app.core.guard_orchestrator.get_request_hedger", return_value=hedger):
+            result = await orchestrator._route_request(OrchestrationRequest(
+                request_id="hedge-1",
+                service_type=GuardServiceType.TOKEN_GUARD,
+                payload={"text": "x"}
+            ))
+
+        assert result["served_by"] == "fast-replica"
+
+    @pytest.mark.asyncio
+    async def test_fast_5xx_from_replica_does_not_win(self, orchestrator):
+        config = orchestrator.services["tokenguard"]
+        config.base_url = "http://slow-replica:8000"
+        config.replica_urls = ["http://failing-replica:8000"]
+        hedger = warmed_hedger(budget_percent=100)
+
+        with patch("app.core.guard_orchestrator.get_request_hedger", return_value=hedger):
+            result = await orchestrator._route_request(OrchestrationRequest(
+                request_id="hedge-2",
+                service_type=GuardServiceType.TOKEN_GUARD,
+                payload={"text": "x"}
+            ))
+
+        assert result["served_by"] == "slow-replica"
+
+    def test_no_hedge_target_without_replicas(self, orchestrator):
+        config = orchestrator.services["tokenguard"]
+        config.replica_urls = [config.base_url]
+
+        assert orchestrator._hedge_target(config, "/scan") is None
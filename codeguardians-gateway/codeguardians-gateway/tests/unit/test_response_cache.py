@@ -0,0 +1,226 @@
+"""
+Unit tests for response cache invalidation.
+
+Covers tag sets, generation counters, the SCAN/UNLINK sweep that replaces
+KEYS, and stale-while-revalidate in cache_response (in-memory stand-in for
+the asyncio Redis client).
+"""
+
+import asyncio
+import fnmatch
+import json
+
+import pytest
+from unittest.mock import patch
+
+from app.core import response_cache
+from app.core.response_cache import (
+    bump_cache_generation,
+    cache_response,
+    invalidate_cache,
+    invalidate_cache_tags,
+)
+
+
+class FakeRedis:
+    """Strings, sets and counters with the commands the cache uses."""
+
+    def __init__(self):
+        self.data = {}
+        self.ttls = {}
+        self.unlink_calls = []
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def mget(self, keys):
+        return [self.data.get(key) for key in keys]
+
+    async def setex(self, key, ttl, value):
+        self.data[key] = value
+        self.ttls[key] = ttl
+
+    async def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.data:
+            return None
+        self.data[key] = value
+        return True
+
+    async def delete(self, *keys):
+        return sum(self.data.pop(key, None) is not None for key in keys)
+
+    async def unlink(self, *keys):
+        self.unlink_calls.append(len(keys))
+        return await self.delete(*keys)
+
+    async def incr(self, key):
+        self.data[key] = str(int(self.data.get(key, 0)) + 1)
+        return int(self.data[key])
+
+    async def sadd(self, key, *members):
+        self.data.setdefault(key, set()).update(members)
+
+    async def expire(self, key, ttl, nx=False, gt=False):
+        current = self.ttls.get(key)
+        if (nx and current is not None) or (gt and (current is None or ttl <= current)):
+            return False
+        self.ttls[key] = ttl
+        return True
+
+    async def keys(self, pattern):
+        raise AssertionError("KEYS must not be used")
+
+    async def scan_iter(self, match=None, count=None):
+        for key in list(self.data):
+            if fnmatch.fnmatch(key, match):
+                yield key
+
+    async def sscan_iter(self, name, count=None):
+        for member in list(self.data.get(name, ())):
+            yield member
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+
+class FakePipeline:
+    def __init__(self, client):
+        self.client = client
+        self.calls = []
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self.calls.append((name, args, kwargs))
+        return queue
+
+    async def execute(self):
+        return [await getattr(self.client, name)(*args, **kwargs) for name, args, kwargs in self.calls]
+
+
+@pytest.fixture
+def redis_client():
+    client = FakeRedis()
+    with patch.object(response_cache, "_cache_client", client):
+        yield client
+
+
+def counting_endpoint(calls, **decorator_args):
+    @cache_response(ttl=60, key_params=["organization_id", "guard"], **decorator_args)
+    async def endpoint(organization_id=None, guard=None):
+        calls.append((organization_id, guard))
+        return {"org": organization_id, "guard": guard, "n": len(calls)}
+    return endpoint
+
+
+class TestInvalidation:
+    """Test tag, generation and pattern invalidation."""
+
+    @pytest.mark.asyncio
+    async def test_pattern_invalidation_scans_and_unlinks_in_batches(self, redis_client):
+        for i in range(12):
+            await redis_client.setex(f"cache:response:{i}", 60, "{}")
+        await redis_client.setex("other:key", 60, "{}")
+
+        with patch.object(response_cache, "_SWEEP_BATCH_SIZE", 5):
+            removed = await invalidate_cache("cache:response:*")
+
+        assert removed == 12
+        assert redis_client.unlink_calls == [5, 5, 2]
+        assert list(redis_client.data) == ["other:key"]
+
+    @pytest.mark.asyncio
+    async def test_tag_invalidation_removes_only_tagged_entries(self, redis_client):
+        calls = []
+        endpoint = counting_endpoint(calls, tags=["tenant:{organization_id}", "guard:{guard}"])
+
+        await endpoint(organization_id=1, guard="tokenguard")
+        await endpoint(organization_id=2, guard="tokenguard")
+        await endpoint(organization_id=1, guard="tokenguard")
+        assert len(calls) == 2
+
+        assert await invalidate_cache_tags("tenant:1") == 1
+        await endpoint(organization_id=1, guard="tokenguard")
+        await endpoint(organization_id=2, guard="tokenguard")
+        assert calls == [(1, "tokenguard"), (2, "tokenguard"), (1, "tokenguard")]
+
+        assert await invalidate_cache_tags("guard:tokenguard") == 2
+        assert "cache:tag:guard:tokenguard" not in redis_client.data
+
+    @pytest.mark.asyncio
+    async def test_entries_are_tagged_with_endpoint(self, redis_client):
+        calls = []
+        endpoint = counting_endpoint(calls)
+        await endpoint(organization_id=1)
+
+        tag_keys = [key for key in redis_client.data if key.startswith("cache:tag:endpoint:")]
+        assert len(tag_keys) == 1
+        assert redis_client.ttls[tag_keys[0]] == 60
+
+    @pytest.mark.asyncio
+    async def test_generation_bump_makes_entries_miss(self, redis_client):
+        calls = []
+        endpoint = counting_endpoint(calls, generation_tags=["tenant:{organization_id}"])
+
+        await endpoint(organization_id=1)
+        await endpoint(organization_id=1)
+        await endpoint(organization_id=2)
+        assert len(calls) == 2
+
+        assert await bump_cache_generation("tenant:1") == {"tenant:1": 1}
+        await endpoint(organization_id=1)
+        await endpoint(organization_id=2)
+        assert calls == [(1, None), (2, None), (1, None)]
+
+        await endpoint(organization_id=1)
+        assert len(calls) == 3
+
+
+class TestStaleWhileRevalidate:
+    """Test background refresh of stale entries."""
+
+    @staticmethod
+    def expire_freshness(redis_client):
+        for key, value in redis_client.data.items():
+            if key.startswith("cache:response:"):
+                entry = json.loads(value)
+                entry["fresh_until"] = 0
+                redis_client.data[key] = json.dumps(entry)
+
+    @pytest.mark.asyncio
+    async def test_stale_entry_served_and_refreshed_once(self, redis_client):
+        calls = []
+        endpoint = counting_endpoint(calls, stale_ttl=120)
+        first = await endpoint(organization_id=1)
+        assert redis_client.ttls[next(k for k in redis_client.data if k.startswith("cache:response:"))] == 180
+
+        self.expire_freshness(redis_client)
+        results = await asyncio.gather(*[endpoint(organization_id=1) for _ in range(20)])
+        assert all(result == first for result in results)
+
+        await asyncio.gather(*response_cache._refresh_tasks)
+        assert len(calls) == 2
+        assert (await endpoint(organization_id=1))["n"] == 2
+        assert not response_cache._refreshing
+
+    @pytest.mark.asyncio
+    async def test_stale_entry_without_swr_is_recomputed(self, redis_client):
+        calls = []
+        endpoint = counting_endpoint(calls)
+        await endpoint(organization_id=1)
+
+        self.expire_freshness(redis_client)
+        assert (await endpoint(organization_id=1))["n"] == 2
+
+    @pytest.mark.asyncio
+    async def test_refresh_skipped_when_another_replica_holds_lock(self, redis_client):
+        calls = []
+        endpoint = counting_endpoint(calls, stale_ttl=120)
+        await endpoint(organization_id=1)
+        self.expire_freshness(redis_client)
+        cache_key = next(k for k in redis_client.data if k.startswith("cache:response:"))
+        await redis_client.set(f"cache:refresh:{cache_key}", "1")
+
+        await endpoint(organization_id=1)
+        await asyncio.gather(*response_cache._refresh_tasks)
+
+        assert len(calls) == 1
@@ -0,0 +1,289 @@
+"""
+Unit tests for streaming S3 uploads and ranged downloads.
+
+S3 is replaced by an in-memory stand-in that implements the boto3 calls
+the service uses (single PUT, multipart upload, ranged GET, HEAD).
+"""
+
+import io
+from types import SimpleNamespace
+
+import pytest
+from botocore.exceptions import ClientError
+
+from app.core.exceptions import FileUploadError
+from app.services.s3_service import MIN_PART_SIZE, S3Service, iter_bytes, parse_byte_range
+
+MB = 1024 * 1024
+
+
+class FakeBody:
+    """StreamingBody stand-in."""
+
+    def __init__(self, data: bytes):
+        self._stream = io.BytesIO(data)
+        self.closed = False
+
+    def read(self, size: int = -1) -> bytes:
+        return self._stream.read(size)
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class FakeS3Client:
+    """In-memory S3 implementing the calls S3Service makes."""
+
+    def __init__(self):
+        self.objects = {}
+        self.uploads = {}
+        self.part_sizes = []
+        self.aborted = []
+        self.bodies = []
+
+    def put_object(self, Bucket, Key, Body, Metadata=None, ContentType=None):
+        self.objects[Key] = (Body, ContentType, Metadata or {})
+        return {"ETag": '"put"'}
+
+    def create_multipart_upload(self, Bucket, Key, Metadata=None, ContentType=None):
+        upload_id = f"upload-{len(self.uploads) + 1}"
+        self.uploads[upload_id] = {"key": Key, "parts": {}, "type": ContentType, "metadata": Metadata or {}}
+        return {"UploadId": upload_id}
+
+    def upload_part(self, Bucket, Key, UploadId, PartNumber, Body):
+        self.uploads[UploadId]["parts"][PartNumber] = Body
+        self.part_sizes.append(len(Body))
+        return {"ETag": f'"part-{PartNumber}"'}
+
+    def complete_multipart_upload(self, Bucket, Key, UploadId, MultipartUpload):
+        upload = self.uploads.pop(UploadId)
+        numbers = [part["PartNumber"] for part in MultipartUpload["Parts"]]
+        assert numbers == sorted(upload["parts"])
+        for number in numbers[:-1]:
+            assert len(upload["parts"][number]) >= MIN_PART_SIZE
+        body = b"".join(upload["parts"][number] for number in numbers)
+        self.objects[Key] = (body, upload["type"], upload["metadata"])
+        return {"ETag": f'"multi-{len(numbers)}"'}
+
+    def abort_multipart_upload(self, Bucket, Key, UploadId):
+        self.uploads.pop(UploadId)
+        self.aborted.append(UploadId)
+
+    def get_object(self, Bucket, Key, Range=None):
+        if Key not in self.objects:
+            raise ClientError({"Error": {"Code": "NoSuchKey"}}, "GetObject")
+        data = self.objects[Key][0]
+        if Range:
+            start, end = Range[len("bytes="):].split("-")
+            data = data[int(start):int(end) + 1]
+        body = FakeBody(data)
+        self.bodies.append(body)
+        return {"Body": body, "ContentLength": len(data)}
+
+
+def make_service(client=None, local_dir=None, max_file_size=64 * MB) -> S3Service:
+    service = S3Service.__new__(S3Service)
+    service.settings = SimpleNamespace(
+        MAX_FILE_SIZE=max_file_size,
+        ALLOWED_FILE_TYPES=["application/octet-stream", "application/pdf"],
+        S3_ENDPOINT_URL=None,
+        S3_BUCKET_NAME="bucket",
+        S3_REGION="us-east-1",
+    )
+    service._client = client
+    service._bucket_name = "bucket"
+    service._use_local_fallback = local_dir is not None
+    service._local_upload_dir = str(local_dir) if local_dir is not None else None
+    return service
+
+
+async def chunked(data: bytes, chunk_size: int = 64 * 1024):
+    for offset in range(0, len(data), chunk_size):
+        yield data[offset:offset + chunk_size]
+
+
+def payload(size: int) -> bytes:
+    return bytes(range(256)) * (size // 256) + bytes(size % 256)
+
+
+class TestParseByteRange:
+    """Test HTTP Range parsing."""
+
+    def test_no_header_serves_whole_object(self):
+        assert parse_byte_range(None, 100) is None
+        assert parse_byte_range("", 100) is None
+
+    def test_closed_open_and_suffix_ranges(self):
+        assert parse_byte_range("bytes=0-9", 100) == (0, 9)
+        assert parse_byte_range("bytes=90-", 100) == (90, 99)
+        assert parse_byte_range("bytes=-10", 100) == (90, 99)
+        assert parse_byte_range("bytes=50-500", 100) == (50, 99)
+        assert parse_byte_range("bytes=-500", 100) == (0, 99)
+
+    def test_multiple_or_malformed_ranges_are_ignored(self):
+        assert parse_byte_range("bytes=0-1,5-6", 100) is None
+        assert parse_byte_range("items=0-1", 100) is None
+
+    def test_unsatisfiable_ranges(self):
+        for header in ("bytes=100-", "bytes=10-5", "bytes=-0"):
+            with pytest.raises(ValueError):
+                parse_byte_range(header, 100)
+
+
+class TestStreamingUpload:
+    """Test multipart uploads against the S3 stand-in."""
+
+    @pytest.mark.asyncio
+    async def test_small_upload_uses_single_put(self):
+        client = FakeS3Client()
+        service = make_service(client)
+
+        result = await service.upload_stream(chunked(b"hello"), "a.pdf", "application/pdf", user_id=7)
+
+        assert client.uploads == {}
+        body, content_type, metadata = client.objects[result["file_id"]]
+        assert body == b"hello"
+        assert content_type == "application/pdf"
+        assert metadata["user_id"] == "7"
+        assert result["file_size"] == 5
+
+    @pytest.mark.asyncio
+    async def test_large_upload_is_split_into_bounded_parts(self):
+        client = FakeS3Client()
+        service = make_service(client)
+        data = payload(12 * MB + 123)
+
+        result = await service.upload_stream(chunked(data), "big.pdf", part_size=MIN_PART_SIZE)
+
+        assert client.part_sizes == [MIN_PART_SIZE, MIN_PART_SIZE, 2 * MB + 123]
+        assert client.objects[result["file_id"]][0] == data
+        assert result["parts"] == 3
+        assert result["file_size"] == len(data)
+
+    @pytest.mark.asyncio
+    async def test_part_size_below_s3_minimum_is_raised(self):
+        client = FakeS3Client()
+        service = make_service(client)
+
+        await service.upload_stream(chunked(payload(6 * MB)), "big.pdf", part_size=1024)
+
+        assert client.part_sizes == [MIN_PART_SIZE, MB]
+
+    @pytest.mark.asyncio
+    async def test_oversized_stream_aborts_multipart_upload(self):
+        client = FakeS3Client()
+        service = make_service(client, max_file_size=7 * MB)
+
+        with pytest.raises(FileUploadError):
+            await service.upload_stream(chunked(payload(12 * MB)), "big.pdf", part_size=MIN_PART_SIZE)
+
+        assert client.aborted == ["upload-1"]
+        assert client.uploads == {}
+        assert client.objects == {}
+
+    @pytest.mark.asyncio
+    async def test_failing_stream_aborts_multipart_upload(self):
+        client = FakeS3Client()
+        service = make_service(client)
+
+        async def broken():
+            yield payload(6 * MB)
+            raise ConnectionError("client went away")
+
+        with pytest.raises(FileUploadError):
+            await service.upload_stream(broken(), "big.pdf", part_size=MIN_PART_SIZE)
+
+        assert client.aborted == ["upload-1"]
+
+    @pytest.mark.asyncio
+    async def test_disallowed_type_is_rejected_before_reading(self):
+        client = FakeS3Client()
+        service = make_service(client)
+        consumed = []
+
+        async def tracked():
+            consumed.append(True)
+            yield b"x"
+
+        with pytest.raises(FileUploadError):
+            await service.upload_stream(tracked(), "script.exe")
+
+        assert consumed == []
+
+    @pytest.mark.asyncio
+    async def test_upload_file_bytes_still_supported(self):
+        client = FakeS3Client()
+        service = make_service(client)
+
+        result = await service.upload_file(b"content", "a.pdf")
+
+        assert client.objects[result["file_id"]][0] == b"content"
+
+
+class TestRangedDownload:
+    """Test streamed downloads against the S3 stand-in."""
+
+    @pytest.mark.asyncio
+    async def test_stream_whole_object_in_chunks(self):
+        client = FakeS3Client()
+        client.objects["k"] = (payload(1000), None, {})
+        service = make_service(client)
+
+        chunks = [chunk async for chunk in service.stream_file("k", chunk_size=300)]
+
+        assert [len(chunk) for chunk in chunks] == [300, 300, 300, 100]
+        assert b"".join(chunks) == payload(1000)
+        assert client.bodies[0].closed
+
+    @pytest.mark.asyncio
+    async def test_stream_byte_range(self):
+        client = FakeS3Client()
+        client.objects["k"] = (payload(1000), None, {})
+        service = make_service(client)
+
+        data = b"".join([chunk async for chunk in service.stream_file("k", (100, 199))])
+
+        assert data == payload(1000)[100:200]
+
+    @pytest.mark.asyncio
+    async def test_missing_object(self):
+        service = make_service(FakeS3Client())
+
+        with pytest.raises(FileUploadError, match="not found"):
+            await service.download_file("missing")
+
+
+class TestLocalFallback:
+    """Test chunked writes and ranged reads of the local fallback."""
+
+    @pytest.mark.asyncio
+    async def test_round_trip_with_range(self, tmp_path):
+        service = make_service(local_dir=tmp_path)
+        data = payload(300 * 1024)
+
+        result = await service.upload_stream(chunked(data), "doc.pdf", "application/pdf", user_id=3)
+
+        metadata = await service.get_file_metadata(result["file_id"])
+        assert metadata["file_size"] == len(data)
+        assert metadata["content_type"] == "application/pdf"
+        assert metadata["metadata"]["user_id"] == "3"
+        assert await service.download_file(result["file_id"]) == data
+
+        ranged = b"".join([chunk async for chunk in service.stream_file(result["file_id"], (1000, 70000), chunk_size=4096)])
+        assert ranged == data[1000:70001]
+        assert not any(name.endswith(".part") for name in (p.name for p in tmp_path.iterdir()))
+
+    @pytest.mark.asyncio
+    async def test_oversized_upload_leaves_no_files(self, tmp_path):
+        service = make_service(local_dir=tmp_path, max_file_size=100 * 1024)
+
+        with pytest.raises(FileUploadError):
+            await service.upload_stream(chunked(payload(200 * 1024)), "doc.pdf")
+
+        assert list(tmp_path.iterdir()) == []
+
+    @pytest.mark.asyncio
+    async def test_iter_bytes_chunks_content(self):
+        chunks = [chunk async for chunk in iter_bytes(b"abcdefg", chunk_size=3)]
+
+        assert chunks == [b"abc", b"def", b"g"]
@@ -0,0 +1,164 @@
+"""
+Unit tests for the per-user session index of RedisSessionManager.
+
+Covers index maintenance on create/delete/expiry, single-MGET user lookups
+(no KEYS), SCAN-based admin listings and index pruning.
+"""
+
+import fnmatch
+import time
+
+import pytest
+
+from app.core.session_manager import RedisSessionManager
+
+
+class FakeRedis:
+    """Minimal async Redis stand-in for the commands the manager uses."""
+
+    def __init__(self):
+        self.values = {}
+        self.zsets = {}
+        self.calls = []
+
+    def expire_now(self, key):
+        self.values.pop(key, None)
+
+    async def get(self, key):
+        self.calls.append("get")
+        return self.values.get(key)
+
+    async def mget(self, keys):
+        self.calls.append("mget")
+        return [self.values.get(key) for key in keys]
+
+    async def set(self, key, value, ex=None):
+        self.values[key] = value
+        return True
+
+    async def delete(self, *keys):
+        return sum(self.values.pop(key, None) is not None for key in keys)
+
+    async def expire(self, key, seconds, nx=False, gt=False):
+        return key in self.values or key in self.zsets
+
+    async def zadd(self, key, mapping):
+        self.zsets.setdefault(key, {}).update(mapping)
+        return len(mapping)
+
+    async def zrem(self, key, *members):
+        zset = self.zsets.get(key, {})
+        return sum(zset.pop(member, None) is not None for member in members)
+
+    async def zrange(self, key, start, end):
+        zset = self.zsets.get(key, {})
+        return sorted(zset, key=zset.get)
+
+    async def zremrangebyscore(self, key, low, high):
+        zset = self.zsets.get(key, {})
+        expired = [member for member, score in zset.items() if score <= high]
+        for member in expired:
+            del zset[member]
+        return len(expired)
+
+    async def scan(self, cursor=0, match="*", count=10):
+        self.calls.append("scan")
+        keys = sorted(k for k in list(self.values) + list(self.zsets) if fnmatch.fnmatch(k, match))
+        page = keys[cursor:cursor + count]
+        next_cursor = cursor + count if cursor + count < len(keys) else 0
+        return next_cursor, page
+
+    async def keys(self, pattern):
+        raise AssertionError("KEYS must not be used")
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.queued = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self.queued.append((name, args, kwargs))
+            return self
+        return queue
+
+    async def execute(self):
+        results = [await getattr(self.redis, name)(*args, **kwargs) for name, args, kwargs in self.queued]
+        self.queued = []
+        return results
+
+
+@pytest.fixture
+def manager():
+    manager = RedisSessionManager(redis_url="redis://localhost:6379/0", scan_count=2)
+    manager._client = FakeRedis()
+    return manager
+
+
+class TestUserIndex:
+    """Test the per-user session index."""
+
+    @pytest.mark.asyncio
+    async def test_user_sessions_use_index_and_one_mget(self, manager):
+        mine = {await manager.create_session(1, {"n": i}) for i in range(3)}
+        await manager.create_session(2)
+        manager._client.calls.clear()
+
+        sessions = await manager.get_user_sessions(1)
+
+        assert {session["session_id"] for session in sessions} == mine
+        assert manager._client.calls == ["mget"]
+
+    @pytest.mark.asyncio
+    async def test_delete_removes_index_entry(self, manager):
+        session_id = await manager.create_session(1)
+
+        assert await manager.delete_session(session_id)
+        assert manager._client.zsets["user_sessions:1"] == {}
+        assert await manager.get_user_sessions(1) == []
+
+    @pytest.mark.asyncio
+    async def test_expired_sessions_pruned(self, manager):
+        kept = await manager.create_session(1)
+        expired = await manager.create_session(1)
+        evicted = await manager.create_session(1)
+        manager._client.zsets["user_sessions:1"][expired] = time.time() - 1
+        manager._client.expire_now(f"sessions:{evicted}")
+
+        sessions = await manager.get_user_sessions(1)
+
+        assert [session["session_id"] for session in sessions] == [kept]
+        assert set(manager._client.zsets["user_sessions:1"]) == {kept}
+
+    @pytest.mark.asyncio
+    async def test_cleanup_prunes_all_indexes(self, manager):
+        for user_id in (1, 2, 3):
+            session_id = await manager.create_session(user_id)
+            manager._client.zsets[f"user_sessions:{user_id}"][session_id] = time.time() - 1
+
+        assert await manager.cleanup_expired_sessions() == 3
+
+
+class TestAdminListing:
+    """Test SCAN-based listings."""
+
+    @pytest.mark.asyncio
+    async def test_stats_scan_every_session(self, manager):
+        for user_id in (1, 1, 2, 3, 3):
+            await manager.create_session(user_id)
+
+        stats = await manager.get_session_stats()
+
+        assert stats["total_sessions"] == 5
+        assert stats["user_session_counts"] == {1: 2, 2: 1, 3: 2}
+        assert manager._client.calls.count("scan") > 1
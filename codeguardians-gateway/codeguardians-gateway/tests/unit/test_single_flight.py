@@ -0,0 +1,156 @@
+"""
+Unit tests for single-flight coalescing of concurrent identical guard calls.
+"""
+
+import asyncio
+import pytest
+import pytest_asyncio
+from unittest.mock import AsyncMock, patch
+
+from app.core.guard_orchestrator import (
+    GuardServiceOrchestrator,
+    GuardServiceType,
+    OrchestrationRequest
+)
+from app.core.guard_verdict_cache import GuardVerdictCache
+from app.core.single_flight import SingleFlight
+
+
+class TestSingleFlight:
+    """Test the coalescing primitive."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_share_one_execution(self):
+        flight = SingleFlight()
+        calls = 0
+
+        async def fetch():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.05)
+            return {"ok": True}
+
+        results = await asyncio.gather(*[flight.do("key", fetch) for _ in range(5)])
+
+        assert calls == 1
+        assert [shared for _, shared in results].count(False) == 1
+        assert flight.coalesced_total == 4
+        assert flight.in_flight() == 0
+
+    @pytest.mark.asyncio
+    async def test_exception_delivered_to_all_waiters(self):
+        flight = SingleFlight()
+
+        async def fail():
+            await asyncio.sleep(0.01)
+            raise RuntimeError("guard down")
+
+        results = await asyncio.gather(
+            flight.do("key", fail), flight.do("key", fail), return_exceptions=True
+        )
+
+        assert all(isinstance(r, RuntimeError) for r in results)
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_does_not_cancel_others(self):
+        flight = SingleFlight()
+
+        async def fetch():
+            await asyncio.sleep(0.05)
+            return "done"
+
+        first = asyncio.create_task(flight.do("key", fetch))
+        second = asyncio.create_task(flight.do("key", fetch))
+        await asyncio.sleep(0)
+        first.cancel()
+
+        assert await second == ("done", True)
+
+    @pytest.mark.asyncio
+    async def test_sequential_calls_not_coalesced(self):
+        flight = SingleFlight()
+        fetch = AsyncMock(return_value=1)
+
+        await flight.do("key", fetch)
+        await flight.do("key", fetch)
+
+        assert fetch.await_count == 2
+
+
+@pytest_asyncio.fixture
+async def orchestrator():
+    """Create an initialized orchestrator without network access or verdict cache."""
+    orch = GuardServiceOrchestrator()
+    orch.http_client = AsyncMock()
+    await orch._load_service_configurations()
+    await orch._initialize_circuit_breakers()
+    orch._initialized = True
+    with patch("app.core.guard_orchestrator.get_guard_verdict_cache",
+               return_value=GuardVerdictCache(enabled=False)):
+        yield orch
+
+
+def make_request(request_id, text="same commit", tenant_id="org-1", user_id=None):
+    return OrchestrationRequest(
+        request_id=request_id,
+        service_type=GuardServiceType.TOKEN_GUARD,
+        payload={"text": text},
+        tenant_id=tenant_id,
+        user_id=user_id
+    )
+
+
+class TestOrchestratorCoalescing:
+    """Test coalescing in orchestrate_request."""
+
+    @pytest.mark.asyncio
+    async def test_burst_of_identical_scans_makes_one_call(self, orchestrator):
+        calls = 0
+
+        async def fake_route(request, context_data=None, **kwargs):
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.05)
+            return {"score": 0.2}
+
+        with patch.object(orchestrator, "_route_request", side_effect=fake_route):
+            responses = await asyncio.gather(*[
+                orchestrator.orchestrate_request(make_request(f"ci-{i}")) for i in range(10)
+            ])
+
+        assert calls == 1
+        assert all(r.success and r.data == {"score": 0.2} for r in responses)
+        assert len({id(r.data) for r in responses}) == 10
+
+    @pytest.mark.asyncio
+    async def test_different_payloads_and_tenants_not_coalesced(self, orchestrator):
+        async def fake_route(request, context_data=None, **kwargs):
+            await asyncio.sleep(0.05)
+            return {"ok": True}
+
+        route = AsyncMock(side_effect=fake_route)
+        with patch.object(orchestrator, "_route_request", route):
+            await asyncio.gather(
+                orchestrator.orchestrate_request(make_request("a", text="one")),
+                orchestrator.orchestrate_request(make_request("b", text="two")),
+                orchestrator.orchestrate_request(make_request("c", text="one", tenant_id="org-2"))
+            )
+
+        assert route.await_count == 3
+
+    @pytest.mark.asyncio
+    async def test_different_users_and_anonymous_calls_not_coalesced(self, orchestrator):
+        async def fake_route(request, context_data=None, **kwargs):
+            await asyncio.sleep(0.05)
+            return {"ok": True}
+
+        route = AsyncMock(side_effect=fake_route)
+        with patch.object(orchestrator, "_route_request", route):
+            await asyncio.gather(
+                orchestrator.orchestrate_request(make_request("a", user_id="u1")),
+                orchestrator.orchestrate_request(make_request("b", user_id="u2")),
+                orchestrator.orchestrate_request(make_request("c", tenant_id=None)),
+                orchestrator.orchestrate_request(make_request("d", tenant_id=None))
+            )
+
+        assert route.await_count == 4
@@ -0,0 +1,179 @@
+"""
+Unit tests for per-stage orchestration latency instrumentation.
+
+Covers histogram accuracy, stage timers, the sampled slow-request log and
+the stage breakdown recorded by orchestrate_request.
+"""
+
+import random
+
+import httpx
+import pytest
+import pytest_asyncio
+from unittest.mock import patch
+
+from app.core.adaptive_concurrency import AdaptiveConcurrencyController
+from app.core.guard_orchestrator import (
+    GuardServiceOrchestrator,
+    GuardServiceType,
+    OrchestrationRequest
+)
+from app.core.stage_timing import (
+    LatencyHistogram,
+    StageTimer,
+    StageTimingRegistry,
+    current_stage_timer,
+    timed_stage
+)
+
+
+class TestLatencyHistogram:
+    """Test the log-linear histogram."""
+
+    def test_percentiles_within_bucket_precision(self):
+        histogram = LatencyHistogram()
+        values = [random.randint(1_000, 50_000_000) for _ in range(5000)]
+        for value in values:
+            histogram.record(value)
+
+        values.sort()
+        for percent in (50, 90, 99):
+            exact = values[int(len(values) * percent / 100) - 1]
+            assert abs(histogram.percentile(percent) - exact) <= exact / 8
+
+        assert histogram.total == 5000
+        assert histogram.max_ns == values[-1]
+        assert histogram.percentile(100) == values[-1]
+
+    def test_small_values_are_exact(self):
+        histogram = LatencyHistogram()
+        for value in (0, 3, 7, 15):
+            histogram.record(value)
+        assert histogram.percentile(50) == 3
+        assert histogram.summary()["count"] == 4
+
+    def test_empty_histogram(self):
+        assert LatencyHistogram().percentile(99) == 0
+        assert LatencyHistogram().summary()["mean_ms"] == 0.0
+
+
+class TestStageTimer:
+    """Test sequential laps and nested stages."""
+
+    def test_laps_and_nested_stages(self):
+        timer = StageTimer()
+        timer.lap("validation")
+        with timer.stage("upstream"):
+            pass
+        timer.add("upstream", 1000)
+        timer.lap("route")
+
+        assert set(timer.stages) == {"validation", "upstream", "route"}
+        assert timer.stages["upstream"] >= 1000
+        assert timer.total_ns() >= timer.stages["validation"] + timer.stages["route"]
+
+    def test_timed_stage_is_noop_outside_a_request(self):
+        assert current_stage_timer() is None
+        with timed_stage("upstream"):
+            pass
+
+    @pytest.mark.asyncio
+    async def test_httpx_trace_splits_upstream_call(self):
+        timer = StageTimer()
+        for event in (
+            "connection.connect_tcp.started",
+            "http11.send_request_headers.started",
+            "http11.receive_response_headers.complete",
+            "http11.receive_response_body.complete",
+        ):
+            await timer.httpx_trace(event, {})
+
+        assert set(timer.stages) == {"connect", "ttfb", "body_read"}
+
+
+class TestSlowRequestLog:
+    """Test threshold and sampling of the slow-request log."""
+
+    def finish(self, registry, request_id):
+        token = registry.start()
+        current_stage_timer().add("upstream", 5_000_000)
+        registry.finish(token, "tokenguard", request_id, {"success": True})
+
+    def test_slow_requests_logged_with_breakdown(self):
+        registry = StageTimingRegistry(slow_threshold_ms=0, slow_sample_rate=1.0)
+        self.finish(registry, "r-1")
+
+        entry = registry.get_slow_requests()[0]
+        assert entry["request_id"] == "r-1"
+        assert entry["stages_ms"]["upstream"] == 5.0
+        assert entry["success"] is True
+        assert registry.get_stats()["tokenguard"]["total"]["count"] == 1
+        assert current_stage_timer() is None
+
+    def test_sampling_and_threshold(self):
+        unsampled = StageTimingRegistry(slow_threshold_ms=0, slow_sample_rate=0.0)
+        fast = StageTimingRegistry(slow_threshold_ms=60_000, slow_sample_rate=1.0)
+        for registry in (unsampled, fast):
+            self.finish(registry, "r-1")
+            assert registry.get_slow_requests() == []
+            assert registry.get_stats()["tokenguard"]["upstream"]["count"] == 1
+
+
+@pytest_asyncio.fixture
+async def orchestrator():
+    """Orchestrator whose guards answer through an in-memory transport."""
+
+    async def handler(request):
+        return httpx.Response(200, json={"clean": True})
+
+    orch = GuardServiceOrchestrator()
+    await orch._load_service_configurations()
+    await orch._initialize_circuit_breakers()
+    orch.http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    orch._initialized = True
+    registry = StageTimingRegistry(slow_threshold_ms=0, slow_sample_rate=1.0)
+    controller = AdaptiveConcurrencyController(initial_limit=4)
+    with patch("app.core.guard_orchestrator.get_stage_timings", return_value=registry), \
+            patch("app.core.guard_orchestrator.get_concurrency_controller", return_value=controller), \
+            patch.object(orch, "_is_service_available", return_value=True):
+        orch.stage_timings = registry
+        yield orch
+    await orch.http_client.aclose()
+
+
+class TestOrchestratorStages:
+    """Test the stage breakdown recorded for orchestrated requests."""
+
+    @pytest.mark.asyncio
+    async def test_request_records_each_stage(self, orchestrator):
+        response = await orchestrator.orchestrate_request(OrchestrationRequest(
+            request_id="stage-1",
+            service_type=GuardServiceType.TOKEN_GUARD,
+            payload={"text": "stage timing probe"}
+        ))
+
+        assert response.success
+        stages = orchestrator.stage_timings.get_stats()["tokenguard"]
+        for stage in ("validation", "transform", "admission", "queue_wait",
+                      "context_enhancement", "upstream", "json_decode",
+                      "route", "post_processing", "total"):
+            assert stages[stage]["count"] == 1, stage
+        assert current_stage_timer() is None
+
+        entry = orchestrator.stage_timings.get_slow_requests()[0]
+        assert entry["request_id"] == "stage-1"
+        assert entry["stages_ms"]["route"] >= entry["stages_ms"]["upstream"]
+
+    @pytest.mark.asyncio
+    async def test_failed_request_still_recorded(self, orchestrator):
+        with patch.object(orchestrator, "_is_service_available", return_value=False):
+            response = await orchestrator.orchestrate_request(OrchestrationRequest(
+                request_id="stage-2",
+                service_type=GuardServiceType.TOKEN_GUARD,
+                payload={"text": "stage timing failure"}
+            ))
+
+        assert not response.success
+        entry = orchestrator.stage_timings.get_slow_requests()[0]
+        assert entry["success"] is False
+        assert "total" in entry["stages_ms"]
@@ -0,0 +1,184 @@
+"""
+Unit tests for fast cold start.
+
+Covers the import/phase startup profiler, warm-up steps, lazily imported
+optional routers, and the readiness probe reporting not ready until warm-up
+has finished.
+"""
+
+import asyncio
+import importlib
+import json
+import sys
+import time
+from types import SimpleNamespace
+
+import pytest
+from fastapi import FastAPI
+from unittest.mock import AsyncMock, patch
+
+from app.core import optimized_health
+from app.core.optimized_health import OptimizedHealthChecker
+from app.core.startup_profile import StartupProfiler
+from app.core.startup_warmup import StartupWarmup, warm_guards
+
+
+@pytest.fixture
+def slow_package(tmp_path, monkeypatch):
+    """A package whose parent and child each sleep at import time."""
+    package = tmp_path / "slowpkg"
+    package.mkdir()
+    (package / "__init__.py").write_text("import time\ntime.sleep(0.02)\nfrom slowpkg import child\n")
+    (package / "child.py").write_text("import time\ntime.sleep(0.05)\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield "slowpkg"
+    for name in ("slowpkg", "slowpkg.child"):
+        sys.modules.pop(name, None)
+
+
+class TestStartupProfiler:
+    """Test import and phase timing."""
+
+    def test_reports_self_and_cumulative_import_time(self, slow_package):
+        profiler = StartupProfiler()
+        profiler.install()
+        try:
+            importlib.import_module(slow_package)
+        finally:
+            profiler.uninstall()
+
+        report = profiler.report()
+        modules = {entry["module"]: entry for entry in report["modules"]}
+        assert modules["slowpkg.child"]["self_ms"] >= 50
+        assert modules["slowpkg"]["self_ms"] >= 20
+        assert modules["slowpkg"]["cumulative_ms"] >= 70
+        assert report["modules"][0]["module"] == "slowpkg.child"
+
+    def test_uninstall_stops_timing(self, slow_package):
+        profiler = StartupProfiler()
+        profiler.install()
+        profiler.uninstall()
+
+        importlib.import_module(slow_package)
+
+        assert profiler.imports == {}
+        assert sys.modules[slow_package].__loader__.__class__.__name__ != "_TimedLoader"
+
+    def test_phases_accumulate(self):
+        profiler = StartupProfiler()
+        for _ in range(2):
+            with profiler.phase("routes"):
+                time.sleep(0.01)
+
+        assert profiler.report()["phases_ms"]["routes"] >= 20
+        json.dumps(profiler.report())
+
+
+class TestOptionalRouters:
+    """Test that disabled subsystems are neither imported nor mounted."""
+
+    AB_TESTING_MODULE = "app.api.v1.ab_testing"
+
+    def test_disabled_ab_testing_not_imported_or_mounted(self, monkeypatch):
+        main = importlib.import_module("app.main")
+        monkeypatch.delitem(sys.modules, self.AB_TESTING_MODULE, raising=False)
+        flags = SimpleNamespace(ENTERPRISE_ENABLED=False, UPLOAD_ENABLED=False, AB_TESTING_ENABLED=False)
+        app = FastAPI()
+
+        with patch.object(main, "settings", flags):
+            main._add_optional_routers(app)
+
+        paths = {route.path for route in app.routes}
+        assert self.AB_TESTING_MODULE not in sys.modules
+        assert not any(path.startswith("/api/v1/ab-testing") or path.startswith("/experiments") for path in paths)
+
+
+class TestStartupWarmup:
+    """Test warm-up steps and completion."""
+
+    @pytest.mark.asyncio
+    async def test_steps_run_in_order_and_failures_are_recorded(self):
+        order = []
+
+        async def ok(name):
+            order.append(name)
+            return {"name": name}
+
+        async def failing():
+            order.append("redis")
+            raise ConnectionError("Redis unavailable")
+
+        warmup = StartupWarmup()
+        warmup.add_step("database", lambda: ok("database"))
+        warmup.add_step("redis", failing)
+        warmup.add_step("guards", lambda: ok("guards"))
+
+        assert await warmup.run() is False
+        assert order == ["database", "redis", "guards"]
+        assert warmup.is_complete
+        assert warmup.results["redis"] == {"ok": False, "error": "Redis unavailable", "duration_ms": pytest.approx(0, abs=50)}
+
+    @pytest.mark.asyncio
+    async def test_slow_step_times_out(self):
+        warmup = StartupWarmup(step_timeout=0.05)
+        warmup.add_step("guards", lambda: asyncio.sleep(10))
+
+        start = time.perf_counter()
+        await warmup.run()
+
+        assert time.perf_counter() - start < 1
+        assert warmup.results["guards"]["error"] == "timeout"
+
+    @pytest.mark.asyncio
+    async def test_warm_guards_opens_connections_to_enabled_guards(self):
+        client = AsyncMock()
+        orchestrator = SimpleNamespace(http_client=client, services={
+            "tokenguard": SimpleNamespace(enabled=True, base_url="http://tokenguard:8000", health_endpoint="/health"),
+            "biasguard": SimpleNamespace(enabled=False, base_url="http://biasguard:8000", health_endpoint="/health")
+        })
+
+        opened = await warm_guards(orchestrator, connections=3)
+
+        assert opened == {"tokenguard": 3}
+        assert [call.args[0] for call in client.get.call_args_list] == ["http://tokenguard:8000/health"] * 3
+
+
+class TestReadiness:
+    """Test readiness gating on warm-up."""
+
+    @staticmethod
+    def body(response):
+        return json.loads(response.body)
+
+    @pytest.mark.asyncio
+    async def test_not_ready_while_warming_up(self):
+        release = asyncio.Event()
+        warmup = StartupWarmup()
+        warmup.add_step("guards", release.wait)
+        checker = OptimizedHealthChecker()
+
+        with patch.object(optimized_health, "get_startup_warmup", return_value=warmup), \
+                patch.object(checker, "_check_database", AsyncMock(return_value={"healthy": True})), \
+                patch.object(checker, "_check_redis", AsyncMock(return_value={"healthy": True})):
+            warmup.start()
+            response = await checker.readiness_check()
+            assert response.status_code == 503
+            assert self.body(response)["status"] == "warming_up"
+            checker._check_database.assert_not_awaited()
+
+            release.set()
+            await warmup.wait(timeout=1)
+            response = await checker.readiness_check()
+
+        assert response.status_code == 200
+        assert self.body(response)["checks"]["warmup"]["complete"] is True
+
+    @pytest.mark.asyncio
+    async def test_ready_without_warmup(self):
+        checker = OptimizedHealthChecker()
+
+        with patch.object(optimized_health, "get_startup_warmup", return_value=StartupWarmup()):
+            response = await checker.readiness_check(check_dependencies=False)
+
+        assert response.status_code == 200
+        assert "warmup" not in self.body(response)["checks"]
@@ -0,0 +1,164 @@
+"""
+Unit tests for the tenant context cache.
+
+Covers local hits, negative caching, single-flight loading, invalidation by
+key, user and organization, and the cached path of API-key authentication.
+"""
+
+import asyncio
+import time
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.core.tenant_cache import TenantContextCache, hash_api_key
+from app.middleware.tenant_context import extract_tenant_from_api_key
+
+TENANT = {
+    "organization_id": "1",
+    "user_id": "10",
+    "role": "member",
+    "permissions": ["read"]
+}
+
+
+def counting_loader(value):
+    calls = []
+
+    async def loader():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return value
+
+    return loader, calls
+
+
+class TestLookup:
+    """Test cached lookups without Redis."""
+
+    @pytest.mark.asyncio
+    async def test_second_lookup_is_local_hit(self):
+        cache = TenantContextCache()
+        loader, calls = counting_loader(TENANT)
+
+        assert await cache.get_or_load("h1", loader) == TENANT
+        assert await cache.get_or_load("h1", loader) == TENANT
+        assert len(calls) == 1
+        assert cache.stats["local_hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_unknown_key_negatively_cached(self):
+        cache = TenantContextCache(negative_ttl=60)
+        loader, calls = counting_loader(None)
+
+        assert await cache.get_or_load("bad", loader) is None
+        assert await cache.get_or_load("bad", loader) is None
+        assert len(calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_share_one_load(self):
+        cache = TenantContextCache()
+        loader, calls = counting_loader(TENANT)
+
+        results = await asyncio.gather(*(cache.get_or_load("h2", loader) for _ in range(10)))
+
+        assert all(result == TENANT for result in results)
+        assert len(calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_lru_bound(self):
+        cache = TenantContextCache(max_entries=2)
+        for key_hash in ("a", "b", "c"):
+            await cache.get_or_load(key_hash, counting_loader(TENANT)[0])
+
+        assert list(cache._local) == ["b", "c"]
+
+    @pytest.mark.asyncio
+    async def test_expired_key_not_served_from_cache(self):
+        cache = TenantContextCache(local_ttl=300)
+        tenant = {**TENANT, "expires_at": time.time() + 60}
+        loader, calls = counting_loader(tenant)
+        await cache.get_or_load("h3", loader)
+
+        tenant["expires_at"] = time.time() - 1
+        await cache.get_or_load("h3", loader)
+
+        assert len(calls) == 2
+        assert "h3" not in cache._local
+
+    @pytest.mark.asyncio
+    async def test_ttls_capped_at_key_lifetime(self):
+        cache = TenantContextCache(local_ttl=300, redis_ttl=300)
+        tenant = {**TENANT, "expires_at": time.time() + 10}
+        pipe = MagicMock()
+        client = MagicMock()
+        client.pipeline.return_value = pipe
+        pipe.execute = AsyncMock()
+
+        await cache.get_or_load("h4", counting_loader(tenant)[0])
+        await cache._store_redis(client, "h4", tenant)
+
+        assert cache._local["h4"][0] - time.monotonic() <= 10
+        assert pipe.set.call_args.kwargs["ex"] <= 10
+
+
+class TestInvalidation:
+    """Test invalidation paths."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("invalidate", [
+        lambda cache: cache.invalidate_api_key("h3"),
+        lambda cache: cache.invalidate_user(10),
+        lambda cache: cache.invalidate_organization("1"),
+    ])
+    async def test_invalidation_forces_reload(self, invalidate):
+        cache = TenantContextCache()
+        loader, calls = counting_loader(TENANT)
+        await cache.get_or_load("h3", loader)
+
+        await invalidate(cache)
+        await cache.get_or_load("h3", loader)
+
+        assert len(calls) == 2
+        assert not cache._by_user.get("10") or cache._by_user["10"] == {"h3"}
+
+    @pytest.mark.asyncio
+    async def test_load_racing_invalidation_not_cached(self):
+        cache = TenantContextCache()
+        loader, calls = counting_loader(TENANT)
+
+        lookup = asyncio.ensure_future(cache.get_or_load("h4", loader))
+        await asyncio.sleep(0.005)
+        assert calls
+        await cache.invalidate_user(10)
+        assert await lookup == TENANT
+
+        assert "h4" not in cache._local
+
+    def test_remote_invalidation_drops_local_entries(self):
+        cache = TenantContextCache()
+        cache._store_local("h5", TENANT)
+        cache._store_local("h6", {**TENANT, "user_id": "11"})
+
+        cache._apply_remote_invalidation("org:1")
+
+        assert not cache._local
+        assert not cache._by_org
+
+
+class TestAPIKeyAuthentication:
+    """Test the cached API-key path of the tenant middleware."""
+
+    @pytest.mark.asyncio
+    async def test_repeat_requests_skip_database(self):
+        cache = TenantContextCache()
+        load = AsyncMock(return_value=TENANT)
+
+        with patch("app.middleware.tenant_context.get_tenant_cache", return_value=cache), \
+                patch("app.middleware.tenant_context.load_api_key_tenant", load):
+            first = await extract_tenant_from_api_key("cg_live_secret", db=None)
+            second = await extract_tenant_from_api_key("cg_live_secret", db=None)
+
+        assert first.organization_id == second.organization_id == "1"
+        assert first.has_permission("read")
+        load.assert_awaited_once_with(hash_api_key("cg_live_secret"), None)
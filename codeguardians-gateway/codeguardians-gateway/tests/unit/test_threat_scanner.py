@@ -0,0 +1,149 @@
+"""
+Unit tests for the compiled threat scanner.
+
+Covers literal extraction, equivalence with per-pattern re.search, span
+reporting reused by the sanitizer, equivalence on 1KB-1MB inputs and a
+(slow-marked, reporting only) 1KB-1MB scan benchmark.
+"""
+
+import random
+import re
+import time
+
+import pytest
+
+from app.core.security import SecurityMiddleware, SecurityValidator
+from app.core.threat_scanner import ThreatScanner, redact_spans, required_literal
+
+PATTERNS = SecurityValidator().threat_patterns
+
+SAMPLES = [
+    "hello world",
+    "1' OR 1=1 --",
+    "x'; DROP TABLE users",
+    "<SCRIPT src=x>alert(document.cookie)</script>",
+    "../../etc/passwd",
+    "{{ 7*7 }} and ${user.name}",
+    '{"$where": "this.a > 1", "__proto__": {}}',
+    "UNION ſELECT password FROM users",
+    "run PowerShell -c whoami",
+    "*)(uid=*)",
+]
+
+
+def reference_matches(text):
+    """Pre-scanner behaviour: one re.search per pattern on the lowered text."""
+    return [
+        (threat_type, pattern)
+        for threat_type, patterns in PATTERNS.items()
+        for pattern in patterns
+        if re.search(pattern, text.lower(), re.IGNORECASE)
+    ]
+
+
+def scanned_matches(scanner, text):
+    seen = []
+    for match in scanner.scan(text):
+        if (match.threat_type, match.pattern) not in seen:
+            seen.append((match.threat_type, match.pattern))
+    return seen
+
+
+def benign_text(size):
+    words = "the quick brown fox jumps over a lazy dog while reading quarterly reports".split()
+    rng = random.Random(size)
+    return " ".join(rng.choice(words) for _ in range(size // 4))[:size]
+
+
+class TestCompilation:
+    """Test prefilter literal extraction."""
+
+    @pytest.mark.parametrize("pattern,literal", [
+        (r"';?\s*DROP\s+TABLE", "table"),
+        (r"<script[^>]*>", "<script"),
+        (r"document\.cookie", "document.cookie"),
+        (r"[|&;`$]", None),
+    ])
+    def test_required_literal(self, pattern, literal):
+        assert required_literal(pattern) == literal
+
+    def test_shared_patterns_compiled_once(self):
+        scanner = ThreatScanner(PATTERNS)
+        total = sum(len(patterns) for patterns in PATTERNS.values())
+
+        assert len(scanner.patterns) < total
+        assert scanner.patterns.count("javascript:") == 1
+
+
+class TestScan:
+    """Test scan results and spans."""
+
+    @pytest.mark.parametrize("text", SAMPLES)
+    def test_matches_per_pattern_search(self, text):
+        assert scanned_matches(ThreatScanner(PATTERNS), text) == reference_matches(text)
+
+    def test_spans_point_into_original_text(self):
+        text = "ok <SCRIPT>x</SCRIPT> then <script>"
+        spans = [(m.start, m.end) for m in ThreatScanner(PATTERNS).scan(text) if m.pattern == "<script[^>]*>"]
+
+        assert [text[start:end] for start, end in spans] == ["<SCRIPT>", "<script>"]
+        assert redact_spans(text, spans) == "ok x</SCRIPT> then "
+
+    def test_redact_merges_overlapping_spans(self):
+        assert redact_spans("abcdefgh", [(1, 4), (2, 6), (7, 8)], "_") == "a_g_"
+
+
+class TestSecurityValidator:
+    """Test the validator and sanitizer on top of the scanner."""
+
+    @pytest.mark.asyncio
+    async def test_payload_threats_carry_path_and_spans(self):
+        validator = SecurityValidator()
+        threats = await validator.validate_input({"items": ["fine", "go ../up"], "$where": "x"})
+
+        traversal = [t for t in threats if t.threat_type == "path_traversal"]
+        assert traversal[0].path == ["items", 1]
+        assert traversal[0].spans == [(3, 6)]
+        assert any(t.in_key and t.path == ["$where"] for t in threats)
+
+    @pytest.mark.asyncio
+    async def test_sanitizer_reuses_spans(self):
+        middleware = SecurityMiddleware()
+
+        sanitized = await middleware.validate_request({"comment": "hi {{ secret }} there"})
+
+        assert sanitized == {"comment": "hi  there"}
+
+
+class TestLargeInputs:
+    """Compare the compiled scanner with per-pattern searches on large inputs."""
+
+    @pytest.mark.parametrize("size", [1024, 64 * 1024, 1024 * 1024])
+    def test_matches_per_pattern_search(self, size):
+        scanner = ThreatScanner(PATTERNS)
+        text = benign_text(size) + " <iframe src=x> "
+
+        assert scanned_matches(scanner, text) == reference_matches(text)
+
+
+@pytest.mark.slow
+class TestScanBenchmark:
+    """Compare the prefilter scanner with per-pattern searches (reports, never asserts timings)."""
+
+    @pytest.mark.parametrize("size", [1024, 10 * 1024, 100 * 1024, 1024 * 1024])
+    def test_scan_throughput(self, size):
+        scanner = ThreatScanner(PATTERNS)
+        text = benign_text(size) + " <iframe src=x> "
+
+        start = time.perf_counter()
+        reference_matches(text)
+        reference_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        scanned_matches(scanner, text)
+        scanner_s = time.perf_counter() - start
+
+        print(
+            f"{size} bytes: per-pattern {reference_s * 1000:.2f}ms, scanner {scanner_s * 1000:.2f}ms "
+            f"({reference_s / scanner_s if scanner_s else float('inf'):.1f}x)"
+        )
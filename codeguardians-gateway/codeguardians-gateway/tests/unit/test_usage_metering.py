@@ -0,0 +1,137 @@
+"""
+Unit tests for usage metering.
+
+Covers the single-script Redis metering call, the per-endpoint counter hash
+and the buffered bulk insert of usage records.
+"""
+
+import asyncio
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.middleware.usage_tracking import UsageRecordBuffer, UsageTracker
+
+
+class FakeSession:
+    """Async session recording executed bulk inserts."""
+
+    def __init__(self, inserts, fail=False):
+        self.inserts = inserts
+        self.fail = fail
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute(self, statement, rows):
+        if self.fail:
+            raise RuntimeError("database down")
+        self.inserts.append(rows)
+
+    async def commit(self):
+        pass
+
+
+def session_factory(inserts, fail=False):
+    return lambda: FakeSession(inserts, fail)
+
+
+class TestUsageTracker:
+    """Test metering through the Lua script."""
+
+    @pytest.mark.asyncio
+    async def test_track_api_call_is_one_script_call(self):
+        tracker = UsageTracker(record_buffer=UsageRecordBuffer())
+        tracker._meter_script = AsyncMock(return_value=[4, "2.0"])
+
+        usage = await tracker.track_api_call("42", "/api/v1/scan", "POST", 0.25, 200)
+
+        assert usage["api_calls"] == 4
+        assert usage["avg_response_time"] == 0.5
+        tracker._meter_script.assert_awaited_once()
+        call = tracker._meter_script.await_args.kwargs
+        assert call["keys"] == ["usage:org:42:current", "usage:org:42:current:endpoints"]
+        assert call["args"][:2] == ["POST:/api/v1/scan", 0.25]
+        assert tracker.record_buffer.stats["buffered"] == 1
+
+    @pytest.mark.asyncio
+    async def test_redis_failure_does_not_raise(self):
+        tracker = UsageTracker(record_buffer=UsageRecordBuffer())
+        tracker._meter_script = AsyncMock(side_effect=ConnectionError("redis down"))
+
+        assert await tracker.track_api_call("42", "/x", "GET", 0.1, 200) == {}
+
+    @pytest.mark.asyncio
+    async def test_current_usage_reads_endpoint_hash(self):
+        tracker = UsageTracker(record_buffer=UsageRecordBuffer())
+        pipe = MagicMock()
+        pipe.execute = AsyncMock(return_value=[
+            {"api_calls": "3", "total_response_time": "1.5", "last_updated": "t"},
+            {"GET:/a": "2", "POST:/b": "1"}
+        ])
+        tracker.redis_client = MagicMock(pipeline=MagicMock(return_value=pipe))
+
+        usage = await tracker.get_current_usage("42")
+
+        assert usage["api_calls"] == 3
+        assert usage["avg_response_time"] == 0.5
+        assert usage["endpoints"] == {"GET:/a": 2, "POST:/b": 1}
+
+
+class TestUsageRecordBuffer:
+    """Test aggregation and bulk flushing of usage records."""
+
+    @pytest.mark.asyncio
+    async def test_calls_aggregated_into_one_bulk_insert(self):
+        inserts = []
+        buffer = UsageRecordBuffer(flush_interval=60)
+        for response_time in (0.1, 0.3):
+            buffer.add("7", "/scan", "POST", response_time, 200)
+        buffer.add("7", "/scan", "POST", 0.2, 500)
+        buffer.add("not-a-number", "/scan", "POST", 0.2, 200)
+
+        with patch("app.middleware.usage_tracking.get_session_factory", return_value=session_factory(inserts)):
+            await buffer.close()
+
+        assert len(inserts) == 1
+        rows = sorted(inserts[0], key=lambda row: row["status_code"])
+        assert rows[0] == {
+            "organization_id": 7, "endpoint": "POST:/scan", "status_code": 200,
+            "request_count": 2, "response_time_ms": 200, "record_type": "api_call"
+        }
+        assert rows[1]["request_count"] == 1
+        assert buffer.stats["flushed"] == 3
+
+    @pytest.mark.asyncio
+    async def test_failed_flush_is_retried(self):
+        inserts = []
+        buffer = UsageRecordBuffer(flush_interval=60)
+        buffer.add("7", "/scan", "POST", 0.1, 200)
+
+        with patch("app.middleware.usage_tracking.get_session_factory",
+                   return_value=session_factory(inserts, fail=True)):
+            assert await buffer.flush() == 0
+        buffer.add("7", "/scan", "POST", 0.1, 200)
+        with patch("app.middleware.usage_tracking.get_session_factory", return_value=session_factory(inserts)):
+            assert await buffer.flush() == 1
+        await buffer.close()
+
+        assert inserts[0][0]["request_count"] == 2
+        assert buffer.stats["flush_errors"] == 1
+
+    @pytest.mark.asyncio
+    async def test_background_flush_and_bound(self):
+        inserts = []
+        buffer = UsageRecordBuffer(flush_interval=0.01, max_records=2)
+        with patch("app.middleware.usage_tracking.get_session_factory", return_value=session_factory(inserts)):
+            for endpoint in ("/a", "/b", "/c"):
+                buffer.add("7", endpoint, "GET", 0.1, 200)
+            await asyncio.sleep(0.05)
+            await buffer.close()
+
+        assert len(inserts) == 1
+        assert len(inserts[0]) == 2
+        assert buffer.stats["dropped"] == 1